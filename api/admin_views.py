@@ -1,13 +1,18 @@
 from django.contrib.admin.views.decorators import staff_member_required
 from django.shortcuts import render
-from django.db.models import Sum, Count
 from django.utils.decorators import method_decorator
 from django.views import View
 
 from orders.models import Order
-from lecture.models import LiveLectureOrder
-from meetup.models import MeetupOrder
-from file.models import FileOrder
+from stores.models import DailySalesRollup
+from stores.sales_rollup import STORE_TOTAL, sales_totals
+
+# 밋업/라이브 강의/디지털 파일 주문은 유입 채널이 없어 채널을 지정하지 않았을 때만 요약에 포함
+UNCHANNELED_SUMMARY_KINDS = (
+    (DailySalesRollup.KIND_LIVE_LECTURE, "라이브 강의"),
+    (DailySalesRollup.KIND_MEETUP, "밋업"),
+    (DailySalesRollup.KIND_FILE, "디지털 파일"),
+)
 
 
 @method_decorator(staff_member_required, name="dispatch")
@@ -17,39 +22,30 @@ class ChannelSalesView(View):
     def get(self, request):
         channel = request.GET.get("channel", "").strip()
 
-        def base_filter(qs):
-            return qs.filter(channel=channel) if channel else qs
-
-        product_orders = base_filter(Order.objects.all())
-        live_orders = base_filter(LiveLectureOrder.objects.all()) if hasattr(LiveLectureOrder, "channel") else []
-        meetup_orders = base_filter(MeetupOrder.objects.all()) if hasattr(MeetupOrder, "channel") else []
-        file_orders = base_filter(FileOrder.objects.all()) if hasattr(FileOrder, "channel") else []
+        product_orders = Order.objects.select_related("store")
+        if channel:
+            product_orders = product_orders.filter(channel=channel)
 
+        # 요약은 일별 판매 집계에서 합산 (주문 원본 전체를 읽지 않음)
         summary = []
-        def add_summary(label, qs, amount_field="total_amount"):
-            if not qs:
-                return
-            total = qs.aggregate(
-                count=Count("id"),
-                amount=Sum(amount_field),
-            )
-            summary.append({
-                "label": label,
-                "count": total.get("count") or 0,
-                "amount": total.get("amount") or 0,
-            })
-
-        add_summary("상품 주문", product_orders, "total_amount")
-        add_summary("라이브 강의", live_orders, "total_amount")
-        add_summary("밋업", meetup_orders, "total_amount")
-        add_summary("디지털 파일", file_orders, "total_amount")
+
+        def add_summary(label, kind, rollup_channel=None):
+            sales = sales_totals(kind, channel=rollup_channel, item_ids=[STORE_TOTAL]).get(STORE_TOTAL)
+            if sales and sales["order_count"]:
+                summary.append({
+                    "label": label,
+                    "count": sales["order_count"],
+                    "amount": sales["revenue"],
+                })
+
+        add_summary("상품 주문", DailySalesRollup.KIND_PRODUCT, rollup_channel=channel or None)
+        if not channel:
+            for kind, label in UNCHANNELED_SUMMARY_KINDS:
+                add_summary(label, kind)
 
         context = {
             "channel": channel,
             "product_orders": product_orders,
-            "live_orders": live_orders,
-            "meetup_orders": meetup_orders,
-            "file_orders": file_orders,
             "summary": summary,
         }
         return render(request, self.template_name, context)
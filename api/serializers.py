@@ -4,6 +4,7 @@ from django.utils import timezone
 
 from stores.models import Store
 from products.models import Product
+from products.pricing import resolve_product_prices
 from meetup.models import Meetup
 from lecture.models import LiveLecture
 from file.models import DigitalFile
@@ -18,6 +19,12 @@ def _format_datetime(value) -> Optional[str]:
     return value.isoformat()
 
 
+def _first_image_url(product: Product) -> Optional[str]:
+    # prefetch 된 경우 캐시를 그대로 사용하고, 아니면 LIMIT 1 로 한 번만 조회
+    first_image = next(iter(product.images.all()[:1]), None)
+    return first_image.file_url if first_image else None
+
+
 def serialize_product(product: Product) -> dict:
     display_currency = "krw" if product.price_display == "krw" else "sats"
     display_price = product.display_price
@@ -29,7 +36,7 @@ def serialize_product(product: Product) -> dict:
         "id": product.id,
         "title": product.title,
         "description": product.description,
-        "thumbnail": product.images.first().file_url if hasattr(product, "images") and product.images.exists() else None,
+        "thumbnail": _first_image_url(product),
         "pricing_mode": product.price_display,
         "display_currency": display_currency,
         "display_price": display_price,
@@ -123,12 +130,12 @@ def serialize_digital_file(digital_file: DigitalFile) -> dict:
         pay_discounted_price_sats = None
         if digital_file.is_discounted:
             if pricing_mode == "krw":
-                from myshop.models import ExchangeRate
+                if digital_file.discounted_price_krw is not None:
+                    pay_discounted_price_sats = digital_file.public_discounted_price_sats
+                    if pay_discounted_price_sats is None:
+                        from myshop.rate_snapshot import krw_to_sats
 
-                latest_rate = ExchangeRate.get_latest_rate()
-                if latest_rate and latest_rate.btc_krw_rate and latest_rate.btc_krw_rate > 0 and digital_file.discounted_price_krw is not None:
-                    btc_amount = digital_file.discounted_price_krw / float(latest_rate.btc_krw_rate)
-                    pay_discounted_price_sats = round(btc_amount * 100_000_000)
+                        pay_discounted_price_sats = krw_to_sats(digital_file.discounted_price_krw)
             else:
                 pay_discounted_price_sats = digital_file.discounted_price
 
@@ -175,6 +182,12 @@ def serialize_store(store: Store) -> dict:
 
 
 def serialize_store_list(stores) -> dict:
+    stores = list(stores)
+    # 모든 스토어의 상품 가격을 하나의 환율로 한 번에 계산
+    resolve_product_prices(
+        [product for store in stores for product in getattr(store, "active_products", [])],
+        include_options=False,
+    )
     return {"stores": [serialize_store(store) for store in stores]}
 
 
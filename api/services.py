@@ -2,6 +2,7 @@ from django.db.models import Prefetch
 
 from stores.models import Store
 from products.models import Product
+from products.pricing import resolve_product_prices
 from meetup.models import Meetup
 from lecture.models import LiveLecture
 from file.models import DigitalFile
@@ -11,7 +12,7 @@ from ln_payment.blink_service import get_blink_service_for_store
 
 def get_active_stores_with_relations():
     """활성 스토어와 활성 연관 리소스를 한 번에 로드."""
-    product_qs = Product.objects.filter(is_active=True).order_by("-created_at")
+    product_qs = Product.objects.filter(is_active=True).prefetch_related("images").order_by("-created_at")
     meetup_qs = Meetup.objects.filter(
         is_active=True,
         is_temporarily_closed=False,
@@ -51,7 +52,10 @@ def get_store_owner(store_id: str):
 
 
 def get_active_products(store):
-    return store.products.filter(is_active=True).prefetch_related("images").order_by("-created_at")
+    """활성 상품 목록을 단일 환율로 가격 계산까지 마친 리스트로 반환."""
+    products = list(store.products.filter(is_active=True).prefetch_related("images").order_by("-created_at"))
+    resolve_product_prices(products, include_options=False)
+    return products
 
 
 def get_active_meetups(store):
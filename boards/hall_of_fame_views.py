@@ -4,9 +4,10 @@ from django.contrib import messages
 from django.views.generic import ListView
 from django.http import JsonResponse
 from .models import HallOfFame
+from storage.image_derivatives import get_profile, process_profile_image
 from storage.utils import upload_file_to_s3
 from django.core.files.base import ContentFile
-import io
+from dataclasses import replace
 import logging
 
 from .cache_utils import (
@@ -20,12 +21,6 @@ logger = logging.getLogger(__name__)
 
 HALL_OF_FAME_LIST_CACHE_VERSION = 'v2'
 
-try:
-    from PIL import Image, ImageOps
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
-
 
 def has_hall_of_fame_permission(user):
     """Hall of Fame 등록 권한 확인"""
@@ -221,85 +216,28 @@ def hall_of_fame_create(request):
 
 def process_hall_of_fame_image(image_file, thumbnail_size=400):
     """
-    Hall of Fame 이미지를 처리합니다.
-    - 원본은 1:1 비율로 크롭 후 1000x1000 리사이즈
-    - 썸네일은 400x400 생성
+    Hall of Fame 이미지를 처리합니다. (``storage.image_derivatives`` 의 'hall_of_fame' 프로필)
+    - 1:1 비율로 크롭 후 원본 1000x1000, 썸네일 400x400 을 한 번의 디코딩으로 생성
     - WebP 포맷으로 변환
     """
-    try:
-        if not PIL_AVAILABLE:
-            return {
-                'success': False,
-                'error': 'Pillow 패키지가 설치되지 않았습니다.'
-            }
-        
-        logger.info(f"Hall of Fame 이미지 처리 시작: {image_file.name}")
-        
-        # 이미지 열기
-        image = Image.open(image_file)
-        original_size = image.size
-        logger.info(f"원본 이미지 크기: {original_size}")
-        
-        # EXIF 정보에 따른 회전 보정
-        image = ImageOps.exif_transpose(image)
-        
-        # RGB 모드로 변환
-        if image.mode not in ('RGB', 'RGBA'):
-            image = image.convert('RGB')
-        elif image.mode == 'RGBA':
-            # 투명 배경을 흰색으로 변환
-            background = Image.new('RGB', image.size, (255, 255, 255))
-            background.paste(image, mask=image.split()[-1])
-            image = background
-        
-        # 1:1 비율로 중앙 크롭
-        width, height = image.size
-        min_dimension = min(width, height)
-        
-        left = (width - min_dimension) // 2
-        top = (height - min_dimension) // 2
-        right = left + min_dimension
-        bottom = top + min_dimension
-        
-        image_cropped = image.crop((left, top, right, bottom))
-        logger.info(f"1:1 크롭 완료: {image_cropped.size}")
-        
-        # 원본 이미지 리사이즈 (1000x1000)
-        original_resized = image_cropped.resize((1000, 1000), Image.Resampling.LANCZOS)
-        
-        # 썸네일 생성 (400x400)
-        thumbnail = image_cropped.resize((thumbnail_size, thumbnail_size), Image.Resampling.LANCZOS)
-        
-        # 원본 WebP 변환
-        original_output = io.BytesIO()
-        original_resized.save(original_output, format='WEBP', quality=85, method=6)
-        original_output.seek(0)
-        
-        # 썸네일 WebP 변환
-        thumbnail_output = io.BytesIO()
-        thumbnail.save(thumbnail_output, format='WEBP', quality=85, method=6)
-        thumbnail_output.seek(0)
-        
-        # ContentFile 생성
-        base_name = image_file.name.rsplit('.', 1)[0]
-        original_file = ContentFile(original_output.getvalue(), name=f"{base_name}_original.webp")
-        thumbnail_file = ContentFile(thumbnail_output.getvalue(), name=f"{base_name}_thumbnail.webp")
-        
-        return {
-            'success': True,
-            'original_file': original_file,
-            'thumbnail_file': thumbnail_file,
-            'original_size': (1000, 1000),
-            'thumbnail_size': (thumbnail_size, thumbnail_size)
-        }
-        
-    except Exception as e:
-        error_msg = f"Hall of Fame 이미지 처리 실패: {str(e)}"
-        logger.error(error_msg)
-        return {
-            'success': False,
-            'error': error_msg
-        }
+    profile = get_profile('hall_of_fame')
+    if thumbnail_size != profile.widths[1]:
+        profile = replace(profile, widths=(profile.widths[0], thumbnail_size))
+
+    process_result = process_profile_image(image_file, profile)
+    if not process_result['success']:
+        return process_result
+
+    rendered = process_result['derivatives']
+    original, thumbnail = rendered.derivatives
+    base_name = image_file.name.rsplit('.', 1)[0]
+    return {
+        'success': True,
+        'original_file': ContentFile(original.content, name=f"{base_name}_original{original.extension}"),
+        'thumbnail_file': ContentFile(thumbnail.content, name=f"{base_name}_thumbnail{thumbnail.extension}"),
+        'original_size': (original.width, original.height),
+        'thumbnail_size': (thumbnail.width, thumbnail.height)
+    }
 
 
 @login_required
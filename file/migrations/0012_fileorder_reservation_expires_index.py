@@ -0,0 +1,19 @@
+# Generated by Django 5.2.2 on 2026-10-18 14:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('file', '0011_digitalfile_public_discounted_price_sats_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fileorder',
+            index=models.Index(fields=['reservation_expires_at'], name='file_fileor_reserva_f155e5_idx'),
+        ),
+    ]
@@ -113,6 +113,9 @@ class DigitalFile(models.Model):
     is_discounted = models.BooleanField(default=False, verbose_name="할인 적용")
     discounted_price = models.PositiveIntegerField(verbose_name="할인가(satoshi)", null=True, blank=True)
     discounted_price_krw = models.PositiveIntegerField(null=True, blank=True, verbose_name="원화 할인가", help_text="원화 단위")
+    # 사토시 환산 가격 (원화 연동 시 환율 갱신마다 일괄 재계산 - myshop.sats_prices)
+    public_price_sats = models.PositiveIntegerField(null=True, blank=True, editable=False, verbose_name="사토시 환산 가격")
+    public_discounted_price_sats = models.PositiveIntegerField(null=True, blank=True, editable=False, verbose_name="사토시 환산 할인가")
     discount_end_date = models.DateField(verbose_name="할인 종료일", null=True, blank=True)
     discount_end_time = models.TimeField(verbose_name="할인 종료시간", null=True, blank=True)
     
@@ -157,6 +160,7 @@ class DigitalFile(models.Model):
             models.Index(fields=['is_discounted']),
             models.Index(fields=['is_temporarily_closed']),
             models.Index(fields=['store', 'is_discounted']),
+            models.Index(fields=['store', 'is_active', 'public_price_sats']),  # 사토시 가격순 정렬용
         ]
     
     def __str__(self):
@@ -311,15 +315,12 @@ class DigitalFile(models.Model):
         current = self.current_price
         
         if self.price_display == 'krw' and current is not None:
-            from myshop.models import ExchangeRate
-            try:
-                latest_rate = ExchangeRate.objects.latest('created_at')
-                if latest_rate and latest_rate.btc_krw_rate > 0:
-                    btc_amount = current / float(latest_rate.btc_krw_rate)
-                    sats_amount = btc_amount * 100_000_000
-                    return round(sats_amount)
-            except ExchangeRate.DoesNotExist:
-                pass
+            if self.is_discount_active and self.discounted_price_krw:
+                sats_amount = self._krw_to_public_sats(self.discounted_price_krw, self.public_discounted_price_sats)
+            else:
+                sats_amount = self._krw_to_public_sats(self.price_krw, self.public_price_sats)
+            if sats_amount is not None:
+                return sats_amount
         
         return current
     
@@ -330,18 +331,19 @@ class DigitalFile(models.Model):
             return 0
         
         if self.price_display == 'krw' and self.price_krw is not None:
-            from myshop.models import ExchangeRate
-            try:
-                latest_rate = ExchangeRate.objects.latest('created_at')
-                if latest_rate and latest_rate.btc_krw_rate > 0:
-                    btc_amount = self.price_krw / float(latest_rate.btc_krw_rate)
-                    sats_amount = btc_amount * 100_000_000
-                    return round(sats_amount)
-            except ExchangeRate.DoesNotExist:
-                pass
+            sats_amount = self._krw_to_public_sats(self.price_krw, self.public_price_sats)
+            if sats_amount is not None:
+                return sats_amount
         
         return self.price
     
+    def _krw_to_public_sats(self, krw_amount, materialized_sats):
+        """원화 금액의 사토시 환산값 (구체화 컬럼 우선, 없으면 환율 스냅샷, 환율도 없으면 None)"""
+        if materialized_sats is not None:
+            return materialized_sats
+        from myshop.rate_snapshot import krw_to_sats
+        return krw_to_sats(krw_amount)
+    
     @property
     def current_price_krw(self):
         """현재 원화 가격 (원화연동인 경우)"""
@@ -392,18 +394,7 @@ class DigitalFile(models.Model):
     @property
     def get_price_sats(self):
         """정가를 사토시로 반환"""
-        if self.price_display == 'free':
-            return 0
-        
-        if self.price_display == 'krw' and self.price_krw is not None:
-            from myshop.models import ExchangeRate
-            latest_rate = ExchangeRate.get_latest_rate()
-            if latest_rate and latest_rate.btc_krw_rate > 0:
-                btc_amount = self.price_krw / float(latest_rate.btc_krw_rate)
-                sats_amount = btc_amount * 100_000_000
-                return round(sats_amount)
-        
-        return self.price
+        return self.price_sats
     
     @property
     def discount_percentage(self):
@@ -660,6 +651,7 @@ class FileOrder(models.Model):
             models.Index(fields=['user', 'status']),
             models.Index(fields=['is_discounted']),
             models.Index(fields=['download_clicked']),
+            models.Index(fields=['reservation_expires_at']),  # 예약 만료 정리용
         ]
     
     def __str__(self):
@@ -3,12 +3,13 @@
 """
 import logging
 from django.conf import settings
-from django.core.mail.backends.smtp import EmailBackend
 from django.core.mail import EmailMessage
 from django.utils import timezone
 from django.template.loader import render_to_string
 from django.template import Context, Template
 
+from stores.email_outbox import queue_store_email
+
 logger = logging.getLogger(__name__)
 
 
@@ -59,16 +60,6 @@ def send_file_purchase_notification_email(file_order):
             logger.debug(f"파일 {file_order.order_number}: 스토어 주인장 이메일이 설정되지 않음")
             return False
             
-        # 스토어별 SMTP 설정
-        backend = EmailBackend(
-            host='smtp.gmail.com',
-            port=587,
-            username=store.email_host_user,
-            password=store.get_email_host_password(),
-            use_tls=True,
-            fail_silently=False,
-        )
-        
         # 이메일 내용 생성
         subject = f'[{store.store_name}] 새로운 파일 구매 - {file_order.order_number}'
         
@@ -110,15 +101,15 @@ SatoShop 팀"""
             body=message,
             from_email=f'{store.email_from_display} <{store.email_host_user}>',
             to=[recipient_email],
-            connection=backend
         )
         
-        email.send()
+        if queue_store_email(store, email, kind='file_owner_notification', dedupe_key=f"file_owner:{file_order.order_number}") is None:
+            return False
         
         # 이메일 발송 성공 기록 (중복 방지용)
         cache.set(email_cache_key, True, timeout=86400)  # 24시간 보관
         
-        logger.info(f"파일 구매 알림 이메일 발송 성공 - 주문: {file_order.order_number}, 수신: {recipient_email}")
+        logger.info(f"파일 구매 알림 이메일 발송 대기열 추가 - 주문: {file_order.order_number}, 수신: {recipient_email}")
         return True
         
     except Exception as e:
@@ -164,16 +155,6 @@ def send_file_buyer_confirmation_email(file_order):
             logger.debug(f"파일 구매자 이메일 {file_order.order_number}: Gmail 설정 불완전")
             return False
             
-        # 스토어별 SMTP 설정
-        backend = EmailBackend(
-            host='smtp.gmail.com',
-            port=587,
-            username=store.email_host_user,
-            password=store.get_email_host_password(),
-            use_tls=True,
-            fail_silently=False,
-        )
-        
         # 이메일 내용 생성
         subject = f'[{store.store_name}] "{file_order.digital_file.name}" 파일 구매 확정 - {file_order.order_number}'
         
@@ -215,15 +196,15 @@ def send_file_buyer_confirmation_email(file_order):
             body=message,
             from_email=f'{store.email_from_display} <{store.email_host_user}>',
             to=[file_order.user.email],
-            connection=backend
         )
         
-        email.send()
+        if queue_store_email(store, email, kind='file_buyer_confirmation', dedupe_key=f"file_buyer:{file_order.order_number}") is None:
+            return False
         
         # 이메일 발송 성공 기록 (중복 방지용)
         cache.set(email_cache_key, True, timeout=86400)  # 24시간 보관
         
-        logger.info(f"파일 구매자 확인 이메일 발송 성공 - 주문: {file_order.order_number}, 수신: {file_order.user.email}")
+        logger.info(f"파일 구매자 확인 이메일 발송 대기열 추가 - 주문: {file_order.order_number}, 수신: {file_order.user.email}")
         return True
         
     except Exception as e:
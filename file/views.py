@@ -26,6 +26,7 @@ from .services import (
     send_file_buyer_confirmation_email
 )
 from ln_payment.blink_service import get_blink_service_for_store
+from ln_payment.dashboard import transaction_dashboard
 from ln_payment.models import PaymentTransaction
 from ln_payment.services import LightningPaymentProcessor, PaymentStage
 
@@ -254,8 +255,8 @@ def delete_file(request, store_id, file_id):
         # 메인 파일 삭제
         if file_info.get('file'):
             try:
-                from storage.backends import S3Storage
-                storage = S3Storage()
+                from storage.backends import get_s3_storage
+                storage = get_s3_storage()
                 storage.delete(file_info['file'])
                 logger.info(f"Deleted file from storage: {file_info['file']}")
             except Exception as e:
@@ -265,8 +266,8 @@ def delete_file(request, store_id, file_id):
         # 미리보기 이미지 삭제
         if file_info.get('preview_image'):
             try:
-                from storage.backends import S3Storage
-                storage = S3Storage()
+                from storage.backends import get_s3_storage
+                storage = get_s3_storage()
                 storage.delete(file_info['preview_image'])
                 logger.info(f"Deleted preview image from storage: {file_info['preview_image']}")
             except Exception as e:
@@ -531,35 +532,15 @@ def file_payment_transactions(request, store_id):
     if not store:
         return redirect('stores:store_detail', store_id=store_id)
 
-    status_filter = request.GET.get('status')
-    stage_filter = request.GET.get('stage')
-
-    transactions_qs = PaymentTransaction.objects.filter(
-        store=store,
-        file_order__isnull=False,
-    )
-
-    if status_filter in {
-        PaymentTransaction.STATUS_PENDING,
-        PaymentTransaction.STATUS_PROCESSING,
-        PaymentTransaction.STATUS_FAILED,
-        PaymentTransaction.STATUS_COMPLETED,
-    }:
-        transactions_qs = transactions_qs.filter(status=status_filter)
-
-    if stage_filter and stage_filter.isdigit():
-        transactions_qs = transactions_qs.filter(current_stage=int(stage_filter))
-
-    paginator = Paginator(
-        transactions_qs.select_related(
-            'user',
-            'file_order',
-            'file_order__digital_file',
-        ).order_by('-created_at'),
-        5,
+    dashboard = transaction_dashboard(
+        request.GET,
+        PaymentTransaction.objects.filter(
+            store=store,
+            file_order__isnull=False,
+        ),
+        select_related=('user', 'file_order', 'file_order__digital_file'),
     )
-    page_number = request.GET.get('page')
-    transactions_page = paginator.get_page(page_number)
+    transactions_page = dashboard.page
 
     for tx in transactions_page:
         metadata = tx.metadata if isinstance(tx.metadata, dict) else {}
@@ -582,29 +563,16 @@ def file_payment_transactions(request, store_id):
                 or (metadata.get('manual_restore_history') or [])
             )
 
-    base_qs = PaymentTransaction.objects.filter(
-        store=store,
-        file_order__isnull=False,
-    )
-    summary = {
-        'total': base_qs.count(),
-        'pending': base_qs.filter(status=PaymentTransaction.STATUS_PENDING).count(),
-        'processing': base_qs.filter(status=PaymentTransaction.STATUS_PROCESSING).count(),
-        'completed': base_qs.filter(status=PaymentTransaction.STATUS_COMPLETED).count(),
-        'failed': base_qs.filter(status=PaymentTransaction.STATUS_FAILED).count(),
-        'total_amount': base_qs.aggregate(total=Sum('amount_sats'))['total'] or 0,
-    }
-
     admin_access_query = '?admin_access=true' if request.GET.get('admin_access', '').lower() == 'true' else ''
 
     context = {
         'store': store,
         'transactions': transactions_page,
-        'paginator': paginator,
+        'paginator': transactions_page.paginator,
         'page_obj': transactions_page,
-        'status_filter': status_filter or '',
-        'stage_filter': stage_filter or '',
-        'summary': summary,
+        'status_filter': dashboard.status_filter,
+        'stage_filter': dashboard.stage_filter,
+        'summary': dashboard.summary,
         'admin_access_query': admin_access_query,
     }
     return render(request, 'file/file_payment_transactions.html', context)
@@ -925,32 +893,15 @@ def file_start_payment_workflow(request, store_id, file_id):
                     'error_code': 'inventory_unavailable',
                 })
 
-            active_reservations = []
-            pending_reservations = (
-                FileOrder.objects.select_for_update()
-                .filter(
-                    digital_file=locked_file,
-                    status='pending',
-                    is_temporary_reserved=True,
-                )
-            )
-            for reservation in pending_reservations:
-                expires_at = reservation.reservation_expires_at
-                if expires_at and expires_at <= now:
-                    reservation.status = 'cancelled'
-                    reservation.is_temporary_reserved = False
-                    reservation.auto_cancelled_reason = '예약 만료'
-                    reservation.save(update_fields=[
-                        'status',
-                        'is_temporary_reserved',
-                        'auto_cancelled_reason',
-                        'updated_at',
-                    ])
-                    continue
-                active_reservations.append(reservation)
+            # 만료된 임시 예약은 세지 않음 (취소 처리는 만료 정리 워커 run_expiry_scheduler 가 담당)
+            active_reservation_count = FileOrder.objects.filter(
+                digital_file=locked_file,
+                status='pending',
+                is_temporary_reserved=True,
+            ).filter(Q(reservation_expires_at__isnull=True) | Q(reservation_expires_at__gt=now)).count()
 
             confirmed_count = locked_file.orders.filter(status='confirmed').count()
-            total_reserved = confirmed_count + len(active_reservations)
+            total_reserved = confirmed_count + active_reservation_count
             if locked_file.max_downloads and total_reserved >= locked_file.max_downloads:
                 return JsonResponse({
                     'success': False,
@@ -1128,21 +1079,23 @@ def file_verify_payment(request, store_id, file_id, transaction_id):
     if not file_order:
         return JsonResponse({'success': False, 'error': '주문 정보를 찾을 수 없습니다.'}, status=500)
 
-    finalize_file_order_from_transaction(
-        file_order,
-        payment_hash=transaction.payment_hash,
-        payment_request=transaction.payment_request,
-    )
+    # 정산 보정기가 이미 확정한 결제면 다시 확정하거나 메일을 보내지 않음
+    if transaction.status != PaymentTransaction.STATUS_COMPLETED:
+        finalize_file_order_from_transaction(
+            file_order,
+            payment_hash=transaction.payment_hash,
+            payment_request=transaction.payment_request,
+        )
 
-    settlement_payload = {'status': status_result.get('raw_status'), 'provider': 'blink'}
-    processor.mark_settlement(transaction, tx_payload=settlement_payload)
-    processor.finalize_file_order(transaction, file_order)
+        settlement_payload = {'status': status_result.get('raw_status'), 'provider': 'blink'}
+        processor.mark_settlement(transaction, tx_payload=settlement_payload)
+        processor.finalize_file_order(transaction, file_order)
 
-    try:
-        send_file_buyer_confirmation_email(file_order)
-        send_file_purchase_notification_email(file_order)
-    except Exception as exc:  # pylint: disable=broad-except
-        logger.error('파일 결제 이메일 발송 실패 - order_id=%s, error=%s', file_order.id, exc)
+        try:
+            send_file_buyer_confirmation_email(file_order)
+            send_file_purchase_notification_email(file_order)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error('파일 결제 이메일 발송 실패 - order_id=%s, error=%s', file_order.id, exc)
 
     request.session.pop(session_key, None)
 
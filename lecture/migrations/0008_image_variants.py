@@ -0,0 +1,18 @@
+# Generated by Django 5.2.2 on 2026-10-18 14:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lecture', '0007_livelecture_public_discounted_price_sats_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='livelectureimage',
+            name='variants',
+            field=models.JSONField(blank=True, default=list, verbose_name='반응형 변형'),
+        ),
+    ]
@@ -4,8 +4,6 @@ from django.utils import timezone
 from django.core.validators import EmailValidator, RegexValidator
 from stores.models import Store
 from decimal import Decimal
-from django.core.cache import cache
-import requests
 import datetime
 import uuid
 
@@ -155,6 +153,9 @@ class LiveLecture(models.Model):
     is_discounted = models.BooleanField(default=False, verbose_name="할인 적용")
     discounted_price = models.PositiveIntegerField(verbose_name="할인가(satoshi)", null=True, blank=True)
     discounted_price_krw = models.PositiveIntegerField(null=True, blank=True, verbose_name="원화 할인가", help_text="원화 단위")
+    # 사토시 환산 가격 (원화 연동 시 환율 갱신마다 일괄 재계산 - myshop.sats_prices)
+    public_price_sats = models.PositiveIntegerField(null=True, blank=True, editable=False, verbose_name="사토시 환산 가격")
+    public_discounted_price_sats = models.PositiveIntegerField(null=True, blank=True, editable=False, verbose_name="사토시 환산 할인가")
     early_bird_end_date = models.DateField(verbose_name="조기등록 종료일", null=True, blank=True)
     early_bird_end_time = models.TimeField(verbose_name="조기등록 종료시간", null=True, blank=True)
     
@@ -186,6 +187,7 @@ class LiveLecture(models.Model):
             models.Index(fields=['updated_at']),
             models.Index(fields=['is_temporarily_closed']),
             models.Index(fields=['price_display']),
+            models.Index(fields=['store', 'is_active', 'public_price_sats']),  # 사토시 가격순 정렬용
         ]
     
     def __str__(self):
@@ -315,34 +317,24 @@ class LiveLecture(models.Model):
     
     @classmethod
     def get_btc_krw_rate(cls):
-        """업비트 BTC/KRW 환율 조회 (캐시 60초)"""
-        cache_key = 'btc_krw_rate'
-        rate = cache.get(cache_key)
-        
+        """BTC/KRW 환율 조회 (프로세스 환율 스냅샷, 요청 경로에서 외부 API 호출 없음)"""
+        from myshop.rate_refresher import get_rate_for_request
+        rate = get_rate_for_request()
         if rate is None:
-            try:
-                response = requests.get('https://api.upbit.com/v1/ticker?markets=KRW-BTC')
-                if response.status_code == 200:
-                    data = response.json()
-                    if data and len(data) > 0:
-                        rate = Decimal(str(data[0]['trade_price']))
-                        cache.set(cache_key, rate, 60)
-            except Exception as e:
-                print(f"환율 조회 실패: {e}")
-                rate = Decimal('0')
-        
-        return rate
+            return Decimal('0')
+        return Decimal(str(rate.btc_krw_rate))
     
     @property
     def public_price_krw(self):
         """사용자용 원화연동 가격 (사토시 단위)"""
         if self.price_display == 'krw' and self.price_krw is not None:
-            from myshop.models import ExchangeRate
-            latest_rate = ExchangeRate.get_latest_rate()
-            if latest_rate and latest_rate.btc_krw_rate > 0:
-                btc_amount = self.price_krw / float(latest_rate.btc_krw_rate)
-                sats_amount = btc_amount * 100_000_000
-                return round(sats_amount)
+            # 구체화된 사토시 컬럼 우선, 없으면 환율 스냅샷으로 계산
+            if self.public_price_sats is not None:
+                return self.public_price_sats
+            from myshop.rate_snapshot import krw_to_sats
+            sats_amount = krw_to_sats(self.price_krw)
+            if sats_amount is not None:
+                return sats_amount
         return self.price
     
     @property
@@ -352,12 +344,13 @@ class LiveLecture(models.Model):
             return None
         
         if self.price_display == 'krw' and self.discounted_price_krw is not None:
-            from myshop.models import ExchangeRate
-            latest_rate = ExchangeRate.get_latest_rate()
-            if latest_rate and latest_rate.btc_krw_rate > 0:
-                btc_amount = self.discounted_price_krw / float(latest_rate.btc_krw_rate)
-                sats_amount = btc_amount * 100_000_000
-                return round(sats_amount)
+            # 구체화된 사토시 컬럼 우선, 없으면 환율 스냅샷으로 계산
+            if self.public_discounted_price_sats is not None:
+                return self.public_discounted_price_sats
+            from myshop.rate_snapshot import krw_to_sats
+            sats_amount = krw_to_sats(self.discounted_price_krw)
+            if sats_amount is not None:
+                return sats_amount
         return self.discounted_price
     
     @property
@@ -423,6 +416,8 @@ class LiveLectureImage(models.Model):
     # 이미지 크기 정보 (1:1 비율)
     width = models.PositiveIntegerField(default=500, verbose_name='이미지 너비')
     height = models.PositiveIntegerField(default=500, verbose_name='이미지 높이')
+    # 반응형 변형 [{width, height, file_path, file_url, file_size}, ...] (storage.image_derivatives)
+    variants = models.JSONField(default=list, blank=True, verbose_name='반응형 변형')
     
     # 순서 정보
     order = models.PositiveIntegerField(default=0, verbose_name='정렬 순서')
@@ -3,12 +3,13 @@
 """
 import logging
 from django.conf import settings
-from django.core.mail.backends.smtp import EmailBackend
 from django.core.mail import EmailMessage
 from django.utils import timezone
 from django.template.loader import render_to_string
 from django.template import Context, Template
 
+from stores.email_outbox import queue_store_email
+
 logger = logging.getLogger(__name__)
 
 
@@ -61,16 +62,6 @@ def send_live_lecture_notification_email(live_lecture_order):
             logger.debug(f"라이브 강의 {live_lecture_order.order_number}: 강사 이메일과 스토어 주인장 이메일이 모두 설정되지 않음")
             return False
             
-        # 스토어별 SMTP 설정
-        backend = EmailBackend(
-            host='smtp.gmail.com',
-            port=587,
-            username=store.email_host_user,
-            password=store.get_email_host_password(),
-            use_tls=True,
-            fail_silently=False,
-        )
-        
         # 이메일 내용 생성 (템플릿 파일 사용)
         subject = f'[{store.store_name}] 새로운 라이브 강의 참가 신청 - {live_lecture_order.order_number}'
         
@@ -138,19 +129,19 @@ SatoShop 팀"""
             body=message,
             from_email=f'{store.email_from_display} <{store.email_host_user}>',
             to=[recipient_email],
-            connection=backend
         )
         
         # TODO: QR코드 첨부 기능은 추후 구현 예정
         
-        email.send()
+        if queue_store_email(store, email, kind='live_lecture_owner_notification', dedupe_key=f"live_lecture_owner:{live_lecture_order.order_number}") is None:
+            return False
         
         # 🛡️ 이메일 발송 성공 기록 (중복 방지용)
         from django.core.cache import cache
         email_cache_key = f"live_lecture_owner_email_sent_{live_lecture_order.order_number}"
         cache.set(email_cache_key, True, timeout=86400)  # 24시간 보관
         
-        logger.info(f"라이브 강의 알림 이메일 발송 성공 - 주문: {live_lecture_order.order_number}, 수신: {recipient_email}")
+        logger.info(f"라이브 강의 알림 이메일 발송 대기열 추가 - 주문: {live_lecture_order.order_number}, 수신: {recipient_email}")
         return True
         
     except Exception as e:
@@ -196,16 +187,6 @@ def send_live_lecture_participant_confirmation_email(live_lecture_order):
             logger.debug(f"라이브 강의 참가자 이메일 {live_lecture_order.order_number}: Gmail 설정 불완전")
             return False
             
-        # 스토어별 SMTP 설정
-        backend = EmailBackend(
-            host='smtp.gmail.com',
-            port=587,
-            username=store.email_host_user,
-            password=store.get_email_host_password(),
-            use_tls=True,
-            fail_silently=False,
-        )
-        
         # 이메일 내용 생성 (템플릿 파일 사용)
         subject = f'[{store.store_name}] "{live_lecture_order.live_lecture.name}" 라이브 강의 참가 확정 - {live_lecture_order.order_number}'
         
@@ -247,19 +228,19 @@ def send_live_lecture_participant_confirmation_email(live_lecture_order):
             body=message,
             from_email=f'{store.email_from_display} <{store.email_host_user}>',
             to=[live_lecture_order.user.email],
-            connection=backend
         )
         
         # TODO: QR코드 첨부 기능은 추후 구현 예정
         
-        email.send()
+        if queue_store_email(store, email, kind='live_lecture_participant_confirmation', dedupe_key=f"live_lecture_participant:{live_lecture_order.order_number}") is None:
+            return False
         
         # 🛡️ 이메일 발송 성공 기록 (중복 방지용)
         from django.core.cache import cache
         email_cache_key = f"live_lecture_participant_email_sent_{live_lecture_order.order_number}"
         cache.set(email_cache_key, True, timeout=86400)  # 24시간 보관
         
-        logger.info(f"라이브 강의 참가자 확인 이메일 발송 성공 - 주문: {live_lecture_order.order_number}, 수신: {live_lecture_order.user.email}")
+        logger.info(f"라이브 강의 참가자 확인 이메일 발송 대기열 추가 - 주문: {live_lecture_order.order_number}, 수신: {live_lecture_order.user.email}")
         return True
         
     except Exception as e:
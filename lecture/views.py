@@ -20,6 +20,7 @@ import json
 import logging
 from django.conf import settings
 from ln_payment.blink_service import get_blink_service_for_store
+from ln_payment.dashboard import transaction_dashboard
 from ln_payment.models import PaymentTransaction
 from ln_payment.services import LightningPaymentProcessor, PaymentStage
 
@@ -526,35 +527,15 @@ def live_lecture_payment_transactions(request, store_id):
     if not store:
         return redirect('myshop:home')
 
-    status_filter = request.GET.get('status')
-    stage_filter = request.GET.get('stage')
-
-    transactions_qs = PaymentTransaction.objects.filter(
-        store=store,
-        live_lecture_order__isnull=False,
-    )
-
-    if status_filter in {
-        PaymentTransaction.STATUS_PENDING,
-        PaymentTransaction.STATUS_PROCESSING,
-        PaymentTransaction.STATUS_FAILED,
-        PaymentTransaction.STATUS_COMPLETED,
-    }:
-        transactions_qs = transactions_qs.filter(status=status_filter)
-
-    if stage_filter and stage_filter.isdigit():
-        transactions_qs = transactions_qs.filter(current_stage=int(stage_filter))
-
-    paginator = Paginator(
-        transactions_qs.select_related(
-            'user',
-            'live_lecture_order',
-            'live_lecture_order__live_lecture',
-        ).order_by('-created_at'),
-        5,
+    dashboard = transaction_dashboard(
+        request.GET,
+        PaymentTransaction.objects.filter(
+            store=store,
+            live_lecture_order__isnull=False,
+        ),
+        select_related=('user', 'live_lecture_order', 'live_lecture_order__live_lecture'),
     )
-    page_number = request.GET.get('page')
-    transactions_page = paginator.get_page(page_number)
+    transactions_page = dashboard.page
 
     for tx in transactions_page:
         metadata = tx.metadata if isinstance(tx.metadata, dict) else {}
@@ -585,29 +566,16 @@ def live_lecture_payment_transactions(request, store_id):
                 or (metadata.get('manual_restore_history') or [])
             )
 
-    base_qs = PaymentTransaction.objects.filter(
-        store=store,
-        live_lecture_order__isnull=False,
-    )
-    summary = {
-        'total': base_qs.count(),
-        'pending': base_qs.filter(status=PaymentTransaction.STATUS_PENDING).count(),
-        'processing': base_qs.filter(status=PaymentTransaction.STATUS_PROCESSING).count(),
-        'completed': base_qs.filter(status=PaymentTransaction.STATUS_COMPLETED).count(),
-        'failed': base_qs.filter(status=PaymentTransaction.STATUS_FAILED).count(),
-        'total_amount': base_qs.aggregate(total=Sum('amount_sats'))['total'] or 0,
-    }
-
     admin_access_query = '?admin_access=true' if request.GET.get('admin_access', '').lower() == 'true' else ''
 
     context = {
         'store': store,
         'transactions': transactions_page,
-        'paginator': paginator,
+        'paginator': transactions_page.paginator,
         'page_obj': transactions_page,
-        'status_filter': status_filter or '',
-        'stage_filter': stage_filter or '',
-        'summary': summary,
+        'status_filter': dashboard.status_filter,
+        'stage_filter': dashboard.stage_filter,
+        'summary': dashboard.summary,
         'admin_access_query': admin_access_query,
     }
     return render(request, 'lecture/lecture_live_payment_transactions.html', context)
@@ -1113,9 +1081,7 @@ def live_lecture_orders(request, store_id):
 @login_required
 def export_live_lecture_participants_csv(request, store_id, live_lecture_id):
     """라이브 강의 참가자 목록 CSV 다운로드"""
-    import csv
-    from django.http import HttpResponse
-    from datetime import datetime
+    from myshop.streaming_export import QUERYSET_CHUNK_SIZE, csv_streaming_response
     
     store = get_store_with_admin_check(request, store_id)
     if not store:
@@ -1133,46 +1099,36 @@ def export_live_lecture_participants_csv(request, store_id, live_lecture_id):
         live_lecture=live_lecture
     ).select_related('user').order_by('-created_at')
     
-    # CSV 응답 생성
-    response = HttpResponse(content_type='text/csv; charset=utf-8')
-    exported_at = timezone.localtime(timezone.now())
-    response['Content-Disposition'] = (
-        f'attachment; filename="라이브강의_참가자_{live_lecture.name}_{exported_at.strftime("%Y%m%d")}.csv"'
-    )
-    
-    # BOM 추가 (Excel에서 한글 깨짐 방지)
-    response.write('\ufeff')
-    
-    writer = csv.writer(response)
-    
     # 헤더 작성
     headers = [
         '참가자명', '이메일', '참가비', '주문번호', 
         '참가신청일시', '결제완료일시', '상태'
     ]
-    if live_lecture.price_display != 'free':
+    include_payment_hash = live_lecture.price_display != 'free'
+    if include_payment_hash:
         headers.append('결제해시')
     
-    writer.writerow(headers)
-    
-    # 데이터 작성
-    for order in orders:
-        row = [
-            order.user.username,
-            order.user.email,
-            f"{order.price} sats" if order.price > 0 else "무료",
-            order.order_number,
-            timezone.localtime(order.created_at).strftime('%Y-%m-%d %H:%M:%S'),
-            timezone.localtime(order.paid_at).strftime('%Y-%m-%d %H:%M:%S') if order.paid_at else '',
-            '참가확정' if order.status == 'confirmed' else '신청완료' if order.status == 'completed' else '취소됨'
-        ]
-        
-        if live_lecture.price_display != 'free':
-            row.append(order.payment_hash if hasattr(order, 'payment_hash') and order.payment_hash else '')
-        
-        writer.writerow(row)
+    def rows():
+        # 참가자가 많아도 메모리가 일정하도록 나눠서 조회
+        for order in orders.iterator(chunk_size=QUERYSET_CHUNK_SIZE):
+            row = [
+                order.user.username,
+                order.user.email,
+                f"{order.price} sats" if order.price > 0 else "무료",
+                order.order_number,
+                timezone.localtime(order.created_at).strftime('%Y-%m-%d %H:%M:%S'),
+                timezone.localtime(order.paid_at).strftime('%Y-%m-%d %H:%M:%S') if order.paid_at else '',
+                '참가확정' if order.status == 'confirmed' else '신청완료' if order.status == 'completed' else '취소됨'
+            ]
+            
+            if include_payment_hash:
+                row.append(order.payment_hash if hasattr(order, 'payment_hash') and order.payment_hash else '')
+            
+            yield row
     
-    return response
+    exported_at = timezone.localtime(timezone.now())
+    filename = f'라이브강의_참가자_{live_lecture.name}_{exported_at.strftime("%Y%m%d")}.csv'
+    return csv_streaming_response(filename, headers, rows())
 
 @login_required
 def live_lecture_order_complete(request, store_id, live_lecture_id, order_id):
@@ -1273,31 +1229,14 @@ def live_lecture_start_payment_workflow(request, store_id, live_lecture_id):
                 deleted_at__isnull=True,
             )
             if locked_live_lecture.max_participants:
-                active_reservations = []
-                pending_reservations = (
-                    LiveLectureOrder.objects.select_for_update()
-                    .filter(
-                        live_lecture=locked_live_lecture,
-                        status='pending',
-                        is_temporary_reserved=True,
-                    )
-                )
-                for reservation in pending_reservations:
-                    expires_at = reservation.reservation_expires_at
-                    if expires_at and expires_at <= now:
-                        reservation.status = 'cancelled'
-                        reservation.is_temporary_reserved = False
-                        reservation.auto_cancelled_reason = '예약 만료'
-                        reservation.save(update_fields=[
-                            'status',
-                            'is_temporary_reserved',
-                            'auto_cancelled_reason',
-                            'updated_at',
-                        ])
-                        continue
-                    active_reservations.append(reservation)
-
-                total_reserved = locked_live_lecture.current_participants + len(active_reservations)
+                # 만료된 임시 예약은 세지 않음 (취소 처리는 만료 정리 워커 run_expiry_scheduler 가 담당)
+                active_reservation_count = LiveLectureOrder.objects.filter(
+                    live_lecture=locked_live_lecture,
+                    status='pending',
+                    is_temporary_reserved=True,
+                ).filter(Q(reservation_expires_at__isnull=True) | Q(reservation_expires_at__gt=now)).count()
+
+                total_reserved = locked_live_lecture.current_participants + active_reservation_count
                 if total_reserved >= locked_live_lecture.max_participants:
                     return JsonResponse({
                         'success': False,
@@ -1464,30 +1403,32 @@ def live_lecture_verify_payment(request, store_id, live_lecture_id, transaction_
     if not live_lecture_order:
         return JsonResponse({'success': False, 'error': '주문 정보를 찾을 수 없습니다.'}, status=500)
 
-    participant_data['payment_hash'] = transaction.payment_hash
-    participant_data['payment_request'] = transaction.payment_request
+    # 정산 보정기가 이미 확정한 결제면 다시 확정하거나 메일을 보내지 않음
+    if transaction.status != PaymentTransaction.STATUS_COMPLETED:
+        participant_data['payment_hash'] = transaction.payment_hash
+        participant_data['payment_request'] = transaction.payment_request
 
-    finalize_live_lecture_order_from_transaction(
-        live_lecture_order,
-        participant_data,
-        payment_hash=transaction.payment_hash,
-        payment_request=transaction.payment_request,
-    )
+        finalize_live_lecture_order_from_transaction(
+            live_lecture_order,
+            participant_data,
+            payment_hash=transaction.payment_hash,
+            payment_request=transaction.payment_request,
+        )
 
-    settlement_payload = {'status': status_result.get('raw_status'), 'provider': 'blink'}
-    processor.mark_settlement(transaction, tx_payload=settlement_payload)
-    processor.finalize_live_lecture_order(transaction, live_lecture_order)
+        settlement_payload = {'status': status_result.get('raw_status'), 'provider': 'blink'}
+        processor.mark_settlement(transaction, tx_payload=settlement_payload)
+        processor.finalize_live_lecture_order(transaction, live_lecture_order)
 
-    try:
-        from .services import (
-            send_live_lecture_notification_email,
-            send_live_lecture_participant_confirmation_email,
-        )
+        try:
+            from .services import (
+                send_live_lecture_notification_email,
+                send_live_lecture_participant_confirmation_email,
+            )
 
-        send_live_lecture_notification_email(live_lecture_order)
-        send_live_lecture_participant_confirmation_email(live_lecture_order)
-    except Exception as exc:  # pylint: disable=broad-except
-        logger.error('라이브 강의 결제 이메일 발송 실패 - order_id=%s, error=%s', live_lecture_order.id, exc)
+            send_live_lecture_notification_email(live_lecture_order)
+            send_live_lecture_participant_confirmation_email(live_lecture_order)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error('라이브 강의 결제 이메일 발송 실패 - order_id=%s, error=%s', live_lecture_order.id, exc)
 
     request.session.pop(session_key, None)
 
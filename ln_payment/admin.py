@@ -7,8 +7,10 @@ from .models import (
     OrderItemReservation,
     PaymentStageLog,
     PaymentTransaction,
+    WebhookEvent,
 )
 from .services import PaymentStage
+from .webhook_inbox import replay_events
 
 
 class PaymentTransactionAdmin(admin.ModelAdmin):
@@ -156,9 +158,37 @@ class OrderItemReservationAdmin(admin.ModelAdmin):
     ordering = ("-created_at",)
 
 
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    list_display = ("event_id", "event_type", "payment_hash", "status", "attempts", "next_attempt_at", "received_at", "processed_at")
+    list_filter = ("status", "event_type")
+    search_fields = ("event_id", "payment_hash")
+    ordering = ("-id",)
+    readonly_fields = (
+        "event_id",
+        "event_type",
+        "payment_hash",
+        "payload",
+        "status",
+        "attempts",
+        "last_error",
+        "next_attempt_at",
+        "locked_at",
+        "received_at",
+        "processed_at",
+    )
+    actions = ("replay_selected_events",)
+
+    @admin.action(description="선택한 웹훅 이벤트 다시 처리")
+    def replay_selected_events(self, request, queryset):
+        count = replay_events(queryset)
+        self.message_user(request, f"{count}건을 다시 처리 대기 상태로 되돌렸습니다.")
+
+
 __all__ = [
     "ManualPaymentTransactionAdmin",
     "OrderItemReservationAdmin",
     "PaymentStageLogAdmin",
     "PaymentTransactionAdmin",
+    "WebhookEventAdmin",
 ]
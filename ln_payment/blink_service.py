@@ -1,14 +1,82 @@
 import os
 import json
+import hashlib
+import threading
 import requests
 import logging
 from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
 from django.conf import settings
 from django.utils import timezone
 from stores.models import Store
+from .invoice_status_cache import get_invoice_status
 
 logger = logging.getLogger(__name__)
 
+# API 문서에서 권장하는 엔드포인트
+DEFAULT_BLINK_ENDPOINTS = (
+    'https://api.blink.sv/graphql',  # Production (문서의 기본)
+    'https://api.staging.blink.sv/graphql',  # Staging (문서에서 명시)
+)
+
+# 여러 가능한 인증 방식 (이름, 헤더 생성 함수)
+AUTH_STYLES = (
+    ('x-api-key-upper', lambda api_key: {'X-API-KEY': api_key}),  # 잘 동작하는 코드 형식 (대문자 KEY)
+    ('x-api-key', lambda api_key: {'X-API-Key': api_key}),  # 기존 형식
+    ('bearer', lambda api_key: {'Authorization': f'Bearer {api_key}'}),
+    ('api-key', lambda api_key: {'Authorization': f'API-Key {api_key}'}),
+    ('raw', lambda api_key: {'Authorization': api_key}),
+)
+_AUTH_STYLE_HEADERS = dict(AUTH_STYLES)
+
+REQUEST_TIMEOUT_SECONDS = 30
+
+# 프로세스 단위 HTTP 세션 (keep-alive 커넥션 재사용). fork 후에는 자식 프로세스에서 새로 만든다.
+_session_lock = threading.Lock()
+_http_session = None
+_http_session_pid = None
+
+# API 키 해시 -> (엔드포인트, 인증 방식 이름). 첫 성공 이후 탐색 없이 바로 요청한다.
+_auth_cache = {}
+_auth_cache_lock = threading.Lock()
+
+
+def get_http_session():
+    """프로세스 공유 ``requests.Session`` (커넥션 풀)"""
+    global _http_session, _http_session_pid
+
+    pid = os.getpid()
+    if _http_session is not None and _http_session_pid == pid:
+        return _http_session
+
+    with _session_lock:
+        if _http_session is None or _http_session_pid != pid:
+            pool_size = getattr(settings, 'BLINK_HTTP_POOL_MAXSIZE', 10)
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=len(DEFAULT_BLINK_ENDPOINTS) + 1, pool_maxsize=pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update({
+                'Content-Type': 'application/json',
+                'Accept': 'application/json',
+            })
+            _http_session = session
+            _http_session_pid = pid
+    return _http_session
+
+
+def _api_key_fingerprint(api_key):
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+def forget_blink_auth(api_key=None):
+    """기억해 둔 엔드포인트/인증 방식 삭제 (API 키 변경 시, 인자가 없으면 전체)"""
+    with _auth_cache_lock:
+        if api_key is None:
+            _auth_cache.clear()
+        else:
+            _auth_cache.pop(_api_key_fingerprint(api_key), None)
+
 
 class BlinkAPIService:
     """Blink API 서비스 클래스"""
@@ -20,11 +88,12 @@ class BlinkAPIService:
         Args:
             api_key: Blink API 키 (필수)
             wallet_id: Blink 월렛 ID (필수)
-            api_url: Blink API URL (선택사항)
+            api_url: Blink API URL (선택사항, 지정하면 기본 엔드포인트보다 먼저 시도)
         """
         self.api_key = api_key
         self.wallet_id = wallet_id
         self.api_url = api_url or getattr(settings, 'BLINK_API_URL', 'https://api.staging.blink.sv/graphql')
+        self._explicit_api_url = api_url
         
         if not self.api_key:
             raise ValueError("Blink API 키가 설정되지 않았습니다.")
@@ -35,98 +104,92 @@ class BlinkAPIService:
             logger.debug(f"BlinkAPIService 초기화: API URL={self.api_url}, 월렛 ID={self.wallet_id}")
             if settings.DEBUG:
                 logger.debug(f"API 키 길이: {len(self.api_key)}, 시작: {self.api_key[:8]}...")
+
+    def _candidate_endpoints(self):
+        endpoints = list(DEFAULT_BLINK_ENDPOINTS)
+        if self._explicit_api_url:
+            endpoints = [self._explicit_api_url] + [e for e in endpoints if e != self._explicit_api_url]
+        return endpoints
+
+    def _post(self, endpoint, auth_style, payload):
+        return get_http_session().post(
+            endpoint,
+            headers=_AUTH_STYLE_HEADERS[auth_style](self.api_key),
+            json=payload,
+            timeout=REQUEST_TIMEOUT_SECONDS,
+        )
+
+    @staticmethod
+    def _parse_response(response):
+        if not response.ok:
+            return {
+                'success': False,
+                'error': f'HTTP 오류: {response.status_code} {response.reason}'
+            }
+        
+        data = response.json()
+        
+        if 'errors' in data:
+            error_messages = [error.get('message', '알 수 없는 오류') for error in data['errors']]
+            return {
+                'success': False,
+                'error': f'GraphQL 오류: {", ".join(error_messages)}'
+            }
+        
+        return {
+            'success': True,
+            'data': data.get('data', {})
+        }
+
+    def _request_with_cached_auth(self, payload):
+        """기억해 둔 엔드포인트/인증 방식으로 한 번에 요청 (없거나 인증 실패 시 None)"""
+        fingerprint = _api_key_fingerprint(self.api_key)
+        cached = _auth_cache.get(fingerprint)
+        if cached is None:
+            return None
+
+        endpoint, auth_style = cached
+        try:
+            response = self._post(endpoint, auth_style, payload)
+            if response.status_code in (401, 403):
+                # API 키가 바뀌었거나 폐기됨 - 다시 탐색
+                forget_blink_auth(self.api_key)
+                return None
+            return self._parse_response(response)
+        except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+            logger.warning(f"Blink API 요청 실패, 인증 방식 재탐색: {e}")
+            forget_blink_auth(self.api_key)
+            return None
     
     def _make_request(self, query, variables=None):
         """GraphQL 요청 실행"""
-        # 여러 가능한 인증 방식 시도
-        auth_methods = [
-            {'X-API-KEY': self.api_key},  # 잘 동작하는 코드 형식 (대문자 KEY)
-            {'X-API-Key': self.api_key},  # 기존 형식
-            {'Authorization': f'Bearer {self.api_key}'},
-            {'Authorization': f'API-Key {self.api_key}'},
-            {'Authorization': self.api_key},
-        ]
-        
         payload = {
             'query': query,
             'variables': variables or {}
         }
-        
-        # API 문서에서 권장하는 엔드포인트 사용
-        endpoints = [
-            'https://api.blink.sv/graphql',  # Production (문서의 기본)
-            'https://api.staging.blink.sv/graphql',  # Staging (문서에서 명시)
-        ]
+
+        result = self._request_with_cached_auth(payload)
+        if result is not None:
+            return result
         
         # 각 엔드포인트와 인증 방식 조합 시도
-        for endpoint in endpoints:
-            for auth_method in auth_methods:
-                
-                headers = {
-                    'Content-Type': 'application/json',
-                    'Accept': 'application/json',
-                    **auth_method  # 인증 헤더 병합
-                }
-                
+        for endpoint in self._candidate_endpoints():
+            for auth_style, _ in AUTH_STYLES:
                 try:
                     # 먼저 authorization 쿼리로 API 키 유효성 확인
-                    auth_test_payload = {
-                        'query': 'query { authorization { scopes } }'
-                    }
-                    
-                    auth_response = requests.post(
-                        endpoint,
-                        headers=headers,
-                        json=auth_test_payload,
-                        timeout=30
-                    )
-                    
-                    if auth_response.status_code == 200:
-                        # authorization 성공시 응답 확인
-                        try:
-                            auth_data = auth_response.json()
-                            
-                            # 인증이 성공했으면 실제 쿼리 실행
-                            response = requests.post(
-                                endpoint,
-                                headers=headers,
-                                json=payload,
-                                timeout=30
-                            )
-                            
-                            if not response.ok:
-                                return {
-                                    'success': False,
-                                    'error': f'HTTP 오류: {response.status_code} {response.reason}'
-                                }
-                            
-                            data = response.json()
-                            
-                            if 'errors' in data:
-                                error_messages = [error.get('message', '알 수 없는 오류') for error in data['errors']]
-                                return {
-                                    'success': False,
-                                    'error': f'GraphQL 오류: {", ".join(error_messages)}'
-                                }
-                            
-                            return {
-                                'success': True,
-                                'data': data.get('data', {})
-                            }
-                            
-                        except json.JSONDecodeError as e:
-                            continue
-                            
-                    elif auth_response.status_code == 401:
-                        continue
-                    else:
+                    auth_response = self._post(endpoint, auth_style, {'query': 'query { authorization { scopes } }'})
+                    if auth_response.status_code != 200:
                         continue
-                        
-                except requests.exceptions.Timeout:
-                    continue
-                except requests.exceptions.ConnectionError:
-                    continue
-                except Exception as e:
+
+                    # 인증이 성공했으면 실제 쿼리 실행
+                    response = self._post(endpoint, auth_style, payload)
+                    result = self._parse_response(response)
+                    if response.ok:
+                        with _auth_cache_lock:
+                            _auth_cache[_api_key_fingerprint(self.api_key)] = (endpoint, auth_style)
+                    return result
+                    
+                except Exception:
                     continue
         
         # 모든 조합에서 실패
@@ -220,12 +283,16 @@ class BlinkAPIService:
             'expires_at': expires_at
         }
     
-    def check_invoice_status(self, payment_hash):
+    def check_invoice_status(self, payment_hash, use_cache=True):
         """
         인보이스 결제 상태 확인
         
+        같은 payment_hash 조회는 ``invoice_status_cache`` 를 거쳐 짧은 TTL 동안
+        한 번만 Blink 로 나간다.
+        
         Args:
             payment_hash: 결제 해시
+            use_cache: False 면 캐시를 거치지 않고 바로 조회
         
         Returns:
             dict: {
@@ -234,6 +301,12 @@ class BlinkAPIService:
                 'error': str (실패시)
             }
         """
+        if use_cache and payment_hash:
+            return get_invoice_status(payment_hash, self._fetch_invoice_status)
+        return self._fetch_invoice_status(payment_hash)
+
+    def _fetch_invoice_status(self, payment_hash):
+        """Blink 에 인보이스 상태를 직접 조회 (``check_invoice_status`` 참고)"""
         query = """
         query LnInvoicePaymentStatusByHash($input: LnInvoicePaymentStatusByHashInput!) {
           lnInvoicePaymentStatusByHash(input: $input) {
@@ -410,7 +483,7 @@ def get_blink_service_for_store(store):
         if not api_key or not wallet_id:
             raise ValueError("스토어에 Blink API 정보가 설정되지 않았습니다.")
         
-        return BlinkAPIService(api_key=api_key, wallet_id=wallet_id)
+        return BlinkAPIService(api_key=api_key, wallet_id=wallet_id, api_url=getattr(settings, 'BLINK_API_URL', None))
         
     except Exception as e:
         if settings.DEBUG:
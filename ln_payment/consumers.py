@@ -0,0 +1,39 @@
+from asgiref.sync import sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .status_channel import get_published_status, is_valid_payment_hash, payment_status_group
+
+
+class PaymentStatusConsumer(AsyncJsonWebsocketConsumer):
+    """인보이스 결제 상태 푸시 Consumer.
+
+    결제 해시는 인보이스(BOLT11)에 그대로 노출되는 값이고 상태 외의 정보는 보내지 않으므로
+    별도 인증 없이 구독할 수 있다.
+    """
+
+    async def connect(self):
+        payment_hash = self.scope["url_route"]["kwargs"].get("payment_hash")
+        if not is_valid_payment_hash(payment_hash):
+            await self.close(code=4400)
+            return
+
+        self.payment_hash = payment_hash
+        self.group_name = payment_status_group(payment_hash)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+        # 접속 전에 이미 발행된 상태가 있으면 바로 전달
+        latest = await sync_to_async(get_published_status)(payment_hash)
+        if latest:
+            await self.send_json({"type": "payment.status", "payment_hash": payment_hash, **latest})
+
+    async def disconnect(self, code):
+        if hasattr(self, "group_name"):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        # 클라이언트 메시지는 사용하지 않음 (keep-alive ping 무시)
+        return
+
+    async def payment_status(self, event):
+        await self.send_json(event)
@@ -0,0 +1,210 @@
+"""결제 트랜잭션 현황 화면 공통 조회
+
+주문/밋업/라이브 강의/파일 결제 트랜잭션 현황은 같은 방식으로 상태별 건수와 목록을 보여준다.
+
+- 상태별 건수와 금액 합계는 조건부 집계 한 번으로 구한다. 상태마다 ``count()`` 를 따로 하지 않는다.
+- 목록은 OFFSET 대신 ``(created_at, id)`` 키셋 커서로 넘긴다. 뒤쪽 페이지도 앞 행들을 읽고 버리지
+  않으므로 첫 페이지와 비용이 같다. 페이지 번호는 표시용으로만 URL 에 함께 싣는다.
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils.http import urlencode
+
+from .models import PaymentTransaction
+
+PAGE_SIZE = 5
+FILTERABLE_STATUSES = (
+    PaymentTransaction.STATUS_PENDING,
+    PaymentTransaction.STATUS_PROCESSING,
+    PaymentTransaction.STATUS_FAILED,
+    PaymentTransaction.STATUS_COMPLETED,
+)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def status_summary(queryset):
+    """전체/상태별 건수와 금액 합계를 쿼리 한 번으로 계산"""
+    return queryset.aggregate(
+        total=Count('pk'),
+        pending=Count('pk', filter=Q(status=PaymentTransaction.STATUS_PENDING)),
+        processing=Count('pk', filter=Q(status=PaymentTransaction.STATUS_PROCESSING)),
+        completed=Count('pk', filter=Q(status=PaymentTransaction.STATUS_COMPLETED)),
+        failed=Count('pk', filter=Q(status=PaymentTransaction.STATUS_FAILED)),
+        total_amount=Coalesce(Sum('amount_sats'), 0),
+    )
+
+
+def encode_cursor(transaction):
+    """``(created_at, id)`` 를 URL 에 넣을 문자열로 변환 (마이크로초 단위까지 그대로 보존)"""
+    micros = (transaction.created_at - _EPOCH) // timedelta(microseconds=1)
+    return f'{micros}_{transaction.pk.hex}'
+
+
+def decode_cursor(value):
+    """잘못된 커서는 ``None`` (첫 페이지로 처리)"""
+    try:
+        micros, pk = (value or '').split('_', 1)
+        return _EPOCH + timedelta(microseconds=int(micros)), uuid.UUID(hex=pk)
+    except (ValueError, OverflowError):
+        return None
+
+
+class KeysetPaginator:
+    """템플릿의 ``paginator.count`` / ``paginator.num_pages`` 호환용"""
+
+    def __init__(self, count, per_page):
+        self.count = count
+        self.per_page = per_page
+
+    @property
+    def num_pages(self):
+        return max(1, -(-self.count // self.per_page))
+
+
+class KeysetPage:
+    """키셋 커서로 가져온 한 페이지 (Django ``Page`` 에서 템플릿이 쓰는 속성만 제공)"""
+
+    def __init__(self, object_list, *, number, paginator, has_previous, has_next, extra_params=None):
+        self.object_list = object_list
+        self.number = number
+        self.paginator = paginator
+        self._has_previous = has_previous
+        self._has_next = has_next
+        self._extra_params = extra_params or {}
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_next(self):
+        return self._has_next
+
+    def has_other_pages(self):
+        return self._has_previous or self._has_next
+
+    def start_index(self):
+        if not self.object_list:
+            return 0
+        return (self.number - 1) * self.paginator.per_page + 1
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1 if self.object_list else 0
+
+    def _query(self, **params):
+        return urlencode({**params, **self._extra_params})
+
+    @property
+    def previous_page_query(self):
+        if not (self._has_previous and self.object_list):
+            return ''
+        return self._query(page=self.number - 1, before=encode_cursor(self.object_list[0]))
+
+    @property
+    def next_page_query(self):
+        if not (self._has_next and self.object_list):
+            return ''
+        return self._query(page=self.number + 1, after=encode_cursor(self.object_list[-1]))
+
+
+def _page_number(value, default=1):
+    try:
+        return max(int(value), 1)
+    except (TypeError, ValueError):
+        return default
+
+
+def keyset_page(queryset, params, *, count, per_page=PAGE_SIZE, extra_params=None):
+    """최신순 ``(created_at, id)`` 키셋 페이지
+
+    Args:
+        params: ``request.GET`` (``after``/``before`` 커서, 표시용 ``page``)
+        count: 필터된 전체 건수 (``paginator.count`` 로 표시)
+        extra_params: 이전/다음 링크에 유지할 검색 조건 (예: 상태/단계 필터)
+    """
+    # (created_at, id) < 커서 비교는 created_at 범위 조건을 따로 두어야 인덱스 범위 탐색이 됨
+    # (OR 만 쓰면 sqlite 는 인덱스를 처음부터 훑어 뒤쪽 페이지일수록 느려짐)
+    ordered = queryset.order_by('-created_at', '-pk')
+    after = decode_cursor(params.get('after'))
+    before = None if after else decode_cursor(params.get('before'))
+    number = _page_number(params.get('page'))
+
+    if before:
+        created_at, pk = before
+        rows = list(
+            queryset.filter(Q(created_at__gt=created_at) | Q(pk__gt=pk), created_at__gte=created_at)
+            .order_by('created_at', 'pk')[:per_page + 1]
+        )
+        has_previous = len(rows) > per_page
+        object_list = list(reversed(rows[:per_page]))
+        has_next = True
+        if not has_previous:
+            number = 1
+    else:
+        if after:
+            created_at, pk = after
+            ordered = ordered.filter(Q(created_at__lt=created_at) | Q(pk__lt=pk), created_at__lte=created_at)
+        rows = list(ordered[:per_page + 1])
+        object_list = rows[:per_page]
+        has_next = len(rows) > per_page
+        has_previous = after is not None
+        number = max(number, 2) if has_previous else 1
+
+    return KeysetPage(
+        object_list,
+        number=number,
+        paginator=KeysetPaginator(count, per_page),
+        has_previous=has_previous,
+        has_next=has_next,
+        extra_params=extra_params,
+    )
+
+
+@dataclass
+class TransactionDashboard:
+    page: KeysetPage
+    summary: dict
+    status_filter: str
+    stage_filter: str
+
+
+def transaction_dashboard(params, base_queryset, *, select_related=(), per_page=PAGE_SIZE):
+    """상태/단계 필터, 상태별 요약, 키셋 페이지를 한 번에 계산
+
+    Args:
+        params: ``request.GET``
+        base_queryset: 화면 범위의 트랜잭션 (예: 스토어의 밋업 결제)
+    """
+    status_filter = params.get('status') or ''
+    stage_filter = params.get('stage') or ''
+
+    summary = status_summary(base_queryset)
+
+    transactions = base_queryset
+    if status_filter in FILTERABLE_STATUSES:
+        transactions = transactions.filter(status=status_filter)
+        count = summary[status_filter]
+    else:
+        count = summary['total']
+    if stage_filter.isdigit():
+        transactions = transactions.filter(current_stage=int(stage_filter))
+        count = transactions.count()
+
+    page = keyset_page(
+        transactions.select_related(*select_related),
+        params,
+        count=count,
+        per_page=per_page,
+        extra_params={'status': status_filter, 'stage': stage_filter},
+    )
+    return TransactionDashboard(page=page, summary=summary, status_filter=status_filter, stage_filter=stage_filter)
@@ -0,0 +1,178 @@
+"""로컬 가짜 Blink GraphQL 서버
+
+테스트와 벤치마크에서 실제 Blink API 대신 사용한다. 요청 수/TCP 연결 수를 세어
+``BlinkAPIService`` 의 왕복 횟수와 커넥션 재사용 여부를 확인할 수 있다.
+
+사용 예::
+
+    with FakeBlinkServer(api_key='test-key') as server:
+        service = BlinkAPIService(api_key='test-key', wallet_id='wallet', api_url=server.url)
+        service.create_invoice(1000)
+        server.request_count  # 왕복 횟수
+"""
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _FakeBlinkHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # keep-alive 응답 지연(Nagle + delayed ACK) 방지
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connection_count += 1
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        fake = self.server.fake
+
+        with self.server.lock:
+            self.server.request_count += 1
+            self.server.queries.append(payload.get('query', ''))
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+
+        try:
+            if fake.latency:
+                time.sleep(fake.latency)
+
+            if self.headers.get(fake.auth_header) != fake.expected_auth_value:
+                self._send_json(401, {'errors': [{'message': 'Not authorized'}]})
+                return
+
+            self._send_json(200, {'data': fake.resolve(payload.get('query', ''), payload.get('variables') or {})})
+        finally:
+            with self.server.lock:
+                self.server.in_flight -= 1
+
+    def _send_json(self, status, body):
+        encoded = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeBlinkServer:
+    """인보이스 생성/상태 조회만 흉내내는 스레드 기반 GraphQL 서버
+
+    Args:
+        api_key: 허용할 API 키
+        auth_header: 인증 헤더 이름 (기본 ``X-API-KEY``)
+        auth_prefix: 인증 값 접두어 (예: ``'Bearer '``)
+        latency: 요청마다 추가할 지연(초)
+    """
+
+    def __init__(self, api_key='test-api-key', auth_header='X-API-KEY', auth_prefix='', latency=0.0):
+        self.api_key = api_key
+        self.auth_header = auth_header
+        self.expected_auth_value = f'{auth_prefix}{api_key}'
+        self.latency = latency
+        # payment_hash -> 상태 (PENDING/PAID/EXPIRED)
+        self.invoices = {}
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}/graphql'
+
+    @property
+    def request_count(self):
+        return self._httpd.request_count
+
+    @property
+    def connection_count(self):
+        return self._httpd.connection_count
+
+    @property
+    def queries(self):
+        return list(self._httpd.queries)
+
+    @property
+    def max_in_flight(self):
+        """동시에 처리 중이던 요청 수의 최댓값"""
+        return self._httpd.max_in_flight
+
+    def reset_counters(self):
+        with self._httpd.lock:
+            self._httpd.request_count = 0
+            self._httpd.connection_count = 0
+            self._httpd.queries = []
+            self._httpd.max_in_flight = 0
+
+    def set_status(self, payment_hash, status):
+        self.invoices[payment_hash] = status
+
+    def resolve(self, query, variables):
+        if 'authorization' in query:
+            return {'authorization': {'scopes': ['READ', 'RECEIVE']}}
+
+        if 'lnInvoiceCreate' in query:
+            data = variables.get('input', {})
+            payment_hash = hashlib.sha256(f'{time.monotonic_ns()}:{data.get("memo")}'.encode()).hexdigest()
+            self.invoices[payment_hash] = 'PENDING'
+            return {
+                'lnInvoiceCreate': {
+                    'invoice': {
+                        'paymentRequest': f'lnbc{data.get("amount")}n1fake{payment_hash[:16]}',
+                        'paymentHash': payment_hash,
+                        'satoshis': int(data.get('amount') or 0),
+                        'paymentStatus': 'PENDING',
+                    },
+                    'errors': [],
+                }
+            }
+
+        if 'lnInvoicePaymentStatusByHash' in query:
+            payment_hash = variables.get('input', {}).get('paymentHash')
+            return {
+                'lnInvoicePaymentStatusByHash': {
+                    'status': self.invoices.get(payment_hash, 'EXPIRED'),
+                    'paymentHash': payment_hash,
+                    'paymentRequest': None,
+                }
+            }
+
+        if 'transactionsByPaymentHash' in query:
+            return {'transactionsByPaymentHash': []}
+
+        return {}
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), _FakeBlinkHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._httpd.lock = threading.Lock()
+        self._httpd.request_count = 0
+        self._httpd.connection_count = 0
+        self._httpd.queries = []
+        self._httpd.in_flight = 0
+        self._httpd.max_in_flight = 0
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='fake-blink', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
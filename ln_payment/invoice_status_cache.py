@@ -0,0 +1,110 @@
+"""인보이스 상태 조회 캐시 (payment_hash 기준 single-flight)
+
+여러 탭/재시도가 같은 인보이스를 폴링해도 Blink 조회는 TTL 구간마다 한 번만 나가도록 한다.
+
+- 결과는 Django 캐시에 ``payment_hash`` 키로 짧게(기본 2초) 보관해 워커 간에 공유한다.
+  ``paid``/``expired`` 는 더 바뀌지 않으므로 더 오래 보관한다.
+- 같은 프로세스에서 동시에 들어온 조회는 하나만 Blink 로 나가고 나머지는 그 결과를 기다린다.
+- 실패 응답은 캐시하지 않는다 (대기 중이던 호출에는 같은 실패를 돌려준다).
+- ``blink_webhook`` 이 입금을 받으면 ``invalidate_invoice_status()`` 로 즉시 비운다.
+  진행 중이던 조회 결과도 캐시에 쓰지 않는다.
+"""
+
+import copy
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_KEY_PREFIX = 'ln_payment:invoice_status:'
+DEFAULT_TTL_SECONDS = 2
+DEFAULT_FINAL_TTL_SECONDS = 60 * 10
+FINAL_STATUSES = {'paid', 'expired'}
+
+# 대기 중인 호출이 리더의 응답을 기다리는 최대 시간 (Blink 요청 타임아웃보다 길게)
+FOLLOWER_WAIT_SECONDS = 30
+
+_lock = threading.Lock()
+_flights = {}
+
+
+class _Flight:
+    __slots__ = ('done', 'result', 'invalidated')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.invalidated = False
+
+
+def _ttl_seconds() -> float:
+    return getattr(settings, 'BLINK_INVOICE_STATUS_CACHE_TTL', DEFAULT_TTL_SECONDS)
+
+
+def _final_ttl_seconds() -> float:
+    return getattr(settings, 'BLINK_INVOICE_STATUS_FINAL_CACHE_TTL', DEFAULT_FINAL_TTL_SECONDS)
+
+
+def _cache_key(payment_hash: str) -> str:
+    return f'{CACHE_KEY_PREFIX}{payment_hash}'
+
+
+def get_cached_invoice_status(payment_hash):
+    """캐시된 상태 조회 결과 (없으면 None)"""
+    cached = cache.get(_cache_key(payment_hash))
+    return copy.deepcopy(cached) if cached is not None else None
+
+
+def get_invoice_status(payment_hash, fetch):
+    """캐시를 거쳐 인보이스 상태 조회
+
+    Args:
+        payment_hash: 결제 해시
+        fetch: 캐시 미스 시 실제 조회 함수 (``fetch(payment_hash) -> dict``)
+
+    Returns:
+        dict: ``BlinkAPIService.check_invoice_status`` 와 같은 형태 (호출마다 새 사본)
+    """
+    cached = get_cached_invoice_status(payment_hash)
+    if cached is not None:
+        return cached
+
+    with _lock:
+        flight = _flights.get(payment_hash)
+        is_leader = flight is None
+        if is_leader:
+            flight = _flights[payment_hash] = _Flight()
+
+    if not is_leader:
+        if flight.done.wait(FOLLOWER_WAIT_SECONDS) and flight.result is not None:
+            return copy.deepcopy(flight.result)
+        return fetch(payment_hash)
+
+    try:
+        # 다른 워커가 방금 채웠을 수 있으므로 한 번 더 확인
+        result = get_cached_invoice_status(payment_hash)
+        if result is None:
+            result = fetch(payment_hash)
+            if result.get('success'):
+                with _lock:
+                    invalidated = flight.invalidated
+                if not invalidated:
+                    ttl = _final_ttl_seconds() if result.get('status') in FINAL_STATUSES else _ttl_seconds()
+                    cache.set(_cache_key(payment_hash), result, ttl)
+        flight.result = result
+        return copy.deepcopy(result)
+    finally:
+        with _lock:
+            _flights.pop(payment_hash, None)
+        flight.done.set()
+
+
+def invalidate_invoice_status(payment_hash):
+    """캐시된 상태를 비우고 진행 중인 조회 결과가 캐시에 저장되지 않도록 표시"""
+    if not payment_hash:
+        return
+    with _lock:
+        flight = _flights.get(payment_hash)
+        if flight is not None:
+            flight.invalidated = True
+    cache.delete(_cache_key(payment_hash))
@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ln_payment.blink_service import BlinkAPIService, forget_blink_auth
+from ln_payment.fake_blink import FakeBlinkServer
+
+
+class Command(BaseCommand):
+    help = '로컬 가짜 Blink GraphQL 서버로 BlinkAPIService 의 호출당 왕복 횟수/커넥션 수/지연을 측정합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help='호출 횟수 (기본 50)')
+        parser.add_argument('--latency-ms', type=float, default=5.0, help='가짜 서버 요청당 지연(ms, 기본 5)')
+        parser.add_argument(
+            '--auth-style',
+            choices=['x-api-key', 'bearer'],
+            default='x-api-key',
+            help='가짜 서버가 허용할 인증 방식 (bearer 는 탐색 비용이 큰 경우)',
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        if options['auth_style'] == 'bearer':
+            server_kwargs = {'auth_header': 'Authorization', 'auth_prefix': 'Bearer '}
+        else:
+            server_kwargs = {}
+
+        with FakeBlinkServer(api_key='bench-api-key', latency=options['latency_ms'] / 1000, **server_kwargs) as server:
+            service = BlinkAPIService(api_key='bench-api-key', wallet_id='bench-wallet', api_url=server.url)
+
+            for label, cold in (('cold (매 호출 인증 탐색)', True), ('warm (인증 방식 재사용)', False)):
+                forget_blink_auth()
+                if not cold:
+                    # 첫 탐색은 측정에서 제외
+                    service.check_invoice_status('warmup', use_cache=False)
+                self.stdout.write(self.style.SUCCESS(f'\n▶ {label}'))
+
+                payment_hashes = []
+                for operation in ('create_invoice', 'check_invoice_status'):
+                    server.reset_counters()
+                    started_at = time.perf_counter()
+                    for index in range(iterations):
+                        if cold:
+                            forget_blink_auth()
+                        if operation == 'create_invoice':
+                            result = service.create_invoice(1000 + index, memo=f'bench-{index}')
+                            payment_hashes.append(result.get('payment_hash'))
+                        else:
+                            result = service.check_invoice_status(payment_hashes[index % len(payment_hashes)], use_cache=False)
+                        if not result['success']:
+                            self.stdout.write(self.style.ERROR(f'  ❌ {operation} 실패: {result["error"]}'))
+                            return
+                    elapsed = time.perf_counter() - started_at
+
+                    self.stdout.write(
+                        f'  {operation:<22} 왕복 {server.request_count / iterations:.2f}회/호출, '
+                        f'새 연결 {server.connection_count}개, '
+                        f'평균 {elapsed / iterations * 1000:.1f}ms'
+                    )
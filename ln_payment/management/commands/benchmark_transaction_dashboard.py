@@ -0,0 +1,139 @@
+import random
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db import transaction as db_transaction
+from django.http import QueryDict
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ln_payment.dashboard import PAGE_SIZE, encode_cursor, keyset_page, status_summary
+from ln_payment.models import PaymentTransaction
+from stores.models import Store
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = '결제 트랜잭션 현황 화면의 OFFSET 페이지 + 상태별 count(변경 전)와 키셋 페이지 + 단일 집계(변경 후)를 비교합니다 (모든 데이터는 롤백)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--transactions', type=int, default=100_000, help='스토어에 만들 트랜잭션 수 (기본 100000)')
+        parser.add_argument('--repeat', type=int, default=5, help='페이지마다 반복 측정 횟수 (중앙값 사용, 기본 5)')
+
+    def handle(self, *args, **options):
+        try:
+            with db_transaction.atomic():
+                self._run(options['transactions'], options['repeat'])
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _seed(self, count):
+        suffix = uuid.uuid4().hex[:8]
+        owner = User.objects.create_user(username=f'bench-{suffix}')
+        store = Store.objects.create(
+            store_id=f'bench{suffix}',
+            store_name='벤치마크 스토어',
+            owner_name='벤치마크',
+            chat_channel='https://t.me/example',
+            owner=owner,
+        )
+        # 다른 스토어 트랜잭션도 섞어 인덱스가 스토어 범위를 골라내야 하게 함
+        other = Store.objects.create(
+            store_id=f'other{suffix}',
+            store_name='다른 스토어',
+            owner_name='벤치마크',
+            chat_channel='https://t.me/example',
+            owner=User.objects.create_user(username=f'bench-other-{suffix}'),
+        )
+        statuses = [choice for choice, _ in PaymentTransaction.STATUS_CHOICES]
+        rng = random.Random(42)
+        base = timezone.now() - timedelta(days=365)
+        started_at = time.perf_counter()
+        for offset in range(0, count, 5000):
+            indexes = range(offset, min(offset + 5000, count))
+            transactions = PaymentTransaction.objects.bulk_create(
+                [
+                    PaymentTransaction(
+                        user=owner,
+                        store=store if index % 10 else other,
+                        amount_sats=rng.randint(1, 100_000),
+                        status=rng.choice(statuses),
+                        current_stage=rng.randint(1, 5),
+                    )
+                    for index in indexes
+                ]
+            )
+            # created_at 은 auto_now_add 라 저장 후 다시 씀. 두 건씩 같은 시각으로 만들어 id 로 순서가 갈리는 경우도 포함
+            for index, tx in zip(indexes, transactions):
+                tx.created_at = base + timedelta(seconds=index // 2 * 300)
+            PaymentTransaction.objects.bulk_update(transactions, ['created_at'], batch_size=500)
+        self.stdout.write(f'트랜잭션 {count:,}건 생성 {time.perf_counter() - started_at:.1f}초')
+        return store
+
+    def _measure(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                started_at = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - started_at) * 1000)
+        return statistics.median(timings), len(queries)
+
+    def _legacy_page(self, store, page_number):
+        """변경 전 뷰와 같은 목록 쿼리: 전체 count + OFFSET 페이지"""
+        paginator = Paginator(
+            PaymentTransaction.objects.filter(store=store).select_related('user', 'order').order_by('-created_at'),
+            PAGE_SIZE,
+        )
+        list(paginator.get_page(page_number))
+
+    def _legacy_summary(self, store):
+        """변경 전 뷰와 같은 요약 쿼리: 전체/상태별 count() 5회"""
+        base_qs = PaymentTransaction.objects.filter(store=store)
+        base_qs.count()
+        for status in ('pending', 'processing', 'completed', 'failed'):
+            base_qs.filter(status=status).count()
+
+    def _run(self, count, repeat):
+        store = self._seed(count)
+        base_qs = PaymentTransaction.objects.filter(store=store)
+        total = base_qs.count()
+        num_pages = -(-total // PAGE_SIZE)
+        self.stdout.write(f'스토어 트랜잭션 {total:,}건, {num_pages:,}페이지 (페이지당 {PAGE_SIZE}건)')
+
+        legacy_ms, legacy_queries = self._measure(lambda: self._legacy_summary(store), repeat)
+        summary_ms, summary_queries = self._measure(lambda: status_summary(base_qs), repeat)
+        self.stdout.write(self.style.SUCCESS('\n▶ 상태별 요약'))
+        self.stdout.write(f'  변경 전 count x5: {legacy_ms:.1f}ms ({legacy_queries}쿼리)')
+        self.stdout.write(f'  변경 후 조건부 집계: {summary_ms:.1f}ms ({summary_queries}쿼리)')
+
+        self.stdout.write(self.style.SUCCESS('\n▶ 목록 페이지 (요약 제외)'))
+        ordered = base_qs.order_by('-created_at', '-id')
+        for page_number in (1, 10, num_pages // 2, num_pages):
+            cursor = None
+            if page_number > 1:
+                # 이전 페이지 마지막 행을 커서로 (화면에서 "다음" 을 눌러 도착한 것과 같은 요청)
+                cursor = encode_cursor(ordered[(page_number - 1) * PAGE_SIZE - 1])
+            params = QueryDict(mutable=True)
+            if cursor:
+                params.update({'page': page_number, 'after': cursor})
+
+            legacy_ms, legacy_queries = self._measure(lambda: self._legacy_page(store, page_number), repeat)
+            keyset_ms, keyset_queries = self._measure(
+                lambda: list(keyset_page(base_qs.select_related('user', 'order'), params, count=total)),
+                repeat,
+            )
+            self.stdout.write(
+                f'  {page_number:>6,}페이지: OFFSET {legacy_ms:7.1f}ms ({legacy_queries}쿼리) / '
+                f'키셋 {keyset_ms:6.2f}ms ({keyset_queries}쿼리)'
+            )
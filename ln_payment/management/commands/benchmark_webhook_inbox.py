@@ -0,0 +1,141 @@
+import json
+import statistics
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.db import transaction as db_transaction
+from django.db.models.signals import post_save
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+
+from ln_payment.models import PaymentTransaction, WebhookEvent
+from ln_payment.views import blink_webhook
+from ln_payment.webhook_inbox import process_pending
+from orders.models import Order
+from products.models import Product
+from stores.models import Store
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = '웹훅 연속 수신(burst) 시 응답 지연을 즉시 처리 방식과 수신함 방식으로 비교합니다 (모든 데이터는 롤백)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=200, help='연속으로 보낼 웹훅 수 (기본 200)')
+        parser.add_argument(
+            '--downstream-delay-ms',
+            type=float,
+            default=50.0,
+            help='주문 저장 후 알림 발송(SMTP 등) 지연을 흉내낼 시간(ms, 기본 50)',
+        )
+
+    def handle(self, *args, **options):
+        events = options['events']
+        delay = options['downstream_delay_ms'] / 1000
+
+        def _slow_notification(sender, instance, created, **kwargs):
+            if created and delay:
+                time.sleep(delay)
+
+        post_save.connect(_slow_notification, sender=Order, dispatch_uid='benchmark_webhook_inbox')
+        try:
+            with override_settings(BLINK_WEBHOOK_SECRET=None, BLINK_WEBHOOK_INBOX_BACKGROUND=False):
+                for label, inline in (('즉시 처리 (변경 전)', True), ('수신함 (변경 후)', False)):
+                    try:
+                        with db_transaction.atomic():
+                            self._run(label, inline, events)
+                            raise _Rollback()
+                    except _Rollback:
+                        pass
+        finally:
+            post_save.disconnect(sender=Order, dispatch_uid='benchmark_webhook_inbox')
+
+    def _prepare(self, events):
+        suffix = uuid.uuid4().hex[:8]
+        owner = User.objects.create_user(username=f'bench-{suffix}', email=f'bench-{suffix}@example.com')
+        store = Store.objects.create(
+            store_id=f'bench{suffix}',
+            store_name='벤치마크 스토어',
+            owner_name='벤치마크',
+            chat_channel='https://t.me/example',
+            owner=owner,
+            email_enabled=False,
+        )
+        product = Product.objects.create(
+            store=store,
+            title='벤치마크 상품',
+            description='벤치마크',
+            price=1000,
+            stock_quantity=events * 2,
+        )
+        hashes = []
+        for index in range(events):
+            payment_hash = uuid.uuid4().hex + uuid.uuid4().hex
+            PaymentTransaction.objects.create(
+                user=owner,
+                store=store,
+                amount_sats=1000,
+                status=PaymentTransaction.STATUS_PROCESSING,
+                payment_hash=payment_hash,
+                metadata={
+                    'shipping': {'buyer_name': f'구매자 {index}', 'pickup_requested': True},
+                    'cart_snapshot': [{
+                        'product_id': product.id,
+                        'product_title': product.title,
+                        'quantity': 1,
+                        'unit_price': 1000,
+                        'store_id': store.store_id,
+                    }],
+                },
+            )
+            hashes.append(payment_hash)
+        return hashes
+
+    def _run(self, label, inline, events):
+        hashes = self._prepare(events)
+        factory = RequestFactory()
+        latencies = []
+
+        with override_settings(BLINK_WEBHOOK_PROCESS_INLINE=inline):
+            burst_started_at = time.perf_counter()
+            for payment_hash in hashes:
+                body = json.dumps({
+                    'eventType': 'receive.lightning',
+                    'transaction': {'initiationVia': {'paymentHash': payment_hash}},
+                })
+                request = factory.post(
+                    '/ln_payment/webhook/blink/',
+                    data=body,
+                    content_type='application/json',
+                    HTTP_SVIX_ID=f'msg_{payment_hash[:24]}',
+                )
+                started_at = time.perf_counter()
+                response = blink_webhook(request)
+                latencies.append(time.perf_counter() - started_at)
+                if response.status_code != 200:
+                    self.stdout.write(self.style.ERROR(f'  ❌ 응답 {response.status_code}: {response.content[:200]}'))
+                    return
+            burst_elapsed = time.perf_counter() - burst_started_at
+
+        drain_started_at = time.perf_counter()
+        while process_pending(limit=100).handled:
+            pass
+        drain_elapsed = time.perf_counter() - drain_started_at
+
+        latencies.sort()
+        p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+        finalized = PaymentTransaction.objects.filter(payment_hash__in=hashes, order__isnull=False).count()
+        stored = WebhookEvent.objects.filter(payment_hash__in=hashes).count()
+        self.stdout.write(self.style.SUCCESS(f'\n▶ {label}'))
+        self.stdout.write(
+            f'  응답 지연 p50 {statistics.median(latencies) * 1000:.1f}ms, p95 {p95 * 1000:.1f}ms, '
+            f'최대 {latencies[-1] * 1000:.1f}ms'
+        )
+        self.stdout.write(f'  수신 처리량 {events / burst_elapsed:.0f}건/초 (burst {burst_elapsed:.2f}초)')
+        if not inline:
+            self.stdout.write(f'  워커 처리 {drain_elapsed:.2f}초 ({events / drain_elapsed:.0f}건/초)')
+        self.stdout.write(f'  주문 저장 {finalized}/{events}건, 수신함 이벤트 {stored}건')
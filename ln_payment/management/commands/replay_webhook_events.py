@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ln_payment.models import WebhookEvent
+from ln_payment.webhook_inbox import process_pending, replay_events
+
+
+class Command(BaseCommand):
+    help = '웹훅 수신함 이벤트를 다시 처리 대기 상태로 되돌리고 (선택) 바로 처리합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event-id', action='append', default=[], help='대상 이벤트 ID (여러 번 지정 가능)')
+        parser.add_argument('--payment-hash', action='append', default=[], help='대상 결제 해시 (여러 번 지정 가능)')
+        parser.add_argument(
+            '--status',
+            choices=[choice for choice, _ in WebhookEvent.STATUS_CHOICES],
+            help='대상 상태 (예: failed)',
+        )
+        parser.add_argument('--since-hours', type=float, help='최근 N시간 안에 받은 이벤트만')
+        parser.add_argument('--dry-run', action='store_true', help='대상만 출력하고 변경하지 않습니다')
+        parser.add_argument('--process', action='store_true', help='되돌린 뒤 바로 처리합니다')
+
+    def handle(self, *args, **options):
+        if not (options['event_id'] or options['payment_hash'] or options['status']):
+            raise CommandError('--event-id, --payment-hash, --status 중 하나 이상을 지정하세요.')
+
+        queryset = WebhookEvent.objects.all()
+        if options['event_id']:
+            queryset = queryset.filter(event_id__in=options['event_id'])
+        if options['payment_hash']:
+            queryset = queryset.filter(payment_hash__in=options['payment_hash'])
+        if options['status']:
+            queryset = queryset.filter(status=options['status'])
+        if options['since_hours'] is not None:
+            queryset = queryset.filter(received_at__gte=timezone.now() - timedelta(hours=options['since_hours']))
+
+        events = list(queryset.order_by('id')[:50])
+        total = queryset.count()
+        for event in events:
+            self.stdout.write(
+                f'  #{event.id} {event.event_type} {event.payment_hash or "-"} '
+                f'[{event.get_status_display()}, 시도 {event.attempts}회] {event.last_error[:80]}'
+            )
+        if total > len(events):
+            self.stdout.write(f'  ... 외 {total - len(events)}건')
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'대상 {total}건 (dry-run, 변경 없음)'))
+            return
+
+        replayed = replay_events(queryset)
+        self.stdout.write(self.style.SUCCESS(f'✅ {replayed}건을 처리 대기 상태로 되돌렸습니다.'))
+
+        if options['process']:
+            processed = failed = 0
+            while True:
+                result = process_pending()
+                if not result.handled:
+                    break
+                processed += result.processed
+                failed += result.failed
+            self.stdout.write(f'처리 {processed}건, 실패 {failed}건')
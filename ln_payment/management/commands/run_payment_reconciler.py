@@ -0,0 +1,77 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ln_payment.reconciler import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_INTERVAL_SECONDS,
+    DEFAULT_MIN_IDLE_SECONDS,
+    run_reconciler,
+)
+
+
+class Command(BaseCommand):
+    help = '웹훅/검증 API 로 마무리되지 않은 라이트닝 결제를 Blink 상태 기준으로 정산하거나 만료 처리합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=DEFAULT_INTERVAL_SECONDS,
+            help=f'보정 주기(초, 기본 {DEFAULT_INTERVAL_SECONDS})',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'한 번에 가져올 트랜잭션 수 (기본 {DEFAULT_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=DEFAULT_CONCURRENCY,
+            help=f'동시에 보낼 Blink 조회 수 (기본 {DEFAULT_CONCURRENCY})',
+        )
+        parser.add_argument(
+            '--min-idle',
+            type=float,
+            default=DEFAULT_MIN_IDLE_SECONDS,
+            help=f'마지막 갱신 후 이 시간(초)이 지난 트랜잭션만 보정 (기본 {DEFAULT_MIN_IDLE_SECONDS})',
+        )
+        parser.add_argument('--once', action='store_true', help='한 번만 보정하고 종료합니다')
+
+    def handle(self, *args, **options):
+        stop_event = threading.Event()
+
+        def _stop(signum, frame):
+            self.stdout.write(self.style.WARNING('🛑 종료 신호 수신 - 현재 회차를 마치고 종료합니다.'))
+            stop_event.set()
+
+        signal.signal(signal.SIGTERM, _stop)
+        signal.signal(signal.SIGINT, _stop)
+
+        def _report(result):
+            if not (result.scanned or options['once']):
+                return
+            now = timezone.localtime().strftime('%Y-%m-%d %H:%M:%S')
+            self.stdout.write(
+                f'[{now}] 대상 {result.scanned}건, 확인 {result.checked}건 '
+                f'(결제 {result.paid}/주문 저장 {result.finalized}/만료 {result.expired}/대기 {result.pending}), '
+                f'실패 {result.failed}건, {result.elapsed:.2f}초 ({result.checks_per_second:.1f}건/초)'
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'🚀 결제 정산 보정 시작 (주기 {options["interval"]:.0f}초, 동시 조회 {options["concurrency"]})'
+        ))
+        run_reconciler(
+            interval=options['interval'],
+            stop_event=stop_event,
+            max_iterations=1 if options['once'] else None,
+            on_result=_report,
+            batch_size=options['batch_size'],
+            concurrency=options['concurrency'],
+            min_idle_seconds=options['min_idle'],
+        )
@@ -0,0 +1,46 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ln_payment.status_watcher import DEFAULT_WATCH_INTERVAL_SECONDS, run_watcher
+
+
+class Command(BaseCommand):
+    help = '대기 중인 라이트닝 인보이스 상태를 주기적으로 확인해 결제 페이지에 푸시합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=DEFAULT_WATCH_INTERVAL_SECONDS,
+            help=f'감시 주기(초, 기본 {DEFAULT_WATCH_INTERVAL_SECONDS})',
+        )
+        parser.add_argument('--once', action='store_true', help='한 번만 확인하고 종료합니다')
+
+    def handle(self, *args, **options):
+        stop_event = threading.Event()
+
+        def _stop(signum, frame):
+            self.stdout.write(self.style.WARNING('🛑 종료 신호 수신 - 현재 회차를 마치고 종료합니다.'))
+            stop_event.set()
+
+        signal.signal(signal.SIGTERM, _stop)
+        signal.signal(signal.SIGINT, _stop)
+
+        def _report(result, elapsed):
+            if not (result.checked or result.failed or options['once']):
+                return
+            now = timezone.localtime().strftime('%Y-%m-%d %H:%M:%S')
+            self.stdout.write(
+                f'[{now}] 확인 {result.checked}건, 발행 {result.published}건, 실패 {result.failed}건 ({elapsed:.2f}초)'
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'🚀 결제 상태 감시 시작 (주기 {options["interval"]:.0f}초)'))
+        run_watcher(
+            interval=options['interval'],
+            stop_event=stop_event,
+            max_iterations=1 if options['once'] else None,
+            on_result=_report,
+        )
@@ -0,0 +1,60 @@
+import signal
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from ln_payment.stock_reservations import (
+    DEFAULT_SWEEP_BATCH_SIZE,
+    rebuild_reserved_quantities,
+    release_expired_reservations,
+)
+
+
+class Command(BaseCommand):
+    help = '만료된 재고 예약을 해제하고 상품 예약 카운터를 줄입니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=30, help='정리 주기(초, 기본 30)')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_SWEEP_BATCH_SIZE,
+            help=f'한 번에 해제할 예약 수 (기본 {DEFAULT_SWEEP_BATCH_SIZE})',
+        )
+        parser.add_argument('--once', action='store_true', help='한 번만 정리하고 종료합니다')
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='정리 후 활성 예약 합계로 예약 카운터를 다시 계산합니다 (관리자 수동 수정 후 보정용)',
+        )
+
+    def handle(self, *args, **options):
+        stop_event = threading.Event()
+
+        def _stop(signum, frame):
+            self.stdout.write(self.style.WARNING('🛑 종료 신호 수신 - 현재 회차를 마치고 종료합니다.'))
+            stop_event.set()
+
+        signal.signal(signal.SIGTERM, _stop)
+        signal.signal(signal.SIGINT, _stop)
+
+        self.stdout.write(self.style.SUCCESS(f'🚀 재고 예약 정리 시작 (주기 {options["interval"]:.0f}초)'))
+        while not stop_event.is_set():
+            started_at = time.monotonic()
+            try:
+                released = release_expired_reservations(batch_size=options['batch_size'])
+                if released or options['once']:
+                    now = timezone.localtime().strftime('%Y-%m-%d %H:%M:%S')
+                    self.stdout.write(f'[{now}] 만료 예약 {released}건 해제 ({time.monotonic() - started_at:.2f}초)')
+                if options['rebuild']:
+                    changed = rebuild_reserved_quantities()
+                    self.stdout.write(f'예약 카운터 보정: 상품 {changed}개')
+            finally:
+                close_old_connections()
+
+            if options['once']:
+                break
+            stop_event.wait(max(0.0, options['interval'] - (time.monotonic() - started_at)))
@@ -0,0 +1,51 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ln_payment.webhook_inbox import DEFAULT_BATCH_SIZE, DEFAULT_POLL_INTERVAL_SECONDS, run_worker
+
+
+class Command(BaseCommand):
+    help = 'Blink 웹훅 수신함 이벤트를 결제 해시별 수신 순서대로 처리합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=DEFAULT_POLL_INTERVAL_SECONDS,
+            help=f'처리할 이벤트가 없을 때 대기 시간(초, 기본 {DEFAULT_POLL_INTERVAL_SECONDS})',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'한 번에 가져올 이벤트 수 (기본 {DEFAULT_BATCH_SIZE})',
+        )
+        parser.add_argument('--once', action='store_true', help='한 배치만 처리하고 종료합니다')
+
+    def handle(self, *args, **options):
+        stop_event = threading.Event()
+
+        def _stop(signum, frame):
+            self.stdout.write(self.style.WARNING('🛑 종료 신호 수신 - 현재 배치를 마치고 종료합니다.'))
+            stop_event.set()
+
+        signal.signal(signal.SIGTERM, _stop)
+        signal.signal(signal.SIGINT, _stop)
+
+        def _report(result, elapsed):
+            if not (result.handled or options['once']):
+                return
+            now = timezone.localtime().strftime('%Y-%m-%d %H:%M:%S')
+            self.stdout.write(f'[{now}] 처리 {result.processed}건, 실패 {result.failed}건 ({elapsed:.2f}초)')
+
+        self.stdout.write(self.style.SUCCESS('🚀 웹훅 수신함 워커 시작'))
+        run_worker(
+            interval=options['interval'],
+            stop_event=stop_event,
+            max_iterations=1 if options['once'] else None,
+            on_result=_report,
+            batch_size=options['batch_size'],
+        )
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.2 on 2026-10-18 13:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ln_payment', '0005_paymenttransaction_file_order'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.CharField(max_length=200, unique=True, verbose_name='이벤트 ID')),
+                ('event_type', models.CharField(max_length=100, verbose_name='이벤트 종류')),
+                ('payment_hash', models.CharField(blank=True, max_length=120, verbose_name='결제 해시')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='페이로드')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('processing', '처리 중'), ('done', '완료'), ('failed', '실패')], default='pending', max_length=20, verbose_name='상태')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='처리 시도 횟수')),
+                ('last_error', models.TextField(blank=True, verbose_name='마지막 오류')),
+                ('next_attempt_at', models.DateTimeField(blank=True, null=True, verbose_name='다음 시도 시각')),
+                ('locked_at', models.DateTimeField(blank=True, null=True, verbose_name='처리 시작 시각')),
+                ('received_at', models.DateTimeField(auto_now_add=True, verbose_name='수신 시각')),
+                ('processed_at', models.DateTimeField(blank=True, null=True, verbose_name='처리 완료 시각')),
+            ],
+            options={
+                'verbose_name': '웹훅 이벤트',
+                'verbose_name_plural': '웹훅 이벤트 수신함',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='lnpay_whk_status_next_idx'), models.Index(fields=['payment_hash', 'status'], name='lnpay_whk_hash_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.2 on 2026-10-18 13:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ln_payment', '0006_webhookevent'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='paymenttransaction',
+            name='lnpay_tx_store_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='paymenttransaction',
+            index=models.Index(fields=['store', 'created_at', 'id'], name='lnpay_tx_store_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymenttransaction',
+            index=models.Index(fields=['store', 'status', 'created_at', 'id'], name='lnpay_tx_store_status_cr_idx'),
+        ),
+    ]
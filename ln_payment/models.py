@@ -98,7 +98,9 @@ class PaymentTransaction(models.Model):
         verbose_name_plural = "결제 트랜잭션 목록"
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["store", "created_at"], name="lnpay_tx_store_created_idx"),
+            # 현황 화면 키셋 페이지 (ln_payment.dashboard): (created_at, id) 순서로 바로 찾아 들어감
+            models.Index(fields=["store", "created_at", "id"], name="lnpay_tx_store_created_id_idx"),
+            models.Index(fields=["store", "status", "created_at", "id"], name="lnpay_tx_store_status_cr_idx"),
             models.Index(fields=["user", "created_at"], name="lnpay_tx_user_created_idx"),
             models.Index(fields=["status", "current_stage"], name="lnpay_tx_status_stage_idx"),
             models.Index(fields=["payment_hash"], name="lnpay_tx_payment_hash_idx"),
@@ -225,3 +227,48 @@ class ManualPaymentTransaction(PaymentTransaction):
         proxy = True
         verbose_name = "수동 저장 결제 트랜잭션"
         verbose_name_plural = "수동 저장 결제 트랜잭션"
+
+
+class WebhookEvent(models.Model):
+    """검증을 마친 Blink 웹훅 이벤트 수신함 (처리는 ``webhook_inbox`` 워커가 담당)."""
+
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "대기"),
+        (STATUS_PROCESSING, "처리 중"),
+        (STATUS_DONE, "완료"),
+        (STATUS_FAILED, "실패"),
+    ]
+
+    event_id = models.CharField(max_length=200, unique=True, verbose_name="이벤트 ID")
+    event_type = models.CharField(max_length=100, verbose_name="이벤트 종류")
+    payment_hash = models.CharField(max_length=120, blank=True, verbose_name="결제 해시")
+    payload = models.JSONField(default=dict, blank=True, verbose_name="페이로드")
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        verbose_name="상태",
+    )
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="처리 시도 횟수")
+    last_error = models.TextField(blank=True, verbose_name="마지막 오류")
+    next_attempt_at = models.DateTimeField(null=True, blank=True, verbose_name="다음 시도 시각")
+    locked_at = models.DateTimeField(null=True, blank=True, verbose_name="처리 시작 시각")
+    received_at = models.DateTimeField(auto_now_add=True, verbose_name="수신 시각")
+    processed_at = models.DateTimeField(null=True, blank=True, verbose_name="처리 완료 시각")
+
+    class Meta:
+        verbose_name = "웹훅 이벤트"
+        verbose_name_plural = "웹훅 이벤트 수신함"
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="lnpay_whk_status_next_idx"),
+            models.Index(fields=["payment_hash", "status"], name="lnpay_whk_hash_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} {self.payment_hash or self.event_id} ({self.get_status_display()})"
@@ -0,0 +1,230 @@
+"""미완료 라이트닝 결제 정산 보정기
+
+웹훅이 유실되거나 결제 탭이 닫혀 아무도 검증 API 를 호출하지 않으면 트랜잭션이
+진행 중 상태로 남는다. 보정기는 일정 시간 갱신되지 않은 미완료 트랜잭션을 배치로
+가져와 Blink 에 상태를 확인하고,
+
+- ``paid``: ``settle_paid_transaction`` 으로 정산 기록 및 상품 주문 자동 저장,
+  밋업/라이브 강의/디지털 파일 주문은 ``finalize_linked_order`` 로 확정
+- ``expired``: ``cancel_transaction`` 으로 재고 예약 해제 및 실패 처리
+
+를 수행한다. Blink 조회만 스레드 풀(동시성 제한)에서 병렬로 실행하고, DB 변경은
+호출 스레드에서 순서대로 처리한다. 최종 상태 조회 결과는 ``invoice_status_cache`` 에
+남으므로 단계 기록을 위한 재확인은 Blink 를 다시 호출하지 않는다.
+
+정산 단계가 이미 기록된 트랜잭션은 다시 가져오지 않는다. 확정할 주문 정보가 없는
+결제는 경고 로그를 한 번 남기고 수동 처리로 넘어간다.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.db import close_old_connections
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .blink_service import get_blink_service_for_store
+from .models import PaymentStageLog, PaymentTransaction
+from .services import (
+    LightningPaymentProcessor,
+    PaymentStage,
+    PaymentStatus,
+    finalize_linked_order,
+    settle_paid_transaction,
+)
+from .status_channel import publish_payment_status
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_CONCURRENCY = 8
+DEFAULT_INTERVAL_SECONDS = 30
+# 결제 페이지가 아직 폴링 중인 트랜잭션과 겹치지 않도록, 이 시간 동안 갱신이 없을 때만 보정
+DEFAULT_MIN_IDLE_SECONDS = 60
+# 이보다 오래된 트랜잭션은 보정 대상에서 제외 (수동 처리 영역)
+DEFAULT_MAX_AGE_SECONDS = 60 * 60 * 24 * 7
+
+
+@dataclass
+class ReconcileResult:
+    scanned: int = 0
+    checked: int = 0
+    paid: int = 0
+    finalized: int = 0
+    expired: int = 0
+    pending: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def checks_per_second(self) -> float:
+        return self.checked / self.elapsed if self.elapsed else 0.0
+
+
+def reconcilable_transactions(now=None, *, min_idle_seconds=DEFAULT_MIN_IDLE_SECONDS, max_age_seconds=DEFAULT_MAX_AGE_SECONDS):
+    """보정 대상: 인보이스가 발급된 미완료 트랜잭션 중 일정 시간 갱신되지 않은 것
+
+    정산 단계가 이미 완료된 트랜잭션은 제외한다 (주문 확정 실패 등은 수동 처리).
+    """
+    now = now or timezone.now()
+    settled = PaymentStageLog.objects.filter(
+        transaction=OuterRef('pk'),
+        stage=PaymentStage.MERCHANT_SETTLEMENT,
+        status=PaymentStatus.COMPLETED,
+    )
+    return (
+        PaymentTransaction.objects.filter(
+            status__in=[PaymentTransaction.STATUS_PENDING, PaymentTransaction.STATUS_PROCESSING],
+            updated_at__lte=now - timedelta(seconds=min_idle_seconds),
+            created_at__gte=now - timedelta(seconds=max_age_seconds),
+        )
+        .exclude(payment_hash='')
+        .exclude(Exists(settled))
+        .order_by('created_at', 'id')
+    )
+
+
+def _check_status(blink, payment_hash):
+    try:
+        return blink.check_invoice_status(payment_hash)
+    except Exception as exc:  # pylint: disable=broad-except
+        return {'success': False, 'error': str(exc)}
+
+
+def _apply_status(transaction, status_result, result: ReconcileResult):
+    """조회 결과를 트랜잭션에 반영 (호출 스레드에서 실행)"""
+    status = status_result.get('status')
+    if status not in ('paid', 'expired'):
+        result.pending += 1
+        return
+
+    processor = LightningPaymentProcessor(transaction.store)
+    if (transaction.current_stage or PaymentStage.PREPARE) < PaymentStage.USER_PAYMENT:
+        # 캐시된 최종 상태로 사용자 결제 단계를 기록 (Blink 재호출 없음)
+        processor.check_user_payment(transaction)
+
+    if status == 'expired':
+        processor.cancel_transaction(transaction, '인보이스 만료 (정산 보정)', detail=status_result)
+        publish_payment_status(transaction.payment_hash, 'expired', source='payment_reconciler')
+        result.expired += 1
+        return
+
+    result.paid += 1
+    order = settle_paid_transaction(
+        transaction,
+        source='payment_reconciler',
+        tx_payload={'source': 'payment_reconciler', 'raw_status': status_result.get('raw_status')},
+    )
+    if order is None:
+        order = finalize_linked_order(transaction)
+    if order is not None:
+        result.finalized += 1
+    else:
+        logger.warning('정산 보정: 확정할 주문 정보가 없어 수동 처리가 필요합니다 transaction=%s', transaction.id)
+    publish_payment_status(transaction.payment_hash, 'paid', source='payment_reconciler')
+
+
+def reconcile_batch(transactions, *, concurrency=DEFAULT_CONCURRENCY, result=None) -> ReconcileResult:
+    """트랜잭션 묶음을 Blink 에 동시 조회한 뒤 결과를 순서대로 반영"""
+    result = result or ReconcileResult()
+    transactions = list(transactions)
+    result.scanned += len(transactions)
+    if not transactions:
+        return result
+
+    blink_services = {}
+    jobs = []
+    for transaction in transactions:
+        try:
+            blink = blink_services.get(transaction.store_id)
+            if blink is None:
+                blink = blink_services[transaction.store_id] = get_blink_service_for_store(transaction.store)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning('정산 보정 건너뜀 transaction=%s: %s', transaction.id, exc)
+            result.failed += 1
+            continue
+        jobs.append((transaction, blink))
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix='ln-reconcile') as executor:
+        statuses = list(executor.map(lambda job: _check_status(job[1], job[0].payment_hash), jobs))
+
+    for (transaction, _blink), status_result in zip(jobs, statuses):
+        result.checked += 1
+        if not status_result.get('success'):
+            logger.warning('정산 보정 상태 확인 실패 transaction=%s: %s', transaction.id, status_result.get('error'))
+            result.failed += 1
+            continue
+        try:
+            _apply_status(transaction, status_result, result)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('정산 보정 반영 실패 transaction=%s', transaction.id)
+            result.failed += 1
+    return result
+
+
+def reconcile_once(
+    now=None,
+    *,
+    batch_size=DEFAULT_BATCH_SIZE,
+    concurrency=DEFAULT_CONCURRENCY,
+    min_idle_seconds=DEFAULT_MIN_IDLE_SECONDS,
+    max_age_seconds=DEFAULT_MAX_AGE_SECONDS,
+) -> ReconcileResult:
+    """보정 대상 전체를 ``batch_size`` 단위로 한 번 훑는다"""
+    started_at = time.monotonic()
+    result = ReconcileResult()
+    candidate_ids = list(
+        reconcilable_transactions(now, min_idle_seconds=min_idle_seconds, max_age_seconds=max_age_seconds)
+        .values_list('id', flat=True)
+    )
+
+    for start in range(0, len(candidate_ids), batch_size):
+        chunk_ids = candidate_ids[start:start + batch_size]
+        batch = (
+            PaymentTransaction.objects.filter(
+                id__in=chunk_ids,
+                status__in=[PaymentTransaction.STATUS_PENDING, PaymentTransaction.STATUS_PROCESSING],
+            )
+            .select_related('store')
+            .order_by('created_at', 'id')
+        )
+        reconcile_batch(batch, concurrency=concurrency, result=result)
+
+    result.elapsed = time.monotonic() - started_at
+    return result
+
+
+def run_reconciler(interval=DEFAULT_INTERVAL_SECONDS, stop_event=None, max_iterations=None, on_result=None, **options):
+    """보정 루프 (``run_payment_reconciler`` 관리 명령에서 사용)
+
+    Args:
+        interval: 보정 주기(초)
+        stop_event: 설정되면 루프 종료 (``threading.Event``)
+        max_iterations: 지정 시 해당 횟수만큼만 실행
+        on_result: 매 회차 ``ReconcileResult`` 콜백
+        **options: ``reconcile_once`` 인자 (batch_size, concurrency 등)
+    """
+    stop_event = stop_event or threading.Event()
+    iterations = 0
+
+    while not stop_event.is_set():
+        started_at = time.monotonic()
+        try:
+            result = reconcile_once(**options)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error('정산 보정 루프 오류: %s', exc, exc_info=True)
+            result = ReconcileResult()
+        finally:
+            close_old_connections()
+
+        if on_result:
+            on_result(result)
+
+        iterations += 1
+        if max_iterations is not None and iterations >= max_iterations:
+            break
+        stop_event.wait(max(0.0, interval - (time.monotonic() - started_at)))
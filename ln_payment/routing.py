@@ -0,0 +1,7 @@
+from django.urls import re_path
+
+from .consumers import PaymentStatusConsumer
+
+websocket_urlpatterns = [
+    re_path(r"^ws/payments/(?P<payment_hash>[A-Za-z0-9_-]+)/status/$", PaymentStatusConsumer.as_asgi()),
+]
@@ -8,15 +8,15 @@ from datetime import timedelta
 from typing import Any, Dict, Iterable, List, Optional
 
 from django.conf import settings
-from django.db import models, transaction as db_transaction
+from django.db import transaction as db_transaction
 from django.utils import timezone
 
 from orders.models import Order
-from products.models import Product
 from stores.models import Store
 
 from .blink_service import BlinkAPIService, get_blink_service_for_store
 from .models import OrderItemReservation, PaymentStageLog, PaymentTransaction
+from .stock_reservations import reserve_stock, transition_reservations
 
 logger = logging.getLogger(__name__)
 
@@ -116,16 +116,6 @@ class LightningPaymentProcessor:
     # ------------------------------------------------------------------
     # 트랜잭션 생성 및 예약 관리
     # ------------------------------------------------------------------
-    def _cleanup_expired_reservations(self) -> None:
-        now = timezone.now()
-        expired = OrderItemReservation.objects.filter(
-            status=OrderItemReservation.STATUS_ACTIVE,
-            expires_at__lt=now,
-        )
-        count = expired.update(status=OrderItemReservation.STATUS_RELEASED)
-        if count:
-            logger.debug('만료된 재고 예약 %s건 해제', count)
-
     @db_transaction.atomic
     def create_transaction(
         self,
@@ -140,7 +130,6 @@ class LightningPaymentProcessor:
         prepare_detail: Optional[Dict[str, Any]] = None,
     ) -> PaymentTransaction:
         now = timezone.now()
-        self._cleanup_expired_reservations()
         transaction = PaymentTransaction.objects.create(
             user=user,
             store=self.store,
@@ -155,24 +144,11 @@ class LightningPaymentProcessor:
         cart_items = list(cart_items or [])
 
         for item in cart_items:
-            product = Product.objects.select_for_update().get(id=item.product_id, store=self.store)
-            active_reserved = (
-                OrderItemReservation.objects.filter(
-                    product=product,
-                    status=OrderItemReservation.STATUS_ACTIVE,
-                )
-                .exclude(transaction=transaction)
-                .aggregate(total=models.Sum("quantity"))
-                .get("total")
-                or 0
-            )
-            available_stock = max(product.stock_quantity - active_reserved, 0)
-            if item.quantity > available_stock:
-                raise ValueError("재고가 부족합니다.")
-
+            # 재고 확인과 예약 카운터 증가를 조건부 UPDATE 한 번으로 처리 (실패 시 InsufficientStockError)
+            reserve_stock(item.product_id, item.quantity, store=self.store)
             OrderItemReservation.objects.create(
                 transaction=transaction,
-                product=product,
+                product_id=item.product_id,
                 quantity=item.quantity,
                 expires_at=transaction.soft_lock_expires_at,
                 metadata=item.metadata,
@@ -340,10 +316,10 @@ class LightningPaymentProcessor:
 
     def finalize_order(self, transaction: PaymentTransaction, order: Order) -> None:
         with db_transaction.atomic():
-            OrderItemReservation.objects.filter(
-                transaction=transaction,
-                status=OrderItemReservation.STATUS_ACTIVE,
-            ).update(status=OrderItemReservation.STATUS_CONVERTED)
+            transition_reservations(
+                OrderItemReservation.objects.filter(transaction=transaction),
+                OrderItemReservation.STATUS_CONVERTED,
+            )
             transaction.order = order
             transaction.status = PaymentTransaction.STATUS_COMPLETED
             transaction.current_stage = PaymentStage.ORDER_FINALIZE
@@ -473,10 +449,10 @@ class LightningPaymentProcessor:
         )
 
     def release_reservations(self, transaction: PaymentTransaction) -> None:
-        updated = OrderItemReservation.objects.filter(
-            transaction=transaction,
-            status=OrderItemReservation.STATUS_ACTIVE,
-        ).update(status=OrderItemReservation.STATUS_RELEASED)
+        updated = transition_reservations(
+            OrderItemReservation.objects.filter(transaction=transaction),
+            OrderItemReservation.STATUS_RELEASED,
+        )
         if updated:
             logger.info("소프트락 해제 완료 transaction=%s count=%s", transaction.id, updated)
 
@@ -493,6 +469,111 @@ class LightningPaymentProcessor:
         )
 
 
+def settle_paid_transaction(
+    transaction: PaymentTransaction,
+    *,
+    source: str,
+    tx_payload: Optional[Dict[str, Any]] = None,
+) -> Optional[Order]:
+    """입금이 확인된 트랜잭션의 정산 기록 및 상품 주문 자동 저장 (웹훅/정산 보정 공용)
+
+    정산 단계는 한 번만 기록한다. 주문이 아직 연결되지 않았고 배송/장바구니 스냅샷이
+    저장돼 있으면 ``finalize_order_from_payment_transaction`` 으로 주문을 만든다.
+    주문 저장 예외는 호출자에게 그대로 전달한다.
+
+    Returns:
+        Order | None: 저장(또는 연결)된 상품 주문
+    """
+    processor = LightningPaymentProcessor(transaction.store)
+    with db_transaction.atomic():
+        locked_tx = PaymentTransaction.objects.select_for_update().get(pk=transaction.pk)
+        settled = locked_tx.stage_logs.filter(
+            stage=PaymentStage.MERCHANT_SETTLEMENT,
+            status=PaymentStatus.COMPLETED,
+        ).exists()
+        if not settled:
+            processor.mark_settlement(locked_tx, tx_payload=tx_payload)
+
+    should_finalize_order = (
+        transaction.order_id is None
+        and transaction.meetup_order_id is None
+        and transaction.live_lecture_order_id is None
+        and transaction.file_order_id is None
+    )
+    metadata = transaction.metadata if isinstance(transaction.metadata, dict) else {}
+    has_snapshot = bool(metadata.get("shipping")) and bool(metadata.get("cart_snapshot"))
+    if not (should_finalize_order and has_snapshot):
+        return None
+
+    from orders.services import finalize_order_from_payment_transaction  # 지연 임포트로 순환 의존 방지
+
+    return finalize_order_from_payment_transaction(transaction, source=source)
+
+
+def finalize_linked_order(transaction: PaymentTransaction):
+    """밋업/라이브 강의/디지털 파일 임시 주문을 결제 완료로 확정 (세션 없는 경로용)
+
+    각 앱의 결제 검증 API 와 같은 순서로 주문을 확정하고 확정 메일을 보낸다. 참가자
+    정보는 결제 준비 시 ``metadata.participant`` 에 저장한 값을 쓴다. 트랜잭션이 이미
+    완료됐거나 연결된 주문이 없으면 아무 것도 하지 않는다. 정산 단계 기록은
+    ``settle_paid_transaction`` 이 맡는다.
+
+    Returns:
+        확정한 주문 | None
+    """
+    processor = LightningPaymentProcessor(transaction.store)
+    with db_transaction.atomic():
+        locked_tx = (
+            PaymentTransaction.objects.select_for_update()
+            .select_related("meetup_order", "live_lecture_order", "file_order")
+            .get(pk=transaction.pk)
+        )
+        if locked_tx.status == PaymentTransaction.STATUS_COMPLETED:
+            return None
+
+        metadata = locked_tx.metadata if isinstance(locked_tx.metadata, dict) else {}
+        participant_data = dict(metadata.get("participant") or {})
+        payment = {"payment_hash": locked_tx.payment_hash, "payment_request": locked_tx.payment_request}
+
+        # 지연 임포트로 순환 의존 방지
+        if locked_tx.meetup_order_id:
+            from meetup.services import send_meetup_notification_email, send_meetup_participant_confirmation_email
+            from meetup.views_paid import finalize_meetup_order_from_transaction
+
+            order = locked_tx.meetup_order
+            finalize_meetup_order_from_transaction(order, {**participant_data, **payment}, **payment)
+            processor.finalize_meetup_order(locked_tx, order)
+            senders = (send_meetup_notification_email, send_meetup_participant_confirmation_email)
+        elif locked_tx.live_lecture_order_id:
+            from lecture.services import (
+                send_live_lecture_notification_email,
+                send_live_lecture_participant_confirmation_email,
+            )
+            from lecture.views import finalize_live_lecture_order_from_transaction
+
+            order = locked_tx.live_lecture_order
+            finalize_live_lecture_order_from_transaction(order, {**participant_data, **payment}, **payment)
+            processor.finalize_live_lecture_order(locked_tx, order)
+            senders = (send_live_lecture_notification_email, send_live_lecture_participant_confirmation_email)
+        elif locked_tx.file_order_id:
+            from file.services import send_file_buyer_confirmation_email, send_file_purchase_notification_email
+            from file.views import finalize_file_order_from_transaction
+
+            order = locked_tx.file_order
+            finalize_file_order_from_transaction(order, **payment)
+            processor.finalize_file_order(locked_tx, order)
+            senders = (send_file_buyer_confirmation_email, send_file_purchase_notification_email)
+        else:
+            return None
+
+    for send in senders:
+        try:
+            send(order)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error("결제 확정 메일 발송 실패 transaction=%s order=%s: %s", transaction.id, order.id, exc)
+    return order
+
+
 def build_cart_items(raw_items: Iterable[Dict[str, Any]]) -> List[CartItemData]:
     items: List[CartItemData] = []
     for item in raw_items:
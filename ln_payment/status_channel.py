@@ -0,0 +1,91 @@
+"""결제 상태 푸시 채널
+
+결제 페이지가 몇 초마다 상태 확인 API 를 호출(=Blink 호출)하던 대신, 인보이스 상태가
+바뀌면 Channels 그룹 ``payment-status.<payment_hash>`` 로 한 번 푸시한다.
+
+- 발행: ``blink_webhook`` (입금 수신), ``run_payment_status_watcher`` (서버 측 감시)
+- 구독: ``ws/payments/<payment_hash>/status/`` (``PaymentStatusConsumer``)
+- 마지막 상태는 Django 캐시에도 남겨, 늦게 접속한 구독자에게 바로 보내 준다.
+
+웹 워커와 ASGI 서버가 다른 프로세스라면 ``CHANNEL_REDIS_URL`` 로 Redis 채널 레이어를
+설정해야 푸시가 전달된다 (기본 InMemoryChannelLayer 는 프로세스 내부 전용).
+"""
+
+import logging
+import re
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+GROUP_PREFIX = 'payment-status.'
+CACHE_KEY_PREFIX = 'ln_payment:status:'
+STATUS_CACHE_TIMEOUT = 60 * 30
+
+# 더 이상 바뀌지 않는 상태 (구독자는 이 상태를 받으면 검증 API 를 한 번 호출하고 종료)
+FINAL_STATUSES = {'paid', 'expired'}
+
+# Channels 그룹 이름 제약(영숫자/하이픈/밑줄/마침표, 100자 미만)에 맞는 결제 해시만 허용
+_PAYMENT_HASH_RE = re.compile(r'^[A-Za-z0-9_-]{1,90}$')
+
+
+def is_valid_payment_hash(payment_hash) -> bool:
+    return bool(payment_hash) and bool(_PAYMENT_HASH_RE.match(str(payment_hash)))
+
+
+def payment_status_group(payment_hash: str) -> str:
+    if not is_valid_payment_hash(payment_hash):
+        raise ValueError('올바르지 않은 결제 해시입니다.')
+    return f'{GROUP_PREFIX}{payment_hash}'
+
+
+def _cache_key(payment_hash: str) -> str:
+    return f'{CACHE_KEY_PREFIX}{payment_hash}'
+
+
+def get_published_status(payment_hash):
+    """마지막으로 발행된 상태 (``{'status', 'source', 'published_at'}`` 또는 None)"""
+    if not is_valid_payment_hash(payment_hash):
+        return None
+    return cache.get(_cache_key(payment_hash))
+
+
+def publish_payment_status(payment_hash, status, source=''):
+    """결제 상태를 캐시에 기록하고 구독 중인 브라우저에 푸시
+
+    같은 상태가 이미 발행돼 있으면 다시 보내지 않는다. 채널 레이어 오류는
+    로그만 남기고 호출자(웹훅/감시기)의 처리를 막지 않는다.
+
+    Returns:
+        bool: 새로 발행했으면 True
+    """
+    if not is_valid_payment_hash(payment_hash):
+        logger.warning('결제 상태 발행 건너뜀 - 올바르지 않은 payment_hash: %s', payment_hash)
+        return False
+
+    previous = cache.get(_cache_key(payment_hash))
+    if previous and previous.get('status') == status:
+        return False
+
+    message = {
+        'status': status,
+        'source': source,
+        'published_at': timezone.now().isoformat(),
+    }
+    cache.set(_cache_key(payment_hash), message, STATUS_CACHE_TIMEOUT)
+
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return True
+
+    try:
+        async_to_sync(channel_layer.group_send)(
+            payment_status_group(payment_hash),
+            {'type': 'payment.status', 'payment_hash': payment_hash, **message},
+        )
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.warning('결제 상태 푸시 실패 payment_hash=%s: %s', payment_hash, exc)
+    return True
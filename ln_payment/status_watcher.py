@@ -0,0 +1,112 @@
+"""서버 측 결제 상태 감시기
+
+웹훅이 누락되거나 지연돼도 결제 페이지가 상태를 받을 수 있도록, 대기 중인 인보이스를
+주기마다 한 번씩만 Blink 에 조회하고 상태가 바뀌면 ``publish_payment_status`` 로 푸시한다.
+열린 결제 탭 수와 무관하게 인보이스당 호출 수가 고정된다.
+
+트랜잭션 상태 변경(정산/주문 저장)은 하지 않는다. 푸시를 받은 브라우저가 기존 검증 API 를
+한 번 호출해 처리한다.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .blink_service import get_blink_service_for_store
+from .models import PaymentTransaction
+from .status_channel import FINAL_STATUSES, get_published_status, publish_payment_status
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WATCH_INTERVAL_SECONDS = 5
+# 만료 직후 결제된 인보이스도 한 번 더 확인하기 위한 여유 시간
+EXPIRY_GRACE_SECONDS = 60
+
+
+@dataclass
+class WatchResult:
+    checked: int = 0
+    published: int = 0
+    failed: int = 0
+
+
+def watched_transactions(now=None):
+    """감시 대상: 인보이스가 발급된 미완료 트랜잭션 중 만료되지 않은 것"""
+    now = now or timezone.now()
+    return (
+        PaymentTransaction.objects.filter(
+            status__in=[PaymentTransaction.STATUS_PENDING, PaymentTransaction.STATUS_PROCESSING],
+            invoice_expires_at__gt=now - timedelta(seconds=EXPIRY_GRACE_SECONDS),
+        )
+        .exclude(payment_hash='')
+        .select_related('store')
+        .order_by('invoice_expires_at')
+    )
+
+
+def watch_once(now=None) -> WatchResult:
+    """대기 중인 인보이스 상태를 한 번씩 확인하고 바뀐 상태를 발행"""
+    result = WatchResult()
+    blink_services = {}
+
+    for transaction in watched_transactions(now):
+        published = get_published_status(transaction.payment_hash)
+        if published and published.get('status') in FINAL_STATUSES:
+            continue
+
+        try:
+            blink = blink_services.get(transaction.store_id)
+            if blink is None:
+                blink = blink_services[transaction.store_id] = get_blink_service_for_store(transaction.store)
+            status_result = blink.check_invoice_status(transaction.payment_hash)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning('결제 상태 감시 실패 transaction=%s: %s', transaction.id, exc)
+            result.failed += 1
+            continue
+
+        result.checked += 1
+        if not status_result.get('success'):
+            result.failed += 1
+            continue
+
+        if publish_payment_status(transaction.payment_hash, status_result['status'], source='status_watcher'):
+            result.published += 1
+
+    return result
+
+
+def run_watcher(interval=DEFAULT_WATCH_INTERVAL_SECONDS, stop_event=None, max_iterations=None, on_result=None):
+    """감시 루프 (``run_payment_status_watcher`` 관리 명령에서 사용)
+
+    Args:
+        interval: 감시 주기(초)
+        stop_event: 설정되면 루프 종료 (``threading.Event``)
+        max_iterations: 지정 시 해당 횟수만큼만 실행
+        on_result: 매 회차 ``(WatchResult, 소요초)`` 콜백
+    """
+    stop_event = stop_event or threading.Event()
+    iterations = 0
+
+    while not stop_event.is_set():
+        started_at = time.monotonic()
+        try:
+            result = watch_once()
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error('결제 상태 감시 루프 오류: %s', exc, exc_info=True)
+            result = WatchResult()
+        finally:
+            close_old_connections()
+
+        elapsed = time.monotonic() - started_at
+        if on_result:
+            on_result(result, elapsed)
+
+        iterations += 1
+        if max_iterations is not None and iterations >= max_iterations:
+            break
+        stop_event.wait(max(0.0, interval - elapsed))
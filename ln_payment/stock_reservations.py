@@ -0,0 +1,158 @@
+"""상품 재고 예약 카운터
+
+결제 대기 중인 예약 수량을 ``Product.reserved_quantity`` 카운터로 관리한다.
+
+- 예약: ``stock_quantity >= reserved_quantity + 수량`` 조건부 UPDATE 한 번으로 확인과 증가를
+  동시에 처리한다. 상품 행 잠금이나 예약 합계(SUM) 집계가 필요 없다.
+- 해제/전환: 활성 예약의 상태를 바꾼 만큼 카운터를 줄인다. 상태 전환은 ``status='active'``
+  조건으로만 일어나므로 같은 예약이 두 번 차감되지 않는다.
+- 만료: ``release_expired_reservations()`` 를 스위퍼(``run_reservation_sweeper``)가 주기적으로
+  실행한다. 예약이 실패하면 해당 상품의 만료 예약만 즉시 정리하고 한 번 더 시도한다.
+"""
+
+import logging
+from collections import Counter
+
+from django.db import transaction as db_transaction
+from django.db.models import F, Sum
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from products.models import Product
+
+from .models import OrderItemReservation
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SWEEP_BATCH_SIZE = 500
+
+
+class InsufficientStockError(ValueError):
+    """예약 가능한 재고가 부족함"""
+
+
+def _try_reserve(product_id, quantity, store=None) -> bool:
+    queryset = Product.objects.filter(
+        pk=product_id,
+        stock_quantity__gte=F('reserved_quantity') + quantity,
+    )
+    if store is not None:
+        queryset = queryset.filter(store=store)
+    return queryset.update(reserved_quantity=F('reserved_quantity') + quantity) == 1
+
+
+def reserve_stock(product_id, quantity, *, store=None):
+    """재고 예약 카운터 증가 (호출자의 트랜잭션 안에서 실행)
+
+    Raises:
+        Product.DoesNotExist: 상품이 없거나 다른 스토어 상품인 경우
+        InsufficientStockError: 남은 재고가 부족한 경우
+    """
+    if quantity <= 0:
+        raise ValueError('예약 수량이 올바르지 않습니다.')
+
+    if _try_reserve(product_id, quantity, store):
+        return
+
+    lookup = {'pk': product_id}
+    if store is not None:
+        lookup['store'] = store
+    if not Product.objects.filter(**lookup).exists():
+        raise Product.DoesNotExist(f'상품({product_id})을 찾을 수 없습니다.')
+
+    # 스위퍼가 아직 정리하지 못한 만료 예약이 재고를 잡고 있을 수 있음
+    if release_expired_reservations(product_ids=[product_id]) and _try_reserve(product_id, quantity, store):
+        return
+    raise InsufficientStockError('재고가 부족합니다.')
+
+
+def transition_reservations(reservations, status) -> int:
+    """활성 예약을 ``status`` (해제/전환)로 바꾸고 상품별 예약 카운터를 줄인다
+
+    Args:
+        reservations: ``OrderItemReservation`` 쿼리셋 (활성 상태만 처리)
+        status: ``STATUS_RELEASED`` 또는 ``STATUS_CONVERTED``
+
+    Returns:
+        int: 상태가 바뀐 예약 수
+    """
+    with db_transaction.atomic():
+        rows = list(
+            reservations.filter(status=OrderItemReservation.STATUS_ACTIVE)
+            .select_for_update()
+            .values_list('id', 'product_id', 'quantity')
+        )
+        if not rows:
+            return 0
+
+        OrderItemReservation.objects.filter(
+            id__in=[row[0] for row in rows],
+            status=OrderItemReservation.STATUS_ACTIVE,
+        ).update(status=status, updated_at=timezone.now())
+
+        released_by_product = Counter()
+        for _, product_id, quantity in rows:
+            released_by_product[product_id] += quantity
+        # 교착 방지를 위해 상품 ID 순서로 갱신
+        for product_id in sorted(released_by_product):
+            Product.objects.filter(pk=product_id).update(
+                reserved_quantity=Greatest(F('reserved_quantity') - released_by_product[product_id], 0)
+            )
+    return len(rows)
+
+
+def release_expired_reservations(now=None, *, product_ids=None, batch_size=DEFAULT_SWEEP_BATCH_SIZE) -> int:
+    """만료된 활성 예약을 ``batch_size`` 단위로 해제
+
+    Args:
+        now: 기준 시각 (기본 현재)
+        product_ids: 지정 시 해당 상품의 예약만 정리
+    """
+    now = now or timezone.now()
+    expired = OrderItemReservation.objects.filter(
+        status=OrderItemReservation.STATUS_ACTIVE,
+        expires_at__lt=now,
+    )
+    if product_ids is not None:
+        expired = expired.filter(product_id__in=product_ids)
+
+    released = 0
+    while True:
+        batch_ids = list(expired.order_by('expires_at').values_list('id', flat=True)[:batch_size])
+        if not batch_ids:
+            break
+        count = transition_reservations(
+            OrderItemReservation.objects.filter(id__in=batch_ids),
+            OrderItemReservation.STATUS_RELEASED,
+        )
+        released += count
+        if len(batch_ids) < batch_size:
+            break
+    if released:
+        logger.debug('만료된 재고 예약 %s건 해제', released)
+    return released
+
+
+def rebuild_reserved_quantities(product_ids=None) -> int:
+    """활성 예약 합계로 카운터를 다시 계산 (배포 직후/수동 보정용)
+
+    Returns:
+        int: 값이 바뀐 상품 수
+    """
+    active_totals = dict(
+        OrderItemReservation.objects.filter(status=OrderItemReservation.STATUS_ACTIVE)
+        .values('product_id')
+        .annotate(total=Sum('quantity'))
+        .values_list('product_id', 'total')
+    )
+    products = Product.objects.all()
+    if product_ids is not None:
+        products = products.filter(pk__in=product_ids)
+
+    changed = 0
+    for product_id, current in products.values_list('id', 'reserved_quantity').iterator():
+        expected = active_totals.get(product_id, 0)
+        if current != expected:
+            Product.objects.filter(pk=product_id).update(reserved_quantity=expected)
+            changed += 1
+    return changed
@@ -1,3 +1,747 @@
-from django.test import TestCase
+import json
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import HttpResponse, QueryDict
+from django.db import OperationalError, connection, connections
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ln_payment.blink_service import BlinkAPIService, forget_blink_auth
+from ln_payment.dashboard import status_summary, transaction_dashboard
+from ln_payment.fake_blink import FakeBlinkServer
+from ln_payment.invoice_status_cache import invalidate_invoice_status
+from ln_payment.models import OrderItemReservation, PaymentTransaction, WebhookEvent
+from ln_payment.reconciler import reconcile_once
+from ln_payment.services import CartItemData, LightningPaymentProcessor, PaymentStage
+from ln_payment.stock_reservations import InsufficientStockError, release_expired_reservations
+from ln_payment.routing import websocket_urlpatterns
+from ln_payment.status_channel import get_published_status, payment_status_group, publish_payment_status
+from ln_payment.status_watcher import watch_once
+from ln_payment.webhook_inbox import MAX_ATTEMPTS, process_pending
+from meetup.models import Meetup, MeetupOrder
+from products.models import Product
+from stores.models import Store
+
+
+class BlinkAPIServiceConnectionReuseTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        forget_blink_auth()
+        self.addCleanup(forget_blink_auth)
+
+    def _start_server(self, **kwargs):
+        server = FakeBlinkServer(api_key='test-api-key', **kwargs).start()
+        self.addCleanup(server.stop)
+        service = BlinkAPIService(api_key='test-api-key', wallet_id='wallet-1', api_url=server.url)
+        return server, service
+
+    def test_auth_discovery_happens_once_per_api_key(self):
+        server, service = self._start_server()
+
+        created = service.create_invoice(1000, memo='first')
+        self.assertTrue(created['success'])
+        self.assertEqual(server.request_count, 2)
+
+        server.reset_counters()
+        self.assertTrue(service.create_invoice(2000, memo='second')['success'])
+        status = BlinkAPIService(api_key='test-api-key', wallet_id='wallet-1', api_url=server.url).check_invoice_status(
+            created['payment_hash']
+        )
+
+        self.assertEqual(status['status'], 'pending')
+        self.assertEqual(server.request_count, 2)
+        self.assertNotIn('authorization', ''.join(server.queries))
+        # 풀링된 세션이 keep-alive 커넥션을 재사용
+        self.assertEqual(server.connection_count, 0)
+
+    def test_discovered_auth_style_is_remembered(self):
+        server, service = self._start_server(auth_header='Authorization', auth_prefix='Bearer ')
+
+        self.assertTrue(service.create_invoice(1000)['success'])
+        # X-API-KEY/X-API-Key 실패 후 Bearer 성공 + 실제 쿼리
+        self.assertEqual(server.request_count, 4)
+
+        server.reset_counters()
+        self.assertTrue(service.check_invoice_status('unknown')['success'])
+        self.assertEqual(server.request_count, 1)
+
+    def test_rejected_cached_auth_triggers_rediscovery(self):
+        server, service = self._start_server()
+        self.assertTrue(service.create_invoice(1000)['success'])
+
+        # 서버 측 인증 방식 변경 (API 키 재발급 등)
+        server.auth_header = 'Authorization'
+        server.expected_auth_value = 'Bearer test-api-key'
+        server.reset_counters()
+
+        self.assertTrue(service.check_invoice_status('unknown')['success'])
+        self.assertEqual(server.request_count, 5)
+
+
+class PaymentStatusChannelTests(SimpleTestCase):
+    """``channels.testing`` 는 daphne 를 요구하므로 asgiref 통신기로 웹소켓을 흉내낸다."""
+
+    PAYMENT_HASH = 'a' * 64
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    async def _connect(self):
+        path = f'/ws/payments/{self.PAYMENT_HASH}/status/'
+        communicator = ApplicationCommunicator(
+            URLRouter(websocket_urlpatterns),
+            {'type': 'websocket', 'path': path, 'headers': [], 'subprotocols': []},
+        )
+        await communicator.send_input({'type': 'websocket.connect'})
+        response = await communicator.receive_output(1)
+        self.assertEqual(response['type'], 'websocket.accept')
+        return communicator
+
+    async def _receive_json(self, communicator):
+        response = await communicator.receive_output(1)
+        self.assertEqual(response['type'], 'websocket.send')
+        return json.loads(response['text'])
+
+    async def _disconnect(self, communicator):
+        await communicator.send_input({'type': 'websocket.disconnect', 'code': 1000})
+        await communicator.wait(1)
+
+    @async_to_sync
+    async def test_subscriber_receives_single_push(self):
+        communicator = await self._connect()
+
+        await sync_to_async(publish_payment_status)(self.PAYMENT_HASH, 'paid', source='test')
+        # 같은 상태는 다시 보내지 않음
+        await sync_to_async(publish_payment_status)(self.PAYMENT_HASH, 'paid', source='test')
+
+        message = await self._receive_json(communicator)
+        self.assertEqual(message['status'], 'paid')
+        self.assertEqual(message['payment_hash'], self.PAYMENT_HASH)
+        self.assertTrue(await communicator.receive_nothing())
+        await self._disconnect(communicator)
+
+    @async_to_sync
+    async def test_late_subscriber_gets_latest_status(self):
+        await sync_to_async(publish_payment_status)(self.PAYMENT_HASH, 'expired', source='test')
+
+        communicator = await self._connect()
+
+        message = await self._receive_json(communicator)
+        self.assertEqual(message['status'], 'expired')
+        await self._disconnect(communicator)
+
+
+@override_settings(BLINK_WEBHOOK_SECRET=None)
+class BlinkWebhookPushTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_webhook_publishes_paid_status(self):
+        payment_hash = 'b' * 64
+        channel_layer = get_channel_layer()
+        channel_name = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(payment_status_group(payment_hash), channel_name)
+
+        response = self.client.post(
+            reverse('ln_payment:blink_webhook'),
+            data=json.dumps({
+                'eventType': 'receive.lightning',
+                'transaction': {'initiationVia': {'paymentHash': payment_hash}},
+            }),
+            content_type='application/json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(process_pending().processed, 1)
+        message = async_to_sync(channel_layer.receive)(channel_name)
+        self.assertEqual(message['status'], 'paid')
+        self.assertEqual(message['source'], 'blink_webhook')
+
+
+@override_settings(BLINK_WEBHOOK_INBOX_BACKGROUND=False)
+class WebhookInboxTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.owner = User.objects.create_user(username='owner', password='test-pass', email='owner@example.com')
+        self.store = Store.objects.create(
+            store_id='inboxstore',
+            store_name='수신함 스토어',
+            owner_name='홍길동',
+            chat_channel='https://t.me/example',
+            owner=self.owner,
+        )
+        self.product = Product.objects.create(
+            store=self.store,
+            title='수신함 상품',
+            description='테스트 상품',
+            price=1000,
+            stock_quantity=10,
+        )
+
+    def _create_transaction(self, payment_hash):
+        return PaymentTransaction.objects.create(
+            user=self.owner,
+            store=self.store,
+            amount_sats=1000,
+            status=PaymentTransaction.STATUS_PROCESSING,
+            payment_hash=payment_hash,
+            metadata={
+                'shipping': {'buyer_name': '구매자', 'buyer_email': 'owner@example.com', 'pickup_requested': True},
+                'cart_snapshot': [{
+                    'product_id': self.product.id,
+                    'product_title': self.product.title,
+                    'quantity': 1,
+                    'unit_price': 1000,
+                    'store_id': self.store.store_id,
+                }],
+            },
+        )
+
+    def _post(self, payment_hash, message_id):
+        return self.client.post(
+            reverse('ln_payment:blink_webhook'),
+            data=json.dumps({
+                'eventType': 'receive.lightning',
+                'transaction': {'initiationVia': {'paymentHash': payment_hash}},
+            }),
+            content_type='application/json',
+            HTTP_SVIX_ID=message_id,
+        )
+
+    def test_webhook_is_stored_once_and_processed_later(self):
+        transaction = self._create_transaction('c' * 64)
+
+        first = self._post(transaction.payment_hash, 'msg_1')
+        retry = self._post(transaction.payment_hash, 'msg_1')
+
+        self.assertEqual((first.status_code, retry.status_code), (200, 200))
+        self.assertFalse(first.json()['duplicate'])
+        self.assertTrue(retry.json()['duplicate'])
+        self.assertEqual(WebhookEvent.objects.count(), 1)
+        # 응답 시점에는 주문이 아직 만들어지지 않음
+        transaction.refresh_from_db()
+        self.assertIsNone(transaction.order_id)
+
+        self.assertEqual(process_pending().processed, 1)
+        transaction.refresh_from_db()
+        self.assertEqual(transaction.status, PaymentTransaction.STATUS_COMPLETED)
+        self.assertIsNotNone(transaction.order_id)
+        self.assertEqual(WebhookEvent.objects.get().status, WebhookEvent.STATUS_DONE)
+
+    def test_failed_event_backs_off_and_blocks_later_events_for_same_hash(self):
+        payment_hash = 'd' * 64
+        self._post(payment_hash, 'msg_1')
+        self._post(payment_hash, 'msg_2')
+        first, second = WebhookEvent.objects.order_by('id')
+
+        with mock.patch('ln_payment.webhook_inbox.settle_paid_transaction', side_effect=RuntimeError('smtp down')):
+            self._create_transaction(payment_hash)
+            result = process_pending()
+
+        # 앞선 이벤트가 재시도 대기 중이면 같은 해시의 뒤 이벤트는 처리하지 않음
+        self.assertEqual((result.processed, result.failed), (0, 1))
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.status, first.attempts), (WebhookEvent.STATUS_PENDING, 1))
+        self.assertGreater(first.next_attempt_at, timezone.now())
+        self.assertIn('smtp down', first.last_error)
+        self.assertEqual(second.status, WebhookEvent.STATUS_PENDING)
+        self.assertEqual(process_pending().handled, 0)
+
+        # 해시별로 한 배치에 하나씩, 수신 순서대로 처리
+        retry_at = first.next_attempt_at + timedelta(seconds=1)
+        self.assertEqual(process_pending(now=retry_at).processed, 1)
+        self.assertEqual(process_pending(now=retry_at).processed, 1)
+        self.assertEqual(set(WebhookEvent.objects.values_list('status', flat=True)), {WebhookEvent.STATUS_DONE})
+
+    def test_replay_command_requeues_failed_events(self):
+        payment_hash = 'e' * 64
+        self._post(payment_hash, 'msg_1')
+        WebhookEvent.objects.update(status=WebhookEvent.STATUS_FAILED, attempts=MAX_ATTEMPTS, last_error='boom')
+        transaction = self._create_transaction(payment_hash)
+
+        call_command('replay_webhook_events', '--status', 'failed', '--process', stdout=StringIO())
+
+        event = WebhookEvent.objects.get()
+        self.assertEqual((event.status, event.attempts), (WebhookEvent.STATUS_DONE, 1))
+        transaction.refresh_from_db()
+        self.assertIsNotNone(transaction.order_id)
+
+
+class PaymentStatusWatcherTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        forget_blink_auth()
+        self.addCleanup(forget_blink_auth)
+
+        self.server = FakeBlinkServer(api_key='store-api-key').start()
+        self.addCleanup(self.server.stop)
+        settings_override = override_settings(BLINK_API_URL=self.server.url)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        owner = User.objects.create_user(username='owner', password='test-pass')
+        self.store = Store(
+            store_id='watchstore',
+            store_name='감시 스토어',
+            owner_name='홍길동',
+            chat_channel='https://t.me/example',
+            owner=owner,
+        )
+        self.store.set_blink_api_info('store-api-key')
+        self.store.set_blink_wallet_id('wallet-1')
+        self.store.save()
+
+    def _create_transaction(self):
+        invoice = BlinkAPIService(api_key='store-api-key', wallet_id='wallet-1', api_url=self.server.url).create_invoice(1000)
+        return PaymentTransaction.objects.create(
+            store=self.store,
+            amount_sats=1000,
+            payment_hash=invoice['payment_hash'],
+            payment_request=invoice['invoice'],
+            invoice_expires_at=timezone.now() + timedelta(minutes=10),
+        )
+
+    def test_watcher_checks_each_invoice_once_and_publishes_changes(self):
+        transaction = self._create_transaction()
+        self.server.reset_counters()
+
+        first = watch_once()
+        self.assertEqual((first.checked, first.published), (1, 1))
+        self.assertEqual(get_published_status(transaction.payment_hash)['status'], 'pending')
+
+        self.server.set_status(transaction.payment_hash, 'PAID')
+        invalidate_invoice_status(transaction.payment_hash)
+        second = watch_once()
+        self.assertEqual((second.checked, second.published), (1, 1))
+        self.assertEqual(get_published_status(transaction.payment_hash)['status'], 'paid')
+
+        # 최종 상태가 발행된 인보이스는 더 이상 Blink 에 조회하지 않음
+        self.server.reset_counters()
+        third = watch_once()
+        self.assertEqual(third.checked, 0)
+        self.assertEqual(self.server.request_count, 0)
+
+    def test_expired_invoices_are_not_watched(self):
+        transaction = self._create_transaction()
+        PaymentTransaction.objects.filter(pk=transaction.pk).update(
+            invoice_expires_at=timezone.now() - timedelta(hours=1)
+        )
+
+        self.assertEqual(watch_once().checked, 0)
+
+
+@override_settings(BLINK_WEBHOOK_SECRET=None)
+class InvoiceStatusCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        forget_blink_auth()
+        self.addCleanup(forget_blink_auth)
+
+        self.server = FakeBlinkServer(api_key='test-api-key', latency=0.2).start()
+        self.addCleanup(self.server.stop)
+        self.service = BlinkAPIService(api_key='test-api-key', wallet_id='wallet-1', api_url=self.server.url)
+        self.payment_hash = self.service.create_invoice(1000)['payment_hash']
+        self.server.reset_counters()
+
+    def _check_concurrently(self, workers):
+        barrier = threading.Barrier(workers)
+        results = []
+
+        def poll():
+            barrier.wait()
+            results.append(self.service.check_invoice_status(self.payment_hash))
+
+        threads = [threading.Thread(target=poll) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_polls_share_one_blink_request(self):
+        results = self._check_concurrently(20)
+
+        self.assertEqual(len(results), 20)
+        self.assertTrue(all(result['status'] == 'pending' for result in results))
+        self.assertEqual(self.server.request_count, 1)
+
+        # TTL 안의 후속 폴링도 Blink 로 나가지 않음
+        self.assertEqual(self.service.check_invoice_status(self.payment_hash)['status'], 'pending')
+        self.assertEqual(self.server.request_count, 1)
+
+    def test_webhook_invalidates_cached_status(self):
+        self.assertEqual(self.service.check_invoice_status(self.payment_hash)['status'], 'pending')
+        self.server.set_status(self.payment_hash, 'PAID')
+        self.assertEqual(self.service.check_invoice_status(self.payment_hash)['status'], 'pending')
+
+        response = self.client.post(
+            reverse('ln_payment:blink_webhook'),
+            data=json.dumps({
+                'eventType': 'receive.lightning',
+                'transaction': {'initiationVia': {'paymentHash': self.payment_hash}},
+            }),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.service.check_invoice_status(self.payment_hash)['status'], 'paid')
+        self.assertEqual(self.server.request_count, 2)
+
+    def test_failed_lookups_are_not_cached(self):
+        self.server.expected_auth_value = 'rotated-key'
+        self.assertFalse(self.service.check_invoice_status(self.payment_hash)['success'])
+
+        self.server.expected_auth_value = 'test-api-key'
+        forget_blink_auth()
+        self.assertTrue(self.service.check_invoice_status(self.payment_hash)['success'])
+
+
+class PaymentReconcilerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        forget_blink_auth()
+        self.addCleanup(forget_blink_auth)
+
+        self.server = FakeBlinkServer(api_key='store-api-key', latency=0.05).start()
+        self.addCleanup(self.server.stop)
+        settings_override = override_settings(BLINK_API_URL=self.server.url)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.owner = User.objects.create_user(username='owner', password='test-pass', email='owner@example.com')
+        self.store = Store(
+            store_id='reconcilestore',
+            store_name='보정 스토어',
+            owner_name='홍길동',
+            chat_channel='https://t.me/example',
+            owner=self.owner,
+        )
+        self.store.set_blink_api_info('store-api-key')
+        self.store.set_blink_wallet_id('wallet-1')
+        self.store.save()
+        self.product = Product.objects.create(
+            store=self.store,
+            title='보정 상품',
+            description='테스트 상품',
+            price=1000,
+            stock_quantity=100,
+        )
+        self.blink = BlinkAPIService(api_key='store-api-key', wallet_id='wallet-1', api_url=self.server.url)
+
+    def _create_idle_transaction(self, blink_status='PENDING', with_snapshot=False, metadata=None, **links):
+        invoice = self.blink.create_invoice(1000)
+        metadata = metadata or {}
+        if with_snapshot:
+            metadata = {
+                'shipping': {'buyer_name': '구매자', 'buyer_email': 'owner@example.com', 'pickup_requested': True},
+                'cart_snapshot': [{
+                    'product_id': self.product.id,
+                    'product_title': self.product.title,
+                    'quantity': 1,
+                    'unit_price': 1000,
+                    'store_id': self.store.store_id,
+                }],
+            }
+        transaction = PaymentTransaction.objects.create(
+            user=self.owner,
+            store=self.store,
+            amount_sats=1000,
+            status=PaymentTransaction.STATUS_PROCESSING,
+            payment_hash=invoice['payment_hash'],
+            payment_request=invoice['invoice'],
+            invoice_expires_at=timezone.now() + timedelta(minutes=2),
+            metadata=metadata,
+            **links,
+        )
+        if not links:
+            OrderItemReservation.objects.create(
+                transaction=transaction,
+                product=self.product,
+                quantity=1,
+                expires_at=timezone.now() + timedelta(minutes=3),
+            )
+        # 결제 탭이 닫혀 한동안 아무도 확인하지 않은 상태
+        PaymentTransaction.objects.filter(pk=transaction.pk).update(updated_at=timezone.now() - timedelta(minutes=5))
+        self.server.set_status(transaction.payment_hash, blink_status)
+        return transaction
+
+    def test_reconciler_settles_and_expires_idle_transactions(self):
+        paid = [self._create_idle_transaction('PAID', with_snapshot=True) for _ in range(3)]
+        expired = [self._create_idle_transaction('EXPIRED') for _ in range(3)]
+        pending = [self._create_idle_transaction('PENDING') for _ in range(6)]
+        self.server.reset_counters()
+
+        result = reconcile_once(batch_size=5, concurrency=4)
+
+        self.assertEqual((result.scanned, result.checked, result.failed), (12, 12, 0))
+        self.assertEqual((result.paid, result.finalized, result.expired, result.pending), (3, 3, 3, 6))
+        # 트랜잭션당 Blink 조회 1회 (단계 기록용 재확인은 캐시 사용), 동시 조회 수 제한
+        self.assertEqual(self.server.request_count, 12)
+        self.assertLessEqual(self.server.max_in_flight, 4)
+        self.assertGreater(self.server.max_in_flight, 1)
+
+        for transaction in paid:
+            transaction.refresh_from_db()
+            self.assertEqual(transaction.status, PaymentTransaction.STATUS_COMPLETED)
+            self.assertIsNotNone(transaction.order_id)
+            self.assertEqual(get_published_status(transaction.payment_hash)['status'], 'paid')
+        for transaction in expired:
+            transaction.refresh_from_db()
+            self.assertEqual(transaction.status, PaymentTransaction.STATUS_FAILED)
+            self.assertFalse(transaction.reservations.filter(status=OrderItemReservation.STATUS_ACTIVE).exists())
+        for transaction in pending:
+            transaction.refresh_from_db()
+            self.assertEqual(transaction.status, PaymentTransaction.STATUS_PROCESSING)
+
+        # 완료/만료 처리된 트랜잭션은 다음 회차 대상에서 빠짐
+        self.server.reset_counters()
+        self.assertEqual(reconcile_once(min_idle_seconds=0, concurrency=4).scanned, 6)
+
+    def test_recently_active_transactions_are_left_to_the_browser(self):
+        transaction = self._create_idle_transaction('PAID', with_snapshot=True)
+        PaymentTransaction.objects.filter(pk=transaction.pk).update(updated_at=timezone.now())
+
+        self.assertEqual(reconcile_once().scanned, 0)
+
+    def test_paid_transactions_without_product_snapshot_are_settled_once(self):
+        meetup = Meetup.objects.create(store=self.store, name='보정 밋업', price=1000, max_participants=10)
+        meetup_order = MeetupOrder.objects.create(
+            meetup=meetup,
+            participant_name='참가자',
+            participant_email='guest@example.com',
+            status='pending',
+            is_temporary_reserved=True,
+            base_price=1000,
+            total_price=1000,
+        )
+        meetup_tx = self._create_idle_transaction(
+            'PAID',
+            metadata={
+                'participant': {'participant_name': '참가자', 'participant_email': 'guest@example.com'},
+                'meetup_order_id': meetup_order.id,
+            },
+            meetup_order=meetup_order,
+        )
+        orphan_tx = self._create_idle_transaction('PAID')
+        self.server.reset_counters()
+
+        first = reconcile_once()
+
+        self.assertEqual((first.scanned, first.paid, first.finalized, first.failed), (2, 2, 1, 0))
+        meetup_tx.refresh_from_db()
+        meetup_order.refresh_from_db()
+        self.assertEqual(meetup_tx.status, PaymentTransaction.STATUS_COMPLETED)
+        self.assertEqual(meetup_tx.current_stage, PaymentStage.ORDER_FINALIZE)
+        self.assertEqual(meetup_order.status, 'confirmed')
+        self.assertEqual(meetup_order.payment_hash, meetup_tx.payment_hash)
+        orphan_tx.refresh_from_db()
+        self.assertEqual(orphan_tx.status, PaymentTransaction.STATUS_PROCESSING)
+        self.assertEqual(orphan_tx.current_stage, PaymentStage.MERCHANT_SETTLEMENT)
+        orphan_logs = orphan_tx.stage_logs.count()
+
+        # 캐시가 만료돼도 정산이 기록된 트랜잭션은 다시 조회하거나 단계를 되돌리지 않음
+        invalidate_invoice_status(orphan_tx.payment_hash)
+        self.server.reset_counters()
+        second = reconcile_once(min_idle_seconds=0)
+
+        self.assertEqual((second.scanned, second.paid), (0, 0))
+        self.assertEqual(self.server.request_count, 0)
+        orphan_tx.refresh_from_db()
+        self.assertEqual(orphan_tx.current_stage, PaymentStage.MERCHANT_SETTLEMENT)
+        self.assertEqual(orphan_tx.stage_logs.count(), orphan_logs)
+
+
+class StockReservationConcurrencyTests(TransactionTestCase):
+    WORKERS = 16
+    STOCK = 5
+
+    def setUp(self):
+        owner = User.objects.create_user(username='owner', password='test-pass')
+        self.store = Store.objects.create(
+            store_id='stockstore',
+            store_name='재고 스토어',
+            owner_name='홍길동',
+            chat_channel='https://t.me/example',
+            owner=owner,
+        )
+        self.product = Product.objects.create(
+            store=self.store,
+            title='한정 상품',
+            description='테스트 상품',
+            price=1000,
+            stock_quantity=self.STOCK,
+        )
+
+    def _checkout(self, barrier, outcomes):
+        processor = LightningPaymentProcessor(self.store)
+        barrier.wait()
+        try:
+            for _ in range(50):
+                try:
+                    processor.create_transaction(
+                        user=None,
+                        amount_sats=1000,
+                        currency=PaymentTransaction.CURRENCY_BTC,
+                        cart_items=[CartItemData(product_id=self.product.id, quantity=1, metadata={})],
+                    )
+                    outcomes.append('reserved')
+                    return
+                except InsufficientStockError:
+                    outcomes.append('sold_out')
+                    return
+                except OperationalError:
+                    # SQLite 는 동시 쓰기를 잠금 오류로 돌려주므로 재시도 (PostgreSQL 은 행 잠금 대기)
+                    if connection.vendor != 'sqlite':
+                        raise
+                    time.sleep(0.01)
+            outcomes.append('gave_up')
+        finally:
+            connections.close_all()
+
+    def test_concurrent_checkouts_never_oversell(self):
+        barrier = threading.Barrier(self.WORKERS)
+        outcomes = []
+        threads = [threading.Thread(target=self._checkout, args=(barrier, outcomes)) for _ in range(self.WORKERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(outcomes.count('reserved'), self.STOCK)
+        self.assertEqual(outcomes.count('sold_out'), self.WORKERS - self.STOCK)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.reserved_quantity, self.STOCK)
+        self.assertEqual(self.product.available_quantity, 0)
+        self.assertEqual(
+            OrderItemReservation.objects.filter(product=self.product, status=OrderItemReservation.STATUS_ACTIVE).count(),
+            self.STOCK,
+        )
+
+    def test_sweeper_returns_expired_reservations_to_stock(self):
+        processor = LightningPaymentProcessor(self.store)
+        for _ in range(self.STOCK):
+            processor.create_transaction(
+                user=None,
+                amount_sats=1000,
+                currency=PaymentTransaction.CURRENCY_BTC,
+                cart_items=[CartItemData(product_id=self.product.id, quantity=1, metadata={})],
+            )
+        with self.assertRaises(InsufficientStockError):
+            processor.create_transaction(
+                user=None,
+                amount_sats=1000,
+                currency=PaymentTransaction.CURRENCY_BTC,
+                cart_items=[CartItemData(product_id=self.product.id, quantity=1, metadata={})],
+            )
+
+        # 인스턴스 저장(관리자 수정 등)이 예약 카운터를 덮어쓰지 않음
+        stale = Product.objects.get(pk=self.product.pk)
+        Product.objects.filter(pk=self.product.pk).update(reserved_quantity=self.STOCK)
+        stale.title = '이름 변경'
+        stale.save()
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.reserved_quantity, self.STOCK)
+
+        OrderItemReservation.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(release_expired_reservations(batch_size=2), self.STOCK)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.reserved_quantity, 0)
+
+
+class TransactionDashboardTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='test-pass')
+        self.store = Store.objects.create(
+            store_id='dashstore',
+            store_name='현황 스토어',
+            owner_name='홍길동',
+            chat_channel='https://t.me/example',
+            owner=self.owner,
+        )
+        statuses = [
+            PaymentTransaction.STATUS_COMPLETED,
+            PaymentTransaction.STATUS_PENDING,
+            PaymentTransaction.STATUS_FAILED,
+        ]
+        base = timezone.now() - timedelta(days=1)
+        self.transactions = [
+            PaymentTransaction.objects.create(
+                user=self.owner,
+                store=self.store,
+                amount_sats=100,
+                status=statuses[index % 3],
+            )
+            for index in range(13)
+        ]
+        # 같은 시각이 여러 건 있어도 id 로 순서가 갈려 빠지거나 겹치지 않아야 함
+        for index, tx in enumerate(self.transactions):
+            PaymentTransaction.objects.filter(pk=tx.pk).update(created_at=base + timedelta(minutes=index // 3))
+        self.expected = list(
+            PaymentTransaction.objects.filter(store=self.store).order_by('-created_at', '-id').values_list('pk', flat=True)
+        )
+
+    def _page(self, query=''):
+        return transaction_dashboard(QueryDict(query), PaymentTransaction.objects.filter(store=self.store)).page
+
+    def test_keyset_pages_walk_forward_and_back(self):
+        pages = [self._page()]
+        while pages[-1].has_next():
+            pages.append(self._page(pages[-1].next_page_query))
+
+        self.assertEqual([page.number for page in pages], [1, 2, 3])
+        self.assertEqual([tx.pk for page in pages for tx in page], self.expected)
+        self.assertEqual((pages[-1].start_index(), pages[-1].end_index()), (11, 13))
+        self.assertEqual(pages[0].paginator.num_pages, 3)
+
+        back = self._page(pages[2].previous_page_query)
+        self.assertEqual([tx.pk for tx in back], [tx.pk for tx in pages[1]])
+        self.assertEqual(back.number, 2)
+        first = self._page(back.previous_page_query)
+        self.assertEqual([tx.pk for tx in first], self.expected[:5])
+        self.assertFalse(first.has_previous())
+
+        self.assertEqual([tx.pk for tx in self._page('after=broken')], self.expected[:5])
+
+    def test_payment_transactions_view_uses_single_summary_query(self):
+        with self.assertNumQueries(1):
+            summary = status_summary(PaymentTransaction.objects.filter(store=self.store))
+        self.assertEqual(
+            (summary['total'], summary['completed'], summary['pending'], summary['failed'], summary['processing']),
+            (13, 5, 4, 4, 0),
+        )
+        self.assertEqual(summary['total_amount'], 1300)
+
+        self.assertEqual(self._page('status=pending').paginator.count, 4)
+
+        self.client.force_login(self.owner)
+        with mock.patch('orders.views.render', return_value=HttpResponse()) as render:
+            response = self.client.get(
+                reverse('orders:payment_transactions', args=[self.store.store_id]) + '?' + self._page().next_page_query
+            )
+
+        self.assertEqual(response.status_code, 200)
+        context = render.call_args.args[2]
+        self.assertEqual(context['paginator'].count, 13)
+        self.assertEqual(context['summary']['failed'], 4)
+        self.assertEqual(context['transactions'].number, 2)
+        self.assertEqual([tx.pk for tx in context['transactions']], self.expected[5:10])
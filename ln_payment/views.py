@@ -3,8 +3,8 @@ from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST, require_http_methods
 from django.conf import settings
-from django.contrib.auth.decorators import login_required
 from django.db import transaction as db_transaction
+from django.contrib.auth.decorators import login_required
 from django.utils import timezone
 from django.urls import reverse
 
@@ -27,10 +27,18 @@ from .blink_service import BlinkAPIService, get_blink_service_for_store
 from .models import PaymentTransaction
 from .services import (
     LightningPaymentProcessor,
-    PaymentStage,
-    PaymentStatus,
     build_cart_items,
 )
+from .invoice_status_cache import invalidate_invoice_status
+from .status_channel import publish_payment_status
+from .webhook_inbox import (
+    SETTLEMENT_EVENT_TYPES,
+    extract_payment_hash,
+    process_pending,
+    request_background_processing,
+    resolve_event_id,
+    store_event,
+)
 
 try:
     from svix.webhooks import Webhook, WebhookVerificationError
@@ -335,6 +343,9 @@ def verify_payment(request, transaction_id):
         return JsonResponse({'success': False, 'error': str(exc)}, status=500)
 
     status = status_result.get('status')
+    if status in ('paid', 'expired'):
+        # 같은 인보이스를 보고 있는 다른 탭에도 알림
+        publish_payment_status(transaction.payment_hash, status, source='verify_payment')
     if status == 'expired':
         processor.cancel_transaction(transaction, '인보이스 만료', detail=status_result)
         return JsonResponse({'success': False, 'error': '인보이스가 만료되었습니다.', 'transaction': _transaction_to_dict(transaction)}, status=400)
@@ -403,57 +414,24 @@ def blink_webhook(request):
         return JsonResponse({'success': False, 'error': 'invalid_signature'}, status=400)
 
     event_type = data.get('eventType') or data.get('event_type')
-    if event_type != 'receive.lightning':
+    if event_type not in SETTLEMENT_EVENT_TYPES:
         return JsonResponse({'success': True})
 
-    transaction_payload = data.get('transaction') or {}
-    initiation = transaction_payload.get('initiationVia') or {}
-    payment_hash = initiation.get('paymentHash') or data.get('paymentHash')
-
+    payment_hash = extract_payment_hash(data)
     if not payment_hash:
         return JsonResponse({'success': False, 'error': 'payment hash missing'}, status=400)
 
-    try:
-        transaction = PaymentTransaction.objects.select_related(
-            'store',
-            'order',
-            'meetup_order',
-            'live_lecture_order',
-            'file_order',
-        ).get(payment_hash=payment_hash)
-    except PaymentTransaction.DoesNotExist:
-        logger.info('Blink webhook: 해당 payment_hash 트랜잭션 없음 %s', payment_hash)
-        return JsonResponse({'success': True})
-
-    processor = LightningPaymentProcessor(transaction.store)
-    with db_transaction.atomic():
-        locked_tx = PaymentTransaction.objects.select_for_update().get(pk=transaction.pk)
-        settled = locked_tx.stage_logs.filter(
-            stage=PaymentStage.MERCHANT_SETTLEMENT,
-            status=PaymentStatus.COMPLETED,
-        ).exists()
-        if not settled:
-            processor.mark_settlement(locked_tx, tx_payload=transaction_payload)
-
-    should_finalize_order = (
-        transaction.order_id is None
-        and transaction.meetup_order_id is None
-        and transaction.live_lecture_order_id is None
-        and transaction.file_order_id is None
-    )
-    metadata = transaction.metadata if isinstance(transaction.metadata, dict) else {}
-    has_snapshot = bool(metadata.get('shipping')) and bool(metadata.get('cart_snapshot'))
-
-    if should_finalize_order and has_snapshot:
-        from orders.services import finalize_order_from_payment_transaction  # 지연 임포트로 순환 의존 방지
+    # 입금이 확인됐으므로 다음 상태 조회는 캐시 대신 Blink 로 확인
+    invalidate_invoice_status(payment_hash)
 
-        try:
-            finalize_order_from_payment_transaction(transaction, source='blink_webhook')
-        except Exception:  # pylint: disable=broad-except
-            logger.exception('Blink webhook 주문 자동 저장 실패 payment_hash=%s', payment_hash)
-            return JsonResponse({'success': False, 'error': 'order_finalize_failed'}, status=500)
+    # 정산/주문 저장은 수신함 워커가 처리하고 Blink 에는 바로 응답
+    event, created = store_event(resolve_event_id(request.headers, payload), data)
+    if getattr(settings, 'BLINK_WEBHOOK_PROCESS_INLINE', False):
+        process_pending()
+    elif created:
+        db_transaction.on_commit(request_background_processing)
+    return JsonResponse({'success': True, 'event_id': event.event_id, 'duplicate': not created})
 
-    return JsonResponse({'success': True})
 
 @require_POST
 def create_invoice(request):
@@ -0,0 +1,289 @@
+"""Blink 웹훅 수신함
+
+``blink_webhook`` 은 서명 검증 후 이벤트를 ``WebhookEvent`` 에 저장하고 바로 200 을 반환한다.
+정산 기록·주문 저장(재고 차감, 이메일, 알림 포함)은 이 모듈의 워커가 처리하므로, 느린 SMTP
+서버 때문에 Blink 가 타임아웃 후 재전송하는 일이 없다.
+
+- 저장은 Svix 메시지 ID(``svix-id``/``webhook-id`` 헤더) 기준으로 멱등이다. 재전송된 이벤트는
+  새로 만들지 않는다.
+- 같은 결제 해시의 이벤트는 수신 순서대로 하나씩 처리한다. 앞선 이벤트가 처리 중이거나
+  재시도 대기 중이면 뒤 이벤트는 기다린다.
+- 실패하면 ``RETRY_BACKOFF_SECONDS`` 간격으로 재시도하고, ``MAX_ATTEMPTS`` 회를 넘으면
+  ``failed`` 로 남긴다 (``replay_webhook_events`` 로 다시 처리).
+- 전용 워커는 ``python manage.py run_webhook_inbox_worker`` 로 실행한다. 워커가 없어도 수신
+  직후 같은 프로세스의 백그라운드 스레드가 한 번 처리를 시도한다.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction as db_transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import PaymentTransaction, WebhookEvent
+from .services import settle_paid_transaction
+from .status_channel import publish_payment_status
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+RETRY_BACKOFF_SECONDS = (10, 30, 120, 600)
+# 처리 중 상태로 이 시간 이상 남은 이벤트는 워커가 중단된 것으로 보고 다시 가져감
+STALE_LOCK_SECONDS = 300
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_POLL_INTERVAL_SECONDS = 1.0
+
+SETTLEMENT_EVENT_TYPES = {'receive.lightning'}
+
+_background_lock = threading.Lock()
+_background_thread = None
+
+
+@dataclass
+class InboxResult:
+    processed: int = 0
+    failed: int = 0
+
+    @property
+    def handled(self) -> int:
+        return self.processed + self.failed
+
+
+def _background_processing_enabled() -> bool:
+    return getattr(settings, 'BLINK_WEBHOOK_INBOX_BACKGROUND', True)
+
+
+def extract_payment_hash(data) -> str:
+    transaction_payload = data.get('transaction') or {}
+    initiation = transaction_payload.get('initiationVia') or {}
+    return initiation.get('paymentHash') or data.get('paymentHash') or ''
+
+
+def resolve_event_id(headers, body: bytes) -> str:
+    """Svix 메시지 ID (헤더가 없으면 본문 해시)"""
+    event_id = headers.get('svix-id') or headers.get('webhook-id')
+    if event_id:
+        return event_id
+    return f"sha256:{hashlib.sha256(body).hexdigest()}"
+
+
+def store_event(event_id, data):
+    """검증된 이벤트를 수신함에 저장
+
+    Returns:
+        tuple: ``(WebhookEvent, created)`` - 이미 받은 이벤트면 created=False
+    """
+    defaults = {
+        'event_type': data.get('eventType') or data.get('event_type') or '',
+        'payment_hash': extract_payment_hash(data),
+        'payload': data,
+    }
+    try:
+        with db_transaction.atomic():
+            return WebhookEvent.objects.get_or_create(event_id=event_id, defaults=defaults)
+    except IntegrityError:
+        # 같은 이벤트가 동시에 두 번 들어온 경우
+        return WebhookEvent.objects.get(event_id=event_id), False
+
+
+def _claimable_events(now, limit):
+    """처리 가능한 이벤트 (결제 해시별로 가장 앞선 미완료 이벤트만)"""
+    stale_before = now - timedelta(seconds=STALE_LOCK_SECONDS)
+    WebhookEvent.objects.filter(
+        status=WebhookEvent.STATUS_PROCESSING,
+        locked_at__lt=stale_before,
+    ).update(status=WebhookEvent.STATUS_PENDING)
+
+    unfinished = WebhookEvent.objects.filter(
+        status__in=[WebhookEvent.STATUS_PENDING, WebhookEvent.STATUS_PROCESSING],
+    )
+    candidates = list(
+        unfinished.filter(status=WebhookEvent.STATUS_PENDING)
+        .exclude(next_attempt_at__gt=now)
+        .order_by('id')[:limit]
+    )
+    hashes = {event.payment_hash for event in candidates if event.payment_hash}
+    first_unfinished = {}
+    for payment_hash, event_id in (
+        unfinished.filter(payment_hash__in=hashes).order_by('id').values_list('payment_hash', 'id')
+    ):
+        first_unfinished.setdefault(payment_hash, event_id)
+
+    return [
+        event
+        for event in candidates
+        if not event.payment_hash or first_unfinished.get(event.payment_hash) == event.id
+    ]
+
+
+def _claim(event, now) -> bool:
+    claimed = WebhookEvent.objects.filter(pk=event.pk, status=WebhookEvent.STATUS_PENDING).update(
+        status=WebhookEvent.STATUS_PROCESSING,
+        locked_at=now,
+        attempts=F('attempts') + 1,
+    )
+    if claimed:
+        event.refresh_from_db(fields=['status', 'locked_at', 'attempts'])
+    return bool(claimed)
+
+
+def handle_settlement_event(event):
+    """``receive.lightning`` 이벤트 처리: 정산 기록, 상품 주문 자동 저장, 결제 페이지 알림"""
+    payment_hash = event.payment_hash
+    if not payment_hash:
+        return
+
+    transaction = (
+        PaymentTransaction.objects.select_related(
+            'store',
+            'order',
+            'meetup_order',
+            'live_lecture_order',
+            'file_order',
+        )
+        .filter(payment_hash=payment_hash)
+        .first()
+    )
+    if transaction is None:
+        logger.info('Blink webhook: 해당 payment_hash 트랜잭션 없음 %s', payment_hash)
+        # 워크플로 외 결제(기존 인보이스 흐름)도 결제 페이지에 입금을 알림
+        publish_payment_status(payment_hash, 'paid', source='blink_webhook')
+        return
+
+    try:
+        settle_paid_transaction(
+            transaction,
+            source='blink_webhook',
+            tx_payload=(event.payload or {}).get('transaction') or {},
+        )
+    finally:
+        # 주문 저장이 실패해도 입금은 확인됐으므로 결제 페이지가 검증 API 로 재시도하도록 알림
+        publish_payment_status(payment_hash, 'paid', source='blink_webhook')
+
+
+def process_event(event) -> bool:
+    """수신함 이벤트 하나 처리 (이미 ``processing`` 으로 가져온 상태)
+
+    Returns:
+        bool: 성공 여부
+    """
+    try:
+        if event.event_type in SETTLEMENT_EVENT_TYPES:
+            handle_settlement_event(event)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.exception('웹훅 이벤트 처리 실패 event=%s payment_hash=%s', event.event_id, event.payment_hash)
+        now = timezone.now()
+        if event.attempts >= MAX_ATTEMPTS:
+            status, next_attempt_at = WebhookEvent.STATUS_FAILED, None
+        else:
+            backoff = RETRY_BACKOFF_SECONDS[min(event.attempts, len(RETRY_BACKOFF_SECONDS)) - 1]
+            status, next_attempt_at = WebhookEvent.STATUS_PENDING, now + timedelta(seconds=backoff)
+        WebhookEvent.objects.filter(pk=event.pk).update(
+            status=status,
+            next_attempt_at=next_attempt_at,
+            last_error=str(exc)[:2000],
+            locked_at=None,
+        )
+        return False
+
+    WebhookEvent.objects.filter(pk=event.pk).update(
+        status=WebhookEvent.STATUS_DONE,
+        processed_at=timezone.now(),
+        next_attempt_at=None,
+        last_error='',
+        locked_at=None,
+    )
+    return True
+
+
+def process_pending(limit=DEFAULT_BATCH_SIZE, now=None) -> InboxResult:
+    """처리 가능한 이벤트를 수신 순서대로 최대 ``limit`` 건 처리"""
+    result = InboxResult()
+    now = now or timezone.now()
+    for event in _claimable_events(now, limit):
+        if not _claim(event, now):
+            continue
+        if process_event(event):
+            result.processed += 1
+        else:
+            result.failed += 1
+    return result
+
+
+def _run_background_processing():
+    global _background_thread
+    try:
+        while process_pending().handled:
+            pass
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.error('웹훅 수신함 백그라운드 처리 실패: %s', exc, exc_info=True)
+    finally:
+        close_old_connections()
+        with _background_lock:
+            _background_thread = None
+
+
+def request_background_processing() -> bool:
+    """현재 프로세스의 백그라운드 스레드에 수신함 처리를 맡김 (이미 실행 중이면 건너뜀)"""
+    global _background_thread
+    if not _background_processing_enabled():
+        return False
+    with _background_lock:
+        if _background_thread is not None:
+            return False
+        _background_thread = threading.Thread(
+            target=_run_background_processing,
+            name='webhook-inbox',
+            daemon=True,
+        )
+        _background_thread.start()
+    return True
+
+
+def run_worker(interval=DEFAULT_POLL_INTERVAL_SECONDS, stop_event=None, max_iterations=None, on_result=None, batch_size=DEFAULT_BATCH_SIZE):
+    """수신함 처리 루프 (``run_webhook_inbox_worker`` 관리 명령에서 사용)
+
+    처리할 이벤트가 남아 있으면 쉬지 않고 다음 배치를 가져온다.
+    """
+    stop_event = stop_event or threading.Event()
+    iterations = 0
+
+    while not stop_event.is_set():
+        started_at = time.monotonic()
+        try:
+            result = process_pending(limit=batch_size)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error('웹훅 수신함 워커 오류: %s', exc, exc_info=True)
+            result = InboxResult()
+        finally:
+            close_old_connections()
+
+        if on_result:
+            on_result(result, time.monotonic() - started_at)
+
+        iterations += 1
+        if max_iterations is not None and iterations >= max_iterations:
+            break
+        if result.handled < batch_size:
+            stop_event.wait(interval)
+
+
+def replay_events(queryset) -> int:
+    """지정한 이벤트를 다시 처리 대기 상태로 되돌림 (시도 횟수 초기화)
+
+    Returns:
+        int: 되돌린 이벤트 수
+    """
+    return queryset.exclude(status=WebhookEvent.STATUS_PROCESSING).update(
+        status=WebhookEvent.STATUS_PENDING,
+        attempts=0,
+        next_attempt_at=None,
+        locked_at=None,
+        last_error='',
+    )
@@ -221,6 +221,8 @@ class MeetupImage(models.Model):
     # 이미지 크기 정보
     width = models.PositiveIntegerField(default=500, verbose_name='이미지 너비')
     height = models.PositiveIntegerField(default=500, verbose_name='이미지 높이')  # 1:1 비율
+    # 반응형 변형 [{width, height, file_path, file_url, file_size}, ...] (storage.image_derivatives)
+    variants = models.JSONField(default=list, blank=True, verbose_name='반응형 변형')
     
     # 순서 정보 (이미지 정렬용)
     order = models.PositiveIntegerField(default=0, verbose_name='정렬 순서')
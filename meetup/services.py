@@ -3,12 +3,13 @@
 """
 import logging
 from django.conf import settings
-from django.core.mail.backends.smtp import EmailBackend
 from django.core.mail import EmailMessage
 from django.utils import timezone
 from django.template.loader import render_to_string
 from django.template import Context, Template
 
+from stores.email_outbox import queue_store_email
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,16 +50,6 @@ def send_meetup_notification_email(meetup_order):
             logger.debug(f"밋업 {meetup_order.order_number}: 스토어 주인장 이메일 주소가 설정되지 않음")
             return False
             
-        # 스토어별 SMTP 설정
-        backend = EmailBackend(
-            host='smtp.gmail.com',
-            port=587,
-            username=store.email_host_user,
-            password=store.get_email_host_password(),
-            use_tls=True,
-            fail_silently=False,
-        )
-        
         # 이메일 내용 생성 (템플릿 파일 사용)
         subject = f'[{store.store_name}] 새로운 밋업 참가 신청 - {meetup_order.order_number}'
         
@@ -102,7 +93,6 @@ SatoShop 팀"""
             body=message,
             from_email=f'{store.email_from_display} <{store.email_host_user}>',
             to=[store.owner_email],
-            connection=backend
         )
         
         # PNG QR코드 첨부파일 추가
@@ -124,14 +114,15 @@ SatoShop 팀"""
             logger.warning(f"밋업 QR코드 첨부 실패: {meetup_order.order_number}, 오류: {str(e)}")
             # QR코드 첨부 실패해도 이메일은 계속 발송
         
-        email.send()
+        if queue_store_email(store, email, kind='meetup_owner_notification', dedupe_key=f"meetup_owner:{meetup_order.order_number}") is None:
+            return False
         
         # 🛡️ 이메일 발송 성공 기록 (중복 방지용)
         from django.core.cache import cache
         email_cache_key = f"meetup_owner_email_sent_{meetup_order.order_number}"
         cache.set(email_cache_key, True, timeout=86400)  # 24시간 보관
         
-        logger.info(f"밋업 알림 이메일 발송 성공 - 주문: {meetup_order.order_number}, 수신: {store.owner_email}")
+        logger.info(f"밋업 알림 이메일 발송 대기열 추가 - 주문: {meetup_order.order_number}, 수신: {store.owner_email}")
         return True
         
     except Exception as e:
@@ -177,16 +168,6 @@ def send_meetup_participant_confirmation_email(meetup_order):
             logger.debug(f"밋업 참가자 이메일 {meetup_order.order_number}: Gmail 설정 불완전")
             return False
             
-        # 스토어별 SMTP 설정
-        backend = EmailBackend(
-            host='smtp.gmail.com',
-            port=587,
-            username=store.email_host_user,
-            password=store.get_email_host_password(),
-            use_tls=True,
-            fail_silently=False,
-        )
-        
         # 이메일 내용 생성 (템플릿 파일 사용)
         subject = f'[{store.store_name}] "{meetup_order.meetup.name}" 밋업 참가 확정 - {meetup_order.order_number}'
         
@@ -227,7 +208,6 @@ def send_meetup_participant_confirmation_email(meetup_order):
             body=message,
             from_email=f'{store.email_from_display} <{store.email_host_user}>',
             to=[meetup_order.participant_email],
-            connection=backend
         )
         
         # PNG QR코드 첨부파일 추가
@@ -247,14 +227,15 @@ def send_meetup_participant_confirmation_email(meetup_order):
             logger.warning(f"참가자 QR코드 첨부 실패: {meetup_order.order_number}, 오류: {str(e)}")
             # QR코드 첨부 실패해도 이메일은 계속 발송
         
-        email.send()
+        if queue_store_email(store, email, kind='meetup_participant_confirmation', dedupe_key=f"meetup_participant:{meetup_order.order_number}") is None:
+            return False
         
         # 🛡️ 이메일 발송 성공 기록 (중복 방지용)
         from django.core.cache import cache
         email_cache_key = f"meetup_participant_email_sent_{meetup_order.order_number}"
         cache.set(email_cache_key, True, timeout=86400)  # 24시간 보관
         
-        logger.info(f"밋업 참가자 확인 이메일 발송 성공 - 주문: {meetup_order.order_number}, 수신: {meetup_order.participant_email}")
+        logger.info(f"밋업 참가자 확인 이메일 발송 대기열 추가 - 주문: {meetup_order.order_number}, 수신: {meetup_order.participant_email}")
         return True
         
     except Exception as e:
@@ -384,34 +365,17 @@ def extend_reservation(order, additional_seconds=None):
 
 def cancel_expired_reservations():
     """
-    만료된 임시 예약들을 자동 취소
+    만료된 임시 예약들을 자동 취소 (만료 정리 워커와 같은 배치 UPDATE)
     
     Returns:
         int: 취소된 예약 수
     """
-    from django.utils import timezone
-    from .models import MeetupOrder
+    from myshop.expiry import sweep_expired
     
     try:
-        now = timezone.now()
-        expired_orders = MeetupOrder.objects.filter(
-            status='pending',
-            is_temporary_reserved=True,
-            reservation_expires_at__lt=now
-        )
-        
-        cancelled_count = 0
-        for order in expired_orders:
-            order.status = 'cancelled'
-            order.auto_cancelled_reason = '예약 시간 만료'
-            order.is_temporary_reserved = False
-            order.save()
-            cancelled_count += 1
-            logger.info(f"만료된 예약 자동 취소 - 주문: {order.order_number}")
-        
+        cancelled_count = sweep_expired('meetup_reservations')
         if cancelled_count > 0:
             logger.info(f"총 {cancelled_count}개의 만료된 예약을 자동 취소했습니다.")
-        
         return cancelled_count
         
     except Exception as e:
@@ -13,8 +13,8 @@ from .models import Meetup, MeetupImage, MeetupOption, MeetupChoice, MeetupOrder
 from .forms import MeetupForm
 import json
 import logging
-from django.core.paginator import Paginator
 from django.db import models
+from ln_payment.dashboard import transaction_dashboard
 from ln_payment.models import PaymentTransaction
 from ln_payment.services import PaymentStage
 
@@ -480,52 +480,36 @@ def meetup_orders(request, store_id):
 def meetup_status(request, store_id):
     """밋업 현황 페이지"""
     from stores.decorators import store_owner_required
-    from django.db import models
     
     # 스토어 소유자 권한 확인
     store = get_store_with_admin_check(request, store_id)
     if not store:
         return redirect('myshop:home')
     
-    # 밋업별 참가 통계 계산
+    # 밋업별 참가 통계 (일별 판매 집계 합산, 확정/완료 주문 기준)
+    from stores.models import DailySalesRollup
+    from stores.sales_rollup import STORE_TOTAL, sales_totals
+    meetup_sales = sales_totals(DailySalesRollup.KIND_MEETUP, store=store)
+
     meetups_with_orders = []
     meetups = Meetup.objects.filter(store=store, deleted_at__isnull=True).prefetch_related('images')
     
     for meetup in meetups:
-        # 확정된 주문만 집계 (결제 완료된 참가자)
-        confirmed_orders = MeetupOrder.objects.filter(
-            meetup=meetup,
-            status__in=['confirmed', 'completed']
-        )
-        
-        total_participants = confirmed_orders.count()
-        total_revenue = confirmed_orders.aggregate(
-            total=models.Sum('total_price')
-        )['total'] or 0
+        sales = meetup_sales.get(meetup.id, {})
         
         # 통계 정보 추가
-        meetup.total_participants = total_participants
-        meetup.total_revenue = total_revenue
+        meetup.total_participants = sales.get('order_count', 0)
+        meetup.total_revenue = sales.get('revenue', 0)
         meetups_with_orders.append(meetup)
     
     # 매출 순으로 정렬
     meetups_with_orders.sort(key=lambda x: x.total_revenue, reverse=True)
     
     # 전체 통계
-    total_meetup_orders = MeetupOrder.objects.filter(
-        meetup__store=store, 
-        status__in=['confirmed', 'completed']
-    ).count()
-    total_meetup_revenue = MeetupOrder.objects.filter(
-        meetup__store=store, 
-        status__in=['confirmed', 'completed']
-    ).aggregate(
-        total=models.Sum('total_price')
-    )['total'] or 0
-    total_participants = MeetupOrder.objects.filter(
-        meetup__store=store, 
-        status__in=['confirmed', 'completed']
-    ).count()
+    store_total = meetup_sales.get(STORE_TOTAL, {})
+    total_meetup_orders = store_total.get('order_count', 0)
+    total_meetup_revenue = store_total.get('revenue', 0)
+    total_participants = total_meetup_orders
     
     context = {
         'store': store,
@@ -545,35 +529,15 @@ def meetup_payment_transactions(request, store_id):
     if not store:
         return redirect('myshop:home')
 
-    status_filter = request.GET.get('status')
-    stage_filter = request.GET.get('stage')
-
-    transactions_qs = PaymentTransaction.objects.filter(
-        store=store,
-        meetup_order__isnull=False,
+    dashboard = transaction_dashboard(
+        request.GET,
+        PaymentTransaction.objects.filter(
+            store=store,
+            meetup_order__isnull=False,
+        ),
+        select_related=('user', 'meetup_order', 'meetup_order__meetup'),
     )
-
-    if status_filter in {
-        PaymentTransaction.STATUS_PENDING,
-        PaymentTransaction.STATUS_PROCESSING,
-        PaymentTransaction.STATUS_FAILED,
-        PaymentTransaction.STATUS_COMPLETED,
-    }:
-        transactions_qs = transactions_qs.filter(status=status_filter)
-
-    if stage_filter and stage_filter.isdigit():
-        transactions_qs = transactions_qs.filter(current_stage=int(stage_filter))
-
-    paginator = Paginator(
-        transactions_qs.select_related(
-            'user',
-            'meetup_order',
-            'meetup_order__meetup',
-        ).order_by('-created_at'),
-        5,
-    )
-    page_number = request.GET.get('page')
-    transactions_page = paginator.get_page(page_number)
+    transactions_page = dashboard.page
 
     for tx in transactions_page:
         metadata = tx.metadata if isinstance(tx.metadata, dict) else {}
@@ -603,29 +567,16 @@ def meetup_payment_transactions(request, store_id):
                 or (metadata.get('manual_restore_history') or [])
             )
 
-    base_qs = PaymentTransaction.objects.filter(
-        store=store,
-        meetup_order__isnull=False,
-    )
-    summary = {
-        'total': base_qs.count(),
-        'pending': base_qs.filter(status=PaymentTransaction.STATUS_PENDING).count(),
-        'processing': base_qs.filter(status=PaymentTransaction.STATUS_PROCESSING).count(),
-        'completed': base_qs.filter(status=PaymentTransaction.STATUS_COMPLETED).count(),
-        'failed': base_qs.filter(status=PaymentTransaction.STATUS_FAILED).count(),
-        'total_amount': base_qs.aggregate(total=models.Sum('amount_sats'))['total'] or 0,
-    }
-
     admin_access_query = '?admin_access=true' if request.GET.get('admin_access', '').lower() == 'true' else ''
 
     context = {
         'store': store,
         'transactions': transactions_page,
-        'paginator': paginator,
+        'paginator': transactions_page.paginator,
         'page_obj': transactions_page,
-        'status_filter': status_filter or '',
-        'stage_filter': stage_filter or '',
-        'summary': summary,
+        'status_filter': dashboard.status_filter,
+        'stage_filter': dashboard.stage_filter,
+        'summary': dashboard.summary,
         'admin_access_query': admin_access_query,
     }
 
@@ -698,9 +649,8 @@ def meetup_status_detail(request, store_id, meetup_id):
 @login_required
 def export_meetup_participants_csv(request, store_id, meetup_id):
     """프론트엔드용 밋업 참가자 정보 CSV 내보내기"""
-    import csv
-    from django.http import HttpResponse
     from django.utils import timezone
+    from myshop.streaming_export import QUERYSET_CHUNK_SIZE, csv_streaming_response
     
     # 스토어 소유자 권한 확인
     store = get_store_with_admin_check(request, store_id)
@@ -714,14 +664,6 @@ def export_meetup_participants_csv(request, store_id, meetup_id):
         status__in=['confirmed', 'completed']
     ).select_related('user').prefetch_related('selected_options__option', 'selected_options__choice').order_by('-created_at')
     
-    # CSV 응답 생성
-    response = HttpResponse(content_type='text/csv; charset=utf-8')
-    generated_at = timezone.localtime(timezone.now())
-    response['Content-Disposition'] = f'attachment; filename="{meetup.name}_participants_{generated_at.strftime("%Y%m%d_%H%M")}.csv"'
-    response.write('\ufeff'.encode('utf8'))  # BOM for Excel
-    
-    writer = csv.writer(response)
-    
     # 헤더 작성
     headers = [
         '밋업명', '스토어명', '참가자명', '이메일', '연락처', '주문번호',
@@ -729,52 +671,53 @@ def export_meetup_participants_csv(request, store_id, meetup_id):
         '결제해시', '결제일시', '참가신청일시', '참석여부', '참석체크일시',
         '선택옵션'
     ]
-    writer.writerow(headers)
-    
-    # 데이터 작성
-    for participant in participants:
-        # 선택 옵션 정보 수집
-        selected_options = []
-        for selected_option in participant.selected_options.all():
-            option_text = f"{selected_option.option.name}: {selected_option.choice.name}"
-            if selected_option.additional_price > 0:
-                option_text += f" (+{selected_option.additional_price:,} sats)"
-            selected_options.append(option_text)
-        
-        options_text = " | ".join(selected_options) if selected_options else "없음"
-        
-        # 상태 텍스트 변환
-        status_text = {
-            'confirmed': '참가확정',
-            'completed': '밋업완료',
-            'pending': '결제대기',
-            'cancelled': '참가취소'
-        }.get(participant.status, participant.status)
-        
-        row = [
-            meetup.name,
-            meetup.store.store_name,
-            participant.participant_name,
-            participant.participant_email,
-            participant.participant_phone or '',
-            participant.order_number,
-            status_text,
-            f"{participant.base_price:,}",
-            f"{participant.options_price:,}",
-            f"{participant.total_price:,}",
-            f"{participant.original_price:,}" if participant.original_price else '',
-            f"{participant.discount_rate}%" if participant.discount_rate else '',
-            "예" if participant.is_early_bird else "아니오",
-            participant.payment_hash or '',
-            timezone.localtime(participant.paid_at).strftime('%Y-%m-%d %H:%M:%S') if participant.paid_at else '',
-            timezone.localtime(participant.created_at).strftime('%Y-%m-%d %H:%M:%S'),
-            "참석" if participant.attended else "미참석",
-            timezone.localtime(participant.attended_at).strftime('%Y-%m-%d %H:%M:%S') if participant.attended_at else '',
-            options_text
-        ]
-        writer.writerow(row)
     
-    return response
+    def rows():
+        # 참가자가 많아도 메모리가 일정하도록 나눠서 조회
+        for participant in participants.iterator(chunk_size=QUERYSET_CHUNK_SIZE):
+            # 선택 옵션 정보 수집
+            selected_options = []
+            for selected_option in participant.selected_options.all():
+                option_text = f"{selected_option.option.name}: {selected_option.choice.name}"
+                if selected_option.additional_price > 0:
+                    option_text += f" (+{selected_option.additional_price:,} sats)"
+                selected_options.append(option_text)
+            
+            options_text = " | ".join(selected_options) if selected_options else "없음"
+            
+            # 상태 텍스트 변환
+            status_text = {
+                'confirmed': '참가확정',
+                'completed': '밋업완료',
+                'pending': '결제대기',
+                'cancelled': '참가취소'
+            }.get(participant.status, participant.status)
+            
+            yield [
+                meetup.name,
+                meetup.store.store_name,
+                participant.participant_name,
+                participant.participant_email,
+                participant.participant_phone or '',
+                participant.order_number,
+                status_text,
+                f"{participant.base_price:,}",
+                f"{participant.options_price:,}",
+                f"{participant.total_price:,}",
+                f"{participant.original_price:,}" if participant.original_price else '',
+                f"{participant.discount_rate}%" if participant.discount_rate else '',
+                "예" if participant.is_early_bird else "아니오",
+                participant.payment_hash or '',
+                timezone.localtime(participant.paid_at).strftime('%Y-%m-%d %H:%M:%S') if participant.paid_at else '',
+                timezone.localtime(participant.created_at).strftime('%Y-%m-%d %H:%M:%S'),
+                "참석" if participant.attended else "미참석",
+                timezone.localtime(participant.attended_at).strftime('%Y-%m-%d %H:%M:%S') if participant.attended_at else '',
+                options_text
+            ]
+    
+    generated_at = timezone.localtime(timezone.now())
+    filename = f'{meetup.name}_participants_{generated_at.strftime("%Y%m%d_%H%M")}.csv'
+    return csv_streaming_response(filename, headers, rows())
 
 @login_required
 @require_POST
@@ -5,6 +5,7 @@ from django.http import JsonResponse
 from django.urls import reverse
 from django.views.decorators.http import require_POST, require_http_methods
 from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 from stores.models import Store
 from .models import Meetup, MeetupOrder, MeetupOption, MeetupChoice, MeetupOrderOption
@@ -508,31 +509,14 @@ def meetup_start_payment_workflow(request, store_id, meetup_id):
                 deleted_at__isnull=True,
             )
             if locked_meetup.max_participants:
-                active_reservations = []
-                pending_reservations = (
-                    MeetupOrder.objects.select_for_update()
-                    .filter(
-                        meetup=locked_meetup,
-                        status='pending',
-                        is_temporary_reserved=True,
-                    )
-                )
-                for reservation in pending_reservations:
-                    expires_at = reservation.reservation_expires_at
-                    if expires_at and expires_at <= now:
-                        reservation.status = 'cancelled'
-                        reservation.is_temporary_reserved = False
-                        reservation.auto_cancelled_reason = '예약 만료'
-                        reservation.save(update_fields=[
-                            'status',
-                            'is_temporary_reserved',
-                            'auto_cancelled_reason',
-                            'updated_at',
-                        ])
-                        continue
-                    active_reservations.append(reservation)
-
-                total_reserved = locked_meetup.current_participants + len(active_reservations)
+                # 만료된 임시 예약은 세지 않음 (취소 처리는 만료 정리 워커 run_expiry_scheduler 가 담당)
+                active_reservation_count = MeetupOrder.objects.filter(
+                    meetup=locked_meetup,
+                    status='pending',
+                    is_temporary_reserved=True,
+                ).filter(Q(reservation_expires_at__isnull=True) | Q(reservation_expires_at__gt=now)).count()
+
+                total_reserved = locked_meetup.current_participants + active_reservation_count
                 if total_reserved >= locked_meetup.max_participants:
                     return JsonResponse({
                         'success': False,
@@ -689,26 +673,28 @@ def meetup_verify_payment(request, store_id, meetup_id, transaction_id):
     if not meetup_order:
         return JsonResponse({'success': False, 'error': '주문 정보를 찾을 수 없습니다.'}, status=500)
 
-    participant_data['payment_hash'] = transaction.payment_hash
-    participant_data['payment_request'] = transaction.payment_request
-    finalize_meetup_order_from_transaction(
-        meetup_order,
-        participant_data,
-        payment_hash=transaction.payment_hash,
-        payment_request=transaction.payment_request,
-    )
+    # 정산 보정기가 이미 확정한 결제면 다시 확정하거나 메일을 보내지 않음
+    if transaction.status != PaymentTransaction.STATUS_COMPLETED:
+        participant_data['payment_hash'] = transaction.payment_hash
+        participant_data['payment_request'] = transaction.payment_request
+        finalize_meetup_order_from_transaction(
+            meetup_order,
+            participant_data,
+            payment_hash=transaction.payment_hash,
+            payment_request=transaction.payment_request,
+        )
 
-    settlement_payload = {'status': status_result.get('raw_status'), 'provider': 'blink'}
-    processor.mark_settlement(transaction, tx_payload=settlement_payload)
-    processor.finalize_meetup_order(transaction, meetup_order)
+        settlement_payload = {'status': status_result.get('raw_status'), 'provider': 'blink'}
+        processor.mark_settlement(transaction, tx_payload=settlement_payload)
+        processor.finalize_meetup_order(transaction, meetup_order)
 
-    try:
-        from .services import send_meetup_notification_email, send_meetup_participant_confirmation_email
+        try:
+            from .services import send_meetup_notification_email, send_meetup_participant_confirmation_email
 
-        send_meetup_notification_email(meetup_order)
-        send_meetup_participant_confirmation_email(meetup_order)
-    except Exception as exc:  # pylint: disable=broad-except
-        logger.error('밋업 결제 이메일 발송 실패 - order_id=%s, error=%s', meetup_order.id, exc)
+            send_meetup_notification_email(meetup_order)
+            send_meetup_participant_confirmation_email(meetup_order)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error('밋업 결제 이메일 발송 실패 - order_id=%s, error=%s', meetup_order.id, exc)
 
     if f'meetup_participant_data_{meetup_id}' in request.session:
         del request.session[f'meetup_participant_data_{meetup_id}']
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.2 on 2026-10-18 12:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0009_update_order_number_format_final'),
+        ('stores', '0033_storefeatureditem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='menu',
+            name='public_discounted_price_sats',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='사토시 환산 할인가'),
+        ),
+        migrations.AddField(
+            model_name='menu',
+            name='public_price_sats',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='사토시 환산 가격'),
+        ),
+        migrations.AddIndex(
+            model_name='menu',
+            index=models.Index(fields=['store', 'is_active', 'public_price_sats'], name='menu_menu_store_i_11357a_idx'),
+        ),
+    ]
@@ -49,6 +49,9 @@ class Menu(models.Model):
     is_discounted = models.BooleanField(default=False, verbose_name='할인 적용')
     discounted_price = models.PositiveIntegerField(null=True, blank=True, validators=[MinValueValidator(0)], verbose_name='할인가')
     discounted_price_krw = models.PositiveIntegerField(null=True, blank=True, verbose_name='원화 할인가')
+    # 사토시 환산 가격 (원화 연동 시 환율 갱신마다 일괄 재계산 - myshop.sats_prices)
+    public_price_sats = models.PositiveIntegerField(null=True, blank=True, editable=False, verbose_name='사토시 환산 가격')
+    public_discounted_price_sats = models.PositiveIntegerField(null=True, blank=True, editable=False, verbose_name='사토시 환산 할인가')
     
     # 상태 정보
     is_active = models.BooleanField(default=True, verbose_name='활성화')
@@ -73,6 +76,7 @@ class Menu(models.Model):
             models.Index(fields=['is_discounted']),           # 할인 상품 조회용
             models.Index(fields=['is_temporarily_out_of_stock']), # 품절 상품 조회용
             models.Index(fields=['store', 'is_active', 'created_at']),  # 스토어 메뉴 목록용
+            models.Index(fields=['store', 'is_active', 'public_price_sats']),  # 사토시 가격순 정렬용
         ]
 
     def __str__(self):
@@ -82,14 +86,13 @@ class Menu(models.Model):
     def public_price(self):
         """사용자용 가격 (항상 사토시) - 원화 연동 시 최신 환율 반영"""
         if self.price_display == 'krw' and self.price_krw is not None:
-            # 원화 연동 메뉴: 최신 환율로 사토시 가격 계산
-            from myshop.models import ExchangeRate
-            latest_rate = ExchangeRate.get_latest_rate()
-            if latest_rate and latest_rate.btc_krw_rate > 0:
-                # 원화를 사토시로 변환
-                btc_amount = self.price_krw / float(latest_rate.btc_krw_rate)
-                sats_amount = btc_amount * 100_000_000
-                return round(sats_amount)
+            # 원화 연동 메뉴: 구체화된 사토시 컬럼 우선, 없으면 환율 스냅샷으로 계산
+            if self.public_price_sats is not None:
+                return self.public_price_sats
+            from myshop.rate_snapshot import krw_to_sats
+            sats_amount = krw_to_sats(self.price_krw)
+            if sats_amount is not None:
+                return sats_amount
         return self.price
 
     @property
@@ -99,14 +102,13 @@ class Menu(models.Model):
             return None
         
         if self.price_display == 'krw' and self.discounted_price_krw is not None:
-            # 원화 연동 메뉴: 최신 환율로 사토시 할인가 계산
-            from myshop.models import ExchangeRate
-            latest_rate = ExchangeRate.get_latest_rate()
-            if latest_rate and latest_rate.btc_krw_rate > 0:
-                # 원화를 사토시로 변환
-                btc_amount = self.discounted_price_krw / float(latest_rate.btc_krw_rate)
-                sats_amount = btc_amount * 100_000_000
-                return round(sats_amount)
+            # 원화 연동 메뉴: 구체화된 사토시 컬럼 우선, 없으면 환율 스냅샷으로 계산
+            if self.public_discounted_price_sats is not None:
+                return self.public_discounted_price_sats
+            from myshop.rate_snapshot import krw_to_sats
+            sats_amount = krw_to_sats(self.discounted_price_krw)
+            if sats_amount is not None:
+                return sats_amount
         return self.discounted_price
 
     @property
@@ -158,6 +160,8 @@ class MenuImage(models.Model):
     # 이미지 크기 정보
     width = models.PositiveIntegerField(default=500, verbose_name='이미지 너비')
     height = models.PositiveIntegerField(default=500, verbose_name='이미지 높이')  # 1:1 비율
+    # 반응형 변형 [{width, height, file_path, file_url, file_size}, ...] (storage.image_derivatives)
+    variants = models.JSONField(default=list, blank=True, verbose_name='반응형 변형')
     
     # 순서 정보 (이미지 정렬용)
     order = models.PositiveIntegerField(default=0, verbose_name='정렬 순서')
@@ -387,8 +387,8 @@ def cancel_menu_invoice(request, store_id):
             # BlinkAPIService 초기화
             blink_service = get_blink_service_for_store(store)
             
-            # 결제 상태 재확인
-            result = blink_service.check_invoice_status(payment_hash)
+            # 결제 상태 재확인 (취소 판단이므로 캐시를 거치지 않음)
+            result = blink_service.check_invoice_status(payment_hash, use_cache=False)
             
             if result['success'] and result['status'] == 'paid':
                 # 실제로는 결제가 완료되었음!
@@ -1,60 +1,32 @@
-import io
 import json
 import os
+from dataclasses import replace
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple
 
 from django.conf import settings
-from django.core.files.base import ContentFile
 from django.template.loader import render_to_string
 
+from storage.image_derivatives import ImageProfile, get_profile, process_profile_image
+from storage.image_transcode import queue_transcode, store_original, transcode_async_enabled
 from storage.utils import upload_file_to_s3
 
-try:
-    from PIL import Image, ImageOps
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
 
-
-def _open_image(image_file):
-    if not PIL_AVAILABLE:
-        return None, "Pillow 패키지가 설치되지 않았습니다."
-
-    image = Image.open(image_file)
-    image = ImageOps.exif_transpose(image)
-    if image.mode == "RGBA":
-        background = Image.new("RGB", image.size, (255, 255, 255))
-        background.paste(image, mask=image.split()[-1])
-        image = background
-    elif image.mode != "RGB":
-        image = image.convert("RGB")
-    return image, None
-
-
-def _resize_to_width(image, target_width: int):
-    if image.width <= target_width:
-        return image
-    target_height = int(image.height * (target_width / image.width))
-    return image.resize((target_width, target_height), Image.Resampling.LANCZOS)
-
-
-def _resize_to_max(image, max_size: Tuple[int, int]):
-    max_width, max_height = max_size
-    scale = min(max_width / image.width, max_height / image.height, 1.0)
-    new_width = int(image.width * scale)
-    new_height = int(image.height * scale)
-    return image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-
-def _resize_to_square(image, size: int):
-    side = min(image.width, image.height)
-    left = int((image.width - side) / 2)
-    top = int((image.height - side) / 2)
-    right = left + side
-    bottom = top + side
-    image = image.crop((left, top, right, bottom))
-    return image.resize((size, size), Image.Resampling.LANCZOS)
+def _minihome_profile(
+    *,
+    target_width: Optional[int] = None,
+    max_size: Optional[Tuple[int, int]] = None,
+    square_size: Optional[int] = None,
+) -> ImageProfile:
+    profile = get_profile("minihome")
+    if square_size:
+        return replace(profile, crop=(1, 1), widths=(square_size,), upscale=True)
+    widths = (target_width,) if target_width else ()
+    max_height = None
+    if max_size:
+        widths = (min(target_width or max_size[0], max_size[0]),)
+        max_height = max_size[1]
+    return replace(profile, widths=widths, max_height=max_height)
 
 
 def process_minihome_image(
@@ -64,32 +36,18 @@ def process_minihome_image(
     max_size: Optional[Tuple[int, int]] = None,
     square_size: Optional[int] = None,
 ) -> Dict[str, Any]:
-    image, error = _open_image(image_file)
-    if error:
-        return {"success": False, "error": error}
-
-    if square_size:
-        image = _resize_to_square(image, square_size)
-    else:
-        if target_width:
-            image = _resize_to_width(image, target_width)
-        if max_size:
-            image = _resize_to_max(image, max_size)
-
-    output = io.BytesIO()
-    image.save(output, format="WEBP", quality=85, method=6)
-    output.seek(0)
-
-    base_name = os.path.splitext(image_file.name)[0] or "minihome"
-    filename = f"{base_name}.webp"
-    processed_file = ContentFile(output.getvalue(), name=filename)
+    profile = _minihome_profile(target_width=target_width, max_size=max_size, square_size=square_size)
+    process_result = process_profile_image(image_file, profile)
+    if not process_result["success"]:
+        return process_result
 
+    width, height = process_result["processed_size"]
     return {
         "success": True,
-        "processed_file": processed_file,
-        "width": image.width,
-        "height": image.height,
-        "filename": filename,
+        "processed_file": process_result["processed_file"],
+        "width": width,
+        "height": height,
+        "filename": process_result["filename"],
     }
 
 
@@ -100,7 +58,33 @@ def upload_minihome_image(
     target_width: Optional[int] = None,
     max_size: Optional[Tuple[int, int]] = None,
     square_size: Optional[int] = None,
+    minihome=None,
 ) -> Dict[str, Any]:
+    """미니홈 이미지 업로드
+
+    ``minihome`` 을 넘기고 ``IMAGE_TRANSCODE_ASYNC`` 가 켜져 있으면 원본만 저장해 바로 돌려준다.
+    파생본은 워커가 만들고, 섹션 JSON 에서 원본 경로를 가리키는 이미지 정보를 바꾼다.
+    """
+    if minihome is not None and transcode_async_enabled():
+        upload_result = store_original(image_file, prefix)
+        if not upload_result["success"]:
+            return upload_result
+        profile = _minihome_profile(target_width=target_width, max_size=max_size, square_size=square_size)
+        queue_transcode(
+            minihome,
+            profile,
+            upload_result["file_path"],
+            prefix=prefix,
+            source_name=image_file.name,
+        )
+        return {
+            "success": True,
+            "file_path": upload_result["file_path"],
+            "file_url": upload_result["file_url"],
+            "width": upload_result["width"],
+            "height": upload_result["height"],
+        }
+
     process_result = process_minihome_image(
         image_file,
         target_width=target_width,
@@ -7,6 +7,8 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils import timezone
 
+from storage.image_transcode import resolve_transcoded_references
+
 from .models import Minihome, normalize_domain
 from .services import upload_minihome_image
 
@@ -253,6 +255,7 @@ def _apply_uploaded_files(minihome, sections, files):
             result = upload_minihome_image(
                 file,
                 prefix=f"{prefix_base}/brand",
+                minihome=minihome,
                 target_width=BRAND_IMAGE_WIDTH,
             )
             if result.get("success"):
@@ -270,6 +273,7 @@ def _apply_uploaded_files(minihome, sections, files):
             result = upload_minihome_image(
                 file,
                 prefix=f"{prefix_base}/infographic",
+                minihome=minihome,
                 target_width=INFOGRAPHIC_IMAGE_WIDTH,
             )
             if result.get("success"):
@@ -290,6 +294,7 @@ def _apply_uploaded_files(minihome, sections, files):
                 result = upload_minihome_image(
                     file,
                     prefix=f"{prefix_base}/gallery",
+                    minihome=minihome,
                     target_width=GALLERY_IMAGE_WIDTH,
                 )
                 if result.get("success"):
@@ -317,6 +322,7 @@ def _apply_uploaded_files(minihome, sections, files):
                 result = upload_minihome_image(
                     file,
                     prefix=f"{prefix_base}/blog",
+                    minihome=minihome,
                     target_width=BLOG_IMAGE_WIDTH,
                 )
                 if result.get("success"):
@@ -334,6 +340,7 @@ def _apply_uploaded_files(minihome, sections, files):
             result = upload_minihome_image(
                 file,
                 prefix=f"{prefix_base}/cta",
+                minihome=minihome,
                 max_size=CTA_PROFILE_MAX_SIZE,
             )
             if result.get("success"):
@@ -351,6 +358,7 @@ def _apply_uploaded_files(minihome, sections, files):
             result = upload_minihome_image(
                 file,
                 prefix=f"{prefix_base}/cta",
+                minihome=minihome,
                 target_width=CTA_DONATION_QR_WIDTH,
             )
             if result.get("success"):
@@ -371,6 +379,7 @@ def _apply_uploaded_files(minihome, sections, files):
                 result = upload_minihome_image(
                     file,
                     prefix=f"{prefix_base}/store",
+                    minihome=minihome,
                     target_width=STORE_IMAGE_WIDTH,
                 )
                 if result.get("success"):
@@ -391,6 +400,7 @@ def _apply_uploaded_files(minihome, sections, files):
                 result = upload_minihome_image(
                     file,
                     prefix=f"{prefix_base}/contributor",
+                    minihome=minihome,
                     square_size=CONTRIBUTOR_THUMB_SIZE,
                 )
                 if result.get("success"):
@@ -441,7 +451,7 @@ def _find_item(items, item_id):
 
 
 def _save_sections(minihome, sections):
-    normalized = _normalize_sections(sections)
+    normalized = resolve_transcoded_references(_normalize_sections(sections))
     minihome.draft_sections = normalized
     minihome.published_sections = normalized
     minihome.save(update_fields=["draft_sections", "published_sections", "updated_at"])
@@ -473,6 +483,7 @@ def minihome_add_gallery_item(request, slug):
         upload_result = upload_minihome_image(
             image_file,
             prefix=f"minihome/{minihome.slug}/gallery",
+            minihome=minihome,
             target_width=GALLERY_IMAGE_WIDTH,
         )
         if upload_result.get("success"):
@@ -529,6 +540,7 @@ def minihome_add_blog_post(request, slug):
             upload_result = upload_minihome_image(
                 image_file,
                 prefix=f"minihome/{minihome.slug}/blog",
+                minihome=minihome,
                 target_width=BLOG_IMAGE_WIDTH,
             )
             if upload_result.get("success"):
@@ -585,6 +597,7 @@ def minihome_add_store_item(request, slug):
         upload_result = upload_minihome_image(
             image_file,
             prefix=f"minihome/{minihome.slug}/store",
+            minihome=minihome,
             target_width=STORE_IMAGE_WIDTH,
         )
         if upload_result.get("success"):
@@ -646,6 +659,7 @@ def minihome_update_gallery_item(request, slug):
         upload_result = upload_minihome_image(
             image_file,
             prefix=f"minihome/{minihome.slug}/gallery",
+            minihome=minihome,
             target_width=GALLERY_IMAGE_WIDTH,
         )
         if upload_result.get("success"):
@@ -733,6 +747,7 @@ def minihome_update_blog_post(request, slug):
         upload_result = upload_minihome_image(
             image_file,
             prefix=f"minihome/{minihome.slug}/blog",
+            minihome=minihome,
             target_width=BLOG_IMAGE_WIDTH,
         )
         if upload_result.get("success"):
@@ -812,6 +827,7 @@ def minihome_update_store_item(request, slug):
         upload_result = upload_minihome_image(
             image_file,
             prefix=f"minihome/{minihome.slug}/store",
+            minihome=minihome,
             target_width=STORE_IMAGE_WIDTH,
         )
         if upload_result.get("success"):
@@ -929,6 +945,8 @@ def minihome_manage(request, slug):
             sections = []
         sections = _normalize_sections(sections)
         sections = _apply_uploaded_files(minihome, sections, request.FILES)
+        # 편집 화면을 연 뒤 변환이 끝난 이미지는 원본이 지워졌으므로 파생본으로 바꿈
+        sections = resolve_transcoded_references(sections)
 
         minihome.draft_sections = sections
         minihome.draft_background_preset = background_preset
@@ -14,6 +14,10 @@ class MyshopConfig(AppConfig):
         # 어드민 사이트 설정을 동적으로 로드하되, 실제 데이터베이스 접근은 지연시킴
         self._setup_admin_site_lazy()
 
+        # 원화 연동 가격의 사토시 컬럼 자동 계산
+        from .sats_prices import connect_signals
+        connect_signals()
+
     def _override_runserver_default_port(self):
         """runserver 기본 포트를 8011로 강제."""
         try:
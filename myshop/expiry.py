@@ -0,0 +1,198 @@
+"""만료 시각이 있는 레코드 일괄 정리
+
+결제 대기 인보이스, 밋업/라이브 강의/파일 임시 예약, 상품 재고 예약, 임시 업로드는 모두 만료 시각
+컬럼이 있다. 예전에는 종류마다 관리 명령이 따로 있었고 결제 요청 처리 중에도 정리했다. 이제 한 워커
+(``python manage.py run_expiry_scheduler``)가 등록된 규칙을 차례로 실행한다.
+
+- 규칙(``ExpiryRule``)은 모델, 만료 시각 필드, 대상 조건, 만료 시 바꿀 값을 가진다. 규칙은
+  ``register_expiry()`` 로 추가한다.
+- 정리는 만료된 행 ID 를 ``batch_size`` 만큼 고른 뒤 같은 조건으로 ``UPDATE`` 한 번에 바꾼다.
+  행마다 ``save()`` 하지 않고, 배치마다 커밋되므로 잠금이 짧다.
+  바꿀 값은 대상 조건에서 벗어나야 한다(예: ``status='pending'`` → ``'cancelled'``). 그래야 다음
+  배치에서 같은 행을 다시 고르지 않는다.
+- 카운터 조정이나 파일 삭제가 필요한 종류는 ``sweep`` 함수를 직접 등록한다.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Callable, Optional
+
+from django.apps import apps
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+
+@dataclass(frozen=True)
+class ExpiryRule:
+    name: str
+    model: str  # 'app_label.ModelName'
+    deadline_field: str
+    description: str = ''
+    filters: dict = field(default_factory=dict)
+    updates: dict = field(default_factory=dict)
+    # 만료 시각으로 채울 필드 (``update()`` 는 auto_now 를 적용하지 않음)
+    timestamp_fields: tuple = ()
+    # 만료 시각이 지나고도 이만큼 기다린 뒤 정리
+    grace: timedelta = timedelta(0)
+    # (rule, now, batch_size, grace=) -> 처리 건수. 없으면 ``updates`` 로 일괄 UPDATE
+    sweep: Optional[Callable] = None
+
+
+@dataclass
+class SweepResult:
+    name: str
+    expired: int = 0
+    elapsed_ms: float = 0.0
+    error: str = ''
+
+
+EXPIRY_RULES = {}
+
+
+def register_expiry(rule):
+    """만료 규칙 등록 (같은 이름이면 교체)"""
+    EXPIRY_RULES[rule.name] = rule
+    return rule
+
+
+def expired_queryset(rule, now=None, *, grace=None):
+    """규칙에 해당하는 만료 행"""
+    now = now or timezone.now()
+    cutoff = now - (rule.grace if grace is None else grace)
+    model = apps.get_model(rule.model)
+    return model._default_manager.filter(**rule.filters, **{f'{rule.deadline_field}__lt': cutoff})
+
+
+def _batches(queryset, rule, batch_size):
+    """만료 시각 순으로 ``batch_size`` 개씩 PK 를 고름 (처리된 행은 조건에서 빠져 다음 배치에 안 나옴)"""
+    while True:
+        ids = list(queryset.order_by(rule.deadline_field, 'pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return
+        yield ids
+        if len(ids) < batch_size:
+            return
+
+
+def update_expired(rule, now, batch_size, *, grace=None) -> int:
+    """만료 행을 배치 단위 UPDATE 로 정리"""
+    expired = expired_queryset(rule, now, grace=grace)
+    values = {**rule.updates, **{name: now for name in rule.timestamp_fields}}
+    total = 0
+    for ids in _batches(expired, rule, batch_size):
+        total += expired.filter(pk__in=ids).update(**values)
+    return total
+
+
+def sweep_expired(name, *, now=None, batch_size=DEFAULT_BATCH_SIZE, grace=None) -> int:
+    """규칙 하나 실행 (``grace`` 지정 시 규칙 기본값 대신 사용)"""
+    rule = EXPIRY_RULES[name]
+    now = now or timezone.now()
+    if rule.sweep is not None:
+        return rule.sweep(rule, now, batch_size, grace=grace)
+    return update_expired(rule, now, batch_size, grace=grace)
+
+
+def run_expiry_sweeps(names=None, *, now=None, batch_size=DEFAULT_BATCH_SIZE):
+    """등록된 규칙(또는 ``names``)을 차례로 실행하고 종류별 건수/소요 시간을 반환
+
+    한 종류가 실패해도 나머지는 계속 실행한다.
+    """
+    now = now or timezone.now()
+    results = []
+    for name in names or list(EXPIRY_RULES):
+        result = SweepResult(name=name)
+        started_at = time.perf_counter()
+        try:
+            result.expired = sweep_expired(name, now=now, batch_size=batch_size)
+        except Exception as exc:
+            logger.exception("만료 정리 실패 (%s)", name)
+            result.error = str(exc)
+        result.elapsed_ms = (time.perf_counter() - started_at) * 1000
+        if result.expired:
+            logger.info("만료 정리 %s: %s건 (%.1fms)", name, result.expired, result.elapsed_ms)
+        results.append(result)
+    return results
+
+
+def _release_stock_reservations(rule, now, batch_size, *, grace=None):
+    # 상태 변경과 함께 상품 예약 카운터를 줄여야 하므로 재고 예약 모듈에 맡김
+    from ln_payment.stock_reservations import release_expired_reservations
+
+    return release_expired_reservations(now - (rule.grace if grace is None else grace), batch_size=batch_size)
+
+
+def _delete_temporary_uploads(rule, now, batch_size, *, grace=None):
+    # S3 객체를 먼저 지우고, 성공한 행만 DB 에서 배치로 삭제 (실패한 행은 다음 회차에 다시 시도)
+    from storage.utils import delete_file_from_s3
+
+    expired = expired_queryset(rule, now, grace=grace)
+    deleted = 0
+    failed_ids = []
+    while True:
+        rows = list(
+            expired.exclude(pk__in=failed_ids)
+            .order_by(rule.deadline_field, 'pk')
+            .values_list('pk', 'file_path')[:batch_size]
+        )
+        if not rows:
+            break
+        removed_ids = []
+        for pk, file_path in rows:
+            if delete_file_from_s3(file_path)['success']:
+                removed_ids.append(pk)
+            else:
+                failed_ids.append(pk)
+        if removed_ids:
+            _, per_model = expired.filter(pk__in=removed_ids).delete()
+            deleted += per_model.get(rule.model, 0)
+        if len(rows) < batch_size:
+            break
+    return deleted
+
+
+def _reservation_rule(name, model, description, reason):
+    return ExpiryRule(
+        name=name,
+        model=model,
+        deadline_field='reservation_expires_at',
+        description=description,
+        filters={'status': 'pending', 'is_temporary_reserved': True},
+        updates={'status': 'cancelled', 'is_temporary_reserved': False, 'auto_cancelled_reason': reason},
+        timestamp_fields=('updated_at',),
+    )
+
+
+register_expiry(ExpiryRule(
+    name='invoices',
+    model='orders.Invoice',
+    deadline_field='expires_at',
+    description='결제 대기 인보이스',
+    filters={'status': 'pending'},
+    updates={'status': 'expired'},
+    timestamp_fields=('updated_at',),
+))
+register_expiry(_reservation_rule('meetup_reservations', 'meetup.MeetupOrder', '밋업 임시 예약', '예약 시간 만료'))
+register_expiry(_reservation_rule('live_lecture_reservations', 'lecture.LiveLectureOrder', '라이브 강의 임시 예약', '예약 만료'))
+register_expiry(_reservation_rule('file_reservations', 'file.FileOrder', '디지털 파일 임시 예약', '예약 만료'))
+register_expiry(ExpiryRule(
+    name='stock_reservations',
+    model='ln_payment.OrderItemReservation',
+    deadline_field='expires_at',
+    description='상품 재고 예약',
+    filters={'status': 'active'},
+    sweep=_release_stock_reservations,
+))
+register_expiry(ExpiryRule(
+    name='temporary_uploads',
+    model='storage.TemporaryUpload',
+    deadline_field='expires_at',
+    description='임시 업로드 파일',
+    grace=timedelta(days=1),
+    sweep=_delete_temporary_uploads,
+))
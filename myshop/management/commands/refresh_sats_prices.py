@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from myshop.rate_snapshot import get_rate_snapshot, invalidate_rate_snapshot
+from myshop.sats_prices import DEFAULT_REFRESH_CHUNK_SIZE, refresh_materialized_sats_prices
+
+
+class Command(BaseCommand):
+    help = '최신 환율로 상품/옵션/메뉴/파일/라이브 강의의 사토시 환산 가격 컬럼을 다시 계산합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='원화 연동 행뿐 아니라 사토시 고정 행까지 모두 채웁니다 (최초 백필용)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_REFRESH_CHUNK_SIZE,
+            help=f'bulk_update 청크 크기 (기본 {DEFAULT_REFRESH_CHUNK_SIZE})',
+        )
+
+    def handle(self, *args, **options):
+        # 명령 실행 시점의 DB 최신 환율을 사용
+        invalidate_rate_snapshot()
+        snapshot = get_rate_snapshot()
+        if not snapshot.is_usable:
+            self.stdout.write(self.style.WARNING('⚠️  저장된 환율이 없어 원화 연동 행은 비워 둡니다.'))
+
+        results = refresh_materialized_sats_prices(
+            snapshot=snapshot,
+            chunk_size=options['chunk_size'],
+            krw_only=not options['all'],
+        )
+
+        for model_label, count in results.items():
+            self.stdout.write(f'  {model_label}: {count}건 갱신')
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ 사토시 가격 컬럼 갱신 완료 (환율 버전 {snapshot.version})')
+        )
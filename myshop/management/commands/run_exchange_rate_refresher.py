@@ -0,0 +1,55 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from myshop.rate_refresher import DEFAULT_REFRESH_INTERVAL_SECONDS, run_refresher
+
+
+class Command(BaseCommand):
+    help = '웹 요청과 분리된 전용 프로세스에서 업비트 BTC/KRW 환율을 주기적으로 갱신합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=DEFAULT_REFRESH_INTERVAL_SECONDS,
+            help=f'갱신 주기(초, 기본 {DEFAULT_REFRESH_INTERVAL_SECONDS})',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='한 번만 갱신하고 종료합니다',
+        )
+
+    def handle(self, *args, **options):
+        stop_event = threading.Event()
+
+        def _stop(signum, frame):
+            self.stdout.write(self.style.WARNING('🛑 종료 신호 수신 - 현재 갱신을 마치고 종료합니다.'))
+            stop_event.set()
+
+        signal.signal(signal.SIGTERM, _stop)
+        signal.signal(signal.SIGINT, _stop)
+
+        def _report(exchange_rate, elapsed):
+            now = timezone.localtime().strftime('%Y-%m-%d %H:%M:%S')
+            if exchange_rate:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'✅ [{now}] 1 BTC = {exchange_rate.btc_krw_rate:,} KRW ({elapsed:.2f}초)'
+                    )
+                )
+            else:
+                self.stdout.write(self.style.ERROR(f'❌ [{now}] 환율 갱신 실패 ({elapsed:.2f}초)'))
+
+        self.stdout.write(
+            self.style.SUCCESS(f'🚀 환율 갱신기 시작 (주기 {options["interval"]:.0f}초)')
+        )
+        run_refresher(
+            interval=options['interval'],
+            stop_event=stop_event,
+            max_iterations=1 if options['once'] else None,
+            on_result=_report,
+        )
@@ -0,0 +1,73 @@
+import signal
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from myshop.expiry import DEFAULT_BATCH_SIZE, EXPIRY_RULES, expired_queryset, run_expiry_sweeps
+
+
+class Command(BaseCommand):
+    help = '만료된 인보이스, 임시 예약, 재고 예약, 임시 업로드를 한 워커에서 주기적으로 정리합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=30, help='정리 주기(초, 기본 30)')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'UPDATE 한 번에 처리할 행 수 (기본 {DEFAULT_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--only',
+            nargs='+',
+            choices=sorted(EXPIRY_RULES),
+            help='지정한 종류만 정리합니다',
+        )
+        parser.add_argument('--once', action='store_true', help='한 번만 정리하고 종료합니다')
+        parser.add_argument('--dry-run', action='store_true', help='정리하지 않고 종류별 만료 건수만 출력합니다')
+
+    def handle(self, *args, **options):
+        names = options['only'] or list(EXPIRY_RULES)
+        if options['batch_size'] <= 0:
+            raise CommandError('--batch-size 는 1 이상이어야 합니다.')
+
+        if options['dry_run']:
+            now = timezone.now()
+            for name in names:
+                rule = EXPIRY_RULES[name]
+                count = expired_queryset(rule, now).count()
+                self.stdout.write(f'  {name} ({rule.description}): 만료 {count}건')
+            return
+
+        stop_event = threading.Event()
+
+        def _stop(signum, frame):
+            self.stdout.write(self.style.WARNING('🛑 종료 신호 수신 - 현재 회차를 마치고 종료합니다.'))
+            stop_event.set()
+
+        signal.signal(signal.SIGTERM, _stop)
+        signal.signal(signal.SIGINT, _stop)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'🚀 만료 정리 시작 (주기 {options["interval"]:.0f}초, 대상 {", ".join(names)})'
+        ))
+        while not stop_event.is_set():
+            started_at = time.monotonic()
+            try:
+                results = run_expiry_sweeps(names, batch_size=options['batch_size'])
+            finally:
+                close_old_connections()
+
+            now = timezone.localtime().strftime('%Y-%m-%d %H:%M:%S')
+            for result in results:
+                if result.error:
+                    self.stdout.write(self.style.ERROR(f'[{now}] {result.name}: 실패 - {result.error}'))
+                elif result.expired or options['once']:
+                    self.stdout.write(f'[{now}] {result.name}: {result.expired}건 ({result.elapsed_ms:.1f}ms)')
+
+            if options['once']:
+                break
+            stop_event.wait(max(0.0, options['interval'] - (time.monotonic() - started_at)))
@@ -1,6 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from myshop.services import UpbitExchangeService
+from myshop.services import UpbitExchangeService, refresh_sats_prices_after_rate_update
 from myshop.models import SiteSettings, ExchangeRate
 import logging
 import sys
@@ -74,6 +74,10 @@ class Command(BaseCommand):
                     else:
                         self.stdout.write('📊 환율 변화 없음')
                 
+                # 원화 연동 가격의 사토시 컬럼 일괄 갱신
+                refreshed_counts = refresh_sats_prices_after_rate_update(exchange_rate)
+                self.stdout.write(f'🔁 사토시 가격 컬럼 갱신: {sum(refreshed_counts.values())}건')
+                
                 # 환율 데이터 개수 확인
                 total_rates = ExchangeRate.objects.count()
                 self.stdout.write(f'💾 저장된 환율 데이터: {total_rates}개')
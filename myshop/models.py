@@ -103,6 +103,16 @@ class ExchangeRate(models.Model):
         krw_amount = btc_amount * float(self.btc_krw_rate)
         return round(krw_amount)
 
+# 환율 데이터 저장 시 프로세스 로컬 스냅샷 갱신
+@receiver(post_save, sender=ExchangeRate)
+def refresh_exchange_rate_snapshot(sender, instance, **kwargs):
+    """환율 데이터 저장 시 가격 계산용 환율 스냅샷 교체"""
+    from django.db import transaction
+    from .rate_snapshot import publish_rate
+
+    # 롤백된 환율이 스냅샷에 남지 않도록 커밋 이후 반영
+    transaction.on_commit(lambda: publish_rate(instance))
+
 # 환율 데이터 저장 시 텔레그램 즉시 알림
 @receiver(post_save, sender=ExchangeRate)
 def send_exchange_rate_telegram_notification(sender, instance, created, **kwargs):
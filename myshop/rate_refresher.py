@@ -0,0 +1,183 @@
+"""환율 갱신기 (stale-while-revalidate)
+
+웹 요청 경로에서는 업비트를 직접 호출하지 않는다.
+
+- 요청 경로(``UpbitExchangeService.get_current_rate`` 등)는 항상 저장된 환율
+  스냅샷을 즉시 반환하고, 환율이 없거나 ``EXCHANGE_RATE_STALE_AFTER`` 초보다
+  오래됐으면 ``request_background_refresh()`` 로 워커 내부 백그라운드 스레드에
+  갱신을 맡긴다 (응답은 기다리지 않음).
+- 전용 갱신 프로세스는 ``python manage.py run_exchange_rate_refresher`` 로
+  ``run_refresher()`` 루프를 돌린다.
+- 갱신은 프로세스당 한 번에 하나만 실행되고(single-flight), 실패하면
+  ``EXCHANGE_RATE_RETRY_BACKOFF`` 초 동안 백그라운드 재시도를 미룬다.
+- 웹 워커의 백그라운드 갱신은 워커 전체에서 하나만 실행된다. 공유 캐시에 ``cache.add`` 로
+  임대(lease)를 잡은 워커만 갱신하고, 임대는 끝나도 풀지 않고 만료까지 둔다(재시도 간격 역할).
+  전용 갱신 프로세스의 heartbeat 가 최근에 기록됐으면 웹 워커는 갱신하지 않는다.
+"""
+
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STALE_AFTER_SECONDS = 600
+DEFAULT_RETRY_BACKOFF_SECONDS = 60
+DEFAULT_REFRESH_INTERVAL_SECONDS = 60
+DEFAULT_REFRESH_LEASE_SECONDS = 120
+
+REFRESH_LEASE_CACHE_KEY = 'exchange-rate-refresh-lease'
+REFRESHER_HEARTBEAT_CACHE_KEY = 'exchange-rate-refresher-heartbeat'
+
+_refresh_lock = threading.Lock()
+_state_lock = threading.Lock()
+_last_failure_at = None
+_background_thread = None
+
+
+def _stale_after_seconds() -> float:
+    return getattr(settings, 'EXCHANGE_RATE_STALE_AFTER', DEFAULT_STALE_AFTER_SECONDS)
+
+
+def _retry_backoff_seconds() -> float:
+    return getattr(settings, 'EXCHANGE_RATE_RETRY_BACKOFF', DEFAULT_RETRY_BACKOFF_SECONDS)
+
+
+def _background_refresh_enabled() -> bool:
+    return getattr(settings, 'EXCHANGE_RATE_BACKGROUND_REFRESH', True)
+
+
+def _refresh_lease_seconds() -> float:
+    return getattr(settings, 'EXCHANGE_RATE_REFRESH_LEASE', DEFAULT_REFRESH_LEASE_SECONDS)
+
+
+def refresher_is_running() -> bool:
+    """전용 갱신 프로세스(``run_exchange_rate_refresher``)가 최근에 heartbeat 를 남겼는지"""
+    return cache.get(REFRESHER_HEARTBEAT_CACHE_KEY) is not None
+
+
+def _acquire_refresh_lease() -> bool:
+    """워커 간 갱신 임대. 다른 워커가 잡고 있으면 False"""
+    return cache.add(REFRESH_LEASE_CACHE_KEY, timezone.now().isoformat(), timeout=_refresh_lease_seconds())
+
+
+def is_rate_stale(rate) -> bool:
+    """환율이 없거나 허용 지연 시간을 넘겼는지 여부"""
+    if rate is None or rate.created_at is None:
+        return True
+    return timezone.now() - rate.created_at > timedelta(seconds=_stale_after_seconds())
+
+
+def refresh_exchange_rate():
+    """업비트에서 환율을 받아 저장하고 사토시 가격 컬럼까지 갱신
+
+    이미 같은 프로세스에서 갱신 중이면 기다리지 않고 None 을 반환한다.
+    """
+    global _last_failure_at
+
+    if not _refresh_lock.acquire(blocking=False):
+        logger.debug("환율 갱신이 이미 진행 중이어서 건너뜁니다.")
+        return None
+
+    try:
+        from .services import UpbitExchangeService, refresh_sats_prices_after_rate_update
+
+        exchange_rate = UpbitExchangeService.fetch_btc_krw_rate()
+        with _state_lock:
+            _last_failure_at = None if exchange_rate else time.monotonic()
+        if exchange_rate:
+            refresh_sats_prices_after_rate_update(exchange_rate)
+        return exchange_rate
+    finally:
+        _refresh_lock.release()
+
+
+def _run_background_refresh():
+    try:
+        if refresh_exchange_rate() is None:
+            # 실패하면 다른 워커도 재시도 간격 동안 업비트를 호출하지 않도록 임대를 연장
+            cache.set(REFRESH_LEASE_CACHE_KEY, timezone.now().isoformat(), timeout=_retry_backoff_seconds())
+    except Exception as e:
+        logger.error(f"백그라운드 환율 갱신 실패: {e}", exc_info=True)
+    finally:
+        # 스레드 전용 DB 커넥션 정리
+        close_old_connections()
+
+
+def request_background_refresh() -> bool:
+    """요청을 막지 않고 백그라운드 스레드에서 환율 갱신 시작 (시작했으면 True)
+
+    전용 갱신 프로세스가 돌고 있거나 다른 워커가 임대를 잡고 있으면 시작하지 않는다.
+    """
+    global _background_thread
+
+    if not _background_refresh_enabled():
+        return False
+
+    with _state_lock:
+        if _background_thread is not None and _background_thread.is_alive():
+            return False
+        if _last_failure_at is not None and time.monotonic() - _last_failure_at < _retry_backoff_seconds():
+            return False
+        if refresher_is_running() or not _acquire_refresh_lease():
+            return False
+        _background_thread = threading.Thread(
+            target=_run_background_refresh,
+            name='exchange-rate-refresh',
+            daemon=True,
+        )
+        _background_thread.start()
+        return True
+
+
+def get_rate_for_request():
+    """요청 경로용 환율 조회 - 저장된 값을 즉시 반환하고 오래됐으면 백그라운드 갱신 요청"""
+    from .rate_snapshot import get_snapshot_rate
+
+    rate = get_snapshot_rate()
+    if is_rate_stale(rate):
+        request_background_refresh()
+    return rate
+
+
+def run_refresher(interval=DEFAULT_REFRESH_INTERVAL_SECONDS, stop_event=None, max_iterations=None, on_result=None):
+    """전용 갱신 프로세스 루프
+
+    Args:
+        interval: 갱신 주기(초)
+        stop_event: 설정되면 루프 종료 (``threading.Event``)
+        max_iterations: 지정 시 해당 횟수만큼만 실행 (테스트/단발 실행용)
+        on_result: 매 회차 ``(exchange_rate 또는 None, 소요초)`` 콜백
+    """
+    stop_event = stop_event or threading.Event()
+    iterations = 0
+
+    while not stop_event.is_set():
+        started_at = time.monotonic()
+        # 웹 워커가 백그라운드 갱신을 하지 않도록 살아 있음을 알림 (두 주기 동안 유효)
+        cache.set(REFRESHER_HEARTBEAT_CACHE_KEY, timezone.now().isoformat(), timeout=max(interval * 2, 60))
+        try:
+            exchange_rate = refresh_exchange_rate()
+        except Exception as e:
+            logger.error(f"환율 갱신 루프 오류: {e}", exc_info=True)
+            exchange_rate = None
+        finally:
+            close_old_connections()
+
+        elapsed = time.monotonic() - started_at
+        if on_result:
+            on_result(exchange_rate, elapsed)
+
+        iterations += 1
+        if max_iterations is not None and iterations >= max_iterations:
+            break
+        stop_event.wait(max(0.0, interval - elapsed))
+
+    # 종료하면 바로 웹 워커 백그라운드 갱신으로 넘김
+    cache.delete(REFRESHER_HEARTBEAT_CACHE_KEY)
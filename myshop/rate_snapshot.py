@@ -0,0 +1,117 @@
+"""프로세스 로컬 환율 스냅샷
+
+가격 프로퍼티마다 ``ExchangeRate.objects.first()`` 를 호출하지 않도록
+최신 환율을 워커 프로세스 메모리에 보관한다.
+
+- ``ExchangeRate`` post_save 시그널이 저장한 프로세스의 스냅샷을 즉시 교체한다.
+- 다른 Gunicorn 워커는 ``EXCHANGE_RATE_SNAPSHOT_TTL`` (기본 60초)이 지나면
+  DB에서 한 번만 다시 읽어 온다. 즉 최대 TTL만큼의 지연이 허용된다.
+- ``version`` 은 스냅샷을 만든 ``ExchangeRate`` 의 pk이며 환율이 없으면 0이다.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+
+SATS_PER_BTC = 100_000_000
+DEFAULT_SNAPSHOT_TTL_SECONDS = 60
+
+_lock = threading.Lock()
+_snapshot = None
+
+
+@dataclass(frozen=True)
+class RateSnapshot:
+    rate: Optional[object]
+    version: int
+    loaded_at: float
+
+    @property
+    def btc_krw_rate(self) -> float:
+        if self.rate is None:
+            return 0.0
+        return float(self.rate.btc_krw_rate)
+
+    @property
+    def is_usable(self) -> bool:
+        return self.btc_krw_rate > 0
+
+    def krw_to_sats(self, krw_amount) -> Optional[int]:
+        """원화 금액을 이 스냅샷 환율로 사토시 변환 (환율이 없으면 None)"""
+        if not self.is_usable:
+            return None
+        if not krw_amount:
+            return 0
+        btc_amount = krw_amount / self.btc_krw_rate
+        return round(btc_amount * SATS_PER_BTC)
+
+
+def _ttl_seconds() -> float:
+    return getattr(settings, 'EXCHANGE_RATE_SNAPSHOT_TTL', DEFAULT_SNAPSHOT_TTL_SECONDS)
+
+
+def build_rate_snapshot(rate) -> RateSnapshot:
+    """주어진 ExchangeRate 인스턴스로 스냅샷 생성"""
+    return RateSnapshot(
+        rate=rate,
+        version=rate.pk if rate is not None else 0,
+        loaded_at=time.monotonic(),
+    )
+
+
+def _is_fresh(snapshot) -> bool:
+    return snapshot is not None and time.monotonic() - snapshot.loaded_at < _ttl_seconds()
+
+
+def get_rate_snapshot() -> RateSnapshot:
+    """현재 프로세스의 환율 스냅샷 반환 (TTL 만료 시 DB에서 재적재)"""
+    global _snapshot
+
+    snapshot = _snapshot
+    if _is_fresh(snapshot):
+        return snapshot
+
+    with _lock:
+        # 다른 스레드가 먼저 갱신했으면 그대로 사용
+        snapshot = _snapshot
+        if _is_fresh(snapshot):
+            return snapshot
+
+        from .models import ExchangeRate
+
+        snapshot = build_rate_snapshot(ExchangeRate.get_latest_rate())
+        _snapshot = snapshot
+        return snapshot
+
+
+def get_snapshot_rate():
+    """스냅샷에 담긴 ExchangeRate 인스턴스 반환 (없으면 None)"""
+    return get_rate_snapshot().rate
+
+
+def publish_rate(rate) -> None:
+    """새로 저장된 환율로 스냅샷 교체 (post_save 시그널에서 호출)"""
+    global _snapshot
+
+    with _lock:
+        current = _snapshot
+        # 더 오래된 환율이 늦게 저장되는 경우 최신 스냅샷을 덮어쓰지 않음
+        if current is not None and _is_fresh(current) and current.version > rate.pk:
+            return
+        _snapshot = build_rate_snapshot(rate)
+
+
+def invalidate_rate_snapshot() -> None:
+    """스냅샷 폐기 - 다음 조회 시 DB에서 다시 읽음"""
+    global _snapshot
+
+    with _lock:
+        _snapshot = None
+
+
+def krw_to_sats(krw_amount) -> Optional[int]:
+    """원화 금액을 스냅샷 환율로 사토시 변환 (환율이 없으면 None)"""
+    return get_rate_snapshot().krw_to_sats(krw_amount)
@@ -0,0 +1,243 @@
+"""원화 연동 가격의 사토시 컬럼 구체화
+
+원화 연동(``price_display='krw'``) 상품/메뉴/파일/라이브 강의는 렌더링 시점에만
+사토시 가격을 알 수 있어 SQL 정렬·필터가 불가능했다. 각 모델에
+``public_price_sats`` 류의 컬럼을 두고,
+
+- 저장 시(pre_save) 현재 환율 스냅샷으로 다시 계산하고
+- 새 환율이 저장되면 ``refresh_materialized_sats_prices()`` 가 원화 연동 행만
+  청크 단위 ``bulk_update`` 로 일괄 갱신한다.
+- 옵션 선택지는 상품의 가격 표시 방식을 따르므로, 상품 저장(post_save) 시
+  선택지 컬럼을 함께 비우거나 다시 계산한다.
+
+밋업은 사토시 고정 가격만 지원하므로 ``price``/``discounted_price`` 컬럼이 그대로
+사토시 정렬 기준이 되어 대상에서 제외한다.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from django.apps import apps
+from django.db.models import Q
+from django.db.models.signals import post_save, pre_save
+
+from .rate_snapshot import RateSnapshot, get_rate_snapshot
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_CHUNK_SIZE = 500
+
+
+@dataclass(frozen=True)
+class SatsPriceSpec:
+    model_label: str
+    # (원화 필드, 사토시 필드, 구체화 컬럼)
+    fields: Tuple[Tuple[str, str, str], ...]
+    krw_filter: Q
+    is_krw: Callable[[object], bool]
+    # 사토시 고정 행에도 사토시 가격을 복사해 둘지 여부
+    mirror_sats_price: bool = True
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def source_fields(self):
+        return {name for krw_field, sats_field, _ in self.fields for name in (krw_field, sats_field)}
+
+    @property
+    def target_fields(self):
+        return [target for _, _, target in self.fields]
+
+
+def _price_display_is_krw(instance) -> bool:
+    return instance.price_display == 'krw'
+
+
+def _option_product_is_krw(instance) -> bool:
+    # 뷰에서 막 만든 옵션/상품이 이미 적재돼 있으면 추가 쿼리 없이 판단
+    if instance._meta.get_field('option').is_cached(instance):
+        option = instance.option
+        if option._meta.get_field('product').is_cached(option):
+            return option.product.price_display == 'krw'
+    # 적재돼 있지 않으면 옵션 → 상품 두 번 대신 쿼리 한 번으로 확인
+    return apps.get_model('products.Product').objects.filter(
+        options=instance.option_id, price_display='krw'
+    ).exists()
+
+
+_BASE_PRICE_FIELDS = (
+    ('price_krw', 'price', 'public_price_sats'),
+    ('discounted_price_krw', 'discounted_price', 'public_discounted_price_sats'),
+)
+
+SATS_PRICE_SPECS = (
+    SatsPriceSpec('products.Product', _BASE_PRICE_FIELDS, Q(price_display='krw'), _price_display_is_krw),
+    SatsPriceSpec(
+        'products.ProductOptionChoice',
+        (('price_krw', 'price', 'public_price_sats'),),
+        Q(option__product__price_display='krw'),
+        _option_product_is_krw,
+        # 상품의 가격 표시 방식이 바뀌어도 옛 값이 남지 않도록 원화 연동일 때만 채움
+        mirror_sats_price=False,
+    ),
+    SatsPriceSpec('menu.Menu', _BASE_PRICE_FIELDS, Q(price_display='krw'), _price_display_is_krw),
+    SatsPriceSpec('file.DigitalFile', _BASE_PRICE_FIELDS, Q(price_display='krw'), _price_display_is_krw),
+    SatsPriceSpec('lecture.LiveLecture', _BASE_PRICE_FIELDS, Q(price_display='krw'), _price_display_is_krw),
+)
+
+
+def _compute_sats(krw_amount, sats_amount, is_krw: bool, snapshot: RateSnapshot, spec: SatsPriceSpec):
+    if not is_krw:
+        return sats_amount if spec.mirror_sats_price else None
+    if krw_amount is None:
+        return sats_amount
+    # 환율이 없으면 None 으로 두어 조회 시 스냅샷 계산으로 폴백
+    return snapshot.krw_to_sats(krw_amount)
+
+
+def apply_sats_prices(instance, spec: SatsPriceSpec, snapshot: Optional[RateSnapshot] = None, is_krw=None):
+    """인스턴스의 사토시 컬럼 값을 계산해 채우고 변경 여부를 반환"""
+    snapshot = snapshot or get_rate_snapshot()
+    if is_krw is None:
+        is_krw = spec.is_krw(instance)
+
+    changed = False
+    for krw_field, sats_field, target_field in spec.fields:
+        value = _compute_sats(
+            getattr(instance, krw_field),
+            getattr(instance, sats_field),
+            is_krw,
+            snapshot,
+            spec,
+        )
+        if getattr(instance, target_field) != value:
+            setattr(instance, target_field, value)
+            changed = True
+    return changed
+
+
+def _make_pre_save_handler(spec: SatsPriceSpec):
+    def handler(sender, instance, raw=False, update_fields=None, **kwargs):
+        if raw:
+            return
+        # update_fields 로 가격과 무관한 컬럼만 저장하는 경우는 건너뜀
+        if update_fields is not None and not (set(update_fields) & spec.source_fields):
+            return
+        apply_sats_prices(instance, spec)
+
+    handler.__name__ = f"materialize_sats_prices_{spec.model_label.replace('.', '_').lower()}"
+    return handler
+
+
+def _spec_for(model_label: str) -> SatsPriceSpec:
+    return next(spec for spec in SATS_PRICE_SPECS if spec.model_label == model_label)
+
+
+def sync_option_choice_sats_prices(product, snapshot: Optional[RateSnapshot] = None) -> int:
+    """상품의 가격 표시 방식에 맞춰 옵션 선택지의 사토시 컬럼을 맞추고 갱신 건수를 반환
+
+    사토시 고정 상품이면 선택지 컬럼을 비우고(조회 시 사토시 가격 사용), 원화 연동
+    상품이면 비어 있는 선택지만 다시 계산한다. 이미 원화 연동이던 상품은 선택지가
+    채워져 있으므로 평소에는 UPDATE/SELECT 한 번으로 끝난다.
+    """
+    spec = _spec_for('products.ProductOptionChoice')
+    choices = spec.model.objects.filter(option__product_id=product.pk)
+    if product.price_display != 'krw':
+        return choices.filter(public_price_sats__isnull=False).update(public_price_sats=None)
+
+    snapshot = snapshot or get_rate_snapshot()
+    pending = [
+        choice
+        for choice in choices.filter(public_price_sats__isnull=True).only(
+            'pk', *spec.source_fields, *spec.target_fields
+        )
+        if apply_sats_prices(choice, spec, snapshot, is_krw=True)
+    ]
+    if pending:
+        spec.model.objects.bulk_update(pending, spec.target_fields)
+    return len(pending)
+
+
+def _sync_option_choices_on_product_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and 'price_display' not in update_fields:
+        return
+    sync_option_choice_sats_prices(instance)
+
+
+def connect_signals():
+    """각 모델 pre_save 에 사토시 컬럼 계산 핸들러 연결 (MyshopConfig.ready 에서 호출)"""
+    for spec in SATS_PRICE_SPECS:
+        handler = _make_pre_save_handler(spec)
+        pre_save.connect(handler, sender=spec.model_label, weak=False, dispatch_uid=handler.__name__)
+    post_save.connect(
+        _sync_option_choices_on_product_save,
+        sender='products.Product',
+        weak=False,
+        dispatch_uid='sync_option_choice_sats_prices',
+    )
+
+
+def _refresh_spec(spec: SatsPriceSpec, snapshot: RateSnapshot, chunk_size: int, krw_only: bool) -> int:
+    model = spec.model
+    queryset = model.objects.all()
+    krw_ids = None
+    if krw_only:
+        queryset = queryset.filter(spec.krw_filter)
+    else:
+        # 원화 연동 여부를 행마다 조회하지 않도록 대상 pk 를 한 번에 적재
+        krw_ids = set(model.objects.filter(spec.krw_filter).values_list('pk', flat=True))
+    queryset = queryset.order_by('pk').only('pk', *spec.source_fields, *spec.target_fields)
+
+    updated = 0
+    pending = []
+    for instance in queryset.iterator(chunk_size=chunk_size):
+        is_krw = krw_only or instance.pk in krw_ids
+
+        if apply_sats_prices(instance, spec, snapshot, is_krw=is_krw):
+            pending.append(instance)
+        if len(pending) >= chunk_size:
+            model.objects.bulk_update(pending, spec.target_fields)
+            updated += len(pending)
+            pending = []
+
+    if pending:
+        model.objects.bulk_update(pending, spec.target_fields)
+        updated += len(pending)
+    return updated
+
+
+def refresh_materialized_sats_prices(
+    snapshot: Optional[RateSnapshot] = None,
+    chunk_size: int = DEFAULT_REFRESH_CHUNK_SIZE,
+    krw_only: bool = True,
+) -> Dict[str, int]:
+    """원화 연동 행의 사토시 컬럼을 환율 스냅샷 기준으로 일괄 갱신
+
+    Args:
+        snapshot: 사용할 환율 스냅샷 (없으면 현재 프로세스 스냅샷)
+        chunk_size: ``iterator``/``bulk_update`` 청크 크기
+        krw_only: False 면 사토시 고정 행까지 모두 채움 (최초 백필용)
+
+    Returns:
+        ``{모델 라벨: 갱신된 행 수}``
+    """
+    snapshot = snapshot or get_rate_snapshot()
+    started_at = time.monotonic()
+    results: Dict[str, int] = {}
+
+    for spec in SATS_PRICE_SPECS:
+        results[spec.model_label] = _refresh_spec(spec, snapshot, chunk_size, krw_only)
+
+    logger.info(
+        "사토시 가격 컬럼 갱신 완료 (환율 버전 %s, %.2f초): %s",
+        snapshot.version,
+        time.monotonic() - started_at,
+        results,
+    )
+    return results
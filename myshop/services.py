@@ -1,8 +1,10 @@
 import requests
 import logging
 from decimal import Decimal
+from django.conf import settings
 from django.utils import timezone
 from .models import ExchangeRate, SiteSettings
+from .rate_snapshot import build_rate_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -73,11 +75,21 @@ class UpbitExchangeService:
     # 환율 API - 한국은행 공공데이터나 ExchangeRate-API 사용
     USD_KRW_API_URL = "https://api.exchangerate-api.com/v4/latest/USD"
     
+    @classmethod
+    def _upbit_api_url(cls):
+        """업비트 시세 API 주소 (settings.UPBIT_API_URL 로 교체 가능 - 로컬 가짜 서버 테스트용)"""
+        return getattr(settings, 'UPBIT_API_URL', cls.UPBIT_API_URL)
+    
+    @classmethod
+    def _usd_krw_api_url(cls):
+        """USD/KRW 환율 API 주소 (settings.USD_KRW_API_URL 로 교체 가능)"""
+        return getattr(settings, 'USD_KRW_API_URL', cls.USD_KRW_API_URL)
+    
     @classmethod
     def fetch_usd_krw_rate(cls):
         """USD/KRW 환율 가져오기"""
         try:
-            response = requests.get(cls.USD_KRW_API_URL, timeout=10)
+            response = requests.get(cls._usd_krw_api_url(), timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -103,7 +115,7 @@ class UpbitExchangeService:
         try:
             # BTC/KRW 환율 가져오기
             response = requests.get(
-                cls.UPBIT_API_URL,
+                cls._upbit_api_url(),
                 params={'markets': 'KRW-BTC'},
                 timeout=10
             )
@@ -157,15 +169,17 @@ class UpbitExchangeService:
     
     @classmethod
     def get_current_rate(cls):
-        """현재 환율 가져오기 (DB에서만 조회, 외부 서버에서 crontab으로 업데이트됨)"""
-        # 최신 환율 데이터 반환
-        latest_rate = ExchangeRate.get_latest_rate()
-        if latest_rate:
-            return latest_rate
-        
-        # 환율 데이터가 없으면 API에서 가져오기 시도 (초기 설정용)
-        logger.warning("환율 데이터가 없습니다. API에서 가져오는 중...")
-        return cls.fetch_btc_krw_rate()
+        """현재 환율 가져오기 (프로세스 스냅샷 조회, 외부 서버에서 crontab으로 업데이트됨)
+
+        요청 경로에서는 업비트를 직접 호출하지 않는다. 환율이 없거나 오래됐으면
+        백그라운드 갱신만 요청하고 저장된 값(없으면 None)을 즉시 반환한다.
+        """
+        from .rate_refresher import get_rate_for_request
+
+        latest_rate = get_rate_for_request()
+        if not latest_rate:
+            logger.warning("환율 데이터가 없습니다. 백그라운드 갱신을 요청했습니다.")
+        return latest_rate
     
     @classmethod
     def convert_krw_to_sats(cls, krw_amount):
@@ -193,4 +207,15 @@ class UpbitExchangeService:
         logger.error("환율 데이터를 가져올 수 없어 변환에 실패했습니다.")
         return 0
 
- 
\ No newline at end of file
+ 
+
+
+def refresh_sats_prices_after_rate_update(exchange_rate):
+    """새 환율 저장 후 원화 연동 가격의 사토시 컬럼 일괄 갱신 (실패해도 환율 저장에는 영향 없음)"""
+    from .sats_prices import refresh_materialized_sats_prices
+
+    try:
+        return refresh_materialized_sats_prices(snapshot=build_rate_snapshot(exchange_rate))
+    except Exception as e:
+        logger.error(f"사토시 가격 컬럼 갱신 실패: {e}", exc_info=True)
+        return {}
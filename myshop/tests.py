@@ -1,3 +1,395 @@
-from django.test import TestCase
+import json
+import threading
+from datetime import timedelta
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from meetup.models import Meetup, MeetupOrder
+from myshop import rate_refresher, rate_snapshot
+from myshop.expiry import run_expiry_sweeps, sweep_expired
+from myshop.models import ExchangeRate
+from myshop.sats_prices import refresh_materialized_sats_prices
+from myshop.services import UpbitExchangeService
+from orders.models import Invoice
+from products.models import Product, ProductOption, ProductOptionChoice
+from storage.models import TemporaryUpload
+from stores.models import Store
+
+
+class RateSnapshotTests(TestCase):
+    def setUp(self):
+        rate_snapshot.invalidate_rate_snapshot()
+        self.addCleanup(rate_snapshot.invalidate_rate_snapshot)
+        self.owner = User.objects.create_user(username='owner', password='test-pass')
+        self.store = Store.objects.create(
+            store_id='ratestore',
+            store_name='환율 스토어',
+            owner_name='홍길동',
+            chat_channel='https://t.me/example',
+            owner=self.owner,
+        )
+
+    def _create_rate(self, btc_krw_rate):
+        with self.captureOnCommitCallbacks(execute=True):
+            return ExchangeRate.objects.create(
+                btc_krw_rate=Decimal(btc_krw_rate),
+                api_response_data={},
+            )
+
+    def _create_krw_product(self, price_krw):
+        return Product.objects.create(
+            store=self.store,
+            title='원화 상품',
+            description='테스트 상품',
+            price=1,
+            price_krw=price_krw,
+            price_display='krw',
+            stock_quantity=10,
+        )
+
+    def test_price_properties_share_single_rate_lookup(self):
+        self._create_rate('100000000')
+        products = [self._create_krw_product(10_000 * (i + 1)) for i in range(5)]
+        rate_snapshot.invalidate_rate_snapshot()
+
+        with self.assertNumQueries(1):
+            prices = [product.public_price for product in products]
+            converted = UpbitExchangeService.convert_krw_to_sats(50_000)
+
+        self.assertEqual(prices, [10_000, 20_000, 30_000, 40_000, 50_000])
+        self.assertEqual(converted, 50_000)
+
+    def test_saved_rate_replaces_snapshot(self):
+        self._create_rate('100000000')
+        self.assertEqual(UpbitExchangeService.convert_krw_to_sats(10_000), 10_000)
+
+        new_rate = self._create_rate('200000000')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(UpbitExchangeService.convert_krw_to_sats(10_000), 5_000)
+        self.assertEqual(rate_snapshot.get_rate_snapshot().version, new_rate.pk)
+
+    @override_settings(EXCHANGE_RATE_SNAPSHOT_TTL=0)
+    def test_expired_snapshot_reloads_from_database(self):
+        self._create_rate('100000000')
+        rate_snapshot.get_rate_snapshot()
+
+        with self.assertNumQueries(1):
+            rate_snapshot.get_rate_snapshot()
+
+    def test_option_choice_price_uses_snapshot(self):
+        self._create_rate('100000000')
+        product = self._create_krw_product(10_000)
+        option = ProductOption.objects.create(product=product, name='색상')
+        choice = ProductOptionChoice.objects.create(option=option, name='빨강', price=0, price_krw=2_000)
+
+        self.assertEqual(choice.public_price, 2_000)
+
+    def test_missing_rate_falls_back_to_stored_sats(self):
+        product = self._create_krw_product(10_000)
+
+        self.assertEqual(product.public_price, 1)
+
+
+class MaterializedSatsPriceTests(TestCase):
+    def setUp(self):
+        rate_snapshot.invalidate_rate_snapshot()
+        self.addCleanup(rate_snapshot.invalidate_rate_snapshot)
+        with self.captureOnCommitCallbacks(execute=True):
+            ExchangeRate.objects.create(btc_krw_rate=Decimal('100000000'), api_response_data={})
+        self.owner = User.objects.create_user(username='owner', password='test-pass')
+        self.store = Store.objects.create(
+            store_id='satsstore',
+            store_name='사토시 스토어',
+            owner_name='홍길동',
+            chat_channel='https://t.me/example',
+            owner=self.owner,
+        )
+        self.krw_product = Product.objects.create(
+            store=self.store,
+            title='원화 상품',
+            description='테스트 상품',
+            price=1,
+            price_krw=30_000,
+            price_display='krw',
+            stock_quantity=10,
+        )
+        option = ProductOption.objects.create(product=self.krw_product, name='색상')
+        self.krw_choice = ProductOptionChoice.objects.create(option=option, name='빨강', price=0, price_krw=2_000)
+        self.sats_product = Product.objects.create(
+            store=self.store,
+            title='사토시 상품',
+            description='테스트 상품',
+            price=20_000,
+            stock_quantity=10,
+        )
+
+    def test_columns_are_filled_on_save(self):
+        self.assertEqual(self.krw_product.public_price_sats, 30_000)
+        self.assertEqual(self.krw_choice.public_price_sats, 2_000)
+        self.assertEqual(self.sats_product.public_price_sats, 20_000)
+
+    def test_rate_update_refreshes_krw_rows_only(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ExchangeRate.objects.create(btc_krw_rate=Decimal('200000000'), api_response_data={})
+
+        results = refresh_materialized_sats_prices()
+
+        self.assertEqual(results['products.Product'], 1)
+        self.assertEqual(results['products.ProductOptionChoice'], 1)
+        self.krw_product.refresh_from_db()
+        self.krw_choice.refresh_from_db()
+        self.assertEqual(self.krw_product.public_price_sats, 15_000)
+        self.assertEqual(self.krw_product.public_price, 15_000)
+        self.assertEqual(self.krw_choice.public_price_sats, 1_000)
+
+        ordered = list(
+            Product.objects.filter(store=self.store).order_by('public_price_sats').values_list('title', flat=True)
+        )
+        self.assertEqual(ordered, ['원화 상품', '사토시 상품'])
+
+    def test_price_display_switch_refreshes_option_choices(self):
+        self.krw_product.price_display = 'sats'
+        self.krw_product.save()
+
+        self.krw_choice.refresh_from_db()
+        self.assertIsNone(self.krw_choice.public_price_sats)
+        self.assertEqual(self.krw_choice.public_price, 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ExchangeRate.objects.create(btc_krw_rate=Decimal('200000000'), api_response_data={})
+        self.krw_product.price_display = 'krw'
+        self.krw_product.save(update_fields=['price_display'])
+
+        self.krw_choice.refresh_from_db()
+        self.assertEqual(self.krw_choice.public_price_sats, 1_000)
+        self.assertEqual(self.krw_choice.public_price, 1_000)
+
+    def test_choice_save_reuses_loaded_option_product(self):
+        option = ProductOption.objects.create(product=self.krw_product, name='크기')
+
+        with CaptureQueriesContext(connection) as queries:
+            ProductOptionChoice.objects.create(option=option, name='대', price=0, price_krw=4_000)
+
+        self.assertFalse(any('"products_product"' in query['sql'] for query in queries.captured_queries))
+
+        choice = ProductOptionChoice.objects.get(option=option)
+        choice.price_krw = 6_000
+        with self.assertNumQueries(2):
+            choice.save()
+        self.assertEqual(choice.public_price_sats, 6_000)
+
+
+class _FakeUpbitHandler(BaseHTTPRequestHandler):
+    """업비트 시세 / USD 환율 API 를 흉내내는 로컬 가짜 서버"""
+
+    def do_GET(self):
+        self.server.request_count += 1
+        if self.path.startswith('/v1/ticker'):
+            payload = [{'market': 'KRW-BTC', 'trade_price': self.server.trade_price}]
+        else:
+            payload = {'rates': {'KRW': 1_000}}
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ExchangeRateRefresherTests(TestCase):
+    def setUp(self):
+        rate_snapshot.invalidate_rate_snapshot()
+        self.addCleanup(rate_snapshot.invalidate_rate_snapshot)
+        rate_refresher._last_failure_at = None
+        self.addCleanup(setattr, rate_refresher, '_last_failure_at', None)
+        shared_keys = [rate_refresher.REFRESH_LEASE_CACHE_KEY, rate_refresher.REFRESHER_HEARTBEAT_CACHE_KEY]
+        cache.delete_many(shared_keys)
+        self.addCleanup(cache.delete_many, shared_keys)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _FakeUpbitHandler)
+        self.server.trade_price = 100_000_000
+        self.server.request_count = 0
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        base_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        settings_override = override_settings(
+            UPBIT_API_URL=f'{base_url}/v1/ticker',
+            USD_KRW_API_URL=f'{base_url}/v4/latest/USD',
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_refresh_stores_rate_from_upbit(self):
+        exchange_rate = rate_refresher.refresh_exchange_rate()
+
+        self.assertIsNotNone(exchange_rate)
+        self.assertEqual(exchange_rate.btc_krw_rate, Decimal('100000000'))
+        self.assertEqual(exchange_rate.usd_krw_rate, Decimal('1000'))
+        self.assertEqual(self.server.request_count, 2)
+
+    def test_run_refresher_runs_requested_iterations(self):
+        results = []
+
+        rate_refresher.run_refresher(
+            interval=0,
+            max_iterations=2,
+            on_result=lambda exchange_rate, elapsed: results.append(exchange_rate),
+        )
+
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(results))
+        self.assertEqual(ExchangeRate.objects.count(), 2)
+
+    def test_request_path_returns_stale_rate_without_calling_upbit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            stale_rate = ExchangeRate.objects.create(btc_krw_rate=Decimal('100000000'), api_response_data={})
+        ExchangeRate.objects.filter(pk=stale_rate.pk).update(created_at=timezone.now() - timedelta(hours=1))
+        rate_snapshot.invalidate_rate_snapshot()
+
+        with mock.patch.object(rate_refresher, 'request_background_refresh') as background_refresh:
+            rate = UpbitExchangeService.get_current_rate()
+
+        self.assertEqual(rate.pk, stale_rate.pk)
+        background_refresh.assert_called_once_with()
+        self.assertEqual(self.server.request_count, 0)
+
+    def test_request_path_does_not_refresh_fresh_rate(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ExchangeRate.objects.create(btc_krw_rate=Decimal('100000000'), api_response_data={})
+
+        with mock.patch.object(rate_refresher, 'request_background_refresh') as background_refresh:
+            self.assertEqual(UpbitExchangeService.convert_krw_to_sats(10_000), 10_000)
+
+        background_refresh.assert_not_called()
+
+    @override_settings(EXCHANGE_RATE_RETRY_BACKOFF=600)
+    def test_failed_refresh_backs_off_background_retries(self):
+        with mock.patch.object(UpbitExchangeService, 'fetch_btc_krw_rate', return_value=None):
+            self.assertIsNone(rate_refresher.refresh_exchange_rate())
+
+        with mock.patch.object(threading.Thread, 'start') as start:
+            self.assertFalse(rate_refresher.request_background_refresh())
+        start.assert_not_called()
+
+
+    def test_background_refresh_runs_in_one_worker_and_defers_to_refresher(self):
+        with mock.patch.object(threading.Thread, 'start') as start:
+            self.assertTrue(rate_refresher.request_background_refresh())
+            # 다른 워커(프로세스 상태 없음)는 임대가 남아 있는 동안 시작하지 않음
+            with mock.patch.object(rate_refresher, '_background_thread', None):
+                self.assertFalse(rate_refresher.request_background_refresh())
+        self.assertEqual(start.call_count, 1)
+
+        # 전용 갱신 프로세스가 도는 동안에는 임대가 풀려도 웹 워커가 갱신하지 않음
+        cache.delete(rate_refresher.REFRESH_LEASE_CACHE_KEY)
+        started = []
+
+        def _try_background_refresh(exchange_rate, elapsed):
+            with mock.patch.object(rate_refresher, '_background_thread', None), \
+                    mock.patch.object(threading.Thread, 'start'):
+                started.append(rate_refresher.request_background_refresh())
+
+        rate_refresher.run_refresher(interval=0, max_iterations=1, on_result=_try_background_refresh)
+        self.assertEqual(started, [False])
+        self.assertFalse(rate_refresher.refresher_is_running())
+
+
+class ExpirySchedulerTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='test-pass')
+        self.store = Store.objects.create(
+            store_id='expirystore',
+            store_name='만료 스토어',
+            owner_name='홍길동',
+            chat_channel='https://t.me/example',
+            owner=self.owner,
+        )
+        self.now = timezone.now()
+
+    def _invoice(self, index, *, expires_in, status='pending'):
+        return Invoice.objects.create(
+            payment_hash=f'hash-{index}',
+            invoice_string='lnbc1',
+            amount_sats=1000,
+            store=self.store,
+            status=status,
+            expires_at=self.now + expires_in,
+        )
+
+    def test_sweeps_expire_rows_in_batched_updates(self):
+        expired = [self._invoice(index, expires_in=timedelta(minutes=-index - 1)) for index in range(3)]
+        upcoming = self._invoice(10, expires_in=timedelta(minutes=5))
+        paid = self._invoice(11, expires_in=timedelta(minutes=-5), status='paid')
+
+        meetup = Meetup.objects.create(store=self.store, name='밋업', price=5000, max_participants=10)
+        reservations = [
+            MeetupOrder.objects.create(
+                meetup=meetup,
+                participant_name='참가자',
+                participant_email='guest@example.com',
+                status='pending',
+                is_temporary_reserved=True,
+                reservation_expires_at=self.now + offset,
+                base_price=5000,
+                total_price=5000,
+            )
+            for offset in (timedelta(minutes=-1), timedelta(minutes=1))
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            results = run_expiry_sweeps(['invoices', 'meetup_reservations'], now=self.now, batch_size=2)
+
+        self.assertEqual([(result.name, result.expired, result.error) for result in results], [
+            ('invoices', 3, ''),
+            ('meetup_reservations', 1, ''),
+        ])
+        updates = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 3)  # 인보이스 2배치 + 밋업 1배치
+
+        self.assertEqual(
+            set(Invoice.objects.filter(status='expired').values_list('pk', flat=True)),
+            {invoice.pk for invoice in expired},
+        )
+        self.assertEqual(Invoice.objects.get(pk=upcoming.pk).status, 'pending')
+        self.assertEqual(Invoice.objects.get(pk=paid.pk).status, 'paid')
+
+        cancelled, active = [MeetupOrder.objects.get(pk=order.pk) for order in reservations]
+        self.assertEqual((cancelled.status, cancelled.is_temporary_reserved), ('cancelled', False))
+        self.assertEqual(cancelled.auto_cancelled_reason, '예약 시간 만료')
+        self.assertEqual(active.status, 'pending')
+
+    def test_temporary_upload_kept_when_s3_delete_fails(self):
+        uploads = [
+            TemporaryUpload.objects.create(
+                original_name=f'{name}.png',
+                file_path=f'temp/{name}.png',
+                file_size=10,
+                uploaded_by=self.owner,
+                expires_at=self.now - timedelta(days=2),
+            )
+            for name in ('ok', 'broken', 'ok2')
+        ]
+
+        def _delete(file_path):
+            return {'success': 'broken' not in file_path}
+
+        with mock.patch('storage.utils.delete_file_from_s3', side_effect=_delete) as delete:
+            self.assertEqual(sweep_expired('temporary_uploads', now=self.now, batch_size=1), 2)
+
+        self.assertEqual(delete.call_count, 3)
+        self.assertEqual(list(TemporaryUpload.objects.values_list('pk', flat=True)), [uploads[1].pk])
@@ -2,7 +2,7 @@ from django.shortcuts import render, redirect
 from django.http import JsonResponse, HttpResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
-from .services import UpbitExchangeService
+from .services import UpbitExchangeService, refresh_sats_prices_after_rate_update
 import json
 import os
 from django.utils import timezone
@@ -250,6 +250,9 @@ def update_exchange_rate_webhook(request):
             if exchange_rate:
                 logger.info(f'환율 업데이트 성공: 1 BTC = {exchange_rate.btc_krw_rate:,} KRW (소요시간: {update_duration:.2f}초)')
                 
+                # 원화 연동 가격의 사토시 컬럼을 새 환율로 일괄 갱신
+                refreshed_counts = refresh_sats_prices_after_rate_update(exchange_rate)
+                
                 # 성공 응답
                 response_data = {
                     'success': True,
@@ -257,6 +260,7 @@ def update_exchange_rate_webhook(request):
                     'btc_krw_rate': float(exchange_rate.btc_krw_rate),
                     'updated_at': exchange_rate.created_at.isoformat(),
                     'source': source,
+                    'refreshed_sats_prices': refreshed_counts,
                     'timestamp': timezone.now().isoformat(),
                     'processing_time': {
                         'update_duration': f'{update_duration:.2f}s',
@@ -0,0 +1,118 @@
+"""장바구니 하이드레이션
+
+장바구니 아이템마다 상품/옵션/선택지/대표 이미지를 하나씩 조회하지 않고,
+장바구니 전체에 필요한 데이터를 아이템 수와 무관한 고정 횟수의 쿼리로 적재한다.
+
+- 상품(+스토어) 1회, 대표 이미지 prefetch 1회
+- 옵션 1회, 옵션 선택지 1회
+- 가격은 ``products.pricing`` 으로 하나의 환율 스냅샷에서 일괄 계산
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db.models import prefetch_related_objects
+
+from myshop.rate_snapshot import RateSnapshot, get_rate_snapshot
+from products.models import Product, ProductOption, ProductOptionChoice
+from products.pricing import resolve_choice_price, resolve_product_prices
+
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class CartHydration:
+    products: Dict[int, Product] = field(default_factory=dict)
+    options: Dict[int, ProductOption] = field(default_factory=dict)
+    choices: Dict[int, ProductOptionChoice] = field(default_factory=dict)
+    snapshot: Optional[RateSnapshot] = None
+
+    def get_product(self, product_id) -> Optional[Product]:
+        return self.products.get(_to_int(product_id))
+
+    @staticmethod
+    def image_url(product) -> Optional[str]:
+        """대표 이미지 URL (prefetch 캐시 사용)"""
+        images = product.images.all()[:1]
+        return images[0].file_url if images else None
+
+    @staticmethod
+    def base_price(product) -> int:
+        """상품 기준 가격 (할인 우선 적용)"""
+        if product.is_discounted and product.public_discounted_price:
+            return int(product.public_discounted_price or 0)
+        return int(product.public_price or 0)
+
+    def option_entries(self, selected_options) -> List[dict]:
+        """선택 옵션을 ``{'option', 'choice', 'current_price'}`` 목록으로 변환 (없는 옵션은 건너뜀)"""
+        entries = []
+        for option_id, choice_id in (selected_options or {}).items():
+            option = self.options.get(_to_int(option_id))
+            choice = self.choices.get(_to_int(choice_id))
+            if option is None or choice is None:
+                continue
+            entries.append({
+                'option': option,
+                'choice': choice,
+                'current_price': choice.public_price,
+            })
+        return entries
+
+
+def hydrate_cart(
+    entries: Iterable[Tuple[object, dict]],
+    products: Optional[Iterable[Product]] = None,
+    snapshot: Optional[RateSnapshot] = None,
+) -> CartHydration:
+    """장바구니 아이템 목록에 필요한 상품/옵션/선택지를 일괄 적재
+
+    Args:
+        entries: ``(product_id, selected_options)`` 목록
+        products: 이미 적재된 상품 목록 (DB 장바구니의 ``select_related`` 결과 등).
+            없으면 ``entries`` 의 상품 중 판매 중인 상품만 조회한다.
+        snapshot: 사용할 환율 스냅샷 (없으면 현재 프로세스 스냅샷)
+    """
+    entries = list(entries)
+    snapshot = snapshot or get_rate_snapshot()
+
+    if products is None:
+        product_ids = {_to_int(product_id) for product_id, _ in entries} - {None}
+        products = Product.objects.filter(id__in=product_ids, is_active=True).select_related('store') if product_ids else []
+    products = list(products)
+    prefetch_related_objects(products, 'images')
+    resolve_product_prices(products, snapshot=snapshot, include_options=False)
+
+    hydration = CartHydration(
+        products={product.id: product for product in products},
+        snapshot=snapshot,
+    )
+
+    option_ids = set()
+    choice_ids = set()
+    for _, selected_options in entries:
+        for option_id, choice_id in (selected_options or {}).items():
+            option_ids.add(_to_int(option_id))
+            choice_ids.add(_to_int(choice_id))
+    option_ids.discard(None)
+    choice_ids.discard(None)
+
+    if option_ids:
+        hydration.options = {option.id: option for option in ProductOption.objects.filter(id__in=option_ids)}
+    if choice_ids:
+        hydration.choices = {choice.id: choice for choice in ProductOptionChoice.objects.filter(id__in=choice_ids)}
+
+    # 선택지 가격을 소속 상품 기준으로 미리 계산해 option.product 지연 조회를 막음
+    for choice in hydration.choices.values():
+        option = hydration.options.get(choice.option_id)
+        product = hydration.products.get(option.product_id) if option else None
+        if product is not None:
+            choice.option = option
+            option.product = product
+            resolve_choice_price(choice, product, snapshot)
+
+    return hydration
@@ -0,0 +1,156 @@
+"""무료 주문(0 sats) 결제 트랜잭션
+
+무료 주문은 인보이스를 거치지 않아 결제 흐름에서 ``PaymentTransaction`` 이 생기지 않는다.
+결제 트랜잭션 목록에 보이도록 완료 상태의 트랜잭션을 따로 만든다.
+
+- 새 주문: 주문 저장 시 ``create_free_order_transaction()`` 으로 같은 트랜잭션 안에서 만든다.
+- 예전 주문: ``backfill_free_order_transactions()`` 가 주문 ID 순으로 한 배치씩 확인한다. 마지막으로
+  확인한 주문 ID 는 ``BackfillCheckpoint`` 에 남기고, 다음 실행은 그 뒤의 주문만 본다.
+  ``python manage.py backfill_free_order_transactions`` 로 실행한다.
+
+조회 화면은 백필하지 않고 읽기만 한다.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.db import transaction as db_transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from ln_payment.models import PaymentTransaction
+from ln_payment.services import PaymentStage
+
+from .models import BackfillCheckpoint, Order
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = 'free_order_payment_transactions'
+DEFAULT_BATCH_SIZE = 500
+# 아직 커밋되지 않은 주문을 건너뛰고 지나가지 않도록 최근 주문은 다음 실행에서 확인
+SETTLE_DELAY = timedelta(minutes=5)
+
+
+@dataclass
+class BackfillResult:
+    scanned: int = 0
+    created: int = 0
+    position: int = 0
+
+
+def build_cart_snapshot(order):
+    """주문 항목으로 트랜잭션 상세 화면용 장바구니 스냅샷 생성 (``items__product__images`` prefetch 권장)"""
+    store = order.store
+    cart_snapshot = []
+    for item in order.items.all():
+        product = item.product
+        product_image_url = None
+        if product:
+            images = list(product.images.all())
+            if images:
+                product_image_url = images[0].file_url
+
+        options_display = item.selected_options if isinstance(item.selected_options, dict) else {}
+
+        cart_snapshot.append({
+            'id': None,
+            'product_id': product.id if product else None,
+            'product_title': item.product_title,
+            'product_image_url': product_image_url,
+            'quantity': item.quantity,
+            'unit_price': item.unit_price,
+            'total_price': item.total_price,
+            'selected_options': {},
+            'options_display': options_display,
+            'store_id': store.store_id,
+            'store_name': store.store_name,
+        })
+    return cart_snapshot
+
+
+def _free_order_transaction(order, cart_snapshot):
+    return PaymentTransaction(
+        user=order.user,
+        store=order.store,
+        order=order,
+        amount_sats=0,
+        currency=PaymentTransaction.CURRENCY_BTC,
+        status=PaymentTransaction.STATUS_COMPLETED,
+        current_stage=PaymentStage.ORDER_FINALIZE,
+        payment_hash='',
+        payment_request='',
+        metadata={
+            'free_order': True,
+            'shipping': {
+                'buyer_name': order.buyer_name,
+                'buyer_phone': order.buyer_phone,
+                'buyer_email': order.buyer_email,
+                'shipping_postal_code': order.shipping_postal_code,
+                'shipping_address': order.shipping_address,
+                'shipping_detail_address': order.shipping_detail_address,
+                'order_memo': order.order_memo,
+                'pickup_requested': order.delivery_status == 'pickup',
+            },
+            'cart_snapshot': cart_snapshot,
+            'subtotal_sats': 0,
+            'shipping_fee_sats': 0,
+            'total_sats': 0,
+            'detail_source': 'orders',
+            'payment_id': order.payment_id,
+        },
+    )
+
+
+def create_free_order_transaction(order, *, cart_snapshot=None):
+    """무료 주문의 완료 트랜잭션 생성 (주문 저장과 같은 트랜잭션에서 호출)
+
+    이미 트랜잭션이 있으면 새로 만들지 않고 ``None`` 을 반환한다.
+    """
+    if PaymentTransaction.objects.filter(store=order.store, order=order).exists():
+        return None
+    if cart_snapshot is None:
+        cart_snapshot = build_cart_snapshot(order)
+    payment_transaction = _free_order_transaction(order, cart_snapshot)
+    payment_transaction.save()
+    return payment_transaction
+
+
+def backfill_free_order_transactions(*, batch_size=DEFAULT_BATCH_SIZE, now=None) -> BackfillResult:
+    """마지막 확인 위치 뒤의 주문 한 배치를 확인해 트랜잭션이 없는 무료 주문에 만들어 준다"""
+    now = now or timezone.now()
+    with db_transaction.atomic():
+        checkpoint, _ = BackfillCheckpoint.objects.select_for_update().get_or_create(name=CHECKPOINT_NAME)
+        result = BackfillResult(position=checkpoint.position)
+
+        order_ids = list(
+            Order.objects.filter(pk__gt=checkpoint.position, created_at__lt=now - SETTLE_DELAY)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not order_ids:
+            return result
+
+        missing = (
+            Order.objects.filter(pk__in=order_ids, total_amount=0)
+            .exclude(Exists(PaymentTransaction.objects.filter(order=OuterRef('pk'), store=OuterRef('store'))))
+            .select_related('user', 'store')
+            .prefetch_related('items', 'items__product', 'items__product__images')
+        )
+        transactions = [_free_order_transaction(order, build_cart_snapshot(order)) for order in missing]
+        PaymentTransaction.objects.bulk_create(transactions)
+
+        checkpoint.position = order_ids[-1]
+        checkpoint.save(update_fields=['position', 'updated_at'])
+
+    result.scanned = len(order_ids)
+    result.created = len(transactions)
+    result.position = checkpoint.position
+    if transactions:
+        logger.info("무료 주문 결제 트랜잭션 %s건 백필 (확인 위치 %s)", len(transactions), checkpoint.position)
+    return result
+
+
+def reset_checkpoint(position=0):
+    """백필 위치를 되돌림 (처음부터 다시 확인할 때)"""
+    BackfillCheckpoint.objects.update_or_create(name=CHECKPOINT_NAME, defaults={'position': position})
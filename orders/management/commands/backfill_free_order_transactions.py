@@ -0,0 +1,52 @@
+import signal
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from orders.free_order_transactions import (
+    DEFAULT_BATCH_SIZE,
+    backfill_free_order_transactions,
+    reset_checkpoint,
+)
+
+
+class Command(BaseCommand):
+    help = '결제 트랜잭션이 없는 무료 주문에 완료 트랜잭션을 만듭니다 (마지막 확인 위치부터 이어서 처리)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'한 번에 확인할 주문 수 (기본 {DEFAULT_BATCH_SIZE})',
+        )
+        parser.add_argument('--reset', action='store_true', help='확인 위치를 처음으로 되돌린 뒤 실행합니다')
+
+    def handle(self, *args, **options):
+        stop_event = threading.Event()
+
+        def _stop(signum, frame):
+            self.stdout.write(self.style.WARNING('🛑 종료 신호 수신 - 현재 배치를 마치고 종료합니다.'))
+            stop_event.set()
+
+        signal.signal(signal.SIGTERM, _stop)
+        signal.signal(signal.SIGINT, _stop)
+
+        if options['reset']:
+            reset_checkpoint()
+            self.stdout.write('확인 위치를 처음으로 되돌렸습니다.')
+
+        started_at = time.perf_counter()
+        scanned = created = 0
+        while not stop_event.is_set():
+            result = backfill_free_order_transactions(batch_size=options['batch_size'])
+            if not result.scanned:
+                break
+            scanned += result.scanned
+            created += result.created
+            self.stdout.write(f'  주문 {result.scanned}건 확인, 트랜잭션 {result.created}건 생성 (위치 {result.position})')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ 주문 {scanned}건 확인, 트랜잭션 {created}건 생성 ({time.perf_counter() - started_at:.1f}초)'
+        ))
@@ -0,0 +1,191 @@
+import csv
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction as db_transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.utils import timezone
+
+from orders.models import Order, OrderItem
+from orders.views import export_orders_csv
+from products.models import Product
+from stores.models import Store
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _current_rss():
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return 0
+
+
+class _RssSampler:
+    """측정 구간 동안 RSS 최댓값을 기록"""
+
+    def __init__(self, interval=0.002):
+        self.interval = interval
+        self.baseline = 0
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.baseline = self.peak = _current_rss()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _current_rss())
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _current_rss())
+
+    @property
+    def growth(self):
+        return self.peak - self.baseline
+
+
+def legacy_export(store):
+    """변경 전: 쿼리셋 전체를 읽어 응답 본문을 메모리에 모두 만든 뒤 반환"""
+    response = HttpResponse(content_type='text/csv')
+    response.write('\ufeff')
+    writer = csv.writer(response)
+    writer.writerow([
+        '주문번호', '상품명', '수량', '단가', '총액', '주문일시', '상태',
+        '주문자명', '연락처', '이메일', '우편번호', '주소', '상세주소', '요청사항'
+    ])
+    order_items = OrderItem.objects.filter(
+        product__store=store
+    ).select_related('order', 'product').prefetch_related('order__payment_transactions').order_by('-order__created_at')
+    for item in order_items:
+        order = item.order
+        writer.writerow([
+            order.order_number,
+            item.product_title,
+            item.quantity,
+            item.product_price,
+            item.total_price,
+            timezone.localtime(order.created_at).strftime('%Y-%m-%d %H:%M:%S'),
+            order.get_status_display_with_manual(),
+            order.buyer_name,
+            order.buyer_phone,
+            order.buyer_email,
+            order.shipping_postal_code,
+            order.shipping_address,
+            order.shipping_detail_address,
+            order.order_memo,
+        ])
+    return response
+
+
+class Command(BaseCommand):
+    help = '주문 내보내기의 첫 바이트 시간(TTFB)과 메모리 증가량을 변경 전(메모리 생성)과 스트리밍으로 비교합니다 (모든 데이터는 롤백)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=20000, help='생성할 주문 수 (기본 20000)')
+
+    def handle(self, *args, **options):
+        try:
+            with db_transaction.atomic():
+                store = self._seed(options['orders'])
+                self._run(store, options['orders'])
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _seed(self, count):
+        suffix = uuid.uuid4().hex[:8]
+        owner = User.objects.create_user(username=f'bench-{suffix}')
+        store = Store.objects.create(
+            store_id=f'bench{suffix}',
+            store_name='벤치마크 스토어',
+            owner_name='벤치마크',
+            chat_channel='https://t.me/example',
+            owner=owner,
+        )
+        product = Product.objects.create(store=store, title='벤치마크 상품', description='벤치마크', price=1000)
+
+        started_at = time.perf_counter()
+        for offset in range(0, count, 2000):
+            orders = Order.objects.bulk_create([
+                Order(
+                    order_number=f'B{suffix}-{offset + index:07d}',
+                    user=owner,
+                    store=store,
+                    status='paid',
+                    buyer_name=f'구매자 {offset + index}',
+                    buyer_phone='01012345678',
+                    buyer_email='buyer@example.com',
+                    shipping_postal_code='04524',
+                    shipping_address='서울특별시 중구 세종대로 110',
+                    shipping_detail_address='101동 1001호',
+                    order_memo='문 앞에 놓아주세요',
+                    subtotal=1000,
+                    shipping_fee=0,
+                    total_amount=1000,
+                )
+                for index in range(min(2000, count - offset))
+            ])
+            OrderItem.objects.bulk_create([
+                OrderItem(order=order, product=product, product_title=product.title, product_price=1000, quantity=1)
+                for order in orders
+            ])
+        self.stdout.write(f'주문 {count:,}건 생성 ({time.perf_counter() - started_at:.1f}초)')
+        return store
+
+    def _measure(self, produce):
+        """응답을 만들고 끝까지 읽으며 (TTFB, 전체 시간, 바이트 수) 반환"""
+        started_at = time.perf_counter()
+        response = produce()
+        first_byte_at = None
+        size = 0
+        chunks = response.streaming_content if response.streaming else [response.content]
+        for chunk in chunks:
+            if first_byte_at is None:
+                first_byte_at = time.perf_counter()
+            size += len(chunk)
+        finished_at = time.perf_counter()
+        # response.close() 는 request_finished 로 DB 연결을 닫으므로 호출하지 않음 (롤백 트랜잭션 유지)
+        return first_byte_at - started_at, finished_at - started_at, size
+
+    def _run(self, store, count):
+        request = RequestFactory().get(f'/orders/{store.store_id}/orders/export/')
+        request.user = store.owner
+        request.session = {}
+        request._messages = None
+
+        variants = (
+            # RSS 는 한 번 늘어나면 잘 줄지 않으므로 스트리밍을 먼저 측정
+            ('스트리밍 (변경 후)', lambda: export_orders_csv(request, store.store_id)),
+            ('메모리 생성 (변경 전)', lambda: legacy_export(store)),
+        )
+        for label, produce in variants:
+            with _RssSampler() as sampler:
+                ttfb, total, size = self._measure(produce)
+
+            tracemalloc.start()
+            self._measure(produce)
+            _, traced_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            self.stdout.write(self.style.SUCCESS(f'\n▶ {label}'))
+            self.stdout.write(f'  TTFB {ttfb * 1000:.0f}ms, 전체 {total:.2f}초, 응답 {size / 1024 / 1024:.1f}MB')
+            self.stdout.write(
+                f'  RSS 증가 {sampler.growth / 1024 / 1024:.1f}MB, '
+                f'Python 할당 최대 {traced_peak / 1024 / 1024:.1f}MB ({count:,}건)'
+            )
@@ -0,0 +1,140 @@
+import statistics
+import time
+import uuid
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction as db_transaction
+from django.test.utils import CaptureQueriesContext
+
+from ln_payment.models import PaymentTransaction
+from orders import services
+from orders.models import OrderItem
+from products.models import Product, ProductOption, ProductOptionChoice
+from stores.models import Store
+
+
+class _Rollback(Exception):
+    pass
+
+
+def legacy_create_order_items(order, cart_snapshot):
+    """변경 전: 항목마다 상품 행 잠금 + ``decrease_stock()``(Product 전체 저장) + 옵션 개별 조회 + INSERT"""
+    store = order.store
+    computed_subtotal = 0
+    stock_issues = []
+    for item in cart_snapshot:
+        product = Product.objects.select_for_update().filter(id=item['product_id'], store=store).first()
+        quantity = int(item['quantity'])
+        if not product.decrease_stock(quantity):
+            stock_issues.append({'product_id': product.id})
+            product.stock_quantity = 0
+            product.save(update_fields=['stock_quantity'])
+
+        selected_options_map = {}
+        options_price = 0
+        for option_id, choice_id in (item.get('selected_options') or {}).items():
+            option_obj = ProductOption.objects.get(id=option_id)
+            choice_obj = ProductOptionChoice.objects.get(id=choice_id)
+            selected_options_map[option_obj.name] = choice_obj.name
+            options_price += choice_obj.public_price
+
+        order_item = OrderItem.objects.create(
+            order=order,
+            product=product,
+            product_title=item.get('product_title') or product.title,
+            product_price=int(item['unit_price']) - options_price,
+            quantity=quantity,
+            selected_options=selected_options_map,
+            options_price=options_price,
+        )
+        computed_subtotal += order_item.total_price
+    return computed_subtotal, stock_issues
+
+
+class Command(BaseCommand):
+    help = '결제 트랜잭션 → 주문 확정 지연 시간을 항목별 처리(변경 전)와 일괄 처리로 비교합니다 (모든 데이터는 롤백)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lines', type=int, nargs='+', default=[1, 10, 50], help='장바구니 항목 수 (기본 1 10 50)')
+        parser.add_argument('--repeat', type=int, default=20, help='항목 수마다 반복 횟수 (중앙값 사용, 기본 20)')
+
+    def handle(self, *args, **options):
+        try:
+            with db_transaction.atomic():
+                self._run(options['lines'], options['repeat'])
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _prepare(self, max_lines):
+        suffix = uuid.uuid4().hex[:8]
+        owner = User.objects.create_user(username=f'bench-{suffix}', email=f'bench-{suffix}@example.com')
+        store = Store.objects.create(
+            store_id=f'bench{suffix}',
+            store_name='벤치마크 스토어',
+            owner_name='벤치마크',
+            chat_channel='https://t.me/example',
+            owner=owner,
+        )
+        snapshot = []
+        for index in range(max_lines):
+            product = Product.objects.create(
+                store=store,
+                title=f'벤치마크 상품 {index}',
+                description='벤치마크',
+                price=1000,
+                stock_quantity=1_000_000,
+            )
+            option = ProductOption.objects.create(product=product, name='사이즈')
+            choice = ProductOptionChoice.objects.create(option=option, name='L', price=100)
+            snapshot.append({
+                'product_id': product.id,
+                'product_title': product.title,
+                'quantity': 1 + index % 3,
+                'unit_price': 1100,
+                'selected_options': {str(option.id): str(choice.id)},
+                'store_id': store.store_id,
+            })
+        return owner, store, snapshot
+
+    def _finalize(self, owner, store, snapshot):
+        tx = PaymentTransaction.objects.create(
+            user=owner,
+            store=store,
+            amount_sats=0,
+            status=PaymentTransaction.STATUS_PROCESSING,
+            payment_hash=uuid.uuid4().hex * 2,
+            metadata={
+                'shipping': {'buyer_name': '구매자', 'buyer_email': owner.email, 'pickup_requested': True},
+                'cart_snapshot': snapshot,
+            },
+        )
+        connection.queries_log.clear()
+        with CaptureQueriesContext(connection) as queries:
+            started_at = time.perf_counter()
+            services.finalize_order_from_payment_transaction(tx, source='benchmark')
+            elapsed = (time.perf_counter() - started_at) * 1000
+        return elapsed, len(queries)
+
+    def _measure(self, owner, store, snapshot, repeat):
+        runs = [self._finalize(owner, store, snapshot) for _ in range(repeat)]
+        return statistics.median(ms for ms, _ in runs), runs[-1][1]
+
+    def _run(self, line_counts, repeat):
+        owner, store, snapshot = self._prepare(max(line_counts))
+        # 첫 실행의 연결/캐시 준비 비용은 제외
+        self._finalize(owner, store, snapshot[:1])
+
+        self.stdout.write(f'{"항목 수":>6} | {"항목별 처리 (변경 전)":>22} | {"일괄 처리":>18} | 배율')
+        for lines in line_counts:
+            cart = snapshot[:lines]
+            with mock.patch.object(services, 'create_order_items_from_snapshot', legacy_create_order_items):
+                legacy_ms, legacy_queries = self._measure(owner, store, cart, repeat)
+            bulk_ms, bulk_queries = self._measure(owner, store, cart, repeat)
+            self.stdout.write(
+                f'{lines:>6} | {legacy_ms:>10.2f}ms ({legacy_queries:>3}쿼리) | '
+                f'{bulk_ms:>8.2f}ms ({bulk_queries:>3}쿼리) | x{legacy_ms / bulk_ms:.1f}'
+            )
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
+from myshop.expiry import sweep_expired
 from orders.models import Invoice
 
 
@@ -33,8 +34,8 @@ class Command(BaseCommand):
                     f'  - {invoice.payment_hash[:16]}... ({invoice.user.username}, {invoice.amount_sats} sats)'
                 )
         else:
-            # 실제 업데이트
-            updated = expired_invoices.update(status='expired')
+            # 실제 업데이트 (만료 정리 워커와 같은 배치 UPDATE)
+            updated = sweep_expired('invoices', now=now)
             
             self.stdout.write(
                 self.style.SUCCESS(f'{updated}개의 인보이스 상태를 "만료됨"으로 업데이트했습니다.')
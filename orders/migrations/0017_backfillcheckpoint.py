@@ -0,0 +1,26 @@
+# Generated by Django 5.2.2 on 2026-10-18 13:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0016_order_channel'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackfillCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='작업 이름')),
+                ('position', models.PositiveBigIntegerField(default=0, verbose_name='마지막 확인 ID')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': '백필 진행 위치',
+                'verbose_name_plural': '백필 진행 위치',
+            },
+        ),
+    ]
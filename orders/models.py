@@ -452,3 +452,18 @@ class Invoice(models.Model):
             'cancelled': '#ef4444', # 빨간색
         }
         return colors.get(self.status, '#6b7280')
+
+
+class BackfillCheckpoint(models.Model):
+    """증분 백필 작업의 진행 위치 (마지막으로 확인한 ID)"""
+
+    name = models.CharField(max_length=100, unique=True, verbose_name='작업 이름')
+    position = models.PositiveBigIntegerField(default=0, verbose_name='마지막 확인 ID')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = '백필 진행 위치'
+        verbose_name_plural = '백필 진행 위치'
+
+    def __str__(self):
+        return f"{self.name} @ {self.position}"
@@ -1,36 +1,89 @@
 from django.db import transaction
+from django.db.models import F
 from django.contrib.auth.models import User
+from myshop.rate_snapshot import get_snapshot_rate
 from products.models import Product, ProductOption, ProductOptionChoice
+from products.pricing import resolve_choice_price
+from .cart_hydration import hydrate_cart
 from .models import Cart, CartItem, Order, OrderItem, PurchaseHistory, Invoice
 import json
 import logging
-from django.core.mail.backends.smtp import EmailBackend
+from dataclasses import dataclass
+from typing import Dict, Tuple
 from django.core.mail import EmailMessage
 from django.utils import timezone
+from stores.email_outbox import queue_store_email
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class CartSnapshot:
+    """요청 단위로 한 번만 계산하는 장바구니 스냅샷"""
+    owner_key: Tuple
+    items: Tuple[dict, ...]
+    summary: Dict[str, int]
+
+    @classmethod
+    def build(cls, owner_key, items):
+        return cls(
+            owner_key=owner_key,
+            items=tuple(items),
+            summary={
+                'total_items': sum(item['quantity'] for item in items),
+                'total_amount': sum(item['total_price'] for item in items),
+                'items_count': len(items),
+            },
+        )
+
+
 class CartService:
     """
     하이브리드 장바구니 서비스
     - 로그인 사용자: DB 저장
     - 비로그인 사용자: 세션 저장
     - 로그인 시 세션 -> DB 자동 마이그레이션
+    - 조회 결과는 요청 객체에 스냅샷으로 저장되어 같은 요청의 모든 CartService 가 공유하고,
+      추가/수량 변경/삭제/비우기 시 무효화된다.
     """
+
+    SNAPSHOT_ATTR = '_cart_snapshot'
     
     def __init__(self, request):
         self.request = request
         self.user = request.user if hasattr(request, 'user') and request.user.is_authenticated else None
         self.session = request.session
+
+    def _snapshot_owner_key(self):
+        # 요청 도중 로그인/로그아웃으로 장바구니 주인이 바뀌면 스냅샷을 다시 계산
+        if self.user:
+            return ('user', self.user.pk)
+        return ('session', getattr(self.session, 'session_key', None))
+
+    def get_cart_snapshot(self):
+        """요청 단위 장바구니 스냅샷 (없거나 주인이 바뀌었으면 새로 계산)"""
+        owner_key = self._snapshot_owner_key()
+        snapshot = getattr(self.request, self.SNAPSHOT_ATTR, None)
+        if snapshot is not None and snapshot.owner_key == owner_key:
+            return snapshot
+
+        if self.user:
+            items = self._get_db_cart_items()
+        else:
+            items = self._get_session_cart_items()
+        snapshot = CartSnapshot.build(owner_key, items)
+        setattr(self.request, self.SNAPSHOT_ATTR, snapshot)
+        return snapshot
+
+    def invalidate_cart_snapshot(self):
+        """장바구니 변경 후 요청 단위 스냅샷 무효화"""
+        if hasattr(self.request, self.SNAPSHOT_ATTR):
+            delattr(self.request, self.SNAPSHOT_ATTR)
     
     def get_cart_items(self):
         """장바구니 아이템들 반환"""
         try:
-            if self.user:
-                return self._get_db_cart_items()
-            else:
-                return self._get_session_cart_items()
+            return list(self.get_cart_snapshot().items)
         except Exception as e:
             logger.warning(f"장바구니 아이템 조회 실패: {e}")
             return []
@@ -82,6 +135,8 @@ class CartService:
                 'success': False,
                 'error': '장바구니 추가 중 오류가 발생했습니다.'
             }
+        finally:
+            self.invalidate_cart_snapshot()
     
     def remove_from_cart(self, item_id):
         """장바구니에서 상품 제거"""
@@ -96,6 +151,8 @@ class CartService:
                 'success': False,
                 'error': '장바구니 삭제 중 오류가 발생했습니다.'
             }
+        finally:
+            self.invalidate_cart_snapshot()
     
     def update_cart_item(self, item_id, quantity):
         """장바구니 상품 수량 업데이트"""
@@ -113,6 +170,8 @@ class CartService:
                 'success': False,
                 'error': '수량 업데이트 중 오류가 발생했습니다.'
             }
+        finally:
+            self.invalidate_cart_snapshot()
     
     def clear_cart(self):
         """장바구니 비우기"""
@@ -129,19 +188,13 @@ class CartService:
                     self.session.modified = True
         except Exception as e:
             logger.error(f"장바구니 비우기 실패: {e}")
+        finally:
+            self.invalidate_cart_snapshot()
     
     def get_cart_summary(self):
         """장바구니 요약 정보 반환"""
         try:
-            items = self.get_cart_items()
-            total_items = sum(item['quantity'] for item in items)
-            total_amount = sum(item['total_price'] for item in items)
-            
-            return {
-                'total_items': total_items,
-                'total_amount': total_amount,
-                'items_count': len(items)
-            }
+            return dict(self.get_cart_snapshot().summary)
         except Exception as e:
             logger.error(f"장바구니 요약 조회 실패: {e}")
             return {
@@ -205,6 +258,8 @@ class CartService:
             
         except Exception as e:
             logger.error(f"장바구니 마이그레이션 실패: {e}")
+        finally:
+            self.invalidate_cart_snapshot()
     
     # === DB 카트 관련 메서드 ===
     
@@ -222,112 +277,93 @@ class CartService:
             base_price = product.public_price
         snapshot['frozen_product_price_sats'] = int(base_price or 0)
 
-        # 옵션 합산 가격
+        # 옵션 합산 가격 (선택지 일괄 조회)
         if selected_options:
-            from products.models import ProductOptionChoice
-            options_total = 0
-            for option_id, choice_id in selected_options.items():
-                try:
-                    choice = ProductOptionChoice.objects.get(id=choice_id)
-                    options_total += choice.public_price
-                except ProductOptionChoice.DoesNotExist:
-                    continue
+            choice_ids = [choice_id for choice_id in selected_options.values() if str(choice_id).isdigit()]
+            options_total = sum(
+                resolve_choice_price(choice, product)
+                for choice in ProductOptionChoice.objects.filter(id__in=choice_ids)
+            )
             snapshot['frozen_options_price_sats'] = int(options_total)
 
         # 원화 연동 상품은 당시 환율도 기록 (디버깅 및 추적용)
         if product.price_krw:
-            from myshop.models import ExchangeRate
-            try:
-                exchange_rate = ExchangeRate.objects.latest('created_at')
+            exchange_rate = get_snapshot_rate()
+            if exchange_rate:
                 snapshot['frozen_exchange_rate'] = float(exchange_rate.btc_krw_rate)
-            except ExchangeRate.DoesNotExist:
-                pass
 
         return snapshot
     
+    @staticmethod
+    def _build_options_display(option_entries, frozen_options_price):
+        """옵션 표시 정보 구성 (고정 옵션 가격이 있으면 현재 가격 비율로 분배)"""
+        options_display = []
+        if frozen_options_price is not None:
+            total_current_option_price = sum(entry['current_price'] for entry in option_entries)
+            for entry in option_entries:
+                if total_current_option_price > 0:
+                    frozen_price = int((entry['current_price'] / total_current_option_price) * frozen_options_price)
+                else:
+                    frozen_price = 0
+                options_display.append({
+                    'option_name': entry['option'].name,
+                    'choice_name': entry['choice'].name,
+                    'choice_price': frozen_price,
+                })
+        else:
+            for entry in option_entries:
+                options_display.append({
+                    'option_name': entry['option'].name,
+                    'choice_name': entry['choice'].name,
+                    'choice_price': entry['current_price'],
+                })
+        return options_display
+
     def _get_db_cart_items(self):
-        """DB에서 장바구니 아이템들 가져오기"""
+        """DB에서 장바구니 아이템들 가져오기 (아이템 수와 무관한 고정 쿼리 수)"""
         try:
             cart = Cart.objects.get(user=self.user)
-            items = []
-            
-            for cart_item in cart.items.all().select_related('product', 'product__store'):
-                # 옵션 정보 처리
-                options_display = []
-                if cart_item.selected_options:
-                    # 고정된 옵션 가격이 있는 경우 사용 (환율 고정)
-                    if cart_item.frozen_options_price_sats is not None:
-                        # 고정된 총 옵션 가격을 개별 옵션들에 비례적으로 분배
-                        total_current_option_price = 0
-                        option_prices = {}
-                        for option_id, choice_id in cart_item.selected_options.items():
-                            try:
-                                option = ProductOption.objects.get(id=option_id)
-                                choice = ProductOptionChoice.objects.get(id=choice_id)
-                                current_price = choice.public_price
-                                option_prices[(option_id, choice_id)] = {
-                                    'option': option,
-                                    'choice': choice,
-                                    'current_price': current_price
-                                }
-                                total_current_option_price += current_price
-                            except:
-                                pass
-                        
-                        # 비례적으로 고정 가격 분배
-                        for (option_id, choice_id), data in option_prices.items():
-                            if total_current_option_price > 0:
-                                frozen_price = int((data['current_price'] / total_current_option_price) * cart_item.frozen_options_price_sats)
-                            else:
-                                frozen_price = 0
-                            
-                            options_display.append({
-                                'option_name': data['option'].name,
-                                'choice_name': data['choice'].name,
-                                'choice_price': frozen_price
-                            })
-                    else:
-                        # 고정된 가격이 없으면 실시간 가격 사용
-                        for option_id, choice_id in cart_item.selected_options.items():
-                            try:
-                                option = ProductOption.objects.get(id=option_id)
-                                choice = ProductOptionChoice.objects.get(id=choice_id)
-                                options_display.append({
-                                    'option_name': option.name,
-                                    'choice_name': choice.name,
-                                    'choice_price': choice.public_price
-                                })
-                            except:
-                                pass
-                
-                # 상품 이미지 URL
-                product_image_url = None
-                if cart_item.product.images.first():
-                    product_image_url = cart_item.product.images.first().file_url
-                
-                items.append({
-                    'id': cart_item.id,
-                    'product_id': cart_item.product.id,
-                    'product_title': cart_item.product.title,
-                    'product_image_url': product_image_url,
-                    'quantity': cart_item.quantity,
-                    'unit_price': cart_item.unit_price,
-                    'total_price': cart_item.total_price,
-                    'selected_options': cart_item.selected_options,
-                    'options_display': options_display,
-                    'store_id': cart_item.product.store.store_id,
-                    'store_name': cart_item.product.store.store_name,
-                    'is_db_item': True,
-                    'force_free_shipping': cart_item.product.force_free_shipping,
-                    'frozen_product_price_sats': cart_item.frozen_product_price_sats,
-                    'frozen_options_price_sats': cart_item.frozen_options_price_sats,
-                    'frozen_exchange_rate': float(cart_item.frozen_exchange_rate) if cart_item.frozen_exchange_rate is not None else None,
-                })
-            
-            return items
-            
         except Cart.DoesNotExist:
             return []
+
+        cart_items = list(cart.items.all().select_related('product', 'product__store'))
+        hydration = hydrate_cart(
+            ((cart_item.product_id, cart_item.selected_options) for cart_item in cart_items),
+            products={cart_item.product_id: cart_item.product for cart_item in cart_items}.values(),
+        )
+
+        items = []
+        for cart_item in cart_items:
+            # select_related 로 아이템마다 따로 생긴 상품 인스턴스 대신 하이드레이션된 인스턴스 사용
+            product = hydration.get_product(cart_item.product_id)
+            option_entries = hydration.option_entries(cart_item.selected_options)
+
+            # 고정된 가격이 있으면 사용 (환율 고정), 없으면 실시간 가격 사용
+            if cart_item.frozen_product_price_sats is not None:
+                unit_price = cart_item.frozen_product_price_sats + (cart_item.frozen_options_price_sats or 0)
+            else:
+                unit_price = hydration.base_price(product) + sum(entry['current_price'] for entry in option_entries)
+
+            items.append({
+                'id': cart_item.id,
+                'product_id': product.id,
+                'product_title': product.title,
+                'product_image_url': hydration.image_url(product),
+                'quantity': cart_item.quantity,
+                'unit_price': unit_price,
+                'total_price': unit_price * (cart_item.quantity or 0),
+                'selected_options': cart_item.selected_options,
+                'options_display': self._build_options_display(option_entries, cart_item.frozen_options_price_sats),
+                'store_id': product.store.store_id,
+                'store_name': product.store.store_name,
+                'is_db_item': True,
+                'force_free_shipping': product.force_free_shipping,
+                'frozen_product_price_sats': cart_item.frozen_product_price_sats,
+                'frozen_options_price_sats': cart_item.frozen_options_price_sats,
+                'frozen_exchange_rate': float(cart_item.frozen_exchange_rate) if cart_item.frozen_exchange_rate is not None else None,
+            })
+
+        return items
     
     def _add_to_db_cart(self, product, quantity, selected_options):
         """DB 장바구니에 상품 추가"""
@@ -386,106 +422,73 @@ class CartService:
     # === 세션 카트 관련 메서드 ===
     
     def _get_session_cart_items(self):
-        """세션에서 장바구니 아이템들 가져오기"""
+        """세션에서 장바구니 아이템들 가져오기 (아이템 수와 무관한 고정 쿼리 수)"""
         cart_data = self.session.get('cart', {'items': []})
+        hydration = hydrate_cart(
+            (item_data['product_id'], item_data.get('selected_options')) for item_data in cart_data['items']
+        )
         items = []
+        normalized_snapshot = False
 
         for item_data in cart_data['items']:
-            try:
-                product = Product.objects.get(id=item_data['product_id'], is_active=True)
-
-                selected_options = item_data.get('selected_options') or {}
-                frozen_product_price = item_data.get('frozen_product_price_sats')
-                frozen_options_price = item_data.get('frozen_options_price_sats')
-
-                # 상품 기준 가격 (동결 값 우선)
-                if frozen_product_price is not None:
-                    base_price = frozen_product_price
-                else:
-                    if product.is_discounted and product.public_discounted_price:
-                        base_price = product.public_discounted_price
-                    else:
-                        base_price = product.public_price
-
-                # 옵션 정보 및 표시값 구성
-                option_price_entries = []
-                if selected_options:
-                    for option_id, choice_id in selected_options.items():
-                        try:
-                            option = ProductOption.objects.get(id=option_id)
-                            choice = ProductOptionChoice.objects.get(id=choice_id)
-                            option_price_entries.append({
-                                'option': option,
-                                'choice': choice,
-                                'current_price': choice.public_price,
-                            })
-                        except:
-                            continue
-
-                options_display = []
-                if option_price_entries:
-                    if frozen_options_price is not None:
-                        total_current_option_price = sum(entry['current_price'] for entry in option_price_entries)
-                        for entry in option_price_entries:
-                            if total_current_option_price > 0:
-                                frozen_price = int((entry['current_price'] / total_current_option_price) * frozen_options_price)
-                            else:
-                                frozen_price = 0
-                            options_display.append({
-                                'option_name': entry['option'].name,
-                                'choice_name': entry['choice'].name,
-                                'choice_price': frozen_price,
-                            })
-                    else:
-                        for entry in option_price_entries:
-                            options_display.append({
-                                'option_name': entry['option'].name,
-                                'choice_name': entry['choice'].name,
-                                'choice_price': entry['current_price'],
-                            })
-
-                if frozen_options_price is not None:
-                    options_total = frozen_options_price
-                else:
-                    options_total = sum(entry['current_price'] for entry in option_price_entries)
+            product = hydration.get_product(item_data['product_id'])
+            if product is None:
+                # 삭제되었거나 판매 중지된 상품
+                continue
 
-                base_price = int(base_price or 0)
-                options_total = int(options_total or 0)
-                unit_price = base_price + options_total
-                total_price = unit_price * item_data['quantity']
+            selected_options = item_data.get('selected_options') or {}
+            frozen_product_price = item_data.get('frozen_product_price_sats')
+            frozen_options_price = item_data.get('frozen_options_price_sats')
 
-                normalized_snapshot = False
-                if frozen_product_price is None:
-                    item_data['frozen_product_price_sats'] = base_price
-                    normalized_snapshot = True
-                if frozen_options_price is None:
-                    item_data['frozen_options_price_sats'] = options_total
-                    normalized_snapshot = True
-                if normalized_snapshot:
-                    self.session['cart'] = cart_data
-                    self.session.modified = True
+            # 상품 기준 가격 (동결 값 우선)
+            if frozen_product_price is not None:
+                base_price = frozen_product_price
+            else:
+                base_price = hydration.base_price(product)
 
-                items.append({
-                    'id': item_data['id'],
-                    'product_id': product.id,
-                    'product_title': product.title,
-                    'product_image_url': product.images.first().file_url if product.images.first() else None,
-                    'quantity': item_data['quantity'],
-                    'unit_price': unit_price,
-                    'total_price': total_price,
-                    'selected_options': selected_options,
-                    'options_display': options_display,
-                    'store_id': product.store.store_id,
-                    'store_name': product.store.store_name,
-                    'is_db_item': False,
-                    'force_free_shipping': product.force_free_shipping,
-                    'frozen_product_price_sats': base_price,
-                    'frozen_options_price_sats': options_total,
-                    'frozen_exchange_rate': item_data.get('frozen_exchange_rate'),
-                })
+            # 옵션 정보 및 표시값 구성
+            option_price_entries = hydration.option_entries(selected_options)
+            options_display = self._build_options_display(option_price_entries, frozen_options_price)
 
-            except Product.DoesNotExist:
-                continue
+            if frozen_options_price is not None:
+                options_total = frozen_options_price
+            else:
+                options_total = sum(entry['current_price'] for entry in option_price_entries)
+
+            base_price = int(base_price or 0)
+            options_total = int(options_total or 0)
+            unit_price = base_price + options_total
+            total_price = unit_price * item_data['quantity']
+
+            if frozen_product_price is None:
+                item_data['frozen_product_price_sats'] = base_price
+                normalized_snapshot = True
+            if frozen_options_price is None:
+                item_data['frozen_options_price_sats'] = options_total
+                normalized_snapshot = True
+
+            items.append({
+                'id': item_data['id'],
+                'product_id': product.id,
+                'product_title': product.title,
+                'product_image_url': hydration.image_url(product),
+                'quantity': item_data['quantity'],
+                'unit_price': unit_price,
+                'total_price': total_price,
+                'selected_options': selected_options,
+                'options_display': options_display,
+                'store_id': product.store.store_id,
+                'store_name': product.store.store_name,
+                'is_db_item': False,
+                'force_free_shipping': product.force_free_shipping,
+                'frozen_product_price_sats': base_price,
+                'frozen_options_price_sats': options_total,
+                'frozen_exchange_rate': item_data.get('frozen_exchange_rate'),
+            })
+
+        if normalized_snapshot:
+            self.session['cart'] = cart_data
+            self.session.modified = True
 
         return items
     
@@ -658,16 +661,6 @@ def send_order_notification_email(order):
             logger.debug(f"주문 {order.order_number}: 스토어 주인장 이메일 주소가 설정되지 않음")
             return False
             
-        # 스토어별 SMTP 설정
-        backend = EmailBackend(
-            host='smtp.gmail.com',
-            port=587,
-            username=store.email_host_user,
-            password=store.get_email_host_password(),
-            use_tls=True,
-            fail_silently=False,
-        )
-        
         # 이메일용 주문서 생성 (새로운 포맷터 사용)
         from .formatters import generate_email_order
         email_data = generate_email_order(order)
@@ -681,10 +674,10 @@ def send_order_notification_email(order):
             body=message,
             from_email=f'{store.email_from_display} <{store.email_host_user}>',
             to=[store.owner_email],
-            connection=backend
         )
         
-        email.send()
+        if queue_store_email(store, email, kind='order_owner_notification', dedupe_key=f"order_owner:{order.payment_id or order.order_number}:{store.id}") is None:
+            return False
         
         # 🛡️ 이메일 발송 성공 기록 (중복 방지용)
         if order.payment_id:
@@ -692,7 +685,7 @@ def send_order_notification_email(order):
             email_cache_key = f"order_email_sent_{order.payment_id}_{order.store.id}"
             cache.set(email_cache_key, True, timeout=86400)  # 24시간 보관
         
-        logger.info(f"주문 알림 이메일 발송 성공 - 주문: {order.order_number}, 수신: {store.owner_email}")
+        logger.info(f"주문 알림 이메일 발송 대기열 추가 - 주문: {order.order_number}, 수신: {store.owner_email}")
         return True
         
     except Exception as e:
@@ -728,15 +721,6 @@ def send_tracking_email_to_buyer(order):
         if not store.email_host_user or not store.email_host_password_encrypted:
             return False, '스토어 이메일 계정 정보가 설정되지 않아 발송할 수 없습니다.'
 
-        backend = EmailBackend(
-            host='smtp.gmail.com',
-            port=587,
-            username=store.email_host_user,
-            password=store.get_email_host_password(),
-            use_tls=True,
-            fail_silently=False,
-        )
-
         order_items = []
         for item in order.items.all():
             option_text = ''
@@ -779,23 +763,151 @@ def send_tracking_email_to_buyer(order):
             body=message,
             from_email=f'{store.email_from_display} <{store.email_host_user}>',
             to=[order.buyer_email],
-            connection=backend
         )
 
-        email.send()
-        logger.info("송장 안내 이메일 발송 성공 - 주문: %s, 수신: %s", order.order_number, order.buyer_email)
+        queue_store_email(store, email, kind='order_tracking')
+        logger.info("송장 안내 이메일 발송 대기열 추가 - 주문: %s, 수신: %s", order.order_number, order.buyer_email)
         return True, None
     except Exception as exc:
         logger.error("송장 안내 이메일 발송 실패 - 주문: %s, 오류: %s", order.order_number, exc)
         return False, '이메일 발송 중 오류가 발생했습니다.'
 
 
+def _snapshot_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def create_order_items_from_snapshot(order, cart_snapshot):
+    """결제 트랜잭션의 장바구니 스냅샷으로 주문 항목을 한 번에 만들고 재고를 줄인다 (호출자의 트랜잭션 안에서 실행)
+
+    - 상품/옵션은 종류별 쿼리 한 번으로 읽고 ``OrderItem`` 은 ``bulk_create`` 로 저장한다.
+    - 재고는 상품마다 ``stock_quantity >= 수량`` 조건부 ``F()`` UPDATE 한 번으로 줄인다. 상품 행을
+      먼저 잠그거나 ``Product.save()`` 하지 않으므로 잠금은 UPDATE 부터 커밋까지만 잡힌다.
+      교착을 피하려고 상품 ID 순서로 갱신한다.
+    - 재고가 모자란 상품은 0 으로 맞추고 ``stock_issues`` 에 남긴 뒤 주문은 그대로 진행한다.
+
+    Returns:
+        tuple: (항목 합계 금액, stock_issues)
+    """
+    store = order.store
+    lines = []
+    for item in cart_snapshot:
+        if item.get('store_id') and item.get('store_id') != store.store_id:
+            raise ValueError('장바구니 정보의 스토어와 트랜잭션 스토어가 일치하지 않습니다.')
+        if not item.get('product_id'):
+            raise ValueError('상품 정보가 누락된 항목이 있습니다.')
+        lines.append((item, _snapshot_int(item.get('product_id')), _snapshot_int(item.get('quantity'))))
+
+    products = Product.objects.filter(store=store).in_bulk({product_id for _, product_id, _ in lines})
+    option_ids, choice_ids = set(), set()
+    for item, product_id, quantity in lines:
+        if product_id not in products:
+            raise ValueError(f"상품({item.get('product_title') or item.get('product_id')})을 찾을 수 없습니다.")
+        if quantity <= 0:
+            raise ValueError('유효하지 않은 수량 값이 포함되어 있습니다.')
+        if not item.get('options_display'):
+            for option_id, choice_id in (item.get('selected_options') or {}).items():
+                option_ids.add(_snapshot_int(option_id))
+                choice_ids.add(_snapshot_int(choice_id))
+    options = ProductOption.objects.in_bulk(option_ids) if option_ids else {}
+    choices = (
+        ProductOptionChoice.objects.select_related('option__product').in_bulk(choice_ids) if choice_ids else {}
+    )
+
+    order_items = []
+    requested = {}
+    for item, product_id, quantity in lines:
+        product = products[product_id]
+        requested[product_id] = requested.get(product_id, 0) + quantity
+
+        options_display = item.get('options_display') or []
+        selected_options_map = {}
+        computed_options_price = 0
+        frozen_product_price = item.get('frozen_product_price_sats')
+        frozen_options_price = item.get('frozen_options_price_sats')
+
+        if options_display:
+            for option in options_display:
+                name = option.get('option_name')
+                choice = option.get('choice_name')
+                if name and choice:
+                    selected_options_map[name] = choice
+                if frozen_options_price is None:
+                    computed_options_price += _snapshot_int(option.get('choice_price'))
+        else:
+            raw_options = item.get('selected_options') or {}
+            for option_id, choice_id in raw_options.items():
+                option_obj = options.get(_snapshot_int(option_id))
+                choice_obj = choices.get(_snapshot_int(choice_id))
+                if option_obj is None or choice_obj is None:
+                    continue
+                selected_options_map[option_obj.name] = choice_obj.name
+                if frozen_options_price is None:
+                    computed_options_price += choice_obj.public_price
+
+        unit_price = _snapshot_int(item.get('unit_price'))
+
+        if frozen_options_price is not None:
+            options_price = max(_snapshot_int(frozen_options_price), 0)
+        else:
+            options_price = max(computed_options_price, 0)
+
+        if frozen_product_price is not None:
+            base_price = _snapshot_int(frozen_product_price)
+        else:
+            base_price = unit_price - options_price if unit_price > options_price else unit_price
+            if base_price <= 0:
+                fallback_price = (
+                    product.public_discounted_price
+                    if (product.is_discounted and product.public_discounted_price)
+                    else product.public_price
+                )
+                base_price = fallback_price or 0
+
+        order_items.append(OrderItem(
+            order=order,
+            product=product,
+            product_title=item.get('product_title') or product.title,
+            product_price=base_price,
+            quantity=quantity,
+            selected_options=selected_options_map,
+            options_price=max(options_price, 0),
+        ))
+
+    OrderItem.objects.bulk_create(order_items)
+
+    now = timezone.now()
+    stock_issues = []
+    for product_id in sorted(requested):
+        quantity = requested[product_id]
+        decreased = Product.objects.filter(pk=product_id, stock_quantity__gte=quantity).update(
+            stock_quantity=F('stock_quantity') - quantity,
+            updated_at=now,
+        )
+        if decreased:
+            continue
+        # 재고 부족 시에는 재고를 0으로 맞춘 뒤 그대로 진행한다.
+        available = Product.objects.filter(pk=product_id).values_list('stock_quantity', flat=True).first() or 0
+        Product.objects.filter(pk=product_id).update(stock_quantity=0, updated_at=now)
+        stock_issues.append({
+            'product_id': product_id,
+            'product_title': products[product_id].title,
+            'requested': quantity,
+            'available': available,
+        })
+
+    return sum(order_item.total_price for order_item in order_items), stock_issues
+
 
 def restore_order_from_payment_transaction(payment_transaction, *, operator=None):
     """수동으로 결제 트랜잭션을 주문으로 복구한다."""
     from django.contrib.auth import get_user_model
     from django.utils import timezone
     from ln_payment.models import PaymentStageLog, OrderItemReservation, PaymentTransaction
+    from ln_payment.stock_reservations import transition_reservations
     from ln_payment.services import PaymentStage
 
     metadata = payment_transaction.metadata if isinstance(payment_transaction.metadata, dict) else {}
@@ -845,8 +957,6 @@ def restore_order_from_payment_transaction(payment_transaction, *, operator=None
     now = timezone.now()
     operator_label = getattr(operator, 'username', None) or getattr(operator, 'email', None)
 
-    stock_issues = []
-
     with transaction.atomic():
         payment_completed = payment_transaction.stage_logs.filter(
             stage=PaymentStage.USER_PAYMENT,
@@ -887,87 +997,7 @@ def restore_order_from_payment_transaction(payment_transaction, *, operator=None
             paid_at=payment_transaction.updated_at or now,
         )
 
-        computed_subtotal = 0
-
-        for item in cart_snapshot:
-            if item.get('store_id') and item.get('store_id') != store.store_id:
-                raise ValueError('장바구니 정보의 스토어와 트랜잭션 스토어가 일치하지 않습니다.')
-
-            product_id = item.get('product_id')
-            if not product_id:
-                raise ValueError('상품 정보가 누락된 항목이 있습니다.')
-
-            product = Product.objects.select_for_update().filter(id=product_id, store=store).first()
-            if not product:
-                raise ValueError(f"상품({item.get('product_title') or product_id})을 찾을 수 없습니다.")
-
-            quantity = _to_int(item.get('quantity'))
-            if quantity <= 0:
-                raise ValueError('유효하지 않은 수량 값이 포함되어 있습니다.')
-
-            if quantity > 0:
-                if not product.decrease_stock(quantity):
-                    stock_issues.append({
-                        'product_id': product.id,
-                        'product_title': product.title,
-                        'requested': quantity,
-                        'available': product.stock_quantity,
-                    })
-                    # 재고 부족 시에는 재고를 0으로 맞춘 뒤 그대로 진행한다.
-                    product.stock_quantity = 0
-                    product.save(update_fields=['stock_quantity'])
-
-            options_display = item.get('options_display') or []
-            selected_options_map = {}
-            computed_options_price = 0
-            frozen_product_price = item.get('frozen_product_price_sats')
-            frozen_options_price = item.get('frozen_options_price_sats')
-
-            if options_display:
-                for option in options_display:
-                    name = option.get('option_name')
-                    choice = option.get('choice_name')
-                    if name and choice:
-                        selected_options_map[name] = choice
-                    if frozen_options_price is None:
-                        computed_options_price += _to_int(option.get('choice_price'))
-            else:
-                raw_options = item.get('selected_options') or {}
-                for option_id, choice_id in raw_options.items():
-                    try:
-                        option_obj = ProductOption.objects.get(id=option_id)
-                        choice_obj = ProductOptionChoice.objects.get(id=choice_id)
-                        selected_options_map[option_obj.name] = choice_obj.name
-                        if frozen_options_price is None:
-                            computed_options_price += choice_obj.public_price
-                    except (ProductOption.DoesNotExist, ProductOptionChoice.DoesNotExist):
-                        continue
-
-            unit_price = _to_int(item.get('unit_price'))
-
-            if frozen_options_price is not None:
-                options_price = max(_to_int(frozen_options_price), 0)
-            else:
-                options_price = max(computed_options_price, 0)
-
-            if frozen_product_price is not None:
-                base_price = _to_int(frozen_product_price)
-            else:
-                base_price = unit_price - options_price if unit_price > options_price else unit_price
-                if base_price <= 0:
-                    fallback_price = product.public_discounted_price if (product.is_discounted and product.public_discounted_price) else product.public_price
-                    base_price = fallback_price or 0
-
-            order_item = OrderItem.objects.create(
-                order=order,
-                product=product,
-                product_title=item.get('product_title') or product.title,
-                product_price=base_price,
-                quantity=quantity,
-                selected_options=selected_options_map,
-                options_price=max(options_price, 0),
-            )
-            computed_subtotal += order_item.total_price
+        computed_subtotal, stock_issues = create_order_items_from_snapshot(order, cart_snapshot)
 
         if computed_subtotal <= 0:
             raise ValueError('주문 금액을 계산할 수 없습니다.')
@@ -991,8 +1021,9 @@ def restore_order_from_payment_transaction(payment_transaction, *, operator=None
                 },
             )
 
-        OrderItemReservation.objects.filter(transaction=payment_transaction).update(
-            status=OrderItemReservation.STATUS_CONVERTED,
+        transition_reservations(
+            OrderItemReservation.objects.filter(transaction=payment_transaction),
+            OrderItemReservation.STATUS_CONVERTED,
         )
 
         payment_transaction.order = order
@@ -1061,6 +1092,7 @@ def finalize_order_from_payment_transaction(payment_transaction, *, source='blin
     from django.contrib.auth import get_user_model
     from django.utils import timezone
     from ln_payment.models import OrderItemReservation, PaymentStageLog, PaymentTransaction
+    from ln_payment.stock_reservations import transition_reservations
     from ln_payment.services import PaymentStage
 
     def _to_int(value):
@@ -1108,8 +1140,9 @@ def finalize_order_from_payment_transaction(payment_transaction, *, source='blin
                 },
             )
 
-            OrderItemReservation.objects.filter(transaction=locked_tx).update(
-                status=OrderItemReservation.STATUS_CONVERTED,
+            transition_reservations(
+                OrderItemReservation.objects.filter(transaction=locked_tx),
+                OrderItemReservation.STATUS_CONVERTED,
             )
             locked_tx.order = existing_order
             locked_tx.status = PaymentTransaction.STATUS_COMPLETED
@@ -1160,7 +1193,6 @@ def finalize_order_from_payment_transaction(payment_transaction, *, source='blin
         total_hint = _to_int(metadata.get('total_sats'))
 
         now = timezone.now()
-        stock_issues = []
 
         if not locked_tx.stage_logs.filter(
             stage=PaymentStage.USER_PAYMENT,
@@ -1194,89 +1226,7 @@ def finalize_order_from_payment_transaction(payment_transaction, *, source='blin
             paid_at=locked_tx.updated_at or now,
         )
 
-        computed_subtotal = 0
-
-        for item in cart_snapshot:
-            if item.get('store_id') and item.get('store_id') != store.store_id:
-                raise ValueError('장바구니 정보의 스토어와 트랜잭션 스토어가 일치하지 않습니다.')
-
-            product_id = item.get('product_id')
-            if not product_id:
-                raise ValueError('상품 정보가 누락된 항목이 있습니다.')
-
-            product = Product.objects.select_for_update().filter(id=product_id, store=store).first()
-            if not product:
-                raise ValueError(f"상품({item.get('product_title') or product_id})을 찾을 수 없습니다.")
-
-            quantity = _to_int(item.get('quantity'))
-            if quantity <= 0:
-                raise ValueError('유효하지 않은 수량 값이 포함되어 있습니다.')
-
-            if not product.decrease_stock(quantity):
-                stock_issues.append({
-                    'product_id': product.id,
-                    'product_title': product.title,
-                    'requested': quantity,
-                    'available': product.stock_quantity,
-                })
-                product.stock_quantity = 0
-                product.save(update_fields=['stock_quantity'])
-
-            options_display = item.get('options_display') or []
-            selected_options_map = {}
-            computed_options_price = 0
-            frozen_product_price = item.get('frozen_product_price_sats')
-            frozen_options_price = item.get('frozen_options_price_sats')
-
-            if options_display:
-                for option in options_display:
-                    name = option.get('option_name')
-                    choice = option.get('choice_name')
-                    if name and choice:
-                        selected_options_map[name] = choice
-                    if frozen_options_price is None:
-                        computed_options_price += _to_int(option.get('choice_price'))
-            else:
-                raw_options = item.get('selected_options') or {}
-                for option_id, choice_id in raw_options.items():
-                    try:
-                        option_obj = ProductOption.objects.get(id=option_id)
-                        choice_obj = ProductOptionChoice.objects.get(id=choice_id)
-                        selected_options_map[option_obj.name] = choice_obj.name
-                        if frozen_options_price is None:
-                            computed_options_price += choice_obj.public_price
-                    except (ProductOption.DoesNotExist, ProductOptionChoice.DoesNotExist):
-                        continue
-
-            unit_price = _to_int(item.get('unit_price'))
-
-            if frozen_options_price is not None:
-                options_price = max(_to_int(frozen_options_price), 0)
-            else:
-                options_price = max(computed_options_price, 0)
-
-            if frozen_product_price is not None:
-                base_price = _to_int(frozen_product_price)
-            else:
-                base_price = unit_price - options_price if unit_price > options_price else unit_price
-                if base_price <= 0:
-                    fallback_price = (
-                        product.public_discounted_price
-                        if (product.is_discounted and product.public_discounted_price)
-                        else product.public_price
-                    )
-                    base_price = fallback_price or 0
-
-            order_item = OrderItem.objects.create(
-                order=order,
-                product=product,
-                product_title=item.get('product_title') or product.title,
-                product_price=base_price,
-                quantity=quantity,
-                selected_options=selected_options_map,
-                options_price=max(options_price, 0),
-            )
-            computed_subtotal += order_item.total_price
+        computed_subtotal, stock_issues = create_order_items_from_snapshot(order, cart_snapshot)
 
         if computed_subtotal <= 0:
             raise ValueError('주문 금액을 계산할 수 없습니다.')
@@ -1299,8 +1249,9 @@ def finalize_order_from_payment_transaction(payment_transaction, *, source='blin
             },
         )
 
-        OrderItemReservation.objects.filter(transaction=locked_tx).update(
-            status=OrderItemReservation.STATUS_CONVERTED,
+        transition_reservations(
+            OrderItemReservation.objects.filter(transaction=locked_tx),
+            OrderItemReservation.STATUS_CONVERTED,
         )
 
         locked_tx.order = order
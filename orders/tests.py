@@ -1,8 +1,25 @@
-from django.contrib.auth.models import User
+from datetime import timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.db import connection
+from django.http import HttpResponse
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ln_payment.models import PaymentTransaction
 
+from myshop import rate_snapshot
+from myshop.models import ExchangeRate
+from orders import free_order_transactions
+from orders.models import BackfillCheckpoint, Cart, CartItem, Order, OrderItem
+from orders.services import CartService, finalize_order_from_payment_transaction
 from orders.views import calculate_store_totals
-from products.models import Product
+from products.models import Product, ProductImage, ProductOption, ProductOptionChoice
 from stores.models import Store
 
 
@@ -57,3 +74,411 @@ class ShippingOverrideTests(TestCase):
         self.assertEqual(product.public_shipping_fee, 0)
         self.assertEqual(product.display_shipping_fee, 0)
         self.assertEqual(product.shipping_fee_display(), '배송비 무료')
+
+
+class _Session(dict):
+    modified = False
+
+
+class CartFixtureMixin:
+    def setUp(self):
+        rate_snapshot.invalidate_rate_snapshot()
+        self.addCleanup(rate_snapshot.invalidate_rate_snapshot)
+        with self.captureOnCommitCallbacks(execute=True):
+            ExchangeRate.objects.create(btc_krw_rate=Decimal('100000000'), api_response_data={})
+        self.owner = User.objects.create_user(username='owner', password='test-pass')
+        self.buyer = User.objects.create_user(username='buyer', password='test-pass')
+        self.store = Store.objects.create(
+            store_id='cartstore',
+            store_name='장바구니 스토어',
+            owner_name='홍길동',
+            chat_channel='https://t.me/example',
+            owner=self.owner,
+        )
+
+    def _create_cart_entries(self, count):
+        entries = []
+        for index in range(count):
+            product = Product.objects.create(
+                store=self.store,
+                title=f'상품 {index}',
+                description='테스트 상품',
+                price=1,
+                price_krw=10_000,
+                price_display='krw',
+                stock_quantity=10,
+            )
+            ProductImage.objects.create(
+                product=product,
+                original_name='image.webp',
+                file_path=f'products/{index}.webp',
+                file_url=f'https://cdn.example.com/products/{index}.webp',
+            )
+            option = ProductOption.objects.create(product=product, name='사이즈')
+            choice = ProductOptionChoice.objects.create(option=option, name='L', price=0, price_krw=1_000)
+            entries.append((product, {str(option.id): str(choice.id)}))
+        return entries
+
+    def _session_service(self, entries):
+        session = _Session(cart={'items': [
+            {'id': f'session_{index}', 'product_id': product.id, 'quantity': 2, 'selected_options': selected_options}
+            for index, (product, selected_options) in enumerate(entries)
+        ]})
+        return CartService(SimpleNamespace(user=AnonymousUser(), session=session))
+
+    def _db_service(self, entries):
+        cart, _ = Cart.objects.get_or_create(user=self.buyer)
+        cart.items.all().delete()
+        for product, selected_options in entries:
+            CartItem.objects.create(
+                cart=cart,
+                product=product,
+                quantity=2,
+                selected_options=selected_options,
+                frozen_product_price_sats=None,
+            )
+        return CartService(SimpleNamespace(user=self.buyer, session=_Session()))
+
+    def _count_queries(self, service):
+        rate_snapshot.get_rate_snapshot()
+        with CaptureQueriesContext(connection) as queries:
+            items = service.get_cart_items()
+        return len(queries), items
+
+
+class CartHydrationQueryCountTests(CartFixtureMixin, TestCase):
+    CART_SIZES = (1, 10, 50)
+
+    def test_session_cart_query_count_is_constant(self):
+        for size in self.CART_SIZES:
+            with self.subTest(size=size):
+                Product.objects.all().delete()
+                query_count, items = self._count_queries(self._session_service(self._create_cart_entries(size)))
+
+                self.assertEqual(query_count, 4)
+                self.assertEqual(len(items), size)
+                self.assertEqual(items[0]['unit_price'], 11_000)
+                self.assertEqual(items[0]['total_price'], 22_000)
+                self.assertEqual(items[0]['options_display'][0]['choice_price'], 1_000)
+                self.assertTrue(items[0]['product_image_url'].startswith('https://cdn.example.com/'))
+
+    def test_db_cart_query_count_is_constant(self):
+        for size in self.CART_SIZES:
+            with self.subTest(size=size):
+                Product.objects.all().delete()
+                query_count, items = self._count_queries(self._db_service(self._create_cart_entries(size)))
+
+                self.assertEqual(query_count, 5)
+                self.assertEqual(len(items), size)
+                self.assertEqual(items[0]['unit_price'], 11_000)
+                self.assertEqual(items[0]['options_display'][0]['choice_name'], 'L')
+                self.assertTrue(items[0]['product_image_url'].startswith('https://cdn.example.com/'))
+
+    def test_inactive_products_are_skipped_in_session_cart(self):
+        entries = self._create_cart_entries(2)
+        Product.objects.filter(id=entries[0][0].id).update(is_active=False)
+
+        items = self._session_service(entries).get_cart_items()
+
+        self.assertEqual([item['product_id'] for item in items], [entries[1][0].id])
+
+
+class CartSnapshotTests(CartFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.product, self.selected_options = self._create_cart_entries(1)[0]
+        rate_snapshot.get_rate_snapshot()
+
+    def test_services_in_same_request_share_snapshot(self):
+        request = SimpleNamespace(user=AnonymousUser(), session=_Session(cart={'items': [
+            {'id': 'session_1', 'product_id': self.product.id, 'quantity': 3, 'selected_options': self.selected_options},
+        ]}))
+
+        with self.assertNumQueries(4):
+            summary = CartService(request).get_cart_summary()
+        with self.assertNumQueries(0):
+            items = CartService(request).get_cart_items()
+            header_summary = CartService(request).get_cart_summary()
+
+        self.assertEqual(summary, {'total_items': 3, 'total_amount': 33_000, 'items_count': 1})
+        self.assertEqual(header_summary, summary)
+        self.assertEqual(len(items), 1)
+
+    def test_mutations_invalidate_snapshot(self):
+        request = SimpleNamespace(user=self.buyer, session=_Session())
+        service = CartService(request)
+        self.assertEqual(service.get_cart_summary()['total_items'], 0)
+
+        added = service.add_to_cart(self.product.id, 2, self.selected_options)
+        self.assertTrue(added['success'])
+        self.assertEqual(CartService(request).get_cart_summary()['total_items'], 2)
+
+        service.update_cart_item(added['item_id'], 5)
+        self.assertEqual(CartService(request).get_cart_summary()['total_items'], 5)
+
+        service.remove_from_cart(added['item_id'])
+        self.assertEqual(CartService(request).get_cart_items(), [])
+
+        service.add_to_cart(self.product.id, 1, self.selected_options)
+        self.assertEqual(CartService(request).get_cart_summary()['items_count'], 1)
+        service.clear_cart()
+        self.assertEqual(CartService(request).get_cart_summary()['items_count'], 0)
+
+
+class OrderExportStreamingTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='test-pass')
+        self.store = Store.objects.create(
+            store_id='exportstore',
+            store_name='내보내기 스토어',
+            owner_name='홍길동',
+            chat_channel='https://t.me/example',
+            owner=self.owner,
+        )
+        self.product = Product.objects.create(
+            store=self.store,
+            title='내보내기 상품',
+            description='테스트 상품',
+            price=1000,
+        )
+        self.client.force_login(self.owner)
+        self.order_count = 0
+
+    def _create_orders(self, count, **order_fields):
+        orders = Order.objects.bulk_create([
+            Order(
+                order_number=f'EXPORT-{self.order_count + index:05d}',
+                user=self.owner,
+                store=self.store,
+                status='paid',
+                buyer_name=f'구매자 {index}',
+                buyer_phone='01012345678',
+                buyer_email='buyer@example.com',
+                shipping_postal_code='04524',
+                shipping_address='서울시 중구',
+                shipping_detail_address='101호',
+                subtotal=1000,
+                shipping_fee=0,
+                total_amount=1000,
+                **order_fields,
+            )
+            for index in range(count)
+        ])
+        self.order_count += count
+        OrderItem.objects.bulk_create([
+            OrderItem(
+                order=order,
+                product=self.product,
+                product_title=self.product.title,
+                product_price=1000,
+                quantity=1,
+                selected_options={'색상': '빨강'},
+            )
+            for order in orders
+        ])
+
+    def _download(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+            self.assertTrue(response.streaming)
+            content = b''.join(response.streaming_content).decode('utf-8')
+        return content, len(queries)
+
+    def test_store_export_streams_rows_with_constant_queries(self):
+        url = reverse('orders:export_orders_csv', args=[self.store.store_id])
+        self._create_orders(5)
+        content, small_queries = self._download(url)
+        self._create_orders(45)
+        content, large_queries = self._download(url)
+
+        self.assertTrue(content.startswith('\ufeff주문번호,상품명'))
+        lines = content.strip().splitlines()
+        self.assertEqual(len(lines), 51)
+        self.assertIn('"=""01012345678"""', lines[1])
+        # 주문 수와 관계없이 조회 쿼리 수가 같음 (주문 항목 + 결제 트랜잭션 prefetch)
+        self.assertEqual(small_queries, large_queries)
+
+    def test_product_export_applies_filter_and_hides_pickup_address(self):
+        self._create_orders(3, delivery_status='pickup')
+        url = reverse('orders:export_product_orders_csv', args=[self.store.store_id, self.product.id])
+
+        content, _ = self._download(f'{url}?filter=this_month')
+
+        lines = content.strip().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertIn('색상: 빨강', lines[1])
+        self.assertNotIn('서울시 중구', content)
+
+
+class FreeOrderTransactionBackfillTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='test-pass')
+        self.store = Store.objects.create(
+            store_id='freestore',
+            store_name='무료 스토어',
+            owner_name='홍길동',
+            chat_channel='https://t.me/example',
+            owner=self.owner,
+        )
+        self.product = Product.objects.create(store=self.store, title='무료 상품', description='테스트', price=0)
+        self.client.force_login(self.owner)
+
+    def _create_orders(self, count, *, total_amount=0, age=timedelta(hours=1)):
+        orders = []
+        for _ in range(count):
+            order = Order.objects.create(
+                user=self.owner,
+                store=self.store,
+                status='paid',
+                buyer_name='구매자',
+                buyer_phone='01012345678',
+                buyer_email='buyer@example.com',
+                shipping_postal_code='04524',
+                shipping_address='서울시 중구',
+                shipping_detail_address='101호',
+                subtotal=total_amount,
+                shipping_fee=0,
+                total_amount=total_amount,
+            )
+            OrderItem.objects.create(
+                order=order,
+                product=self.product,
+                product_title=self.product.title,
+                product_price=total_amount,
+                quantity=2,
+            )
+            orders.append(order)
+        Order.objects.filter(pk__in=[order.pk for order in orders]).update(created_at=timezone.now() - age)
+        return orders
+
+    def test_backfill_resumes_from_high_water_mark(self):
+        tracked = self._create_orders(1)[0]
+        free_order_transactions.create_free_order_transaction(tracked)
+        self._create_orders(2, total_amount=1000)
+        untracked = self._create_orders(3)
+        recent = self._create_orders(1, age=timedelta(seconds=0))[0]
+
+        result = free_order_transactions.backfill_free_order_transactions(batch_size=4)
+        self.assertEqual((result.scanned, result.created), (4, 1))
+        result = free_order_transactions.backfill_free_order_transactions(batch_size=4)
+        self.assertEqual((result.scanned, result.created), (2, 2))
+
+        # 위치 이후 주문만 보므로, 따라잡은 뒤에는 쿼리 수가 이력 크기와 무관
+        self.assertEqual(
+            BackfillCheckpoint.objects.get(name=free_order_transactions.CHECKPOINT_NAME).position,
+            untracked[-1].pk,
+        )
+        with CaptureQueriesContext(connection) as queries:
+            result = free_order_transactions.backfill_free_order_transactions(batch_size=4)
+        self.assertEqual(result.scanned, 0)
+        self.assertLessEqual(len(queries), 4)
+
+        transactions = PaymentTransaction.objects.filter(store=self.store, order__total_amount=0)
+        self.assertEqual(transactions.count(), 4)
+        self.assertFalse(transactions.filter(order=recent).exists())
+        snapshot = transactions.get(order=untracked[0]).metadata['cart_snapshot']
+        self.assertEqual([(item['product_id'], item['quantity']) for item in snapshot], [(self.product.id, 2)])
+
+    def _transactions_page_queries(self):
+        with mock.patch('orders.views.render', return_value=HttpResponse()) as render:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse('orders:payment_transactions', args=[self.store.store_id]))
+        self.assertEqual(response.status_code, 200)
+        return len(queries), render.call_args.args[2]
+
+    def test_payment_transactions_view_is_read_only_with_constant_queries(self):
+        for order in self._create_orders(5):
+            free_order_transactions.create_free_order_transaction(order)
+        small_history_queries, _ = self._transactions_page_queries()
+
+        for order in self._create_orders(45):
+            free_order_transactions.create_free_order_transaction(order)
+        # 트랜잭션이 없는 예전 무료 주문이 있어도 조회 화면은 만들지 않음
+        self._create_orders(20)
+        large_history_queries, context = self._transactions_page_queries()
+
+        self.assertEqual(large_history_queries, small_history_queries)
+        self.assertEqual(context['summary']['total'], 50)
+        self.assertEqual(PaymentTransaction.objects.filter(store=self.store).count(), 50)
+
+
+class OrderFinalizationTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='test-pass', email='owner@example.com')
+        self.store = Store.objects.create(
+            store_id='finalstore',
+            store_name='확정 스토어',
+            owner_name='홍길동',
+            chat_channel='https://t.me/example',
+            owner=self.owner,
+        )
+        self.shirt = Product.objects.create(store=self.store, title='셔츠', description='테스트', price=1000, stock_quantity=5)
+        self.cap = Product.objects.create(store=self.store, title='모자', description='테스트', price=500, stock_quantity=1)
+        option = ProductOption.objects.create(product=self.shirt, name='사이즈')
+        self.choice = ProductOptionChoice.objects.create(option=option, name='L', price=200)
+        self.option = option
+
+    def _transaction(self, cart_snapshot):
+        return PaymentTransaction.objects.create(
+            user=self.owner,
+            store=self.store,
+            amount_sats=0,
+            status=PaymentTransaction.STATUS_PROCESSING,
+            payment_hash='f' * 64,
+            metadata={
+                'shipping': {'buyer_name': '구매자', 'buyer_email': 'owner@example.com', 'pickup_requested': True},
+                'cart_snapshot': cart_snapshot,
+            },
+        )
+
+    def test_finalize_bulk_creates_items_and_decrements_stock_per_product(self):
+        tx = self._transaction([
+            {'product_id': self.shirt.id, 'product_title': '셔츠', 'quantity': 2, 'unit_price': 1200,
+             'selected_options': {str(self.option.id): str(self.choice.id)}, 'store_id': self.store.store_id},
+            {'product_id': self.shirt.id, 'product_title': '셔츠', 'quantity': 1, 'unit_price': 1000,
+             'store_id': self.store.store_id},
+            {'product_id': self.cap.id, 'product_title': '모자', 'quantity': 3, 'unit_price': 500,
+             'store_id': self.store.store_id},
+        ])
+
+        with CaptureQueriesContext(connection) as queries:
+            order = finalize_order_from_payment_transaction(tx)
+
+        item_inserts = [q for q in queries.captured_queries if q['sql'].startswith('INSERT INTO "orders_orderitem"')]
+        stock_updates = [
+            q for q in queries.captured_queries
+            if q['sql'].startswith('UPDATE "products_product"') and 'stock_quantity' in q['sql']
+        ]
+        self.assertEqual(len(item_inserts), 1)
+        self.assertEqual(len(stock_updates), 3)  # 셔츠 1회, 모자 조건부 실패 후 0 으로 1회
+
+        items = list(order.items.order_by('id').values_list(
+            'product_id', 'quantity', 'product_price', 'options_price', 'selected_options',
+        ))
+        self.assertEqual(items, [
+            (self.shirt.id, 2, 1000, 200, {'사이즈': 'L'}),
+            (self.shirt.id, 1, 1000, 0, {}),
+            (self.cap.id, 3, 500, 0, {}),
+        ])
+        self.assertEqual(order.subtotal, 2 * 1200 + 1000 + 3 * 500)
+
+        self.shirt.refresh_from_db()
+        self.cap.refresh_from_db()
+        self.assertEqual((self.shirt.stock_quantity, self.cap.stock_quantity), (2, 0))
+        tx.refresh_from_db()
+        self.assertEqual(tx.metadata['stock_issues'], [
+            {'product_id': self.cap.id, 'product_title': '모자', 'requested': 3, 'available': 1},
+        ])
+
+    def test_finalize_rejects_unknown_product_without_side_effects(self):
+        tx = self._transaction([
+            {'product_id': self.shirt.id, 'quantity': 1, 'unit_price': 1000, 'store_id': self.store.store_id},
+            {'product_id': 999999, 'product_title': '없는 상품', 'quantity': 1, 'unit_price': 1000},
+        ])
+
+        with self.assertRaisesMessage(ValueError, '없는 상품'):
+            finalize_order_from_payment_transaction(tx)
+
+        self.shirt.refresh_from_db()
+        self.assertEqual(self.shirt.stock_quantity, 5)
+        self.assertFalse(Order.objects.exists())
@@ -10,13 +10,14 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 from django.urls import reverse
 from django.conf import settings
-import csv
 import json
 import logging
 
 from stores.models import Store
 from products.models import Product, ProductOption, ProductOptionChoice
 from myshop.models import SiteSettings
+from myshop.streaming_export import QUERYSET_CHUNK_SIZE, csv_streaming_response, xlsx_file_response
+from .free_order_transactions import create_free_order_transaction
 from .models import Cart, CartItem, Order, OrderItem, PurchaseHistory, Invoice
 from .payment_utils import calculate_store_totals, calculate_totals, group_cart_items
 from .services import (
@@ -29,6 +30,7 @@ from .services import (
 )
 from stores.decorators import store_owner_required
 from ln_payment.blink_service import get_blink_service_for_store
+from ln_payment.dashboard import transaction_dashboard
 from ln_payment.models import PaymentTransaction
 from ln_payment.services import PaymentStage
 
@@ -53,81 +55,6 @@ TRANSACTION_STAGE_DESCRIPTIONS = {
 FREE_ORDER_STATUS_DESCRIPTION = '무료 주문입니다. 결제 정보가 없습니다.'
 
 
-def _ensure_free_order_payment_transactions(store):
-    """무료 주문(0 sats)이 결제 트랜잭션 목록에 보이도록 백필한다."""
-    free_orders = (
-        Order.objects.filter(
-            store=store,
-            total_amount=0,
-        )
-        .select_related('user', 'store')
-        .prefetch_related('items', 'items__product', 'items__product__images')
-    )
-
-    for order in free_orders:
-        if PaymentTransaction.objects.filter(store=store, order=order).exists():
-            continue
-
-        pickup_requested = order.delivery_status == 'pickup'
-        shipping_data = {
-            'buyer_name': order.buyer_name,
-            'buyer_phone': order.buyer_phone,
-            'buyer_email': order.buyer_email,
-            'shipping_postal_code': order.shipping_postal_code,
-            'shipping_address': order.shipping_address,
-            'shipping_detail_address': order.shipping_detail_address,
-            'order_memo': order.order_memo,
-            'pickup_requested': pickup_requested,
-        }
-
-        cart_snapshot = []
-        for item in order.items.all():
-            product = item.product
-            product_image_url = None
-            if product and getattr(product, 'images', None):
-                first_image = product.images.first()
-                if first_image:
-                    product_image_url = first_image.file_url
-
-            options_display = item.selected_options if isinstance(item.selected_options, dict) else {}
-
-            cart_snapshot.append({
-                'id': None,
-                'product_id': product.id if product else None,
-                'product_title': item.product_title,
-                'product_image_url': product_image_url,
-                'quantity': item.quantity,
-                'unit_price': item.unit_price,
-                'total_price': item.total_price,
-                'selected_options': {},
-                'options_display': options_display,
-                'store_id': store.store_id,
-                'store_name': store.store_name,
-            })
-
-        PaymentTransaction.objects.create(
-            user=order.user,
-            store=store,
-            order=order,
-            amount_sats=0,
-            currency=PaymentTransaction.CURRENCY_BTC,
-            status=PaymentTransaction.STATUS_COMPLETED,
-            current_stage=PaymentStage.ORDER_FINALIZE,
-            payment_hash='',
-            payment_request='',
-            metadata={
-                'free_order': True,
-                'shipping': shipping_data,
-                'cart_snapshot': cart_snapshot,
-                'subtotal_sats': 0,
-                'shipping_fee_sats': 0,
-                'total_sats': 0,
-                'detail_source': 'orders',
-                'payment_id': order.payment_id,
-            },
-        )
-
-
 def _is_manual_restored(order):
     cache = getattr(order, 'manual_restored', None)
     if cache is not None:
@@ -488,7 +415,7 @@ def order_management(request, store_id):
     store = get_object_or_404(Store, store_id=store_id, owner=request.user, deleted_at__isnull=True)
     
     # 현재 월 파라미터 처리
-    from datetime import datetime
+    from datetime import datetime, timedelta
     import calendar
     
     year = int(request.GET.get('year', timezone.now().year))
@@ -521,45 +448,28 @@ def order_management(request, store_id):
     show_prev = not (prev_year < store_year or (prev_year == store_year and prev_month < store_month))
     show_next = not (next_year > current_year or (next_year == current_year and next_month > current_month))
     
-    # 선택된 월 통계
-    monthly_orders = Order.objects.filter(
-        items__product__store=store,
-        created_at__gte=month_start,
-        created_at__lt=month_end
-    ).distinct()
-    
-    monthly_orders_count = monthly_orders.count()
-    monthly_revenue = monthly_orders.aggregate(
-        total=Sum('total_amount')
-    )['total'] or 0
-    
+    # 선택된 월 통계 (일별 판매 집계 합산)
+    from stores.models import DailySalesRollup
+    from stores.sales_rollup import STORE_TOTAL, sales_totals
+    monthly_sales = sales_totals(
+        DailySalesRollup.KIND_PRODUCT,
+        store=store,
+        since=month_start.date(),
+        until=month_end.date() - timedelta(days=1),
+    )
+    store_total = monthly_sales.get(STORE_TOTAL, {})
+    monthly_orders_count = store_total.get('order_count', 0)
+    monthly_revenue = store_total.get('revenue', 0)
+
     # 상품별 판매 현황 (선택된 월 기준)
-    from django.db.models import F
-    products_with_orders = Product.objects.filter(
-        store=store
-    ).annotate(
-        pending_shipment_orders=Count('orderitem__order', distinct=True, filter=Q(
-            orderitem__order__created_at__gte=month_start,
-            orderitem__order__created_at__lt=month_end,
-            orderitem__order__courier_company='',
-            orderitem__order__tracking_number='',
-        )),
-        total_orders=Count('orderitem__order', distinct=True, filter=Q(
-            orderitem__order__created_at__gte=month_start,
-            orderitem__order__created_at__lt=month_end
-        )),
-        total_quantity=Sum('orderitem__quantity', filter=Q(
-            orderitem__order__created_at__gte=month_start,
-            orderitem__order__created_at__lt=month_end
-        )),
-        total_revenue=Sum(
-            F('orderitem__quantity') * (F('orderitem__product_price') + F('orderitem__options_price')),
-            filter=Q(
-                orderitem__order__created_at__gte=month_start,
-                orderitem__order__created_at__lt=month_end
-            )
-        )
-    ).order_by('-total_revenue', '-created_at')
+    products_with_orders = list(Product.objects.filter(store=store))
+    for product in products_with_orders:
+        product_sales = monthly_sales.get(product.id, {})
+        product.pending_shipment_orders = product_sales.get('pending_shipment_count', 0)
+        product.total_orders = product_sales.get('order_count', 0)
+        product.total_quantity = product_sales.get('quantity', 0)
+        product.total_revenue = product_sales.get('revenue', 0)
+    products_with_orders.sort(key=lambda product: (product.total_revenue, product.created_at), reverse=True)
     
     context = {
         'store': store,
@@ -585,23 +495,12 @@ def payment_transactions(request, store_id):
     """Blink 결제 트랜잭션 현황"""
     store = get_object_or_404(Store, store_id=store_id, owner=request.user, deleted_at__isnull=True)
 
-    _ensure_free_order_payment_transactions(store)
-
-    status_filter = request.GET.get('status')
-    stage_filter = request.GET.get('stage')
-
-    transactions_qs = PaymentTransaction.objects.filter(store=store)
-    if status_filter in {PaymentTransaction.STATUS_PENDING, PaymentTransaction.STATUS_PROCESSING, PaymentTransaction.STATUS_FAILED, PaymentTransaction.STATUS_COMPLETED}:
-        transactions_qs = transactions_qs.filter(status=status_filter)
-    if stage_filter and stage_filter.isdigit():
-        transactions_qs = transactions_qs.filter(current_stage=int(stage_filter))
-
-    paginator = Paginator(
-        transactions_qs.select_related('user', 'order').order_by('-created_at'),
-        5,
+    dashboard = transaction_dashboard(
+        request.GET,
+        PaymentTransaction.objects.filter(store=store),
+        select_related=('user', 'order'),
     )
-    page_number = request.GET.get('page')
-    transactions_page = paginator.get_page(page_number)
+    transactions_page = dashboard.page
 
     for tx in transactions_page:
         metadata = tx.metadata if isinstance(tx.metadata, dict) else {}
@@ -627,23 +526,14 @@ def payment_transactions(request, store_id):
             total_items = metadata.get('items_count') or 0
         tx.list_items_count = total_items
 
-    base_qs = PaymentTransaction.objects.filter(store=store)
-    summary = {
-        'total': base_qs.count(),
-        'pending': base_qs.filter(status=PaymentTransaction.STATUS_PENDING).count(),
-        'processing': base_qs.filter(status=PaymentTransaction.STATUS_PROCESSING).count(),
-        'completed': base_qs.filter(status=PaymentTransaction.STATUS_COMPLETED).count(),
-        'failed': base_qs.filter(status=PaymentTransaction.STATUS_FAILED).count(),
-    }
-
     context = {
         'store': store,
         'transactions': transactions_page,
-        'paginator': paginator,
+        'paginator': transactions_page.paginator,
         'page_obj': transactions_page,
-        'status_filter': status_filter or '',
-        'stage_filter': stage_filter or '',
-        'summary': summary,
+        'status_filter': dashboard.status_filter,
+        'stage_filter': dashboard.stage_filter,
+        'summary': dashboard.summary,
     }
     return render(request, 'orders/payment_transactions.html', context)
 
@@ -1149,99 +1039,20 @@ def product_orders(request, store_id, product_id):
 def export_orders_csv(request, store_id):
     """주문 데이터 엑셀 내보내기 (배송 정보 포함)"""
     store = get_object_or_404(Store, store_id=store_id, owner=request.user, deleted_at__isnull=True)
-    
-    try:
-        import openpyxl
-        from openpyxl.styles import Font, Alignment, PatternFill
-        from openpyxl.utils import get_column_letter
-        import io
-        
-        # 워크북 생성
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "주문 목록"
-        
-        # 헤더 스타일
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_alignment = Alignment(horizontal="center", vertical="center")
-        
-        # 헤더 작성
-        headers = [
-            '주문번호', '상품명', '수량', '단가', '총액', '주문일시', '상태',
-            '주문자명', '연락처', '이메일', '우편번호', '주소', '상세주소', '요청사항'
-        ]
-        
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-        
-        # 데이터 조회
-        order_items = OrderItem.objects.filter(
-            product__store=store
-        ).select_related('order', 'product').prefetch_related('order__payment_transactions').order_by('-order__created_at')
-        
-        # 데이터 작성
-        for row, item in enumerate(order_items, 2):
-            order = item.order
-            ws.cell(row=row, column=1, value=order.order_number)
-            ws.cell(row=row, column=2, value=item.product_title)
-            ws.cell(row=row, column=3, value=item.quantity)
-            ws.cell(row=row, column=4, value=item.product_price)
-            ws.cell(row=row, column=5, value=item.total_price)
-            ws.cell(row=row, column=6, value=timezone.localtime(order.created_at).strftime('%Y-%m-%d %H:%M:%S'))
-            ws.cell(row=row, column=7, value=order.get_status_display_with_manual())
-            ws.cell(row=row, column=8, value=order.buyer_name)
-            phone_cell = ws.cell(row=row, column=9, value=str(order.buyer_phone or ''))
-            phone_cell.number_format = '@'
-            ws.cell(row=row, column=10, value=order.buyer_email)
-            ws.cell(row=row, column=11, value=order.shipping_postal_code)
-            ws.cell(row=row, column=12, value=order.shipping_address)
-            ws.cell(row=row, column=13, value=order.shipping_detail_address)
-            ws.cell(row=row, column=14, value=order.order_memo)
-        
-        # 열 너비 자동 조정
-        for col in range(1, len(headers) + 1):
-            column_letter = get_column_letter(col)
-            ws.column_dimensions[column_letter].width = 15
-        
-        # 메모리에 엑셀 파일 저장
-        excel_buffer = io.BytesIO()
-        wb.save(excel_buffer)
-        excel_buffer.seek(0)
-        
-        # HTTP 응답 생성
-        response = HttpResponse(
-            excel_buffer.getvalue(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename="{store.store_id}_orders_with_shipping.xlsx"'
-        
-        return response
-    
-    except ImportError:
-        # openpyxl이 없으면 기존 CSV 방식 사용
-        logger.warning("openpyxl 라이브러리가 없어 CSV로 다운로드됩니다.")
-        
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="{store.store_id}_orders.csv"'
-        response.write('\ufeff')  # UTF-8 BOM for Excel
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            '주문번호', '상품명', '수량', '단가', '총액', '주문일시', '상태',
-            '주문자명', '연락처', '이메일', '우편번호', '주소', '상세주소', '요청사항'
-        ])
-        
-        order_items = OrderItem.objects.filter(
-            product__store=store
-        ).select_related('order', 'product').order_by('-order__created_at')
-        
-        for item in order_items:
+
+    headers = [
+        '주문번호', '상품명', '수량', '단가', '총액', '주문일시', '상태',
+        '주문자명', '연락처', '이메일', '우편번호', '주소', '상세주소', '요청사항'
+    ]
+    order_items = OrderItem.objects.filter(
+        product__store=store
+    ).select_related('order').prefetch_related('order__payment_transactions').order_by('-order__created_at')
+
+    def rows(format_phone):
+        # 주문이 수만 건이어도 메모리가 일정하도록 나눠서 조회
+        for item in order_items.iterator(chunk_size=QUERYSET_CHUNK_SIZE):
             order = item.order
-            writer.writerow([
+            yield [
                 order.order_number,
                 item.product_title,
                 item.quantity,
@@ -1250,15 +1061,26 @@ def export_orders_csv(request, store_id):
                 timezone.localtime(order.created_at).strftime('%Y-%m-%d %H:%M:%S'),
                 order.get_status_display_with_manual(),
                 order.buyer_name,
-                _format_text_for_csv(order.buyer_phone),
+                format_phone(order.buyer_phone),
                 order.buyer_email,
                 order.shipping_postal_code,
                 order.shipping_address,
                 order.shipping_detail_address,
                 order.order_memo,
-            ])
-        
-        return response
+            ]
+
+    try:
+        return xlsx_file_response(
+            f"{store.store_id}_orders_with_shipping.xlsx",
+            "주문 목록",
+            headers,
+            rows(lambda phone: str(phone or '')),
+            text_columns=(9,),
+        )
+    except ImportError:
+        # openpyxl이 없으면 CSV로 다운로드
+        logger.warning("openpyxl 라이브러리가 없어 CSV로 다운로드됩니다.")
+        return csv_streaming_response(f"{store.store_id}_orders.csv", headers, rows(_format_text_for_csv))
 
 
 @login_required
@@ -2200,8 +2022,8 @@ def cancel_invoice(request):
             # BlinkAPIService 초기화
             blink_service = get_blink_service_for_store(store)
             
-            # 결제 상태 재확인
-            result = blink_service.check_invoice_status(payment_hash)
+            # 결제 상태 재확인 (취소 판단이므로 캐시를 거치지 않음)
+            result = blink_service.check_invoice_status(payment_hash, use_cache=False)
             
             if result['success'] and result['status'] == 'paid':
                 # 실제로는 결제가 완료되었음!
@@ -2478,37 +2300,9 @@ def create_order_from_cart_service(request, payment_hash, shipping_data=None):
                     purchase_date=order.paid_at
                 )
 
-            if order.total_amount == 0 and not PaymentTransaction.objects.filter(store=order.store, order=order).exists():
-                PaymentTransaction.objects.create(
-                    user=order.user,
-                    store=order.store,
-                    order=order,
-                    amount_sats=0,
-                    currency=PaymentTransaction.CURRENCY_BTC,
-                    status=PaymentTransaction.STATUS_COMPLETED,
-                    current_stage=PaymentStage.ORDER_FINALIZE,
-                    payment_hash='',
-                    payment_request='',
-                    metadata={
-                        'free_order': True,
-                        'shipping': {
-                            'buyer_name': order.buyer_name,
-                            'buyer_phone': order.buyer_phone,
-                            'buyer_email': order.buyer_email,
-                            'shipping_postal_code': order.shipping_postal_code,
-                            'shipping_address': order.shipping_address,
-                            'shipping_detail_address': order.shipping_detail_address,
-                            'order_memo': order.order_memo,
-                            'pickup_requested': order.delivery_status == 'pickup',
-                        },
-                        'cart_snapshot': cart_items,
-                        'subtotal_sats': 0,
-                        'shipping_fee_sats': 0,
-                        'total_sats': 0,
-                        'detail_source': 'orders',
-                        'payment_id': order.payment_id,
-                    },
-                )
+            # 무료 주문은 결제 흐름을 거치지 않으므로 주문 저장과 함께 트랜잭션 기록
+            if order.total_amount == 0:
+                create_free_order_transaction(order, cart_snapshot=cart_items)
             
         # 🎉 주문 완료 이메일 발송 (스토어별로 중복 방지)
         email_sent_stores = set()  # 이메일 발송한 스토어 추적
@@ -2695,6 +2489,9 @@ def create_order_from_cart(user, cart, payment_hash, shipping_data=None):
                 total_amount=order.total_amount,
                 purchase_date=order.paid_at
             )
+
+            if order.total_amount == 0:
+                create_free_order_transaction(order)
         
         # 장바구니 비우기
         cart.items.all().delete()
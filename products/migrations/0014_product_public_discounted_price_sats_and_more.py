@@ -0,0 +1,33 @@
+# Generated by Django 5.2.2 on 2026-10-18 12:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0013_assign_default_product_category'),
+        ('stores', '0033_storefeatureditem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='public_discounted_price_sats',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='사토시 환산 할인가격'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='public_price_sats',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='사토시 환산 가격'),
+        ),
+        migrations.AddField(
+            model_name='productoptionchoice',
+            name='public_price_sats',
+            field=models.IntegerField(blank=True, editable=False, null=True, verbose_name='사토시 환산 추가 가격'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['store', 'is_active', 'public_price_sats'], name='products_pr_store_i_538966_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.2 on 2026-10-18 13:23
+
+from django.db import migrations, models
+from django.db.models import Sum
+from django.utils import timezone
+
+
+def backfill_reserved_quantity(apps, schema_editor):
+    """만료되지 않은 활성 재고 예약 합계로 예약 카운터를 채운다."""
+    Product = apps.get_model('products', 'Product')
+    OrderItemReservation = apps.get_model('ln_payment', 'OrderItemReservation')
+
+    now = timezone.now()
+    OrderItemReservation.objects.filter(status='active', expires_at__lt=now).update(status='released')
+    totals = (
+        OrderItemReservation.objects.filter(status='active')
+        .values('product_id')
+        .annotate(total=Sum('quantity'))
+    )
+    for row in totals:
+        Product.objects.filter(pk=row['product_id']).update(reserved_quantity=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0014_product_public_discounted_price_sats_and_more'),
+        ('ln_payment', '0005_paymenttransaction_file_order'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='reserved_quantity',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='예약 수량'),
+        ),
+        migrations.RunPython(backfill_reserved_quantity, migrations.RunPython.noop),
+    ]
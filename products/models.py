@@ -1,7 +1,5 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.core.cache import cache
-import requests
 from decimal import Decimal
 
 
@@ -70,6 +68,14 @@ class Product(models.Model):
     discounted_price_krw = models.PositiveIntegerField(
         null=True, blank=True, verbose_name='원화 할인가격', help_text='원화 단위'
     )
+
+    # 사토시 환산 가격 (원화 연동 시 환율 갱신마다 일괄 재계산 - myshop.sats_prices)
+    public_price_sats = models.PositiveIntegerField(
+        null=True, blank=True, editable=False, verbose_name='사토시 환산 가격'
+    )
+    public_discounted_price_sats = models.PositiveIntegerField(
+        null=True, blank=True, editable=False, verbose_name='사토시 환산 할인가격'
+    )
     
     # 배송비
     shipping_fee = models.PositiveIntegerField(default=0, verbose_name='배송비', help_text='가격표시방식에 따라 원 또는 사토시 단위')
@@ -90,6 +96,8 @@ class Product(models.Model):
     is_active = models.BooleanField(default=True, verbose_name='판매 중')
     # 재고 관리
     stock_quantity = models.PositiveIntegerField(default=0, verbose_name='재고 수량')
+    # 결제 대기 중인 재고 예약 합계 (ln_payment.stock_reservations 의 조건부 UPDATE 로만 변경)
+    reserved_quantity = models.PositiveIntegerField(default=0, editable=False, verbose_name='예약 수량')
     is_temporarily_out_of_stock = models.BooleanField(default=False, verbose_name='일시품절')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -114,6 +122,7 @@ class Product(models.Model):
             models.Index(fields=['store', 'is_temporarily_out_of_stock']),
             models.Index(fields=['store', 'category']),
             models.Index(fields=['category']),
+            models.Index(fields=['store', 'is_active', 'public_price_sats']),  # 사토시 가격순 정렬용
         ]
     
     def __str__(self):
@@ -143,23 +152,12 @@ class Product(models.Model):
     
     @classmethod
     def get_btc_krw_rate(cls):
-        """업비트 BTC/KRW 환율 조회 (캐시 60초)"""
-        cache_key = 'btc_krw_rate'
-        rate = cache.get(cache_key)
-        
+        """BTC/KRW 환율 조회 (프로세스 환율 스냅샷, 요청 경로에서 외부 API 호출 없음)"""
+        from myshop.rate_refresher import get_rate_for_request
+        rate = get_rate_for_request()
         if rate is None:
-            try:
-                response = requests.get('https://api.upbit.com/v1/ticker?markets=KRW-BTC')
-                if response.status_code == 200:
-                    data = response.json()
-                    if data and len(data) > 0:
-                        rate = Decimal(str(data[0]['trade_price']))
-                        cache.set(cache_key, rate, 60)  # 60초 캐시
-            except Exception as e:
-                print(f"환율 조회 실패: {e}")
-                rate = Decimal('0')
-        
-        return rate
+            return Decimal('0')
+        return Decimal(str(rate.btc_krw_rate))
     
     @property
     def display_price(self):
@@ -194,15 +192,17 @@ class Product(models.Model):
     @property
     def public_price(self):
         """사용자용 가격 (항상 사토시) - 원화 연동 시 최신 환율 반영"""
+        resolved = getattr(self, '_resolved_prices', None)
+        if resolved is not None:
+            return resolved.public_price
         if self.price_display == 'krw' and self.price_krw is not None:
-            # 원화 연동 상품: 최신 환율로 사토시 가격 계산
-            from myshop.models import ExchangeRate
-            latest_rate = ExchangeRate.get_latest_rate()
-            if latest_rate and latest_rate.btc_krw_rate > 0:
-                # 원화를 사토시로 변환
-                btc_amount = self.price_krw / float(latest_rate.btc_krw_rate)
-                sats_amount = btc_amount * 100_000_000
-                return round(sats_amount)
+            # 원화 연동 상품: 구체화된 사토시 컬럼 우선, 없으면 환율 스냅샷으로 계산
+            if self.public_price_sats is not None:
+                return self.public_price_sats
+            from myshop.rate_snapshot import krw_to_sats
+            sats_amount = krw_to_sats(self.price_krw)
+            if sats_amount is not None:
+                return sats_amount
         return self.price
 
     @property
@@ -210,16 +210,19 @@ class Product(models.Model):
         """사용자용 할인가 (항상 사토시) - 원화 연동 시 최신 환율 반영"""
         if not self.is_discounted:
             return None
-        
+
+        resolved = getattr(self, '_resolved_prices', None)
+        if resolved is not None:
+            return resolved.public_discounted_price
+
         if self.price_display == 'krw' and self.discounted_price_krw is not None:
-            # 원화 연동 상품: 최신 환율로 사토시 할인가 계산
-            from myshop.models import ExchangeRate
-            latest_rate = ExchangeRate.get_latest_rate()
-            if latest_rate and latest_rate.btc_krw_rate > 0:
-                # 원화를 사토시로 변환
-                btc_amount = self.discounted_price_krw / float(latest_rate.btc_krw_rate)
-                sats_amount = btc_amount * 100_000_000
-                return round(sats_amount)
+            # 원화 연동 상품: 구체화된 사토시 컬럼 우선, 없으면 환율 스냅샷으로 계산
+            if self.public_discounted_price_sats is not None:
+                return self.public_discounted_price_sats
+            from myshop.rate_snapshot import krw_to_sats
+            sats_amount = krw_to_sats(self.discounted_price_krw)
+            if sats_amount is not None:
+                return sats_amount
         return self.discounted_price
 
     @property
@@ -259,8 +262,8 @@ class Product(models.Model):
     @property
     def current_exchange_rate(self):
         """현재 환율 정보"""
-        from myshop.models import ExchangeRate
-        return ExchangeRate.get_latest_rate()
+        from myshop.rate_snapshot import get_snapshot_rate
+        return get_snapshot_rate()
 
     @property
     def shipping_fee_display(self):
@@ -284,6 +287,23 @@ class Product(models.Model):
             return f"{info['krw']:,}원"
         return f"{info['sats']:,} sats"
 
+    # 인스턴스 저장 시 덮어쓰지 않는 카운터 컬럼 (동시 예약이 갱신한 값을 옛 값으로 되돌리지 않도록)
+    COUNTER_FIELDS = ('reserved_quantity',)
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def available_quantity(self):
+        """예약분을 뺀 구매 가능 수량"""
+        return max(self.stock_quantity - self.reserved_quantity, 0)
+
     @property
     def is_in_stock(self):
         """재고가 있는지 확인 (일시품절 고려)"""
@@ -336,6 +356,8 @@ class ProductImage(models.Model):
     # 이미지 크기 정보 (1:1 비율)
     width = models.PositiveIntegerField(default=500, verbose_name='이미지 너비')
     height = models.PositiveIntegerField(default=500, verbose_name='이미지 높이')
+    # 반응형 변형 [{width, height, file_path, file_url, file_size}, ...] (storage.image_derivatives)
+    variants = models.JSONField(default=list, blank=True, verbose_name='반응형 변형')
     
     # 순서 정보
     order = models.PositiveIntegerField(default=0, verbose_name='정렬 순서')
@@ -409,6 +431,8 @@ class ProductOptionChoice(models.Model):
     name = models.CharField(max_length=100, verbose_name='옵션 종류명')
     price = models.IntegerField(default=0, verbose_name='추가 가격', help_text='사토시 단위')
     price_krw = models.IntegerField(null=True, blank=True, verbose_name='원화 추가 가격', help_text='원화 단위')
+    # 사토시 환산 추가 가격 (원화 연동 상품만 채움 - myshop.sats_prices)
+    public_price_sats = models.IntegerField(null=True, blank=True, editable=False, verbose_name='사토시 환산 추가 가격')
     order = models.PositiveIntegerField(default=0, verbose_name='정렬 순서')
     
     # 메타 정보
@@ -446,17 +470,17 @@ class ProductOptionChoice(models.Model):
     @property
     def public_price(self):
         """사용자용 추가 가격 (항상 사토시) - 원화 연동 시 최신 환율 반영"""
+        resolved_price = getattr(self, '_resolved_public_price', None)
+        if resolved_price is not None:
+            return resolved_price
         if self.option.product.price_display == 'krw' and self.price_krw is not None:
-            # 원화 연동 상품: 최신 환율로 사토시 가격 계산
-            from myshop.models import ExchangeRate
-            latest_rate = ExchangeRate.get_latest_rate()
-            if latest_rate and latest_rate.btc_krw_rate > 0:
-                # 원화를 사토시로 변환
-                if self.price_krw == 0:
-                    return 0
-                btc_amount = self.price_krw / float(latest_rate.btc_krw_rate)
-                sats_amount = btc_amount * 100_000_000
-                return round(sats_amount)
+            # 원화 연동 상품: 구체화된 사토시 컬럼 우선, 없으면 환율 스냅샷으로 계산
+            if self.public_price_sats is not None:
+                return self.public_price_sats
+            from myshop.rate_snapshot import krw_to_sats
+            sats_amount = krw_to_sats(self.price_krw)
+            if sats_amount is not None:
+                return sats_amount
         return self.price
 
     @property
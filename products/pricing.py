@@ -0,0 +1,116 @@
+"""상품 가격 일괄 계산
+
+목록 화면/API/봇에서 상품마다 가격 프로퍼티를 하나씩 계산하지 않고,
+하나의 환율 스냅샷으로 상품 정가·할인가·옵션 추가 가격을 한 번에 계산한다.
+
+계산 결과는 각 인스턴스에도 붙여 두므로(``Product._resolved_prices``,
+``ProductOptionChoice._resolved_public_price``) 템플릿에서
+``product.public_price`` 를 그대로 써도 같은 값이 재사용된다.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+
+from django.db.models import QuerySet, prefetch_related_objects
+
+from myshop.rate_snapshot import RateSnapshot, get_rate_snapshot
+
+
+@dataclass(frozen=True)
+class ProductPrices:
+    public_price: int
+    public_discounted_price: Optional[int]
+    option_prices: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def final_price(self) -> int:
+        """결제 기준 가격 (할인가가 있으면 할인가)"""
+        if self.public_discounted_price:
+            return self.public_discounted_price
+        return self.public_price
+
+
+def _public_sats(krw_amount, sats_amount, materialized_sats, is_krw: bool, snapshot: RateSnapshot):
+    if is_krw and krw_amount is not None:
+        # 환율 갱신 시 구체화된 사토시 컬럼이 있으면 그대로 사용
+        if materialized_sats is not None:
+            return materialized_sats
+        converted = snapshot.krw_to_sats(krw_amount)
+        if converted is not None:
+            return converted
+    return sats_amount
+
+
+def resolve_choice_price(choice, product, snapshot: Optional[RateSnapshot] = None) -> int:
+    """옵션 선택지 추가 가격(사토시)을 상품의 가격 표시 방식 기준으로 계산해 인스턴스에 저장
+
+    ``choice.option.product`` 를 다시 조회하지 않도록 이미 적재된 상품을 받는다.
+    """
+    snapshot = snapshot or get_rate_snapshot()
+    choice_price = _public_sats(
+        choice.price_krw,
+        choice.price,
+        choice.public_price_sats,
+        product.price_display == 'krw',
+        snapshot,
+    )
+    choice._resolved_public_price = choice_price
+    return choice_price
+
+
+def resolve_product_prices(
+    products: Iterable,
+    snapshot: Optional[RateSnapshot] = None,
+    include_options: bool = True,
+) -> Dict[int, ProductPrices]:
+    """상품 목록의 사용자용(사토시) 가격을 단일 환율로 일괄 계산
+
+    Args:
+        products: ``Product`` 리스트 또는 쿼리셋
+        snapshot: 사용할 환율 스냅샷 (없으면 현재 프로세스 스냅샷)
+        include_options: 옵션 선택지 추가 가격까지 계산할지 여부
+
+    Returns:
+        ``{product.id: ProductPrices}``
+    """
+    if include_options and isinstance(products, QuerySet):
+        products = products.prefetch_related('options__choices')
+    products = list(products)
+    if include_options:
+        # 이미 prefetch 된 인스턴스는 추가 쿼리 없이 건너뜀
+        prefetch_related_objects(products, 'options__choices')
+
+    snapshot = snapshot or get_rate_snapshot()
+    resolved: Dict[int, ProductPrices] = {}
+
+    for product in products:
+        is_krw = product.price_display == 'krw'
+        public_price = _public_sats(
+            product.price_krw, product.price, product.public_price_sats, is_krw, snapshot
+        )
+
+        public_discounted_price = None
+        if product.is_discounted:
+            public_discounted_price = _public_sats(
+                product.discounted_price_krw,
+                product.discounted_price,
+                product.public_discounted_price_sats,
+                is_krw,
+                snapshot,
+            )
+
+        option_prices: Dict[int, int] = {}
+        if include_options:
+            for option in product.options.all():
+                for choice in option.choices.all():
+                    option_prices[choice.id] = resolve_choice_price(choice, product, snapshot)
+
+        prices = ProductPrices(
+            public_price=public_price,
+            public_discounted_price=public_discounted_price,
+            option_prices=option_prices,
+        )
+        product._resolved_prices = prices
+        resolved[product.id] = prices
+
+    return resolved
@@ -4,8 +4,17 @@ from markdown.extensions import codehilite, fenced_code, tables
 import re
 from urllib.parse import urlparse, parse_qs
 
+from storage.image_derivatives import srcset
+
 register = template.Library()
 
+
+@register.filter
+def image_srcset(image):
+    """이미지 모델의 반응형 ``srcset`` 값 (변형이 없으면 빈 문자열)"""
+    return srcset(image) if image else ''
+
+
 @register.filter
 def markdown_render(text):
     """Markdown 텍스트를 HTML로 변환 (링크, 이미지, 유튜브 자동 처리)"""
@@ -1,3 +1,76 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
 from django.test import TestCase
 
-# Create your tests here.
+from myshop import rate_snapshot
+from myshop.models import ExchangeRate
+from products.models import Product, ProductOption, ProductOptionChoice
+from products.pricing import resolve_product_prices
+from stores.models import Store
+
+
+class ResolveProductPricesTests(TestCase):
+    def setUp(self):
+        rate_snapshot.invalidate_rate_snapshot()
+        self.addCleanup(rate_snapshot.invalidate_rate_snapshot)
+        with self.captureOnCommitCallbacks(execute=True):
+            ExchangeRate.objects.create(btc_krw_rate=Decimal('100000000'), api_response_data={})
+        self.owner = User.objects.create_user(username='owner', password='test-pass')
+        self.store = Store.objects.create(
+            store_id='pricingstore',
+            store_name='가격 스토어',
+            owner_name='홍길동',
+            chat_channel='https://t.me/example',
+            owner=self.owner,
+        )
+
+    def _create_products(self, count):
+        for index in range(count):
+            product = Product.objects.create(
+                store=self.store,
+                title=f'상품 {index}',
+                description='테스트 상품',
+                price=1,
+                price_krw=10_000,
+                price_display='krw',
+                is_discounted=True,
+                discounted_price=1,
+                discounted_price_krw=8_000,
+                stock_quantity=10,
+            )
+            option = ProductOption.objects.create(product=product, name='사이즈')
+            ProductOptionChoice.objects.create(option=option, name='S', price=0, price_krw=0)
+            ProductOptionChoice.objects.create(option=option, name='L', price=0, price_krw=1_000)
+
+    def test_query_count_is_independent_of_product_count(self):
+        self._create_products(3)
+        with self.assertNumQueries(3):
+            resolve_product_prices(Product.objects.filter(store=self.store))
+
+        self._create_products(20)
+        with self.assertNumQueries(3):
+            resolve_product_prices(Product.objects.filter(store=self.store))
+
+    def test_resolved_prices_match_properties_and_are_reused(self):
+        self._create_products(1)
+        product = Product.objects.get(store=self.store)
+        expected_price = product.public_price
+        expected_discounted = product.public_discounted_price
+
+        resolved = resolve_product_prices([product])[product.id]
+
+        self.assertEqual(resolved.public_price, expected_price)
+        self.assertEqual(resolved.public_discounted_price, expected_discounted)
+        self.assertEqual(resolved.final_price, 8_000)
+        self.assertEqual(sorted(resolved.option_prices.values()), [0, 1_000])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(product.public_price, 10_000)
+            self.assertEqual(product.public_discount_rate, 20.0)
+            choice_prices = sorted(
+                choice.public_price
+                for option in product.options.all()
+                for choice in option.choices.all()
+            )
+        self.assertEqual(choice_prices, [0, 1_000])
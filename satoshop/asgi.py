@@ -22,11 +22,16 @@ try:
 except Exception:
     expert_websocket_urlpatterns = []
 
+try:
+    from ln_payment.routing import websocket_urlpatterns as ln_payment_websocket_urlpatterns
+except Exception:
+    ln_payment_websocket_urlpatterns = []
+
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
     "websocket": AuthMiddlewareStack(
         URLRouter(
-            expert_websocket_urlpatterns
+            expert_websocket_urlpatterns + ln_payment_websocket_urlpatterns
         )
     ),
 })
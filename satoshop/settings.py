@@ -335,6 +335,18 @@ S3_ALLOWED_FILE_EXTENSIONS = [
     '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.avif',
 ]
 
+# /media/s3/ 프록시 로컬 디스크 캐시 (경로를 지정해야 켜짐, 같은 호스트 워커가 공유)
+S3_DISK_CACHE_DIR = os.getenv('S3_DISK_CACHE_DIR', '')
+S3_DISK_CACHE_MAX_BYTES = int(os.getenv('S3_DISK_CACHE_MAX_MB', '1024')) * 1024 * 1024
+S3_DISK_CACHE_MAX_OBJECT_SIZE = int(os.getenv('S3_DISK_CACHE_MAX_OBJECT_MB', '5')) * 1024 * 1024
+S3_DISK_CACHE_REVALIDATE_AFTER = int(os.getenv('S3_DISK_CACHE_REVALIDATE_AFTER', '300'))  # 초
+
+# 업로드 이미지 파생본(AVIF/WebP) 생성: 원본을 먼저 저장하고 run_image_transcode_worker 가 변환 (False 면 요청 안에서 변환)
+# 워커 없이 켜면 원본이 계속 노출되므로, 워커를 띄운 배포에서만 켠다 (render.yaml 참고)
+IMAGE_TRANSCODE_ASYNC = os.getenv('IMAGE_TRANSCODE_ASYNC', 'False').lower() == 'true'
+# 워커 없는 개발 환경용: 업로드한 웹 프로세스의 백그라운드 스레드가 방금 남긴 작업만 처리 (운영에서는 끔)
+IMAGE_TRANSCODE_BACKGROUND = os.getenv('IMAGE_TRANSCODE_BACKGROUND', 'False').lower() == 'true'
+
 if all([S3_ACCESS_KEY_ID, S3_SECRET_ACCESS_KEY, S3_BUCKET_NAME, S3_ENDPOINT_URL]):
     DEFAULT_FILE_STORAGE = 'storage.backends.S3Storage'
     if S3_CUSTOM_DOMAIN:
@@ -10,6 +10,7 @@ from lecture.models import LiveLecture, LiveLectureOrder
 from meetup.models import Meetup, MeetupOrder
 from orders.models import OrderItem
 from products.models import Product
+from products.pricing import resolve_product_prices
 
 ITEM_TYPE_PRODUCT = "product"
 ITEM_TYPE_MEETUP = "meetup"
@@ -100,6 +101,8 @@ def get_recent_registered_items(limit: int = 20) -> List[dict]:
         .order_by("-created_at")[:per_type_limit]
     )
 
+    resolve_product_prices(products, include_options=False)
+
     items: List[dict] = []
     for product in products:
         price_sats = _product_price_sats(product)
@@ -189,6 +192,7 @@ def get_recent_sold_items(limit: int = 20) -> List[dict]:
         product.id: product
         for product in Product.objects.filter(id__in=product_ids).select_related("store")
     }
+    resolve_product_prices(products.values(), include_options=False)
     for row in product_sales_rows:
         product = products.get(row["product_id"])
         if not product:
@@ -6,9 +6,9 @@ set -euo pipefail
 CERT_PATH=${EXPERT_SIGNER_CERT_PATH:-}
 CERT_BASE64=${EXPERT_SIGNER_CERT_BASE64:-}
 
-# base64 값이 없으면 아무 작업 없음
+# base64 값이 없으면 아무 작업 없음 (entrypoint 가 source 하므로 exit 대신 return)
 if [ -z "$CERT_BASE64" ]; then
-  exit 0
+  return 0 2>/dev/null || exit 0
 fi
 
 # 기본 경로가 없으면 /tmp 이하에 생성
@@ -45,6 +45,11 @@
   let transactionId = null;
   let countdownInterval = null;
   let pollInterval = null;
+  let statusSocket = null;
+  let statusSocketHash = null;
+  const POLL_INTERVAL_MS = 4000;
+  // 푸시 채널이 연결돼 있으면 폴링은 안전망으로만 사용
+  const SOCKET_FALLBACK_POLL_MS = 30000;
   let expiresAt = null;
   let isInventoryRedirectMode = false;
   let cachedLogs = [];
@@ -236,6 +241,7 @@
     if (!invoice) {
       return;
     }
+    subscribeStatus(invoice.payment_hash);
     invoiceArea.classList.remove('hidden');
     if (invoicePanel) {
       invoicePanel.classList.remove('hidden');
@@ -510,7 +516,39 @@
 
   function startPolling() {
     stopPolling();
-    pollInterval = setInterval(verifyPayment, 4000);
+    const interval = statusSocket && statusSocket.isOpen() ? SOCKET_FALLBACK_POLL_MS : POLL_INTERVAL_MS;
+    pollInterval = setInterval(verifyPayment, interval);
+  }
+
+  function subscribeStatus(paymentHash) {
+    if (!paymentHash || paymentHash === statusSocketHash) {
+      return;
+    }
+    if (statusSocket) {
+      statusSocket.close();
+      statusSocket = null;
+    }
+    statusSocketHash = paymentHash;
+    if (typeof window.subscribePaymentStatus !== 'function') {
+      return;
+    }
+    statusSocket = window.subscribePaymentStatus(paymentHash, {
+      onOpen: () => {
+        if (pollInterval) {
+          startPolling();
+        }
+      },
+      onClose: () => {
+        if (pollInterval) {
+          startPolling();
+        }
+      },
+      onStatus: (message) => {
+        if (pollInterval && (message.status === 'paid' || message.status === 'expired')) {
+          verifyPayment();
+        }
+      },
+    });
   }
 
   function stopPolling() {
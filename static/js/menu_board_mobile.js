@@ -848,6 +848,7 @@ function cancelMobilePayment() {
                         clearInterval(window.paymentCheckInterval);
                         window.paymentCheckInterval = null;
                     }
+                    closeMobilePaymentStatusSocket();
                     
                     // 성공 화면으로 전환
                     document.getElementById('mobile-payment-invoice').classList.add('hidden');
@@ -907,6 +908,7 @@ function handleMobileCancelSuccess() {
     
     // 결제 관련 변수 초기화
     window.currentPaymentHash = null;
+    closeMobilePaymentStatusSocket();
     window.paymentExpiresAt = null;
     
     // 🔄 페이지 새로고침으로 완전 초기화
@@ -1088,10 +1090,53 @@ function startMobilePaymentCountdown() {
 function startMobilePaymentStatusCheck() {
     if (!window.currentPaymentHash) return;
     
+    subscribeMobilePaymentStatus(window.currentPaymentHash);
+    scheduleMobilePaymentStatusCheck();
+}
+
+// 푸시 연결 여부에 따라 폴링 간격 조정 (연결 중에는 안전망으로만 15초마다 확인)
+function scheduleMobilePaymentStatusCheck() {
+    if (window.paymentCheckInterval) {
+        clearInterval(window.paymentCheckInterval);
+    }
+    const socketOpen = window.mobilePaymentStatusSocket && window.mobilePaymentStatusSocket.isOpen();
+    window.paymentCheckInterval = setInterval(checkMobilePaymentStatusOnce, socketOpen ? 15000 : 1000);
+}
+
+// 결제 상태 푸시 구독 ('paid'/'expired' 를 받으면 즉시 한 번 확인)
+function subscribeMobilePaymentStatus(paymentHash) {
+    closeMobilePaymentStatusSocket();
+    if (typeof window.subscribePaymentStatus !== 'function') return;
+    
+    window.mobilePaymentStatusSocket = window.subscribePaymentStatus(paymentHash, {
+        onOpen: () => {
+            if (window.paymentCheckInterval) scheduleMobilePaymentStatusCheck();
+        },
+        onClose: () => {
+            if (window.paymentCheckInterval) scheduleMobilePaymentStatusCheck();
+        },
+        onStatus: (message) => {
+            if (window.paymentCheckInterval && (message.status === 'paid' || message.status === 'expired')) {
+                checkMobilePaymentStatusOnce();
+            }
+        }
+    });
+}
+
+function closeMobilePaymentStatusSocket() {
+    if (window.mobilePaymentStatusSocket) {
+        window.mobilePaymentStatusSocket.close();
+        window.mobilePaymentStatusSocket = null;
+    }
+}
+
+// 모바일 결제 상태 1회 확인
+function checkMobilePaymentStatusOnce() {
+    if (!window.currentPaymentHash) return;
+    
     const storeId = currentStoreId || window.location.pathname.split('/')[2];
     
-    window.paymentCheckInterval = setInterval(() => {
-        fetch(`/menu/${storeId}/cart/check-payment/`, {
+    fetch(`/menu/${storeId}/cart/check-payment/`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -1113,7 +1158,9 @@ function startMobilePaymentStatusCheck() {
                 if (data.status === 'paid') {
                     // 결제 완료
                     clearInterval(window.paymentCheckInterval);
+                    window.paymentCheckInterval = null;
                     clearInterval(window.paymentCountdownInterval);
+                    closeMobilePaymentStatusSocket();
                     
                     // UI 상태 변경
                     document.getElementById('mobile-payment-invoice').classList.add('hidden');
@@ -1128,7 +1175,9 @@ function startMobilePaymentStatusCheck() {
                 } else if (data.status === 'expired') {
                     // 인보이스 만료
                     clearInterval(window.paymentCheckInterval);
+                    window.paymentCheckInterval = null;
                     clearInterval(window.paymentCountdownInterval);
+                    closeMobilePaymentStatusSocket();
                     
                     alert('인보이스가 만료되었습니다.');
                     closeMobilePaymentView();
@@ -1141,7 +1190,6 @@ function startMobilePaymentStatusCheck() {
         .catch(error => {
             console.error('모바일 결제 상태 확인 중 오류:', error);
         });
-    }, 1000); // 1초마다 확인
 }
 
 // 모바일 리다이렉트 카운트다운
@@ -479,6 +479,10 @@ function processOrderFromPage() {
 // 결제 관련 변수
 let currentPaymentHash = null;
 let paymentCheckInterval = null;
+let paymentStatusSocket = null;
+const PAYMENT_CHECK_INTERVAL_MS = 1000;
+// 푸시 채널이 연결돼 있으면 폴링은 안전망으로만 사용
+const PAYMENT_SOCKET_FALLBACK_CHECK_MS = 15000;
 let paymentCountdownInterval = null;
 let paymentExpiresAt = null;
 
@@ -705,6 +709,7 @@ function closePaymentView() {
     
     // 결제 관련 변수 초기화
     currentPaymentHash = null;
+    closeMenuPaymentStatusSocket();
     paymentExpiresAt = null;
 }
 
@@ -896,10 +901,56 @@ function startPaymentCountdown() {
 function startPaymentStatusCheck() {
     if (!currentPaymentHash) return;
     
+    subscribeMenuPaymentStatus(currentPaymentHash);
+    schedulePaymentStatusCheck();
+}
+
+// 푸시 연결 여부에 따라 폴링 간격 조정
+function schedulePaymentStatusCheck() {
+    if (paymentCheckInterval) {
+        clearInterval(paymentCheckInterval);
+    }
+    const socketOpen = paymentStatusSocket && paymentStatusSocket.isOpen();
+    paymentCheckInterval = setInterval(
+        checkPaymentStatusOnce,
+        socketOpen ? PAYMENT_SOCKET_FALLBACK_CHECK_MS : PAYMENT_CHECK_INTERVAL_MS
+    );
+}
+
+// 결제 상태 푸시 구독 ('paid'/'expired' 를 받으면 즉시 한 번 확인)
+function subscribeMenuPaymentStatus(paymentHash) {
+    closeMenuPaymentStatusSocket();
+    if (typeof window.subscribePaymentStatus !== 'function') return;
+    
+    paymentStatusSocket = window.subscribePaymentStatus(paymentHash, {
+        onOpen: () => {
+            if (paymentCheckInterval) schedulePaymentStatusCheck();
+        },
+        onClose: () => {
+            if (paymentCheckInterval) schedulePaymentStatusCheck();
+        },
+        onStatus: (message) => {
+            if (paymentCheckInterval && (message.status === 'paid' || message.status === 'expired')) {
+                checkPaymentStatusOnce();
+            }
+        }
+    });
+}
+
+function closeMenuPaymentStatusSocket() {
+    if (paymentStatusSocket) {
+        paymentStatusSocket.close();
+        paymentStatusSocket = null;
+    }
+}
+
+// 결제 상태 1회 확인
+function checkPaymentStatusOnce() {
+    if (!currentPaymentHash) return;
+    
     const storeId = currentStoreId || window.location.pathname.split('/')[2];
     
-    paymentCheckInterval = setInterval(() => {
-        fetch(`/menu/${storeId}/cart/check-payment/`, {
+    fetch(`/menu/${storeId}/cart/check-payment/`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -920,7 +971,9 @@ function startPaymentStatusCheck() {
                 if (data.status === 'paid') {
                     // 결제 완료
                     clearInterval(paymentCheckInterval);
+                    paymentCheckInterval = null;
                     clearInterval(paymentCountdownInterval);
+                    closeMenuPaymentStatusSocket();
                     
                     // UI 상태 변경
                     document.getElementById('payment-invoice').classList.add('hidden');
@@ -935,7 +988,9 @@ function startPaymentStatusCheck() {
                 } else if (data.status === 'expired') {
                     // 인보이스 만료
                     clearInterval(paymentCheckInterval);
+                    paymentCheckInterval = null;
                     clearInterval(paymentCountdownInterval);
+                    closeMenuPaymentStatusSocket();
                     
                     alert('인보이스가 만료되었습니다.');
                     closePaymentView();
@@ -949,7 +1004,6 @@ function startPaymentStatusCheck() {
         .catch(error => {
             console.error('결제 상태 확인 중 오류:', error);
         });
-    }, 1000); // 1초마다 확인
 }
 
 // 결제 취소
@@ -995,6 +1049,7 @@ function cancelPayment() {
                         clearInterval(paymentCheckInterval);
                         paymentCheckInterval = null;
                     }
+                    closeMenuPaymentStatusSocket();
                     
                     // 성공 화면으로 전환
                     document.getElementById('payment-invoice').classList.add('hidden');
@@ -1054,6 +1109,7 @@ function handleCancelSuccess() {
     
     // 결제 관련 변수 초기화
     currentPaymentHash = null;
+    closeMenuPaymentStatusSocket();
     paymentExpiresAt = null;
     
     // 🔄 페이지 새로고침으로 완전 초기화
@@ -0,0 +1,68 @@
+(function (window) {
+  // 결제 상태 푸시 구독 (ws/payments/<payment_hash>/status/)
+  // 연결되어 있는 동안 결제 페이지는 상태 확인 API 폴링 간격을 늘리고,
+  // 'paid'/'expired' 푸시를 받으면 검증 API 를 한 번 호출한다.
+  const RECONNECT_DELAY_MS = 5000;
+  const MAX_RECONNECTS = 3;
+
+  function subscribePaymentStatus(paymentHash, handlers) {
+    if (!paymentHash || !('WebSocket' in window)) {
+      return null;
+    }
+    const callbacks = handlers || {};
+    const scheme = window.location.protocol === 'https:' ? 'wss' : 'ws';
+    const url = `${scheme}://${window.location.host}/ws/payments/${encodeURIComponent(paymentHash)}/status/`;
+
+    let socket = null;
+    let isOpen = false;
+    let isClosedByClient = false;
+    let reconnects = 0;
+
+    function connect() {
+      socket = new WebSocket(url);
+      socket.addEventListener('open', () => {
+        isOpen = true;
+        reconnects = 0;
+        if (callbacks.onOpen) {
+          callbacks.onOpen();
+        }
+      });
+      socket.addEventListener('message', (event) => {
+        let data = null;
+        try {
+          data = JSON.parse(event.data);
+        } catch (error) {
+          return;
+        }
+        if (data && data.status && callbacks.onStatus) {
+          callbacks.onStatus(data);
+        }
+      });
+      socket.addEventListener('close', () => {
+        const wasOpen = isOpen;
+        isOpen = false;
+        if (wasOpen && callbacks.onClose) {
+          callbacks.onClose();
+        }
+        if (!isClosedByClient && reconnects < MAX_RECONNECTS) {
+          reconnects += 1;
+          setTimeout(connect, RECONNECT_DELAY_MS);
+        }
+      });
+    }
+
+    connect();
+
+    return {
+      isOpen: () => isOpen,
+      close: () => {
+        isClosedByClient = true;
+        if (socket) {
+          socket.close();
+        }
+      },
+    };
+  }
+
+  window.subscribePaymentStatus = subscribePaymentStatus;
+})(window);
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class StorageConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'storage'
+
+    def ready(self):
+        """앱이 준비되면 시그널을 등록합니다."""
+        from storage.signals import connect_variant_cleanup
+        connect_variant_cleanup()
@@ -6,6 +6,7 @@ iwinv 오브젝트 스토리지 Swift API 호환
 import os
 import mimetypes
 import logging
+import threading
 from datetime import datetime
 from urllib.parse import urljoin
 import uuid
@@ -25,6 +26,105 @@ from .fallback_upload import direct_upload_with_fallback
 # 로거 설정
 logger = logging.getLogger(__name__)
 
+# 설정 조합 -> boto3 S3 클라이언트. 요청마다 클라이언트를 만들면 커넥션 풀/TLS 세션/자격 증명 해석을
+# 매번 새로 하므로 프로세스 단위로 공유한다. fork 후에는 자식 프로세스에서 새로 만든다.
+_clients = {}
+_clients_pid = None
+_clients_lock = threading.Lock()
+
+# 스토리지 설정 -> 프로세스 공유 S3Storage
+_storages = {}
+_STORAGE_SETTINGS = (
+    'S3_ACCESS_KEY_ID',
+    'S3_SECRET_ACCESS_KEY',
+    'S3_BUCKET_NAME',
+    'S3_ENDPOINT_URL',
+    'S3_REGION_NAME',
+    'S3_CUSTOM_DOMAIN',
+    'S3_USE_SSL',
+    'S3_FILE_OVERWRITE',
+    'S3_MAX_FILE_SIZE',
+    'S3_ALLOWED_FILE_EXTENSIONS',
+)
+
+
+def _build_client(endpoint_url, access_key_id, secret_access_key, region_name, use_ssl):
+    # iwinv 오브젝트 스토리지 최적화 설정
+    from botocore.client import Config
+
+    logger.debug(f"S3 클라이언트 생성 중... endpoint={endpoint_url}")
+    config = Config(
+        signature_version='s3v4',
+        s3={
+            'addressing_style': 'path',  # path-style addressing 사용
+            'payload_signing_enabled': True,  # Swift API 호환을 위해 payload signing 활성화
+        },
+        region_name=region_name,
+        retries={'max_attempts': 3},
+        tcp_keepalive=True,  # 연결 유지
+        max_pool_connections=getattr(settings, 'S3_MAX_POOL_CONNECTIONS', 10),  # 연결 풀 크기
+    )
+    # 기본 세션을 여러 스레드에서 건드리지 않도록 세션을 따로 만듦
+    client = boto3.session.Session().client(
+        's3',
+        endpoint_url=endpoint_url,
+        aws_access_key_id=access_key_id,
+        aws_secret_access_key=secret_access_key,
+        region_name=region_name,
+        use_ssl=use_ssl,
+        config=config,
+    )
+    logger.info("S3 클라이언트 생성 성공")
+    return client
+
+
+def get_s3_client(endpoint_url, access_key_id, secret_access_key, region_name, use_ssl):
+    """설정 조합별 프로세스 공유 S3 클라이언트
+
+    boto3 클라이언트는 스레드 간 공유해도 안전하다. Gunicorn 이 fork 한 뒤 부모의 커넥션 풀을 자식이
+    이어 쓰지 않도록 PID 가 바뀌면 모두 새로 만든다.
+    """
+    global _clients_pid
+
+    key = (endpoint_url, access_key_id, secret_access_key, region_name, use_ssl)
+    pid = os.getpid()
+    if _clients_pid == pid:
+        client = _clients.get(key)
+        if client is not None:
+            return client
+
+    with _clients_lock:
+        if _clients_pid != pid:
+            _clients.clear()
+            _clients_pid = pid
+        client = _clients.get(key)
+        if client is None:
+            try:
+                client = _build_client(*key)
+            except Exception as e:
+                logger.error(f"S3 클라이언트 생성 실패: {e}")
+                raise
+            _clients[key] = client
+    return client
+
+
+def get_s3_storage():
+    """현재 설정의 프로세스 공유 ``S3Storage`` (필수 설정이 없으면 ``ImproperlyConfigured``)"""
+    key = tuple(repr(getattr(settings, name, None)) for name in _STORAGE_SETTINGS)
+    storage = _storages.get(key)
+    if storage is None:
+        storage = S3Storage()
+        with _clients_lock:
+            storage = _storages.setdefault(key, storage)
+    return storage
+
+
+def reset_s3_clients():
+    """공유 클라이언트/스토리지 폐기 (자격 증명 교체 시)"""
+    with _clients_lock:
+        _clients.clear()
+        _storages.clear()
+
 
 @deconstructible
 class S3Storage(Storage):
@@ -62,47 +162,18 @@ class S3Storage(Storage):
             logger.error(error_msg)
             raise ImproperlyConfigured(error_msg)
         
-        # S3 클라이언트 초기화
-        self._client = None
-        self._connection = None
         logger.debug("S3Storage 초기화 완료")
     
     @property
     def client(self):
-        """S3 클라이언트 지연 초기화"""
-        if self._client is None:
-            logger.debug(f"S3 클라이언트 생성 중... endpoint={self.endpoint_url}")
-            try:
-                # iwinv 오브젝트 스토리지 최적화 설정
-                from botocore.client import Config
-                
-                config = Config(
-                    signature_version='s3v4',
-                    s3={
-                        'addressing_style': 'path',  # path-style addressing 사용
-                        'payload_signing_enabled': True,  # Swift API 호환을 위해 payload signing 활성화
-                    },
-                    region_name=self.region_name,
-                    retries={'max_attempts': 3},
-                    tcp_keepalive=True,  # 연결 유지
-                    max_pool_connections=10  # 연결 풀 최적화
-                )
-                
-                self._client = boto3.client(
-                    's3',
-                    endpoint_url=self.endpoint_url,
-                    aws_access_key_id=self.access_key_id,
-                    aws_secret_access_key=self.secret_access_key,
-                    region_name=self.region_name,
-                    use_ssl=self.use_ssl,
-                    config=config
-                )
-                
-                logger.info("S3 클라이언트 생성 성공")
-            except Exception as e:
-                logger.error(f"S3 클라이언트 생성 실패: {e}")
-                raise
-        return self._client
+        """S3 클라이언트 (설정 조합별 프로세스 공유, ``get_s3_client`` 참고)"""
+        return get_s3_client(
+            self.endpoint_url,
+            self.access_key_id,
+            self.secret_access_key,
+            self.region_name,
+            self.use_ssl,
+        )
     
     def _save(self, name, content):
         """파일을 S3에 저장 (iwinv Swift API 호환)"""
@@ -0,0 +1,409 @@
+"""S3 객체 로컬 디스크 캐시
+
+상품 썸네일, 스토어 로고처럼 자주 요청되는 객체를 호스트 디스크에 보관한다. 같은 호스트의 Gunicorn
+워커가 한 디렉터리를 함께 쓴다. ``S3_DISK_CACHE_DIR`` 가 설정된 경우에만 켜진다.
+
+디렉터리 구조 (``<d>`` = 키 SHA-256)::
+
+    <dir>/<d[:2]>/<d>.json            메타데이터 (키, ETag, 크기, 마지막 검증 시각 ...)
+    <dir>/<d[:2]>/<d>.<etag 해시>.bin  본문 (쓴 뒤에는 바꾸지 않음)
+    <dir>/locks/<d[:2]>.lock          채우기 잠금 (키 해시 앞 2자리로 나눈 256개)
+    <dir>/stats/<pid>.json            워커별 적중/미스 카운터
+
+- 원자적 쓰기: 같은 디렉터리의 임시 파일에 쓴 뒤 ``os.replace``. 본문을 먼저 바꾸고 메타데이터를
+  바꾼다. 본문 파일 이름에 ETag 해시가 들어가므로, 읽는 쪽은 항상 메타데이터와 맞는 본문을 연다.
+- LRU: 적중할 때마다 본문 파일 mtime 을 갱신하고, 용량을 넘으면 mtime 이 오래된 것부터 지운다.
+  사용량은 프로세스마다 채우기/삭제로 어림잡고, 디렉터리 전체 스캔은 어림값이 용량을 넘었을 때와
+  ``_RESCAN_INTERVAL`` 마다(다른 워커가 채운 양 반영)만 한다.
+- 재검증: 마지막 검증 후 ``revalidate_after`` 초가 지나면 ``If-None-Match`` 로 S3 에 확인한다.
+- 같은 키를 여러 워커가 동시에 채우지 않도록 ``flock`` 으로 잠근다. 먼저 잠근 워커가 받고, 나머지는
+  기다렸다가 디스크에서 읽는다.
+"""
+
+import errno
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_MAX_OBJECT_SIZE = 5 * 1024 * 1024
+DEFAULT_REVALIDATE_AFTER = 300
+STAT_NAMES = ('hits', 'misses', 'revalidated', 'refreshed', 'bypassed', 'evictions', 'fill_bytes')
+
+# 용량 초과 시 이 비율까지 줄임 (채울 때마다 정리하지 않도록)
+_LOW_WATER = 0.9
+_STALE_TEMP_SECONDS = 3600
+_STATS_FLUSH_INTERVAL = 10.0
+# 사용량 어림값을 디렉터리 스캔으로 다시 맞추는 주기 (초)
+_RESCAN_INTERVAL = 300.0
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    etag: str
+    size: int
+    content_type: str = ''
+    last_modified: str = ''
+    checked_at: float = 0.0
+    body: str = ''
+    # 최대 크기를 넘어 캐시하지 않는 객체 표시 (본문 없음)
+    uncacheable: bool = False
+    path: str = ''
+
+    def is_fresh(self, max_age, now=None):
+        return (now or time.time()) - self.checked_at < max_age
+
+
+def _digest(value):
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def _write_atomic(directory, final_path, chunks):
+    """임시 파일에 쓴 뒤 ``os.replace`` (쓴 바이트 수 반환)"""
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    written = 0
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            for chunk in chunks:
+                temp_file.write(chunk)
+                written += len(chunk)
+        os.replace(temp_path, final_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return written
+
+
+class S3DiskCache:
+    def __init__(
+        self,
+        directory,
+        max_bytes=DEFAULT_MAX_BYTES,
+        *,
+        max_object_size=DEFAULT_MAX_OBJECT_SIZE,
+        revalidate_after=DEFAULT_REVALIDATE_AFTER,
+        lock_timeout=30.0,
+    ):
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.max_object_size = max_object_size
+        self.revalidate_after = revalidate_after
+        self.lock_timeout = lock_timeout
+        os.makedirs(os.path.join(self.directory, 'locks'), exist_ok=True)
+        os.makedirs(os.path.join(self.directory, 'stats'), exist_ok=True)
+        self._stats = Counter()
+        self._stats_lock = threading.Lock()
+        self._stats_pid = os.getpid()
+        self._stats_flushed_at = 0.0
+        # 본문 전체 바이트 어림값 (None = 아직 스캔 전)
+        self._usage = None
+        self._usage_scanned_at = 0.0
+        self._usage_lock = threading.Lock()
+
+    # 경로
+
+    def _shard(self, digest):
+        path = os.path.join(self.directory, digest[:2])
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def _meta_path(self, key):
+        digest = _digest(key)
+        return os.path.join(self._shard(digest), f'{digest}.json')
+
+    # 조회/저장
+
+    def get(self, key) -> Optional[CacheEntry]:
+        """캐시 항목 (없거나 깨졌으면 None). 적중 시 LRU 순서를 갱신"""
+        meta_path = self._meta_path(key)
+        try:
+            with open(meta_path, 'rb') as meta_file:
+                entry = CacheEntry(**json.load(meta_file))
+        except (FileNotFoundError, ValueError, TypeError):
+            return None
+        if entry.key != key:
+            return None
+        if entry.uncacheable:
+            return entry
+
+        entry.path = os.path.join(os.path.dirname(meta_path), entry.body)
+        try:
+            os.utime(entry.path)
+            if os.stat(entry.path).st_size != entry.size:
+                return None
+        except FileNotFoundError:
+            return None
+        return entry
+
+    def put(self, key, chunks, *, etag, size, content_type='', last_modified='') -> Optional[CacheEntry]:
+        """본문을 원자적으로 저장 (받은 크기가 ``size`` 와 다르면 저장하지 않고 None)"""
+        meta_path = self._meta_path(key)
+        shard = os.path.dirname(meta_path)
+        digest = os.path.basename(meta_path)[:-len('.json')]
+        previous = self.get(key)
+
+        body = f'{digest}.{_digest(etag)[:16]}.bin'
+        body_path = os.path.join(shard, body)
+        written = _write_atomic(shard, body_path, chunks)
+        if written != size:
+            logger.warning("S3 디스크 캐시 저장 중단 (크기 불일치): %s (%s/%s bytes)", key, written, size)
+            os.unlink(body_path)
+            return None
+
+        entry = CacheEntry(
+            key=key,
+            etag=etag,
+            size=size,
+            content_type=content_type,
+            last_modified=last_modified,
+            checked_at=time.time(),
+            body=body,
+        )
+        self._write_meta(meta_path, entry)
+        replaced = 0
+        if previous is not None and previous.path:
+            # 같은 이름 본문은 os.replace 로 덮어씀
+            replaced = previous.size
+            if previous.body != body:
+                try:
+                    os.unlink(previous.path)
+                except FileNotFoundError:
+                    pass
+        self.record('fill_bytes', size)
+        if self._add_usage(size - replaced) > self.max_bytes:
+            self.evict()
+        entry.path = body_path
+        return entry
+
+    def mark_uncacheable(self, key, *, etag, size):
+        """최대 크기를 넘는 객체 표시 (재검증 주기 동안 캐시를 거치지 않고 바로 스트리밍)"""
+        self._write_meta(self._meta_path(key), CacheEntry(
+            key=key, etag=etag or '', size=size, checked_at=time.time(), uncacheable=True,
+        ))
+
+    def mark_validated(self, entry):
+        """S3 재검증(304) 후 검증 시각 갱신"""
+        entry.checked_at = time.time()
+        self._write_meta(self._meta_path(entry.key), entry)
+
+    def discard(self, key):
+        """항목 삭제 (S3 에서 지워진 객체)"""
+        meta_path = self._meta_path(key)
+        entry = self.get(key)
+        for path in (meta_path, entry.path if entry else ''):
+            if path:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+        if entry is not None and entry.path:
+            self._add_usage(-entry.size)
+
+    def _write_meta(self, meta_path, entry):
+        data = asdict(entry)
+        data.pop('path')
+        _write_atomic(os.path.dirname(meta_path), meta_path, [json.dumps(data).encode()])
+
+    # 잠금
+
+    @contextmanager
+    def fill_lock(self, key):
+        """키 단위 채우기 잠금 (워커/스레드 간). 시간 안에 못 잡으면 잠금 없이 진행하고 False 를 넘김"""
+        lock_path = os.path.join(self.directory, 'locks', f'{_digest(key)[:2]}.lock')
+        deadline = time.monotonic() + self.lock_timeout
+        with open(lock_path, 'a') as lock_file:
+            acquired = False
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    acquired = True
+                    break
+                except OSError as exc:
+                    if exc.errno not in (errno.EAGAIN, errno.EACCES) or time.monotonic() >= deadline:
+                        break
+                    time.sleep(0.01)
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # 용량 관리
+
+    def _scan(self):
+        """(mtime, 크기, 경로) 본문 목록. 오래된 임시 파일은 지움"""
+        bodies = []
+        now = time.time()
+        with os.scandir(self.directory) as shards:
+            for shard in shards:
+                if not shard.is_dir() or len(shard.name) != 2:
+                    continue
+                with os.scandir(shard.path) as files:
+                    for item in files:
+                        try:
+                            stat = item.stat()
+                        except FileNotFoundError:
+                            continue
+                        if item.name.endswith('.bin'):
+                            bodies.append((stat.st_mtime, stat.st_size, item.path))
+                        elif item.name.endswith('.tmp') and now - stat.st_mtime > _STALE_TEMP_SECONDS:
+                            try:
+                                os.unlink(item.path)
+                            except FileNotFoundError:
+                                pass
+        return bodies
+
+    def usage(self):
+        """(본문 수, 전체 바이트)"""
+        bodies = self._scan()
+        total = sum(size for _, size, _ in bodies)
+        self._set_usage(total)
+        return len(bodies), total
+
+    def _set_usage(self, total):
+        with self._usage_lock:
+            self._usage = total
+            self._usage_scanned_at = time.monotonic()
+
+    def _add_usage(self, delta):
+        """사용량 어림값에 ``delta`` 를 더해 반환. 처음이거나 주기가 지났으면 스캔으로 다시 맞춤"""
+        with self._usage_lock:
+            if self._usage is not None and time.monotonic() - self._usage_scanned_at < _RESCAN_INTERVAL:
+                self._usage = max(self._usage + delta, 0)
+                return self._usage
+        return self.usage()[1]
+
+    def evict(self) -> int:
+        """용량을 넘었으면 오래 안 쓴 본문부터 지움 (다른 워커가 정리 중이면 건너뜀)"""
+        with open(os.path.join(self.directory, '.evict.lock'), 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return 0
+            try:
+                bodies = self._scan()
+                total = sum(size for _, size, _ in bodies)
+                if total <= self.max_bytes:
+                    self._set_usage(total)
+                    return 0
+                evicted = 0
+                target = self.max_bytes * _LOW_WATER
+                for _, size, path in sorted(bodies):
+                    if total <= target:
+                        break
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        continue
+                    # 이 본문을 가리키는 메타데이터도 삭제 (본문 이름 앞부분이 키 해시)
+                    meta_path = os.path.join(os.path.dirname(path), f'{os.path.basename(path).split(".")[0]}.json')
+                    try:
+                        with open(meta_path, 'rb') as meta_file:
+                            if json.load(meta_file).get('body') == os.path.basename(path):
+                                os.unlink(meta_path)
+                    except (FileNotFoundError, ValueError):
+                        pass
+                    total -= size
+                    evicted += 1
+                self._set_usage(total)
+                self.record('evictions', evicted)
+                return evicted
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # 지표
+
+    def record(self, name, amount=1):
+        """카운터 증가. 일정 주기로 ``stats/<pid>.json`` 에 기록"""
+        with self._stats_lock:
+            if os.getpid() != self._stats_pid:
+                # fork 된 워커는 부모 카운터를 물려받지 않음
+                self._stats = Counter()
+                self._stats_pid = os.getpid()
+                self._stats_flushed_at = 0.0
+            self._stats[name] += amount
+            if time.monotonic() - self._stats_flushed_at < _STATS_FLUSH_INTERVAL:
+                return
+            self._stats_flushed_at = time.monotonic()
+            snapshot = dict(self._stats)
+        self._flush_stats(snapshot)
+
+    def flush_stats(self):
+        with self._stats_lock:
+            snapshot = dict(self._stats)
+        self._flush_stats(snapshot)
+
+    def _flush_stats(self, snapshot):
+        stats_dir = os.path.join(self.directory, 'stats')
+        payload = {'pid': os.getpid(), 'updated_at': time.time(), **snapshot}
+        try:
+            _write_atomic(stats_dir, os.path.join(stats_dir, f'{os.getpid()}.json'), [json.dumps(payload).encode()])
+        except OSError as exc:
+            logger.warning("S3 디스크 캐시 지표 기록 실패: %s", exc)
+
+    def stats(self):
+        """이 프로세스의 카운터"""
+        with self._stats_lock:
+            return {name: self._stats[name] for name in STAT_NAMES}
+
+
+def read_stats(directory):
+    """모든 워커의 카운터 합계와 적중률"""
+    totals = Counter()
+    workers = 0
+    stats_dir = os.path.join(directory, 'stats')
+    for name in os.listdir(stats_dir) if os.path.isdir(stats_dir) else []:
+        try:
+            with open(os.path.join(stats_dir, name), 'rb') as stats_file:
+                data = json.load(stats_file)
+        except (OSError, ValueError):
+            continue
+        workers += 1
+        totals.update({stat: int(data.get(stat, 0)) for stat in STAT_NAMES})
+    summary = {stat: totals[stat] for stat in STAT_NAMES}
+    # 재검증(304)도 디스크에서 본문을 보냈으므로 적중으로 셈
+    served_from_disk = summary['hits'] + summary['revalidated']
+    lookups = served_from_disk + summary['misses'] + summary['refreshed']
+    summary['workers'] = workers
+    summary['hit_rate'] = served_from_disk / lookups if lookups else 0.0
+    return summary
+
+
+_cache = None
+_cache_config = None
+_cache_lock = threading.Lock()
+
+
+def get_disk_cache() -> Optional[S3DiskCache]:
+    """설정에 맞는 프로세스 공용 캐시 (``S3_DISK_CACHE_DIR`` 가 없으면 None)"""
+    global _cache, _cache_config
+    config = (
+        getattr(settings, 'S3_DISK_CACHE_DIR', None),
+        getattr(settings, 'S3_DISK_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES),
+        getattr(settings, 'S3_DISK_CACHE_MAX_OBJECT_SIZE', DEFAULT_MAX_OBJECT_SIZE),
+        getattr(settings, 'S3_DISK_CACHE_REVALIDATE_AFTER', DEFAULT_REVALIDATE_AFTER),
+    )
+    if not config[0]:
+        return None
+    with _cache_lock:
+        if _cache_config != config:
+            _cache = S3DiskCache(config[0], config[1], max_object_size=config[2], revalidate_after=config[3])
+            _cache_config = config
+        return _cache
@@ -0,0 +1,220 @@
+"""로컬 가짜 S3 서버
+
+테스트와 벤치마크에서 실제 오브젝트 스토리지 대신 사용한다. path-style 주소(``/버킷/키``)의
+GetObject/HeadObject/PutObject/DeleteObject 만 흉내낸다. ``Range``, ``If-None-Match`` 를 S3 와 같은
+방식으로 처리하고 요청 메서드/헤더와 TCP 연결 수를 기록해 왕복 횟수와 커넥션 재사용 여부를 확인할 수 있다.
+
+사용 예::
+
+    with FakeS3Server(bucket='media') as server:
+        server.put_object('images/a.png', b'...')
+        with override_settings(**server.django_settings()):
+            ...
+        server.requests  # [('GET', 'images/a.png', {...헤더...}), ...]
+"""
+
+import hashlib
+import re
+import threading
+import time
+import urllib.parse
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+_WRITE_CHUNK = 64 * 1024
+
+
+def _etag_matches(header, etag):
+    candidates = [value.strip() for value in header.split(',')]
+    if '*' in candidates:
+        return True
+    return any(candidate.removeprefix('W/') == etag for candidate in candidates)
+
+
+class _FakeS3Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # keep-alive 응답 지연(Nagle + delayed ACK) 방지
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connection_count += 1
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def do_PUT(self):
+        bucket, key = self._record()
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if bucket != self.server.fake.bucket:
+            self._send_error(404, 'NoSuchBucket', 'The specified bucket does not exist.', True)
+            return
+        etag = self.server.fake.put_object(key, body, self.headers.get('Content-Type') or 'application/octet-stream')
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_DELETE(self):
+        bucket, key = self._record()
+        if bucket == self.server.fake.bucket:
+            self.server.fake.objects.pop(key, None)
+        self.send_response(204)
+        self.end_headers()
+
+    def _record(self):
+        bucket, _, key = urllib.parse.unquote(urllib.parse.urlsplit(self.path).path).lstrip('/').partition('/')
+        with self.server.lock:
+            self.server.requests.append((self.command, key, dict(self.headers.items())))
+        return bucket, key
+
+    def _serve(self, send_body):
+        fake = self.server.fake
+        bucket, key = self._record()
+
+        if fake.latency:
+            time.sleep(fake.latency)
+
+        obj = fake.objects.get(key) if bucket == fake.bucket else None
+        if obj is None:
+            self._send_error(404, 'NoSuchKey', 'The specified key does not exist.', send_body, Key=key)
+            return
+
+        data, etag, last_modified, content_type = obj
+        headers = {'ETag': etag, 'Last-Modified': last_modified, 'Accept-Ranges': 'bytes'}
+
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match and _etag_matches(if_none_match, etag):
+            self.send_response(304)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+
+        size = len(data)
+        start, end, status = 0, size - 1, 200
+        match = _RANGE_RE.match(self.headers.get('Range') or '')
+        if match and (match.group(1) or match.group(2)):
+            first, last = match.groups()
+            if first:
+                start = int(first)
+                end = min(int(last), size - 1) if last else size - 1
+            else:
+                start = max(0, size - int(last))
+            if start >= size or (first and last and int(last) < start):
+                self._send_error(
+                    416, 'InvalidRange', 'The requested range is not satisfiable', send_body,
+                    RangeRequested=self.headers.get('Range'), ActualObjectSize=size,
+                )
+                return
+            status = 206
+            headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(end - start + 1))
+        self.end_headers()
+        if send_body:
+            view = memoryview(data)
+            for offset in range(start, end + 1, _WRITE_CHUNK):
+                self.wfile.write(view[offset:min(offset + _WRITE_CHUNK, end + 1)])
+
+    def _send_error(self, status, code, message, send_body, **extra):
+        fields = ''.join(f'<{name}>{escape(str(value))}</{name}>' for name, value in extra.items())
+        body = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            f'<Error><Code>{code}</Code><Message>{escape(message)}</Message>{fields}</Error>'
+        ).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeS3Server:
+    """GetObject/HeadObject/PutObject/DeleteObject 만 흉내내는 스레드 기반 S3 서버
+
+    Args:
+        bucket: 버킷 이름
+        latency: 요청마다 추가할 지연(초)
+    """
+
+    def __init__(self, bucket='satoshop-test', latency=0.0):
+        self.bucket = bucket
+        self.latency = latency
+        # key -> (데이터, ETag, Last-Modified, Content-Type)
+        self.objects = {}
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def requests(self):
+        """(메서드, 키, 요청 헤더) 목록"""
+        return list(self._httpd.requests)
+
+    @property
+    def connection_count(self):
+        """열린 TCP 연결 수"""
+        return self._httpd.connection_count
+
+    def reset_counters(self):
+        with self._httpd.lock:
+            self._httpd.requests = []
+            self._httpd.connection_count = 0
+
+    def put_object(self, key, data, content_type='application/octet-stream'):
+        etag = f'"{hashlib.md5(data).hexdigest()}"'
+        self.objects[key] = (bytes(data), etag, formatdate(usegmt=True), content_type)
+        return etag
+
+    def django_settings(self):
+        """``override_settings(**server.django_settings())`` 로 S3Storage 가 이 서버를 보게 함"""
+        return {
+            'S3_ACCESS_KEY_ID': 'fake-access-key',
+            'S3_SECRET_ACCESS_KEY': 'fake-secret-key',
+            'S3_BUCKET_NAME': self.bucket,
+            'S3_ENDPOINT_URL': self.url,
+            'S3_REGION_NAME': 'us-east-1',
+            'S3_USE_SSL': False,
+        }
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), _FakeS3Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._httpd.lock = threading.Lock()
+        self._httpd.requests = []
+        self._httpd.connection_count = 0
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='fake-s3', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
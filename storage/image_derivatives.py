@@ -0,0 +1,537 @@
+"""업로드 이미지 파생본(derivative) 생성
+
+스토어/상품/메뉴/밋업/라이브 강의 이미지, 미니홈 이미지, 명예의 전당 이미지는 모두 같은 과정을 거친다.
+원본을 열고 EXIF 회전을 보정한 뒤 비율에 맞게 자르고 LANCZOS 로 줄여 AVIF/WebP 로 저장한다.
+예전에는 함수마다 이 코드를 복사해 두었다. 이제는 모델별 프로필(``ImageProfile``)만 선언하고,
+``render_derivatives()`` 가 이미지를 한 번 디코딩해 프로필의 모든 너비를 차례로 만든다.
+
+- ``widths`` 의 첫 번째 값이 대표 이미지(모델의 ``file_url``/``width``/``height``)다. 나머지는
+  ``srcset`` 용 반응형 변형이며 ``variants`` 필드에 경로/URL/크기를 기록한다.
+- JPEG 는 디코딩 전에 ``draft()`` 로 필요한 크기 이상에서 가장 작은 1/2·1/4·1/8 배율을 고른다.
+  4000px 사진을 500px 로 줄일 때 전체 해상도로 풀지 않는다.
+- 자르기는 ``resize(box=...)`` 로 리사이즈와 함께 처리하고, 작은 너비는 바로 앞 결과에서 줄인다.
+- 포맷은 ``formats`` 순서대로 사용 가능한 첫 인코더를 쓰고, 인코딩이 실패하면 JPEG 로 저장한다.
+
+프로필은 ``register_profile()`` 로 추가하고, 모델 이미지 업로드는 ``upload_profile_image()`` 를 쓴다.
+업로드 요청은 기본적으로 원본만 저장하고, 파생본은 ``storage.image_transcode`` 워커가 만든다.
+"""
+
+import io
+import logging
+import math
+import os
+import signal
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.core.files.base import ContentFile
+from django.db import models
+
+try:
+    from PIL import Image, ImageOps, features
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+try:
+    import pillow_avif  # noqa: F401  AVIF 지원
+    AVIF_AVAILABLE = True
+except ImportError:
+    AVIF_AVAILABLE = PIL_AVAILABLE and bool(features.check('avif'))
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS = {'AVIF': '.avif', 'WEBP': '.webp', 'JPEG': '.jpg'}
+
+# 원본보다 이 배수 이상 클 때만 정수 배 축소(reduce) 후 LANCZOS 를 적용
+REDUCING_GAP = 3.0
+
+_ORIENTATION_TAG = 0x0112
+# EXIF 회전 값 중 가로/세로가 바뀌는 것 (exif_transpose 후 크기가 뒤집힘)
+_TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+@dataclass(frozen=True)
+class ImageProfile:
+    name: str
+    # 출력 너비. 첫 번째가 대표 이미지, 나머지는 반응형 변형 (큰 것부터)
+    widths: Tuple[int, ...] = ()
+    # (가로, 세로) 비율로 가운데를 자름. None 이면 원본 비율 유지
+    crop: Optional[Tuple[int, int]] = None
+    # 비율을 유지할 때 높이 상한
+    max_height: Optional[int] = None
+    # False 면 원본보다 크게 만들지 않음
+    upscale: bool = True
+    formats: Tuple[str, ...] = ('AVIF', 'WEBP')
+    # 투명 배경을 흰색으로 채움. False 면 알파 채널 유지 (JPEG 대체 저장 시에만 채움)
+    flatten_alpha: bool = True
+    quality: int = 85
+    avif_speed: int = 6
+    webp_method: int = 6
+    # 대표 이미지 파일명 접미사 (예: '_processed' → 'photo_processed.webp')
+    suffix: str = ''
+    # 모델 이미지 업로드용: 'app_label.ModelName', 소유자 FK 이름, S3 prefix (``{owner.…}`` 포맷)
+    model: str = ''
+    owner_field: str = ''
+    prefix: str = ''
+    label: str = '이미지'
+
+
+@dataclass
+class Derivative:
+    width: int
+    height: int
+    format: str
+    content: bytes
+
+    @property
+    def extension(self):
+        return EXTENSIONS[self.format]
+
+
+@dataclass
+class DerivativeSet:
+    profile: ImageProfile
+    base_name: str
+    original_size: Tuple[int, int]
+    derivatives: List[Derivative] = field(default_factory=list)
+
+    @property
+    def primary(self):
+        return self.derivatives[0]
+
+    @property
+    def variants(self):
+        return self.derivatives[1:]
+
+    def filename(self, derivative):
+        if derivative is self.primary:
+            return f'{self.base_name}{self.profile.suffix}{derivative.extension}'
+        return f'{self.base_name}{self.profile.suffix}_{derivative.width}w{derivative.extension}'
+
+    def as_file(self, derivative=None):
+        derivative = derivative or self.primary
+        return ContentFile(derivative.content, name=self.filename(derivative))
+
+
+PROFILES = {}
+
+
+def register_profile(profile):
+    """프로필 등록 (같은 이름이면 교체)"""
+    PROFILES[profile.name] = profile
+    return profile
+
+
+def get_profile(name):
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise KeyError(f'등록되지 않은 이미지 프로필: {name}') from None
+
+
+# 작업 대기열에 저장할 수 있는 프로필 값 (``profile_overrides`` / ``resolve_profile``)
+_OVERRIDABLE = ('widths', 'crop', 'max_height', 'upscale')
+
+
+def profile_overrides(profile):
+    """등록된 같은 이름 프로필과 다른 값 (JSON 저장용)"""
+    base = get_profile(profile.name)
+    overrides = {}
+    for name in _OVERRIDABLE:
+        value = getattr(profile, name)
+        if value != getattr(base, name):
+            overrides[name] = list(value) if isinstance(value, tuple) else value
+    return overrides
+
+
+def resolve_profile(name, overrides=None):
+    profile = get_profile(name)
+    if not overrides:
+        return profile
+    known = {f.name for f in fields(ImageProfile)}
+    values = {
+        key: tuple(value) if isinstance(value, list) else value
+        for key, value in overrides.items()
+        if key in known
+    }
+    return replace(profile, **values)
+
+
+def encoder_available(image_format):
+    if image_format == 'AVIF':
+        return AVIF_AVAILABLE
+    if image_format == 'WEBP':
+        return PIL_AVAILABLE and bool(features.check('webp'))
+    return PIL_AVAILABLE
+
+
+def output_sizes(source_size, profile):
+    """원본(EXIF 보정 후) 크기에 대한 프로필의 출력 크기 목록"""
+    width, height = source_size
+    if profile.crop:
+        ratio_w, ratio_h = profile.crop
+        return [(target, int(target * ratio_h / ratio_w)) for target in profile.widths]
+
+    sizes = []
+    for target in profile.widths or (width,):
+        scale = target / width
+        if profile.max_height:
+            scale = min(scale, profile.max_height / height)
+        if not profile.upscale:
+            scale = min(scale, 1.0)
+        sizes.append((max(1, int(width * scale)), max(1, int(height * scale))))
+    return sizes
+
+
+def crop_box(source_size, crop):
+    """``ImageOps.fit`` 과 같은 가운데 자르기 영역"""
+    width, height = source_size
+    if not crop:
+        return (0, 0, width, height)
+    target_ratio = crop[0] / crop[1]
+    if width / height > target_ratio:
+        crop_width = height * target_ratio
+        left = (width - crop_width) / 2
+        return (left, 0, left + crop_width, height)
+    crop_height = width / target_ratio
+    top = (height - crop_height) / 2
+    return (0, top, width, top + crop_height)
+
+
+def _oriented_size(image):
+    width, height = image.size
+    try:
+        orientation = image.getexif().get(_ORIENTATION_TAG)
+    except Exception:
+        orientation = None
+    if orientation in _TRANSPOSED_ORIENTATIONS:
+        return height, width
+    return width, height
+
+
+def _request_draft(image, profile):
+    """JPEG 를 필요한 크기 이상에서 가장 작은 배율로 디코딩하도록 설정"""
+    if image.format != 'JPEG':
+        return
+    oriented = _oriented_size(image)
+    box = crop_box(oriented, profile.crop)
+    box_width, box_height = box[2] - box[0], box[3] - box[1]
+    scale = max(
+        max(width / box_width, height / box_height)
+        for width, height in output_sizes(oriented, profile)
+    )
+    if scale >= 1:
+        return
+    requested = (math.ceil(oriented[0] * scale), math.ceil(oriented[1] * scale))
+    if oriented != image.size:
+        requested = requested[::-1]
+    image.draft('RGB', requested)
+
+
+def _normalize_mode(image, flatten_alpha):
+    has_alpha = image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+    if has_alpha:
+        image = image.convert('RGBA')
+        if not flatten_alpha:
+            return image
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    if image.mode != 'RGB':
+        return image.convert('RGB')
+    return image
+
+
+def _save(image, image_format, profile):
+    output = io.BytesIO()
+    if image_format == 'AVIF':
+        image.save(output, format='AVIF', quality=profile.quality, speed=profile.avif_speed)
+    elif image_format == 'WEBP':
+        image.save(output, format='WEBP', quality=profile.quality, method=profile.webp_method)
+    else:
+        if image.mode != 'RGB':
+            image = _normalize_mode(image, flatten_alpha=True)
+        image.save(output, format='JPEG', quality=profile.quality, optimize=True)
+    return output.getvalue()
+
+
+def encode(image, profile, image_format=None):
+    """(포맷, 바이트). ``image_format`` 이 없으면 ``profile.formats`` 중 사용 가능한 첫 포맷"""
+    candidates = [image_format] if image_format else [fmt for fmt in profile.formats if encoder_available(fmt)]
+    for candidate in candidates:
+        try:
+            return candidate, _save(image, candidate, profile)
+        except Exception as exc:
+            logger.warning('%s 인코딩 실패, 다음 포맷으로 저장: %s', candidate, exc)
+    return 'JPEG', _save(image, 'JPEG', profile)
+
+
+def render_derivatives(image_file, profile):
+    """이미지를 한 번 디코딩해 프로필의 모든 너비를 인코딩
+
+    Raises:
+        OSError / ValueError: 이미지가 아니거나 손상된 경우 (Pillow 예외)
+    """
+    if not PIL_AVAILABLE:
+        raise ImportError('Pillow 패키지가 설치되지 않았습니다. pip install Pillow을 실행해주세요.')
+
+    name = getattr(image_file, 'name', '') or profile.name
+    try:
+        image_file.seek(0)
+    except (AttributeError, OSError):
+        pass
+
+    with Image.open(image_file) as opened:
+        original_size = _oriented_size(opened)
+        _request_draft(opened, profile)
+        image = ImageOps.exif_transpose(opened)
+        image = _normalize_mode(image, profile.flatten_alpha)
+
+    sizes = output_sizes(image.size, profile)
+    result = DerivativeSet(
+        profile=profile,
+        base_name=os.path.splitext(os.path.basename(name))[0] or profile.name,
+        original_size=original_size,
+    )
+
+    box = crop_box(image.size, profile.crop)
+    source = image
+    image_format = None
+    for size in sizes:
+        if source is image:
+            resized = image.resize(size, Image.Resampling.LANCZOS, box=box, reducing_gap=REDUCING_GAP)
+        elif source.size == size:
+            resized = source
+        else:
+            resized = source.resize(size, Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+        image_format, content = encode(resized, profile, image_format)
+        result.derivatives.append(Derivative(width=size[0], height=size[1], format=image_format, content=content))
+        # 다음(더 작은) 너비는 방금 줄인 이미지에서 다시 줄임
+        source = resized
+
+    logger.info(
+        '%s 이미지 파생본 생성: %s → %s (%s)',
+        profile.label, original_size, [d.width for d in result.derivatives], image_format,
+    )
+    return result
+
+
+def pool_initializer():
+    """변환 프로세스 풀 초기화 (spawn 된 자식은 Django 설정 없이 이 모듈만 import 함)"""
+    # Ctrl+C 는 부모 워커가 받아 현재 배치를 마치고 풀을 닫음
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def render_source(profile, data, name):
+    """바이트로 받은 원본을 ``render_derivatives`` 로 처리 (프로세스 풀에서 실행)"""
+    buffer = io.BytesIO(data)
+    buffer.name = name
+    return render_derivatives(buffer, profile)
+
+
+def upload_derivatives(rendered, prefix, storage=None):
+    """대표 이미지는 ``upload_file_to_s3`` 로, 변형은 같은 이름 뒤에 ``_<너비>w`` 를 붙여 저장
+
+    변형 업로드 실패는 기록만 하고 건너뛴다 (대표 이미지만으로도 표시 가능).
+    """
+    from .backends import get_s3_storage
+    from .utils import upload_file_to_s3
+
+    storage = storage or get_s3_storage()
+    upload_result = upload_file_to_s3(rendered.as_file(), prefix=prefix, storage=storage)
+    if not upload_result['success']:
+        return upload_result
+
+    stem = os.path.splitext(upload_result['file_path'])[0]
+    variants = []
+    for derivative in rendered.variants:
+        path = f'{stem}_{derivative.width}w{derivative.extension}'
+        try:
+            saved_path = storage.save(path, rendered.as_file(derivative))
+            variants.append({
+                'width': derivative.width,
+                'height': derivative.height,
+                'file_path': saved_path,
+                'file_url': storage.url(saved_path),
+                'file_size': len(derivative.content),
+            })
+        except Exception as exc:
+            logger.warning('반응형 이미지 업로드 실패: %s - %s', path, exc)
+
+    upload_result['file_size'] = len(rendered.primary.content)
+    upload_result['variants'] = variants
+    return upload_result
+
+
+def delete_variant_files(variants):
+    """``variants`` 에 기록된 파일 삭제. 삭제한 수를 돌려줌"""
+    from .utils import delete_file_from_s3
+
+    deleted = 0
+    for variant in variants or ():
+        file_path = variant.get('file_path')
+        if file_path and delete_file_from_s3(file_path)['success']:
+            deleted += 1
+    return deleted
+
+
+def process_profile_image(image_file, profile) -> Dict[str, Any]:
+    """``render_derivatives`` 결과를 기존 ``process_*_image`` 반환 형식으로"""
+    try:
+        rendered = render_derivatives(image_file, profile)
+    except ImportError as e:
+        error_msg = str(e)
+        logger.error(error_msg)
+        return {'success': False, 'error': error_msg}
+    except Exception as e:
+        error_msg = f"{profile.label} 이미지 처리 실패: {str(e)}"
+        logger.error(error_msg)
+        return {'success': False, 'error': error_msg}
+
+    primary = rendered.primary
+    return {
+        'success': True,
+        'processed_file': rendered.as_file(),
+        'original_size': rendered.original_size,
+        'processed_size': (primary.width, primary.height),
+        'filename': rendered.filename(primary),
+        'derivatives': rendered,
+    }
+
+
+def image_fields(rendered, upload_result):
+    """파생본 업로드 결과 → 갤러리 이미지 모델 필드 값"""
+    return {
+        'file_path': upload_result['file_path'],
+        'file_url': upload_result['file_url'],
+        'file_size': upload_result['file_size'],
+        'width': rendered.primary.width,
+        'height': rendered.primary.height,
+        'variants': upload_result['variants'],
+    }
+
+
+def upload_profile_image(image_file, profile_name, owner, user) -> Dict[str, Any]:
+    """프로필의 모델(``StoreImage`` 등)에 이미지를 업로드하고 다음 순서로 행을 만듦
+
+    ``IMAGE_TRANSCODE_ASYNC`` 가 켜져 있으면 원본만 저장해 행을 만들고 파생본 생성은
+    ``storage.image_transcode`` 대기열에 맡긴다. 꺼져 있으면 요청 안에서 바로 변환한다.
+
+    Returns:
+        {'success': True, 'image': 모델 인스턴스} 또는 {'success': False, 'error': str}
+    """
+    from django.apps import apps
+
+    from .image_transcode import queue_transcode, store_original, transcode_async_enabled
+
+    profile = get_profile(profile_name)
+    try:
+        model = apps.get_model(profile.model)
+        prefix = profile.prefix.format(owner=owner)
+
+        deferred = transcode_async_enabled()
+        if deferred:
+            upload_result = store_original(image_file, prefix)
+            if not upload_result['success']:
+                return upload_result
+            values = {
+                'file_path': upload_result['file_path'],
+                'file_url': upload_result['file_url'],
+                'file_size': upload_result['file_size'],
+                'width': upload_result['width'],
+                'height': upload_result['height'],
+            }
+        else:
+            process_result = process_profile_image(image_file, profile)
+            if not process_result['success']:
+                return process_result
+            rendered = process_result['derivatives']
+
+            upload_result = upload_derivatives(rendered, prefix)
+            if not upload_result['success']:
+                return upload_result
+            values = image_fields(rendered, upload_result)
+
+        last_order = model.objects.filter(**{profile.owner_field: owner}).aggregate(
+            models.Max('order')
+        )['order__max'] or 0
+
+        image = model.objects.create(
+            **{profile.owner_field: owner},
+            **values,
+            original_name=image_file.name,
+            order=last_order + 1,
+            uploaded_by=user,
+        )
+        if deferred:
+            queue_transcode(image, profile, image.file_path, prefix=prefix, source_name=image_file.name)
+        return {'success': True, 'image': image}
+
+    except Exception as e:
+        error_msg = f"{profile.label} 이미지 업로드 실패: {str(e)}"
+        logger.error(error_msg)
+        return {'success': False, 'error': error_msg}
+
+
+def srcset(image):
+    """``variants`` 가 있는 이미지 모델의 ``srcset`` 값 (변형이 없으면 빈 문자열)"""
+    variants = getattr(image, 'variants', None)
+    if not variants:
+        return ''
+    candidates = [(image.file_url, image.width)] + [(v['file_url'], v['width']) for v in variants]
+    return ', '.join(f'{url} {width}w' for url, width in candidates)
+
+
+def probe_size(image_file):
+    """디코딩 없이 헤더만 읽어 EXIF 회전을 반영한 (가로, 세로). 읽을 수 없으면 (0, 0)"""
+    if not PIL_AVAILABLE:
+        return (0, 0)
+    try:
+        image_file.seek(0)
+    except (AttributeError, OSError):
+        pass
+    try:
+        with Image.open(image_file) as image:
+            return _oriented_size(image)
+    except Exception as exc:
+        logger.warning('이미지 크기 확인 실패: %s', exc)
+        return (0, 0)
+    finally:
+        try:
+            image_file.seek(0)
+        except (AttributeError, OSError):
+            pass
+
+
+_GALLERY = dict(crop=(1, 1), widths=(500, 250), flatten_alpha=False, webp_method=4, suffix='_processed')
+
+register_profile(ImageProfile(
+    name='store', label='스토어', crop=(16, 9), widths=(1000, 640),
+    model='stores.StoreImage', owner_field='store', prefix='stores/{owner.store_id}/images',
+))
+register_profile(ImageProfile(
+    name='product', label='상품', **_GALLERY,
+    model='products.ProductImage', owner_field='product',
+    prefix='products/{owner.store.store_id}/{owner.id}/images',
+))
+register_profile(ImageProfile(
+    name='menu', label='메뉴', **_GALLERY,
+    model='menu.MenuImage', owner_field='menu',
+    prefix='menus/{owner.store.store_id}/{owner.id}/images',
+))
+register_profile(ImageProfile(
+    name='meetup', label='밋업', **_GALLERY,
+    model='meetup.MeetupImage', owner_field='meetup',
+    prefix='meetups/{owner.store.store_id}/{owner.id}/images',
+))
+register_profile(ImageProfile(
+    name='live_lecture', label='라이브 강의', **_GALLERY,
+    model='lecture.LiveLectureImage', owner_field='live_lecture',
+    prefix='live_lectures/{owner.store.store_id}/{owner.id}/images',
+))
+# 원본(1000)과 썸네일(400)을 한 번에
+register_profile(ImageProfile(name='hall_of_fame', label='Hall of Fame', crop=(1, 1), widths=(1000, 400), formats=('WEBP',)))
+# 크기는 호출마다 ``replace()`` 로 지정 (``minihome.services.process_minihome_image``)
+register_profile(ImageProfile(name='minihome', label='미니홈', formats=('WEBP',), upscale=False))
+
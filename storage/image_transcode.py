@@ -0,0 +1,465 @@
+"""업로드 이미지 파생본 비동기 생성 (원본 먼저 저장)
+
+AVIF/WebP 인코딩은 사진 1장에 수십~수백 ms 가 걸린다. 여러 장을 한 번에 올리는 상품 등록 요청은
+Gunicorn 타임아웃에 가까워질 수 있다. 그래서 업로드 요청은 원본만 저장하고 곧바로 응답한다.
+
+- 업로드: 원본을 ``<prefix>/originals/`` 아래에 저장하고 모델 행(또는 미니홈 JSON)이 원본 URL 을
+  가리키게 한다. 그리고 ``queue_transcode()`` 로 ``ImageTranscodeJob`` 을 남긴다.
+- 워커(``python manage.py run_image_transcode_worker``)는 작업을 가져와 원본을 내려받는다.
+  ``render_derivatives()`` 는 프로세스 풀에서 실행한다. 파생본을 올린 뒤 참조를 바꾸고 원본을 지운다.
+  - 갤러리 이미지(프로필의 ``model``): ``file_path`` 가 아직 원본인 행만 조건부 UPDATE 한다.
+  - 그 밖의 대상(미니홈): 행의 JSON 필드에서 ``path`` 가 원본인 이미지 정보(path/url/width/height)를
+    바꾼다. 편집 화면이 예전 JSON 을 다시 저장하면 ``resolve_transcoded_references()`` 가 파생본으로
+    돌려놓는다.
+- 대상이 사라졌으면 작업을 건너뛴다. 미니홈은 업로드 직후 아직 JSON 을 저장하기 전일 수 있다. 그래서
+  ``ORPHAN_GRACE_SECONDS`` 동안은 미뤘다가 다시 확인한다.
+- 변환이 ``MAX_ATTEMPTS`` 회 실패하면 ``failed`` 로 남긴다. 이때도 원본이 그대로 표시된다.
+- 변환은 전용 워커에서만 한다. 워커를 띄우지 않는 개발 환경은 ``IMAGE_TRANSCODE_BACKGROUND = True`` 로
+  업로드한 웹 프로세스의 백그라운드 스레드가 방금 남긴 작업만 처리하게 할 수 있다 (풀 없이, 기본 꺼짐).
+  ``IMAGE_TRANSCODE_ASYNC`` 는 워커를 띄운 배포에서만 켠다 (기본 꺼짐). 꺼져 있으면 예전처럼 업로드 요청
+  안에서 바로 변환한다.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import partial
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .backends import get_s3_storage
+from .image_derivatives import (
+    get_profile,
+    image_fields,
+    pool_initializer,
+    probe_size,
+    profile_overrides,
+    render_source,
+    resolve_profile,
+    upload_derivatives,
+)
+from .models import ImageTranscodeJob
+from .utils import delete_file_from_s3, upload_file_to_s3
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF_SECONDS = (30, 300)
+# 처리 중 상태로 이 시간 이상 남은 작업은 워커가 중단된 것으로 보고 다시 가져감
+STALE_LOCK_SECONDS = 600
+# 대상에서 원본 참조를 찾지 못해도 이 시간 동안은 저장 전일 수 있으므로 미룸
+ORPHAN_GRACE_SECONDS = 300
+ORPHAN_RECHECK_SECONDS = 10
+DEFAULT_BATCH_SIZE = 16
+DEFAULT_POLL_INTERVAL_SECONDS = 1.0
+
+ORIGINALS_DIR = 'originals'
+
+_background_lock = threading.Lock()
+_background_thread = None
+# 이 프로세스에서 업로드해 백그라운드 스레드가 맡은 작업 id
+_background_job_ids = set()
+
+
+@dataclass
+class TranscodeResult:
+    done: int = 0
+    skipped: int = 0
+    failed: int = 0
+    postponed: int = 0
+    source_bytes: int = 0
+    output_bytes: int = 0
+
+    @property
+    def handled(self) -> int:
+        return self.done + self.skipped + self.failed + self.postponed
+
+
+def transcode_async_enabled() -> bool:
+    return getattr(settings, 'IMAGE_TRANSCODE_ASYNC', False)
+
+
+def _background_enabled() -> bool:
+    return getattr(settings, 'IMAGE_TRANSCODE_BACKGROUND', False)
+
+
+def store_original(image_file, prefix):
+    """원본을 ``<prefix>/originals/`` 에 그대로 저장 (이미지가 아니면 실패)
+
+    Returns:
+        ``upload_file_to_s3`` 결과 + 'width'/'height' (EXIF 회전 반영)
+    """
+    width, height = probe_size(image_file)
+    if not (width and height):
+        return {'success': False, 'error': '이미지 파일을 열 수 없습니다.'}
+
+    upload_result = upload_file_to_s3(image_file, prefix=f'{prefix}/{ORIGINALS_DIR}')
+    if upload_result['success']:
+        upload_result['width'] = width
+        upload_result['height'] = height
+    return upload_result
+
+
+def queue_transcode(target, profile, source_path, *, prefix, source_name=''):
+    """``target`` 이 가리키는 원본(``source_path``)의 파생본 생성을 대기열에 추가"""
+    job = ImageTranscodeJob.objects.create(
+        target_model=target._meta.label,
+        target_id=target.pk,
+        profile=profile.name,
+        overrides=profile_overrides(profile),
+        prefix=prefix,
+        source_path=source_path,
+        source_name=source_name[:255],
+    )
+    transaction.on_commit(partial(request_background_transcode, job.pk))
+    return job
+
+
+# --- 참조 찾기/바꾸기 -------------------------------------------------------
+
+def _json_fields(model):
+    return [field for field in model._meta.concrete_fields if isinstance(field, models.JSONField)]
+
+
+def _walk_image_meta(value):
+    """JSON 값 안의 이미지 정보 dict (``path``/``url`` 키가 있는 것)"""
+    if isinstance(value, dict):
+        if isinstance(value.get('path'), str) and 'url' in value:
+            yield value
+        for child in value.values():
+            yield from _walk_image_meta(child)
+    elif isinstance(value, list):
+        for child in value:
+            yield from _walk_image_meta(child)
+
+
+def _is_row_target(job):
+    return job.target_model == get_profile(job.profile).model
+
+
+def _references_source(job):
+    model = apps.get_model(job.target_model)
+    queryset = model._default_manager.filter(pk=job.target_id)
+    if _is_row_target(job):
+        return queryset.filter(file_path=job.source_path).exists()
+
+    instance = queryset.first()
+    if instance is None:
+        return False
+    return any(
+        meta['path'] == job.source_path
+        for field in _json_fields(model)
+        for meta in _walk_image_meta(getattr(instance, field.attname))
+    )
+
+
+def _swap(job, rendered, upload_result):
+    """대상의 원본 참조를 파생본으로 교체. 바꾼 곳이 없으면 False"""
+    model = apps.get_model(job.target_model)
+    queryset = model._default_manager.filter(pk=job.target_id)
+    if _is_row_target(job):
+        return bool(
+            queryset.filter(file_path=job.source_path).update(**image_fields(rendered, upload_result))
+        )
+
+    replacement = {
+        'path': upload_result['file_path'],
+        'url': upload_result['file_url'],
+        'width': rendered.primary.width,
+        'height': rendered.primary.height,
+    }
+    with transaction.atomic():
+        instance = queryset.select_for_update().first()
+        if instance is None:
+            return False
+        changed = []
+        for field in _json_fields(model):
+            value = getattr(instance, field.attname)
+            matches = [meta for meta in _walk_image_meta(value) if meta['path'] == job.source_path]
+            for meta in matches:
+                meta.update(replacement)
+            if matches:
+                changed.append(field.attname)
+        if changed:
+            instance.save(update_fields=changed)
+    return bool(changed)
+
+
+def resolve_transcoded_references(value):
+    """JSON 값 안에서 이미 변환이 끝난 원본 참조를 파생본으로 바꿈 (쿼리 1회, 제자리 수정)
+
+    편집 화면을 연 뒤 변환이 끝났다면, 저장 요청에는 이미 지워진 원본 경로가 들어 있다.
+    """
+    metas = [meta for meta in _walk_image_meta(value) if f'/{ORIGINALS_DIR}/' in meta['path']]
+    if not metas:
+        return value
+    finished = {
+        job.source_path: job
+        for job in ImageTranscodeJob.objects.filter(
+            status=ImageTranscodeJob.STATUS_DONE,
+            source_path__in={meta['path'] for meta in metas},
+        )
+    }
+    for meta in metas:
+        job = finished.get(meta['path'])
+        if job is not None:
+            meta.update({
+                'path': job.result_path,
+                'url': job.result_url,
+                'width': job.result_width,
+                'height': job.result_height,
+            })
+    return value
+
+
+# --- 대기열 ------------------------------------------------------------------
+
+def _claimable_jobs(now, limit, job_ids=None):
+    stale_before = now - timedelta(seconds=STALE_LOCK_SECONDS)
+    ImageTranscodeJob.objects.filter(
+        status=ImageTranscodeJob.STATUS_PROCESSING,
+        locked_at__lt=stale_before,
+    ).update(status=ImageTranscodeJob.STATUS_PENDING)
+
+    queryset = ImageTranscodeJob.objects.filter(status=ImageTranscodeJob.STATUS_PENDING)
+    if job_ids is not None:
+        queryset = queryset.filter(pk__in=job_ids)
+    return list(queryset.exclude(next_attempt_at__gt=now).order_by('id')[:limit])
+
+
+def _claim(job, now) -> bool:
+    claimed = ImageTranscodeJob.objects.filter(pk=job.pk, status=ImageTranscodeJob.STATUS_PENDING).update(
+        status=ImageTranscodeJob.STATUS_PROCESSING,
+        locked_at=now,
+        attempts=F('attempts') + 1,
+    )
+    if claimed:
+        job.attempts += 1
+    return bool(claimed)
+
+
+def _finish(job, status, **values):
+    ImageTranscodeJob.objects.filter(pk=job.pk).update(
+        status=status,
+        finished_at=timezone.now(),
+        next_attempt_at=None,
+        locked_at=None,
+        **values,
+    )
+
+
+def _postpone(job):
+    """대상이 아직 원본을 저장하기 전일 수 있음 → 시도 횟수에 넣지 않고 다시 확인"""
+    ImageTranscodeJob.objects.filter(pk=job.pk).update(
+        status=ImageTranscodeJob.STATUS_PENDING,
+        attempts=F('attempts') - 1,
+        next_attempt_at=timezone.now() + timedelta(seconds=ORPHAN_RECHECK_SECONDS),
+        locked_at=None,
+    )
+
+
+def _mark_retry(job, error):
+    if job.attempts >= MAX_ATTEMPTS:
+        status, next_attempt_at = ImageTranscodeJob.STATUS_FAILED, None
+    else:
+        backoff = RETRY_BACKOFF_SECONDS[min(job.attempts, len(RETRY_BACKOFF_SECONDS)) - 1]
+        status, next_attempt_at = ImageTranscodeJob.STATUS_PENDING, timezone.now() + timedelta(seconds=backoff)
+    ImageTranscodeJob.objects.filter(pk=job.pk).update(
+        status=status,
+        next_attempt_at=next_attempt_at,
+        last_error=str(error)[:2000],
+        locked_at=None,
+    )
+
+
+def _prepare(job, storage, result):
+    """대상이 아직 원본을 가리키면 원본 바이트, 아니면 작업을 정리하고 None"""
+    if not _references_source(job):
+        if timezone.now() - job.created_at < timedelta(seconds=ORPHAN_GRACE_SECONDS) and not _is_row_target(job):
+            _postpone(job)
+            result.postponed += 1
+            return None
+        # 대상이 삭제됐거나 다른 이미지로 바뀜 → 남은 원본 정리
+        delete_file_from_s3(job.source_path, storage)
+        _finish(job, ImageTranscodeJob.STATUS_SKIPPED)
+        result.skipped += 1
+        return None
+
+    with storage.open(job.source_path) as source:
+        data = source.read()
+    result.source_bytes += len(data)
+    return data
+
+
+def _complete(job, rendered, storage, result):
+    upload_result = upload_derivatives(rendered, job.prefix, storage=storage)
+    if not upload_result['success']:
+        raise RuntimeError(upload_result.get('error') or '파생본 업로드 실패')
+
+    uploaded = [upload_result['file_path']] + [variant['file_path'] for variant in upload_result['variants']]
+    if not _swap(job, rendered, upload_result):
+        # 변환하는 동안 대상이 삭제됨
+        for path in uploaded:
+            delete_file_from_s3(path, storage)
+        delete_file_from_s3(job.source_path, storage)
+        _finish(job, ImageTranscodeJob.STATUS_SKIPPED)
+        result.skipped += 1
+        return
+
+    delete_file_from_s3(job.source_path, storage)
+    _finish(
+        job,
+        ImageTranscodeJob.STATUS_DONE,
+        last_error='',
+        result_path=upload_result['file_path'],
+        result_url=upload_result['file_url'],
+        result_width=rendered.primary.width,
+        result_height=rendered.primary.height,
+    )
+    result.done += 1
+    result.output_bytes += sum(len(d.content) for d in rendered.derivatives)
+
+
+def process_pending(limit=DEFAULT_BATCH_SIZE, now=None, executor=None, job_ids=None) -> TranscodeResult:
+    """처리 가능한 작업을 최대 ``limit`` 건 가져와 변환 (``job_ids`` 를 주면 그 작업만)
+
+    ``executor`` (``ProcessPoolExecutor``) 가 있으면 디코딩/리사이즈/인코딩을 풀에서 실행하고,
+    없으면 현재 프로세스에서 차례로 실행한다. S3 입출력과 DB 갱신은 항상 현재 프로세스에서 한다.
+    """
+    result = TranscodeResult()
+    now = now or timezone.now()
+    storage = get_s3_storage()
+
+    prepared = []
+    for job in _claimable_jobs(now, limit, job_ids):
+        if not _claim(job, now):
+            continue
+        try:
+            data = _prepare(job, storage, result)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning('이미지 변환 원본 읽기 실패 job=%s: %s', job.pk, exc)
+            _mark_retry(job, exc)
+            result.failed += 1
+            continue
+        if data is not None:
+            prepared.append((job, resolve_profile(job.profile, job.overrides), data))
+
+    def _done(job, render):
+        try:
+            _complete(job, render(), storage, result)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning('이미지 변환 실패 job=%s (%s회): %s', job.pk, job.attempts, exc)
+            _mark_retry(job, exc)
+            result.failed += 1
+
+    if executor is None:
+        for job, profile, data in prepared:
+            _done(job, lambda: render_source(profile, data, job.source_name or job.source_path))
+    else:
+        futures = {
+            executor.submit(render_source, profile, data, job.source_name or job.source_path): job
+            for job, profile, data in prepared
+        }
+        for future in as_completed(futures):
+            _done(futures[future], future.result)
+    return result
+
+
+def _run_background_transcode():
+    global _background_thread
+    try:
+        while True:
+            with _background_lock:
+                job_ids = set(_background_job_ids)
+                if not job_ids:
+                    _background_thread = None
+                    return
+            process_pending(job_ids=job_ids)
+            # 미뤄 둔 작업(아직 JSON 을 저장하기 전인 미니홈 등)만 남기고 잠시 뒤 다시 확인
+            waiting = set(
+                ImageTranscodeJob.objects.filter(
+                    pk__in=job_ids,
+                    status=ImageTranscodeJob.STATUS_PENDING,
+                    created_at__gte=timezone.now() - timedelta(seconds=ORPHAN_GRACE_SECONDS),
+                ).values_list('pk', flat=True)
+            )
+            with _background_lock:
+                _background_job_ids.difference_update(job_ids - waiting)
+            if waiting:
+                time.sleep(ORPHAN_RECHECK_SECONDS)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.error('이미지 변환 백그라운드 처리 실패: %s', exc, exc_info=True)
+        with _background_lock:
+            _background_job_ids.clear()
+            _background_thread = None
+    finally:
+        close_old_connections()
+
+
+def request_background_transcode(job_id) -> bool:
+    """``IMAGE_TRANSCODE_BACKGROUND`` 가 켜져 있으면 방금 남긴 작업을 이 프로세스의 스레드가 처리
+
+    전용 워커가 없는 개발 환경용이다. 다른 사용자의 작업이나 밀린 대기열은 건드리지 않는다.
+    """
+    global _background_thread
+    if not _background_enabled():
+        return False
+    with _background_lock:
+        _background_job_ids.add(job_id)
+        if _background_thread is not None:
+            return False
+        _background_thread = threading.Thread(
+            target=_run_background_transcode,
+            name='image-transcode',
+            daemon=True,
+        )
+        _background_thread.start()
+    return True
+
+
+def create_executor(processes=None):
+    """변환용 프로세스 풀. 부모의 DB/S3 연결을 물려받지 않도록 spawn 으로 시작"""
+    return ProcessPoolExecutor(
+        max_workers=processes or os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=pool_initializer,
+    )
+
+
+def run_worker(interval=DEFAULT_POLL_INTERVAL_SECONDS, stop_event=None, max_iterations=None, on_result=None,
+               batch_size=DEFAULT_BATCH_SIZE, processes=None):
+    """대기열 처리 루프 (``run_image_transcode_worker`` 관리 명령에서 사용)
+
+    처리할 작업이 남아 있으면 쉬지 않고 다음 배치를 가져온다.
+    """
+    stop_event = stop_event or threading.Event()
+    iterations = 0
+
+    with create_executor(processes) as executor:
+        while not stop_event.is_set():
+            started_at = time.monotonic()
+            try:
+                result = process_pending(limit=batch_size, executor=executor)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.error('이미지 변환 워커 오류: %s', exc, exc_info=True)
+                result = TranscodeResult()
+            finally:
+                close_old_connections()
+
+            if on_result:
+                on_result(result, time.monotonic() - started_at)
+
+            iterations += 1
+            if max_iterations is not None and iterations >= max_iterations:
+                break
+            if result.handled - result.postponed < batch_size:
+                stop_event.wait(interval)
@@ -0,0 +1,123 @@
+import io
+import random
+import statistics
+import time
+from dataclasses import replace
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+from PIL import Image, ImageFilter, ImageOps
+
+from storage.image_derivatives import encoder_available, get_profile, render_derivatives
+
+
+def sample_photo(width, height, seed=0):
+    """휴대폰 사진과 비슷한 엔트로피의 JPEG (그라디언트 + 흐린 노이즈)"""
+    rng = random.Random(seed)
+    noise = Image.frombytes('RGB', (width // 8, height // 8), rng.randbytes(width // 8 * height // 8 * 3))
+    noise = noise.resize((width, height), Image.Resampling.BILINEAR).filter(ImageFilter.GaussianBlur(2))
+    gradient = Image.linear_gradient('L').resize((width, height)).convert('RGB')
+    image = Image.blend(noise, gradient, 0.5)
+    output = io.BytesIO()
+    image.save(output, format='JPEG', quality=90)
+    return output.getvalue()
+
+
+def legacy_render(data, profile, image_format):
+    """변경 전: 전체 해상도로 디코딩 → 자르기 → 대표 너비 하나만 LANCZOS → 인코딩"""
+    image = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    width = profile.widths[0]
+    if profile.crop == (1, 1):
+        side = min(image.size)
+        left, top = (image.width - side) // 2, (image.height - side) // 2
+        image = image.crop((left, top, left + side, top + side)).resize((width, width), Image.Resampling.LANCZOS)
+    else:
+        height = int(width * profile.crop[1] / profile.crop[0])
+        image = ImageOps.fit(image, (width, height), Image.Resampling.LANCZOS)
+    output = io.BytesIO()
+    if image_format == 'AVIF':
+        image.save(output, format='AVIF', quality=profile.quality, speed=profile.avif_speed)
+    elif image_format == 'WEBP':
+        image.save(output, format='WEBP', quality=profile.quality, method=profile.webp_method)
+    else:
+        image.save(output, format='JPEG', quality=profile.quality, optimize=True)
+    return len(output.getvalue())
+
+
+def engine_render(data, profile):
+    rendered = render_derivatives(SimpleUploadedFile('photo.jpg', data), profile)
+    return sum(len(d.content) for d in rendered.derivatives)
+
+
+class Command(BaseCommand):
+    help = '업로드 이미지 1장당 CPU 시간을 포맷별로 비교합니다 (변경 전 함수 vs 파생본 엔진)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', default='4032x3024', help='원본 JPEG 크기 (기본 4032x3024, 휴대폰 사진)')
+        parser.add_argument('--profiles', nargs='+', default=['product', 'store', 'hall_of_fame'], help='측정할 프로필')
+        parser.add_argument('--formats', nargs='+', default=['AVIF', 'WEBP', 'JPEG'], help='측정할 포맷')
+        parser.add_argument('--repeat', type=int, default=5, help='조합마다 반복 횟수 (기본 5)')
+
+    def handle(self, *args, **options):
+        width, height = (int(value) for value in options['size'].lower().split('x'))
+        data = sample_photo(width, height)
+        repeat = options['repeat']
+        self.stdout.write(f'원본 {width}x{height} JPEG ({len(data) / 1024:.0f}KB), 조합마다 {repeat}회, 이미지 1장당 CPU 시간 중앙값')
+
+        formats = []
+        for image_format in options['formats']:
+            if encoder_available(image_format.upper()):
+                formats.append(image_format.upper())
+            else:
+                self.stdout.write(f'  {image_format.upper()}: 인코더 없음 (건너뜀)')
+
+        self.stdout.write(
+            f'{"프로필":<14} | {"포맷":<5} | {"변경 전(대표)":>12} | {"엔진(대표)":>10} | {"엔진(전체 너비)":>14} | 출력 합계'
+        )
+        for name in options['profiles']:
+            profile = get_profile(name)
+            for image_format in formats:
+                single = replace(profile, widths=profile.widths[:1], formats=(image_format,))
+                full = replace(profile, formats=(image_format,))
+                legacy_ms, _ = self._cpu(lambda: legacy_render(data, single, image_format), repeat)
+                single_ms, _ = self._cpu(lambda: engine_render(data, single), repeat)
+                full_ms, output_bytes = self._cpu(lambda: engine_render(data, full), repeat)
+                widths = '+'.join(str(w) for w in profile.widths)
+                self.stdout.write(
+                    f'{name:<14} | {image_format:<5} | {legacy_ms:>10.1f}ms | {single_ms:>8.1f}ms | '
+                    f'{full_ms:>12.1f}ms | {output_bytes / 1024:.0f}KB ({widths}px)'
+                )
+
+        self._decode_breakdown(data, repeat)
+
+    def _cpu(self, run, repeat):
+        run()  # 인코더 초기화 비용 제외
+        samples = []
+        result = None
+        for _ in range(repeat):
+            started_at = time.process_time()
+            result = run()
+            samples.append(time.process_time() - started_at)
+        return statistics.median(samples) * 1000, result
+
+    def _decode_breakdown(self, data, repeat):
+        """인코딩을 뺀 디코딩+리사이즈 비용 (500px 정사각형)"""
+        def full_decode():
+            image = Image.open(io.BytesIO(data))
+            image.load()
+            side = min(image.size)
+            return image.crop((0, 0, side, side)).resize((500, 500), Image.Resampling.LANCZOS)
+
+        def draft_decode():
+            image = Image.open(io.BytesIO(data))
+            image.draft('RGB', (image.width * 500 // min(image.size) + 1, image.height * 500 // min(image.size) + 1))
+            side = min(image.size)
+            return image.resize((500, 500), Image.Resampling.LANCZOS, box=(0, 0, side, side), reducing_gap=3.0)
+
+        self.stdout.write('')
+        self.stdout.write('디코딩+리사이즈만 (500x500, 인코딩 제외)')
+        for label, run in (('전체 해상도 디코딩', full_decode), ('draft + reducing_gap', draft_decode)):
+            elapsed_ms, _ = self._cpu(run, repeat)
+            self.stdout.write(f'  {label:<22} | {elapsed_ms:>8.1f}ms')
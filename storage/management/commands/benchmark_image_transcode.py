@@ -0,0 +1,82 @@
+import io
+import os
+import time
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+
+from storage.image_derivatives import get_profile, probe_size, render_source
+from storage.image_transcode import create_executor
+
+from .benchmark_image_derivatives import sample_photo
+
+
+class Command(BaseCommand):
+    help = '이미지 변환 워커 처리량을 프로세스 수별로 측정합니다 (CPU 만, S3/DB 없이)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', default='4032x3024', help='원본 JPEG 크기 (기본 4032x3024, 휴대폰 사진)')
+        parser.add_argument('--profile', default='product', help='측정할 프로필 (기본 product)')
+        parser.add_argument('--images', type=int, default=24, help='변환할 이미지 수 (기본 24)')
+        parser.add_argument(
+            '--processes',
+            nargs='+',
+            type=int,
+            default=None,
+            help='측정할 프로세스 수 목록 (기본 1, 2, 4, … CPU 코어 수까지)',
+        )
+
+    def handle(self, *args, **options):
+        width, height = (int(value) for value in options['size'].lower().split('x'))
+        profile = get_profile(options['profile'])
+        count = options['images']
+        # 이미지마다 내용이 달라야 인코더가 같은 입력을 반복하지 않음
+        sources = [sample_photo(width, height, seed=index) for index in range(min(count, 8))]
+        jobs = [(sources[index % len(sources)], f'photo-{index}.jpg') for index in range(count)]
+
+        cpu_count = os.cpu_count() or 1
+        processes = options['processes'] or sorted({1, *(2 ** n for n in range(1, 8) if 2 ** n <= cpu_count), cpu_count})
+
+        self.stdout.write(
+            f'원본 {width}x{height} JPEG {count}장, 프로필 {profile.name} '
+            f'({"+".join(str(w) for w in profile.widths)}px, {profile.formats}), CPU {cpu_count}코어'
+        )
+        self._request_latency(jobs[0][0], profile)
+
+        self.stdout.write('')
+        self.stdout.write(f'{"방식":<16} | {"전체":>8} | {"초당 이미지":>10} | 배율')
+        started_at = time.perf_counter()
+        for data, name in jobs:
+            render_source(profile, data, name)
+        baseline = time.perf_counter() - started_at
+        self._row('현재 프로세스', baseline, count, baseline)
+
+        for size in processes:
+            with create_executor(size) as executor:
+                # 프로세스 시작/import 비용 제외
+                list(executor.map(render_source, [profile] * size, [jobs[0][0]] * size, ['warmup.jpg'] * size))
+                started_at = time.perf_counter()
+                list(executor.map(render_source, [profile] * count, *zip(*jobs)))
+                elapsed = time.perf_counter() - started_at
+            self._row(f'프로세스 풀 {size}개', elapsed, count, baseline)
+
+    def _row(self, label, elapsed, count, baseline):
+        self.stdout.write(
+            f'{label:<16} | {elapsed:>7.2f}s | {count / elapsed:>10.1f} | x{baseline / elapsed:.2f}'
+        )
+
+    def _request_latency(self, data, profile):
+        """업로드 요청 안에서 이미지 처리에 쓰는 시간 (1장, S3 업로드 제외)"""
+        def sync():
+            render_source(profile, data, 'photo.jpg')
+
+        def deferred():
+            probe_size(SimpleUploadedFile('photo.jpg', data))
+
+        sync()
+        for label, run in (('요청 안에서 변환', sync), ('원본만 저장', deferred)):
+            started_at = time.perf_counter()
+            for _ in range(5):
+                run()
+            elapsed_ms = (time.perf_counter() - started_at) / 5 * 1000
+            self.stdout.write(f'  업로드 요청 이미지 처리 ({label}): {elapsed_ms:.1f}ms/장')
@@ -0,0 +1,84 @@
+import statistics
+import time
+
+import boto3
+from botocore.client import Config
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from storage.backends import S3Storage, get_s3_storage, reset_s3_clients
+from storage.fake_s3 import FakeS3Server
+
+
+def legacy_client(storage):
+    """변경 전: ``S3Storage()`` 마다 새로 만들던 boto3 클라이언트"""
+    return boto3.client(
+        's3',
+        endpoint_url=storage.endpoint_url,
+        aws_access_key_id=storage.access_key_id,
+        aws_secret_access_key=storage.secret_access_key,
+        region_name=storage.region_name,
+        use_ssl=storage.use_ssl,
+        config=Config(
+            signature_version='s3v4',
+            s3={'addressing_style': 'path', 'payload_signing_enabled': True},
+            region_name=storage.region_name,
+            retries={'max_attempts': 3},
+            tcp_keepalive=True,
+            max_pool_connections=10,
+        ),
+    )
+
+
+class Command(BaseCommand):
+    help = 'S3 클라이언트를 요청마다 만드는 경우(변경 전)와 프로세스 공유 클라이언트를 비교합니다 (로컬 가짜 S3 사용)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='요청 수 (기본 200)')
+        parser.add_argument('--latency', type=float, default=0.0, help='가짜 S3 요청 지연(초, 기본 0)')
+
+    def handle(self, *args, **options):
+        with FakeS3Server(latency=options['latency']) as server:
+            server.put_object('bench/logo.png', b'x' * 4096)
+            with override_settings(**server.django_settings()):
+                reset_s3_clients()
+                try:
+                    self._run(server, options['requests'])
+                finally:
+                    reset_s3_clients()
+
+    def _run(self, server, count):
+        key = 'bench/logo.png'
+
+        def per_request():
+            storage = S3Storage()
+            started_at = time.perf_counter()
+            client = legacy_client(storage)
+            built_at = time.perf_counter()
+            client.head_object(Bucket=storage.bucket_name, Key=key)
+            return built_at - started_at, time.perf_counter() - started_at
+
+        def shared():
+            started_at = time.perf_counter()
+            storage = get_s3_storage()
+            client = storage.client
+            built_at = time.perf_counter()
+            client.head_object(Bucket=storage.bucket_name, Key=key)
+            return built_at - started_at, time.perf_counter() - started_at
+
+        # import/엔드포인트 데이터 로딩 비용 제외
+        per_request()
+        shared()
+
+        self.stdout.write(f'요청 {count}회 (HeadObject), 중앙값')
+        self.stdout.write(f'{"방식":<14} | {"클라이언트 확보":>12} | {"요청 전체":>10} | {"초당 요청":>8} | 새 TCP 연결')
+        for label, run in (('요청마다 생성', per_request), ('프로세스 공유', shared)):
+            server.reset_counters()
+            started_at = time.perf_counter()
+            samples = [run() for _ in range(count)]
+            elapsed = time.perf_counter() - started_at
+            self.stdout.write(
+                f'{label:<14} | {statistics.median(s[0] for s in samples) * 1000:>10.3f}ms | '
+                f'{statistics.median(s[1] for s in samples) * 1000:>8.3f}ms | {count / elapsed:>8.0f} | '
+                f'{server.connection_count}'
+            )
@@ -0,0 +1,138 @@
+import mimetypes
+import resource
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory, override_settings
+
+from storage.backends import S3Storage
+from storage.disk_cache import get_disk_cache
+from storage.fake_s3 import FakeS3Server
+from storage.proxy import serve_s3_object, stream_s3_object
+
+
+def legacy_serve(storage, key):
+    """변경 전: HeadObject 로 존재 확인 → GetObject 본문 전체를 메모리로 읽어 ``HttpResponse``"""
+    if not storage.exists(key):
+        raise Http404()
+    content = storage._open(key).read()
+    response = HttpResponse(content, content_type=mimetypes.guess_type(key)[0] or 'application/octet-stream')
+    response['Content-Length'] = len(content)
+    return response
+
+
+def _drain(response):
+    """WSGI 서버처럼 응답 본문을 끝까지 보냄 (내용은 버림)"""
+    sent = 0
+    if response.streaming:
+        for chunk in response.streaming_content:
+            sent += len(chunk)
+    else:
+        sent = len(response.content)
+    response.close()
+    return sent
+
+
+class Command(BaseCommand):
+    help = 'S3 프록시 뷰의 처리량/워커 메모리를 전체 읽기(변경 전)와 스트리밍으로 비교합니다 (로컬 가짜 S3 사용)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[64, 1024, 16384], help='객체 크기(KB) 목록 (기본 64 1024 16384)')
+        parser.add_argument('--requests', type=int, default=20, help='크기마다 요청 수 (기본 20)')
+        parser.add_argument('--latency', type=float, default=0.0, help='가짜 S3 요청 지연(초, 기본 0)')
+
+    def handle(self, *args, **options):
+        with FakeS3Server(latency=options['latency']) as server:
+            with override_settings(**server.django_settings()):
+                self._run(server, options['sizes'], options['requests'])
+
+    def _measure(self, server, serve, key, count, headers=None):
+        factory = RequestFactory()
+        server.reset_counters()
+        sent = 0
+        started_at = time.perf_counter()
+        for _ in range(count):
+            sent += _drain(serve(factory.get(f'/media/s3/{key}', **(headers or {})), key))
+        elapsed = time.perf_counter() - started_at
+        s3_requests = len(server.requests) / count
+
+        # 요청 1건의 파이썬 할당 최고치 (처리량 측정과 분리)
+        tracemalloc.start()
+        try:
+            _drain(serve(factory.get(f'/media/s3/{key}', **(headers or {})), key))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return elapsed, sent, s3_requests, peak
+
+    def _run(self, server, sizes, count):
+        storage = S3Storage()
+        keys = {}
+        for size_kb in sizes:
+            key = f'bench/object-{size_kb}k.bin'
+            keys[size_kb] = key
+            server.put_object(key, bytes(range(256)) * (size_kb * 4))
+
+        def legacy(request, key):
+            return legacy_serve(storage, key)
+
+        def streaming(request, key):
+            return stream_s3_object(request, storage, key)
+
+        # 연결/클라이언트 준비 비용 제외
+        _drain(streaming(RequestFactory().get('/'), keys[sizes[0]]))
+
+        self.stdout.write(f'{"크기":>8} | {"방식":<10} | {"처리량":>11} | {"S3 요청/건":>9} | {"요청당 최대 할당":>14} | 누적 최대 RSS')
+        # 최대 RSS 는 줄지 않으므로 스트리밍을 먼저 측정
+        for label, serve in (('스트리밍', streaming), ('전체 읽기', legacy)):
+            for size_kb in sizes:
+                elapsed, sent, s3_requests, peak = self._measure(server, serve, keys[size_kb], count)
+                max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+                self.stdout.write(
+                    f'{size_kb:>6}KB | {label:<10} | {sent / elapsed / 1024 / 1024:>8.1f}MB/s | {s3_requests:>9.1f} | '
+                    f'{peak / 1024:>12.0f}KB | {max_rss_mb:.0f}MB'
+                )
+
+        largest = keys[max(sizes)]
+        etag = server.objects[largest][1]
+        self.stdout.write('')
+        self.stdout.write(f'재검증/범위 요청 ({max(sizes)}KB 객체, {count}회)')
+        scenarios = (
+            ('If-None-Match 일치', {'HTTP_IF_NONE_MATCH': etag}),
+            ('Range 첫 64KB', {'HTTP_RANGE': 'bytes=0-65535'}),
+        )
+        for title, headers in scenarios:
+            for label, serve in (('전체 읽기', legacy), ('스트리밍', streaming)):
+                elapsed, sent, s3_requests, _ = self._measure(server, serve, largest, count, headers)
+                self.stdout.write(
+                    f'  {title:<18} | {label:<10} | {elapsed / count * 1000:>8.2f}ms/건 | '
+                    f'응답 {sent / count / 1024:>8.0f}KB/건 | S3 요청 {s3_requests:.1f}/건'
+                )
+
+        self._run_disk_cache(server, storage, keys, sizes, count, streaming)
+
+    def _run_disk_cache(self, server, storage, keys, sizes, count, streaming):
+        cache_dir = tempfile.mkdtemp(prefix='s3-disk-cache-bench-')
+        try:
+            with override_settings(S3_DISK_CACHE_DIR=cache_dir, S3_DISK_CACHE_MAX_OBJECT_SIZE=max(sizes) * 1024):
+                def cached(request, key):
+                    return serve_s3_object(request, storage, key)
+
+                self.stdout.write('')
+                self.stdout.write(f'디스크 캐시 적중 ({count}회, 첫 요청으로 채운 뒤 측정)')
+                for size_kb in sizes:
+                    _drain(cached(RequestFactory().get('/'), keys[size_kb]))
+                    for label, serve in (('스트리밍', streaming), ('디스크 캐시', cached)):
+                        elapsed, sent, s3_requests, peak = self._measure(server, serve, keys[size_kb], count)
+                        self.stdout.write(
+                            f'  {size_kb:>6}KB | {label:<10} | {elapsed / count * 1000:>8.2f}ms/건 | '
+                            f'S3 요청 {s3_requests:.1f}/건 | 요청당 최대 할당 {peak / 1024:.0f}KB'
+                        )
+                stats = get_disk_cache().stats()
+                self.stdout.write(f'  적중 {stats["hits"]} / 미스 {stats["misses"]}')
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
@@ -4,6 +4,7 @@
 
 from django.core.management.base import BaseCommand
 from django.utils import timezone
+from myshop.expiry import sweep_expired
 from storage.models import TemporaryUpload
 
 
@@ -52,36 +53,12 @@ class Command(BaseCommand):
         else:
             self.stdout.write(f'만료된 임시 파일 {total_count}개를 정리합니다...')
             
-            # S3에서 파일 삭제 및 DB에서 제거
-            success_count = 0
-            error_count = 0
-            
-            for temp_file in expired_files:
-                try:
-                    from storage.utils import delete_file_from_s3
-                    
-                    # S3에서 파일 삭제
-                    result = delete_file_from_s3(temp_file.file_path)
-                    
-                    if result['success']:
-                        # DB에서 제거
-                        temp_file.delete()
-                        success_count += 1
-                        self.stdout.write(f'  ✓ {temp_file.original_name}')
-                    else:
-                        error_count += 1
-                        self.stdout.write(
-                            self.style.ERROR(f'  ✗ {temp_file.original_name}: {result["error"]}')
-                        )
-                
-                except Exception as e:
-                    error_count += 1
-                    self.stdout.write(
-                        self.style.ERROR(f'  ✗ {temp_file.original_name}: {str(e)}')
-                    )
+            # S3에서 파일 삭제 후 성공한 행만 DB에서 배치 삭제 (만료 정리 워커와 같은 처리)
+            success_count = sweep_expired('temporary_uploads', grace=timezone.timedelta(days=days))
+            error_count = total_count - success_count
             
             self.stdout.write(
                 self.style.SUCCESS(
                     f'정리 완료: 성공 {success_count}개, 실패 {error_count}개'
                 )
-            ) 
\ No newline at end of file
+            )
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from storage.disk_cache import get_disk_cache, read_stats
+
+
+class Command(BaseCommand):
+    help = 'S3 디스크 캐시의 사용량과 워커 전체 적중률을 출력합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--evict', action='store_true', help='용량을 넘었으면 지금 정리합니다')
+
+    def handle(self, *args, **options):
+        cache = get_disk_cache()
+        if cache is None:
+            raise CommandError('S3_DISK_CACHE_DIR 가 설정되지 않아 디스크 캐시가 꺼져 있습니다.')
+
+        if options['evict']:
+            self.stdout.write(f'정리: {cache.evict()}개 삭제')
+
+        entries, used = cache.usage()
+        stats = read_stats(cache.directory)
+        self.stdout.write(f'경로: {cache.directory}')
+        self.stdout.write(
+            f'사용량: {entries}개, {used / 1024 / 1024:.1f}MB / {cache.max_bytes / 1024 / 1024:.0f}MB '
+            f'({used / cache.max_bytes:.0%})'
+        )
+        self.stdout.write(
+            f'적중률: {stats["hit_rate"]:.1%} (워커 {stats["workers"]}개 누적, 최근 10초 이내 요청은 빠질 수 있음)'
+        )
+        for name in ('hits', 'revalidated', 'misses', 'refreshed', 'bypassed', 'evictions'):
+            self.stdout.write(f'  {name}: {stats[name]}')
+        self.stdout.write(f'  fill_bytes: {stats["fill_bytes"] / 1024 / 1024:.1f}MB')
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.2 on 2026-10-18 14:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('storage', '0002_temporaryupload_storage_tem_uploade_bb1e5c_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageTranscodeJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target_model', models.CharField(help_text="'app_label.ModelName'", max_length=100)),
+                ('target_id', models.BigIntegerField()),
+                ('profile', models.CharField(help_text='storage.image_derivatives 프로필 이름', max_length=50)),
+                ('overrides', models.JSONField(blank=True, default=dict, help_text='프로필에서 바꿀 값 (너비/자르기 등)')),
+                ('prefix', models.CharField(help_text='파생본을 올릴 S3 prefix', max_length=500)),
+                ('source_path', models.CharField(db_index=True, help_text='원본 파일 경로', max_length=500)),
+                ('source_name', models.CharField(blank=True, help_text='원본 파일명', max_length=255)),
+                ('status', models.CharField(choices=[('pending', '대기'), ('processing', '처리 중'), ('done', '완료'), ('skipped', '건너뜀 (대상 없음)'), ('failed', '실패')], default='pending', max_length=20)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('next_attempt_at', models.DateTimeField(blank=True, null=True)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('result_path', models.CharField(blank=True, max_length=500)),
+                ('result_url', models.URLField(blank=True, max_length=800)),
+                ('result_width', models.PositiveIntegerField(blank=True, null=True)),
+                ('result_height', models.PositiveIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': '이미지 변환 대기열',
+                'verbose_name_plural': '이미지 변환 대기열',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='storage_transcode_status_idx')],
+            },
+        ),
+    ]
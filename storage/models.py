@@ -227,16 +227,9 @@ class TemporaryUpload(models.Model):
     
     @classmethod
     def cleanup_expired(cls):
-        """만료된 임시 파일들 정리"""
-        expired_files = cls.objects.filter(expires_at__lt=timezone.now())
-        
-        # S3에서 파일 삭제
-        from .utils import delete_file_from_s3
-        for temp_file in expired_files:
-            delete_file_from_s3(temp_file.file_path)
-        
-        # DB에서 삭제
-        expired_files.delete()
+        """만료된 임시 파일들 정리 (S3 삭제에 성공한 행만 DB 에서 제거)"""
+        from myshop.expiry import sweep_expired
+        return sweep_expired('temporary_uploads', grace=timezone.timedelta(0))
 
 
 class UploadSession(models.Model):
@@ -307,4 +300,55 @@ class UploadSession(models.Model):
         """업로드 진행률 반환"""
         if self.total_files == 0:
             return 0
-        return int((self.uploaded_files / self.total_files) * 100) 
\ No newline at end of file
+        return int((self.uploaded_files / self.total_files) * 100) 
+
+class ImageTranscodeJob(models.Model):
+    """업로드 이미지 파생본 생성 대기열 (처리는 ``storage.image_transcode`` 워커가 담당)
+
+    업로드 요청은 원본(``source_path``)만 저장하고 이 작업을 남긴다. 워커가 파생본을 만든 뒤
+    대상(``target_model`` / ``target_id``)의 참조를 파생본으로 바꾸고 원본을 지운다.
+    """
+
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_DONE = 'done'
+    STATUS_SKIPPED = 'skipped'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, '대기'),
+        (STATUS_PROCESSING, '처리 중'),
+        (STATUS_DONE, '완료'),
+        (STATUS_SKIPPED, '건너뜀 (대상 없음)'),
+        (STATUS_FAILED, '실패'),
+    ]
+
+    target_model = models.CharField(max_length=100, help_text="'app_label.ModelName'")
+    target_id = models.BigIntegerField()
+    profile = models.CharField(max_length=50, help_text='storage.image_derivatives 프로필 이름')
+    overrides = models.JSONField(default=dict, blank=True, help_text='프로필에서 바꿀 값 (너비/자르기 등)')
+    prefix = models.CharField(max_length=500, help_text='파생본을 올릴 S3 prefix')
+    source_path = models.CharField(max_length=500, db_index=True, help_text='원본 파일 경로')
+    source_name = models.CharField(max_length=255, blank=True, help_text='원본 파일명')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    result_path = models.CharField(max_length=500, blank=True)
+    result_url = models.URLField(max_length=800, blank=True)
+    result_width = models.PositiveIntegerField(null=True, blank=True)
+    result_height = models.PositiveIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = '이미지 변환 대기열'
+        verbose_name_plural = '이미지 변환 대기열'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='storage_transcode_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.target_model}#{self.target_id} {self.source_path} ({self.get_status_display()})"
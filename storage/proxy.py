@@ -0,0 +1,283 @@
+"""S3 객체 스트리밍 프록시
+
+``/media/s3/<경로>`` 요청을 GetObject 한 번으로 처리한다.
+
+- 본문은 읽는 대로 청크 단위로 내보낸다. 워커 메모리는 객체 크기와 무관하게 청크 크기 정도만 쓴다.
+- ``ETag``/``Last-Modified``/``Content-Length``/``Accept-Ranges`` 를 그대로 전달한다.
+- ``If-None-Match`` 는 S3 로 넘긴다. 일치하면 S3 가 본문 없이 304 를 돌려주고, 그대로 304 로 응답한다.
+- 단일 바이트 범위 ``Range`` 는 S3 로 넘겨 206 으로 응답한다. 범위를 벗어나면 416 이다.
+  다중 범위나 잘못된 형식은 무시하고 전체를 보낸다 (RFC 9110 허용).
+
+디스크 캐시(``storage.disk_cache``)가 켜져 있으면 ``serve_s3_object`` 가 캐시를 먼저 본다. 적중하면
+같은 조건부/범위 처리를 디스크 파일로 하고, 미스나 재검증 때만 S3 에 요청한다.
+"""
+
+import logging
+import mimetypes
+import re
+
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import http_date, parse_http_date_safe
+
+from .disk_cache import get_disk_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def requested_range(request):
+    """S3 로 넘길 단일 바이트 범위 (없거나 넘기지 않을 형식이면 None)"""
+    header = request.META.get('HTTP_RANGE', '').strip()
+    match = _RANGE_RE.match(header)
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if first and last and int(last) < int(first):
+        return None
+    return header
+
+
+def resolve_range(request, size):
+    """디스크 본문 기준 범위: (시작, 끝), 범위 밖이면 False, 적용하지 않으면 None"""
+    header = requested_range(request)
+    if header is None:
+        return None
+    first, last = _RANGE_RE.match(header).groups()
+    if not first:
+        return (max(0, size - int(last)), size - 1) if int(last) and size else False
+    start = int(first)
+    if start >= size:
+        return False
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def _etag_matches(if_none_match, etag):
+    """``If-None-Match`` 약한 비교"""
+    candidates = [value.strip().removeprefix('W/') for value in if_none_match.split(',')]
+    return '*' in candidates or etag.removeprefix('W/') in candidates
+
+
+def _if_range_matches(if_range, etag, last_modified):
+    """``If-Range`` 가 현재 객체를 가리키는지 (강한 ETag 또는 정확한 날짜만 인정)"""
+    if_range = if_range.strip()
+    if if_range.startswith('"'):
+        return if_range == etag
+    if if_range.startswith('W/'):
+        return False
+    timestamp = parse_http_date_safe(if_range)
+    return timestamp is not None and parse_http_date_safe(last_modified or '') == timestamp
+
+
+def _set_validators(response, etag, last_modified):
+    response['Accept-Ranges'] = 'bytes'
+    if etag:
+        response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = last_modified
+    return response
+
+
+def _http_date(value):
+    return http_date(value.timestamp()) if value else ''
+
+
+class _ChunkStream:
+    """응답 본문 반복자. 다 보내지 못하고 끝나도 Django 가 ``close()`` 를 불러 파일/S3 본문을 닫음"""
+
+    def __init__(self, chunks, resource):
+        self.chunks = chunks
+        self.resource = resource
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+    def close(self):
+        self.resource.close()
+
+
+def _read_range(file, start, length, chunk_size):
+    file.seek(start)
+    while length > 0:
+        chunk = file.read(min(chunk_size, length))
+        if not chunk:
+            break
+        length -= len(chunk)
+        yield chunk
+
+
+def _not_modified(exc):
+    headers = exc.response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+    response = HttpResponseNotModified()
+    if headers.get('etag'):
+        response['ETag'] = headers['etag']
+    if headers.get('last-modified'):
+        response['Last-Modified'] = headers['last-modified']
+    return response
+
+
+def _range_not_satisfiable(size):
+    response = HttpResponse(status=416)
+    if size:
+        response['Content-Range'] = f'bytes */{size}'
+    return response
+
+
+def _chunk_size(chunk_size=None):
+    return chunk_size or getattr(settings, 'S3_PROXY_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+
+def stream_s3_object(request, storage, key, *, chunk_size=None):
+    """GetObject 한 번으로 ``key`` 를 스트리밍 응답으로 만듦
+
+    객체가 없으면 ``FileNotFoundError``. 그 밖의 S3 오류는 그대로 올린다.
+    """
+    chunk_size = _chunk_size(chunk_size)
+    params = {'Bucket': storage.bucket_name, 'Key': key}
+    byte_range = requested_range(request)
+    if byte_range:
+        params['Range'] = byte_range
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        params['IfNoneMatch'] = if_none_match
+
+    try:
+        obj = storage.client.get_object(**params)
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if byte_range and if_range and not _if_range_matches(if_range, obj.get('ETag'), _http_date(obj.get('LastModified'))):
+            # 범위를 받은 뒤 객체가 바뀜 → 전체를 다시 받음 (드문 경우라 GET 한 번 더)
+            obj['Body'].close()
+            del params['Range']
+            obj = storage.client.get_object(**params)
+    except ClientError as exc:
+        code = exc.response.get('Error', {}).get('Code', '')
+        if code in ('304', 'NotModified'):
+            return _not_modified(exc)
+        if code in ('416', 'InvalidRange'):
+            return _range_not_satisfiable(exc.response.get('Error', {}).get('ActualObjectSize'))
+        if code in ('404', 'NoSuchKey'):
+            raise FileNotFoundError(f"파일을 찾을 수 없습니다: {key}") from exc
+        raise
+
+    content_type = mimetypes.guess_type(key)[0] or obj.get('ContentType') or 'application/octet-stream'
+    response = StreamingHttpResponse(
+        _ChunkStream(obj['Body'].iter_chunks(chunk_size), obj['Body']),
+        status=206 if obj.get('ContentRange') else 200,
+        content_type=content_type,
+    )
+    response['Content-Length'] = obj['ContentLength']
+    if obj.get('ContentRange'):
+        response['Content-Range'] = obj['ContentRange']
+    return _set_validators(response, obj.get('ETag'), _http_date(obj.get('LastModified')))
+
+
+def disk_response(request, entry, *, chunk_size=None):
+    """디스크 캐시 항목으로 응답 (조건부/범위 요청 처리). 방금 정리된 항목이면 ``FileNotFoundError``"""
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match and _etag_matches(if_none_match, entry.etag):
+        return _set_validators(HttpResponseNotModified(), entry.etag, entry.last_modified)
+
+    file = open(entry.path, 'rb')
+    content_type = mimetypes.guess_type(entry.key)[0] or entry.content_type or 'application/octet-stream'
+    byte_range = resolve_range(request, entry.size)
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if byte_range and if_range and not _if_range_matches(if_range, entry.etag, entry.last_modified):
+        byte_range = None
+
+    if byte_range is False:
+        file.close()
+        response = _range_not_satisfiable(entry.size)
+    elif byte_range:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _ChunkStream(_read_range(file, start, end - start + 1, _chunk_size(chunk_size)), file),
+            status=206,
+            content_type=content_type,
+        )
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{entry.size}'
+    else:
+        # wsgi.file_wrapper(sendfile) 사용
+        response = FileResponse(file, content_type=content_type)
+        response.headers.pop('Content-Disposition', None)
+    return _set_validators(response, entry.etag, entry.last_modified)
+
+
+def _fill_disk_cache(cache, storage, key, stale):
+    """S3 에서 받아 캐시에 저장 (``stale`` 이 있으면 ``If-None-Match`` 로 재검증)
+
+    캐시하지 않을 객체(최대 크기 초과 등)면 None.
+    """
+    params = {'Bucket': storage.bucket_name, 'Key': key}
+    if stale is not None and not stale.uncacheable:
+        params['IfNoneMatch'] = stale.etag
+    try:
+        obj = storage.client.get_object(**params)
+    except ClientError as exc:
+        code = exc.response.get('Error', {}).get('Code', '')
+        if code in ('304', 'NotModified'):
+            cache.mark_validated(stale)
+            cache.record('revalidated')
+            return stale
+        if code in ('404', 'NoSuchKey'):
+            cache.discard(key)
+            raise FileNotFoundError(f"파일을 찾을 수 없습니다: {key}") from exc
+        raise
+
+    body = obj['Body']
+    try:
+        if obj['ContentLength'] > cache.max_object_size:
+            cache.mark_uncacheable(key, etag=obj.get('ETag'), size=obj['ContentLength'])
+            cache.record('bypassed')
+            return None
+        entry = cache.put(
+            key,
+            body.iter_chunks(_chunk_size()),
+            etag=obj.get('ETag', ''),
+            size=obj['ContentLength'],
+            content_type=obj.get('ContentType', ''),
+            last_modified=_http_date(obj.get('LastModified')),
+        )
+    finally:
+        body.close()
+    cache.record('refreshed' if stale is not None and not stale.uncacheable else 'misses')
+    return entry
+
+
+def serve_s3_object(request, storage, key):
+    """디스크 캐시를 거쳐 응답 (캐시가 꺼져 있으면 ``stream_s3_object``)"""
+    cache = get_disk_cache()
+    if cache is None:
+        return stream_s3_object(request, storage, key)
+
+    entry = cache.get(key)
+    if entry is not None and entry.is_fresh(cache.revalidate_after):
+        if entry.uncacheable:
+            cache.record('bypassed')
+            return stream_s3_object(request, storage, key)
+        try:
+            response = disk_response(request, entry)
+            cache.record('hits')
+            return response
+        except FileNotFoundError:
+            entry = None
+    if entry is None and requested_range(request):
+        # 처음 보는 객체의 범위 요청(동영상 탐색 등)은 캐시를 채우지 않음
+        cache.record('bypassed')
+        return stream_s3_object(request, storage, key)
+
+    with cache.fill_lock(key):
+        current = cache.get(key)
+        if current is not None and current.is_fresh(cache.revalidate_after):
+            # 기다리는 동안 다른 워커가 채움
+            entry = None if current.uncacheable else current
+            cache.record('bypassed' if entry is None else 'hits')
+        else:
+            entry = _fill_disk_cache(cache, storage, key, current)
+    if entry is None:
+        return stream_s3_object(request, storage, key)
+    return disk_response(request, entry)
@@ -0,0 +1,37 @@
+"""
+Storage 앱 시그널 처리
+"""
+
+import logging
+
+from django.apps import apps
+from django.db.models.signals import post_delete
+
+from .image_derivatives import PROFILES, delete_variant_files
+
+logger = logging.getLogger(__name__)
+
+
+def delete_image_variants(sender, instance, **kwargs):
+    """
+    이미지 행이 삭제되면 ``variants`` 의 반응형 파일도 S3에서 삭제합니다.
+    대표 파일(``file_path``)은 기존 삭제 경로(뷰/시그널)가 처리합니다.
+    """
+    if not instance.variants:
+        return
+    try:
+        deleted = delete_variant_files(instance.variants)
+        logger.info(f"반응형 이미지 삭제: {sender.__name__} {instance.pk} ({deleted}/{len(instance.variants)}개)")
+    except Exception as e:
+        logger.error(f"반응형 이미지 삭제 중 예외 발생: {sender.__name__} {instance.pk} - {e}")
+
+
+def connect_variant_cleanup():
+    """모델이 지정된 이미지 프로필마다 삭제 시그널 연결"""
+    for profile in PROFILES.values():
+        if profile.model:
+            post_delete.connect(
+                delete_image_variants,
+                sender=apps.get_model(profile.model),
+                dispatch_uid=f'image-variants-{profile.model}',
+            )
@@ -0,0 +1,398 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from PIL import Image, JpegImagePlugin
+
+from storage.backends import S3Storage, get_s3_storage, reset_s3_clients
+from storage.disk_cache import S3DiskCache, get_disk_cache, read_stats
+from storage.fake_s3 import FakeS3Server
+from storage.image_derivatives import get_profile, render_derivatives, srcset
+from storage.image_transcode import process_pending, resolve_transcoded_references
+from storage.models import ImageTranscodeJob
+from storage.utils import upload_product_image
+from storage.views import serve_s3_file
+
+
+class S3StreamingProxyTests(SimpleTestCase):
+    def setUp(self):
+        self.server = FakeS3Server().start()
+        self.addCleanup(self.server.stop)
+        settings_override = override_settings(HOTLINK_PROTECTION_ENABLED=False, **self.server.django_settings())
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.data = bytes(range(256)) * 1024
+        self.etag = self.server.put_object('images/photo.png', self.data, content_type='image/png')
+
+    def _get(self, path='images/photo.png', **headers):
+        request = RequestFactory().get(f'/media/s3/{path}', **headers)
+        return serve_s3_file(request, path)
+
+    def test_streams_object_with_single_get_and_validators(self):
+        response = self._get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(b''.join(response.streaming_content), self.data)
+        self.assertEqual(response['Content-Length'], str(len(self.data)))
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(response['ETag'], self.etag)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('Last-Modified', response)
+        self.assertEqual(response['X-Content-Type-Options'], 'nosniff')
+        self.assertEqual([method for method, _, _ in self.server.requests], ['GET'])
+
+    def test_conditional_and_range_requests(self):
+        not_modified = self._get(HTTP_IF_NONE_MATCH=self.etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], self.etag)
+        self.assertEqual(not_modified.content, b'')
+
+        partial = self._get(HTTP_RANGE='bytes=10-19')
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(b''.join(partial.streaming_content), self.data[10:20])
+        self.assertEqual(partial['Content-Range'], f'bytes 10-19/{len(self.data)}')
+        self.assertEqual(partial['Content-Length'], '10')
+
+        suffix = self._get(HTTP_RANGE='bytes=-5')
+        self.assertEqual(b''.join(suffix.streaming_content), self.data[-5:])
+
+        # 객체가 바뀐 뒤의 If-Range → 전체 응답
+        stale = self._get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(b''.join(stale.streaming_content), self.data)
+
+        unsatisfiable = self._get(HTTP_RANGE=f'bytes={len(self.data)}-')
+        self.assertEqual(unsatisfiable.status_code, 416)
+        self.assertEqual(unsatisfiable['Content-Range'], f'bytes */{len(self.data)}')
+
+        # 다중 범위는 무시하고 전체 응답
+        self.assertEqual(self._get(HTTP_RANGE='bytes=0-1,5-6').status_code, 200)
+
+        with self.assertRaises(Http404):
+            self._get('images/missing.png')
+
+
+class S3DiskCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.server = FakeS3Server().start()
+        self.addCleanup(self.server.stop)
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, True)
+        settings_override = override_settings(
+            HOTLINK_PROTECTION_ENABLED=False,
+            S3_DISK_CACHE_DIR=self.cache_dir,
+            **self.server.django_settings(),
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.data = os.urandom(200 * 1024)
+        self.etag = self.server.put_object('logos/store.png', self.data, content_type='image/png')
+
+    def _get(self, path='logos/store.png', **headers):
+        request = RequestFactory().get(f'/media/s3/{path}', **headers)
+        response = serve_s3_file(request, path)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        response.close()
+        return response, body
+
+    def _s3_gets(self):
+        return [headers for method, _, headers in self.server.requests if method == 'GET']
+
+    def test_repeat_requests_are_served_from_disk_and_revalidated_with_etag(self):
+        first, body = self._get()
+        self.assertEqual((first.status_code, body), (200, self.data))
+        second, body = self._get()
+        self.assertEqual((second.status_code, body, second['ETag']), (200, self.data, self.etag))
+        self.assertEqual(second['Content-Length'], str(len(self.data)))
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH=self.etag)[0].status_code, 304)
+        partial, body = self._get(HTTP_RANGE='bytes=100-199')
+        self.assertEqual((partial.status_code, body), (206, self.data[100:200]))
+        self.assertEqual(len(self._s3_gets()), 1)
+
+        cache = get_disk_cache()
+        cache.revalidate_after = 0
+        # 바뀌지 않았으면 S3 는 304, 본문은 디스크에서
+        _, body = self._get()
+        self.assertEqual(body, self.data)
+        self.assertEqual(self._s3_gets()[-1].get('If-None-Match'), self.etag)
+
+        new_data = os.urandom(1024)
+        new_etag = self.server.put_object('logos/store.png', new_data)
+        response, body = self._get()
+        self.assertEqual((body, response['ETag']), (new_data, new_etag))
+        self.assertEqual(len(self._s3_gets()), 3)
+
+        cache.flush_stats()
+        stats = read_stats(self.cache_dir)
+        self.assertEqual(
+            [stats[name] for name in ('hits', 'misses', 'revalidated', 'refreshed')],
+            [3, 1, 1, 1],
+        )
+        self.assertAlmostEqual(stats['hit_rate'], 4 / 6)
+
+    def test_evicts_least_recently_used_bodies_over_capacity(self):
+        cache = S3DiskCache(self.cache_dir, max_bytes=250 * 1024)
+        chunk = b'x' * (100 * 1024)
+        first = cache.put('a', [chunk], etag='"a"', size=len(chunk))
+        second = cache.put('b', [chunk], etag='"b"', size=len(chunk))
+        # b 가 더 오래 안 쓰였음
+        os.utime(first.path, (2000, 2000))
+        os.utime(second.path, (1000, 1000))
+
+        cache.put('c', [chunk], etag='"c"', size=len(chunk))
+
+        self.assertIsNone(cache.get('b'))
+        self.assertFalse(os.path.exists(second.path))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('c'))
+        self.assertEqual(cache.usage(), (2, 200 * 1024))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+        # 크기가 맞지 않는 본문(중단된 다운로드)은 저장하지 않음
+        self.assertIsNone(cache.put('d', [chunk[:10]], etag='"d"', size=len(chunk)))
+        self.assertIsNone(cache.get('d'))
+
+    def test_fills_below_capacity_track_usage_without_rescanning(self):
+        cache = S3DiskCache(self.cache_dir, max_bytes=250 * 1024)
+        chunk = b'x' * (50 * 1024)
+        cache.put('a', [chunk], etag='"a"', size=len(chunk))
+
+        with mock.patch.object(cache, '_scan', wraps=cache._scan) as scan:
+            cache.put('b', [chunk], etag='"b"', size=len(chunk))
+            cache.put('b', [chunk * 2], etag='"b2"', size=len(chunk) * 2)
+            cache.discard('a')
+            cache.put('c', [chunk], etag='"c"', size=len(chunk))
+            scan.assert_not_called()
+            self.assertEqual(cache._usage, 150 * 1024)
+
+            # 어림값이 용량을 넘을 때만 스캔해 정리
+            cache.put('d', [chunk * 3], etag='"d"', size=len(chunk) * 3)
+            scan.assert_called_once()
+        self.assertEqual(cache._usage, cache.usage()[1])
+        self.assertLessEqual(cache._usage, 250 * 1024)
+
+    def test_concurrent_fills_fetch_object_once(self):
+        self.server.latency = 0.2
+        barrier = threading.Barrier(6)
+        bodies = []
+
+        def fetch():
+            barrier.wait()
+            bodies.append(self._get()[1])
+
+        threads = [threading.Thread(target=fetch) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(bodies, [self.data] * 6)
+        self.assertEqual(len(self._s3_gets()), 1)
+        leftovers = [name for _, _, files in os.walk(self.cache_dir) for name in files if name.endswith('.tmp')]
+        self.assertEqual(leftovers, [])
+
+
+class S3ClientRegistryTests(SimpleTestCase):
+    def setUp(self):
+        self.server = FakeS3Server().start()
+        self.addCleanup(self.server.stop)
+        settings_override = override_settings(**self.server.django_settings())
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.server.put_object('a.txt', b'hello')
+        reset_s3_clients()
+        self.addCleanup(reset_s3_clients)
+
+    def test_storages_share_one_client_and_connection_pool(self):
+        storage = get_s3_storage()
+        self.assertIs(get_s3_storage(), storage)
+        self.assertIs(S3Storage().client, storage.client)
+
+        for _ in range(5):
+            self.assertTrue(S3Storage().exists('a.txt'))
+            self.assertEqual(get_s3_storage().open('a.txt').read(), b'hello')
+        self.assertEqual(len(self.server.requests), 10)
+        self.assertEqual(self.server.connection_count, 1)
+
+        with override_settings(S3_BUCKET_NAME='other-bucket'):
+            other = get_s3_storage()
+        self.assertIsNot(other, storage)
+        self.assertIs(other.client, storage.client)
+
+    def test_client_is_rebuilt_after_fork(self):
+        parent_client = get_s3_storage().client
+        self.assertTrue(get_s3_storage().exists('a.txt'))
+        with mock.patch('storage.backends.os.getpid', return_value=os.getpid() + 100000):
+            child_client = get_s3_storage().client
+            self.assertIsNot(child_client, parent_client)
+            self.assertIs(get_s3_storage().client, child_client)
+            self.assertTrue(get_s3_storage().exists('a.txt'))
+        # 자식은 부모 소켓을 이어 쓰지 않고 자기 연결을 엶
+        self.assertEqual(self.server.connection_count, 2)
+
+
+def _jpeg(size, orientation=None):
+    image = Image.linear_gradient('L').resize(size).convert('RGB')
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    output = io.BytesIO()
+    image.save(output, format='JPEG', quality=90, exif=exif.tobytes())
+    return SimpleUploadedFile('photo.jpg', output.getvalue(), content_type='image/jpeg')
+
+
+@override_settings(IMAGE_TRANSCODE_ASYNC=True)
+class ImageDerivativeTests(TestCase):
+    def test_single_decode_emits_every_profile_width(self):
+        # 세로로 찍힌 사진 (EXIF 회전 6): 저장은 4000x3000, 보이는 크기는 3000x4000
+        jpeg_draft = JpegImagePlugin.JpegImageFile.draft
+        with mock.patch.object(JpegImagePlugin.JpegImageFile, 'draft', autospec=True, side_effect=jpeg_draft) as draft:
+            rendered = render_derivatives(_jpeg((4000, 3000), orientation=6), get_profile('store'))
+
+        self.assertEqual(rendered.original_size, (3000, 4000))
+        self.assertEqual([(d.width, d.height) for d in rendered.derivatives], [(1000, 562), (640, 360)])
+        self.assertEqual({d.format for d in rendered.derivatives}, {rendered.primary.format})
+        self.assertEqual(rendered.filename(rendered.variants[0]), f'photo_640w{rendered.primary.extension}')
+        # 1000x562 를 자르려면 (원본 방향으로) 1334x1000 이상이면 충분
+        draft.assert_called_once_with(mock.ANY, 'RGB', (1334, 1000))
+        decoded = Image.open(io.BytesIO(rendered.primary.content))
+        self.assertEqual(decoded.size, (1000, 562))
+
+        square = render_derivatives(_jpeg((300, 200)), get_profile('hall_of_fame'))
+        self.assertEqual([(d.width, d.height, d.format) for d in square.derivatives], [(1000, 1000, 'WEBP'), (400, 400, 'WEBP')])
+
+    def test_upload_stores_responsive_variants_and_cleans_them_up(self):
+        from products.models import Product, ProductImage
+        from stores.models import Store
+
+        owner = User.objects.create_user(username='owner', password='pw')
+        store = Store.objects.create(
+            store_id='imagestore', store_name='이미지 스토어', owner_name='홍길동',
+            chat_channel='https://t.me/example', owner=owner,
+        )
+        product = Product.objects.create(store=store, title='상품', description='테스트', price=1000)
+
+        with FakeS3Server() as server, override_settings(**server.django_settings()):
+            reset_s3_clients()
+            self.addCleanup(reset_s3_clients)
+            result = upload_product_image(_jpeg((800, 600)), product, owner)
+
+            # 요청 안에서는 원본만 저장하고 변환은 대기열에 남김
+            self.assertTrue(result['success'], result.get('error'))
+            image = result['product_image']
+            self.assertEqual((image.width, image.height, image.order, image.variants), (800, 600, 1, []))
+            self.assertTrue(image.file_path.startswith(f'products/imagestore/{product.id}/images/originals/'))
+            original_path = image.file_path
+            self.assertEqual(set(server.objects), {original_path})
+
+            self.assertEqual(process_pending().done, 1)
+
+            image.refresh_from_db()
+            self.assertEqual((image.width, image.height), (500, 500))
+            self.assertEqual([(v['width'], v['height']) for v in image.variants], [(250, 250)])
+            variant = image.variants[0]
+            self.assertEqual(variant['file_path'], f"{os.path.splitext(image.file_path)[0]}_250w{os.path.splitext(image.file_path)[1]}")
+            self.assertEqual(set(server.objects), {image.file_path, variant['file_path']})
+            self.assertEqual(image.file_size, len(server.objects[image.file_path][0]))
+            self.assertEqual(srcset(image), f"{image.file_url} 500w, {variant['file_url']} 250w")
+            job = ImageTranscodeJob.objects.get()
+            self.assertEqual((job.status, job.source_path, job.result_path), ('done', original_path, image.file_path))
+
+            ProductImage.objects.get(pk=image.pk).delete()
+            self.assertEqual(set(server.objects), {image.file_path})
+
+    def test_upload_does_not_render_in_web_process_by_default(self):
+        from products.models import Product
+        from stores.models import Store
+        from storage import image_transcode
+
+        owner = User.objects.create_user(username='owner', password='pw')
+        store = Store.objects.create(
+            store_id='imagestore', store_name='이미지 스토어', owner_name='홍길동',
+            chat_channel='https://t.me/example', owner=owner,
+        )
+        product = Product.objects.create(store=store, title='상품', description='테스트', price=1000)
+
+        with FakeS3Server() as server, override_settings(**server.django_settings()):
+            reset_s3_clients()
+            self.addCleanup(reset_s3_clients)
+            with mock.patch('storage.image_derivatives.render_derivatives') as render, \
+                    mock.patch('storage.image_transcode.threading') as threading_module, \
+                    self.captureOnCommitCallbacks(execute=True):
+                backlog = upload_product_image(_jpeg((800, 600)), product, owner)['product_image']
+                upload_product_image(_jpeg((800, 600)), product, owner)
+            render.assert_not_called()
+            threading_module.Thread.assert_not_called()
+            self.assertEqual(
+                set(ImageTranscodeJob.objects.values_list('status', flat=True)), {ImageTranscodeJob.STATUS_PENDING},
+            )
+
+            # 개발용 백그라운드 처리는 자기 프로세스가 남긴 작업만 처리함 (밀린 대기열은 워커 몫)
+            job = ImageTranscodeJob.objects.exclude(target_id=backlog.pk).get()
+            with override_settings(IMAGE_TRANSCODE_BACKGROUND=True), \
+                    mock.patch('storage.image_transcode.threading') as threading_module, \
+                    mock.patch('storage.image_transcode.close_old_connections'):
+                self.assertTrue(image_transcode.request_background_transcode(job.pk))
+                threading_module.Thread.return_value.start.assert_called_once()
+                image_transcode._run_background_transcode()
+
+            self.assertEqual(
+                dict(ImageTranscodeJob.objects.values_list('target_id', 'status')),
+                {backlog.pk: ImageTranscodeJob.STATUS_PENDING, job.target_id: ImageTranscodeJob.STATUS_DONE},
+            )
+            self.assertIsNone(image_transcode._background_thread)
+
+    def test_transcode_swaps_minihome_json_and_skips_deleted_targets(self):
+        from minihome.models import Minihome
+        from minihome.services import upload_minihome_image
+        from products.models import Product, ProductImage
+        from stores.models import Store
+
+        minihome = Minihome.objects.create(slug='home')
+        owner = User.objects.create_user(username='owner', password='pw')
+        store = Store.objects.create(
+            store_id='imagestore', store_name='이미지 스토어', owner_name='홍길동',
+            chat_channel='https://t.me/example', owner=owner,
+        )
+        product = Product.objects.create(store=store, title='상품', description='테스트', price=1000)
+
+        with FakeS3Server() as server, override_settings(**server.django_settings()):
+            reset_s3_clients()
+            self.addCleanup(reset_s3_clients)
+            result = upload_minihome_image(
+                _jpeg((1600, 1200)), prefix='minihome/home/brand', target_width=800, minihome=minihome,
+            )
+            self.assertEqual((result['width'], result['height']), (1600, 1200))
+            meta = {'path': result['file_path'], 'url': result['file_url'], 'width': 1600, 'height': 1200}
+            stale_sections = [{'id': 'brand', 'type': 'brand', 'data': {'image': meta}}]
+
+            # 편집 화면이 JSON 을 저장하기 전이면 대상에서 원본을 찾지 못해도 미룸
+            self.assertEqual(process_pending().postponed, 1)
+            Minihome.objects.filter(pk=minihome.pk).update(
+                draft_sections=stale_sections, published_sections=stale_sections,
+            )
+            ImageTranscodeJob.objects.update(next_attempt_at=None)
+
+            deleted = upload_product_image(_jpeg((800, 600)), product, owner)['product_image']
+            ProductImage.objects.filter(pk=deleted.pk).delete()
+
+            result = process_pending()
+            self.assertEqual((result.done, result.skipped), (1, 1))
+
+            minihome.refresh_from_db()
+            swapped = minihome.published_sections[0]['data']['image']
+            self.assertEqual(minihome.draft_sections, minihome.published_sections)
+            self.assertEqual((swapped['width'], swapped['height']), (800, 600))
+            self.assertNotIn('/originals/', swapped['path'])
+            # 변환 전 JSON 을 다시 저장해도 파생본을 가리키도록 바뀜
+            self.assertEqual(resolve_transcoded_references(stale_sections)[0]['data']['image'], swapped)
+            # 두 원본과 삭제된 상품 이미지 몫의 파생본은 남지 않음
+            self.assertEqual(set(server.objects), {swapped['path']})
@@ -6,31 +6,23 @@ import os
 import uuid
 import logging
 from datetime import datetime
+from dataclasses import replace
 from typing import Optional, Dict, Any
 
-import io
-
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
-from django.core.files.base import ContentFile
 from django.core.files.uploadedfile import UploadedFile
-from django.db import models
 
-from .backends import S3Storage
+from .backends import S3Storage, get_s3_storage
+from .image_derivatives import get_profile, process_profile_image, upload_profile_image
 
 # 조건부 import
 try:
-    from PIL import Image, ImageOps
+    from PIL import Image
     PIL_AVAILABLE = True
 except ImportError:
     PIL_AVAILABLE = False
 
-try:
-    import pillow_avif  # AVIF 지원
-    AVIF_AVAILABLE = True
-except ImportError:
-    AVIF_AVAILABLE = False
-
 # 로거 설정
 logger = logging.getLogger(__name__)
 
@@ -72,7 +64,7 @@ def upload_file_to_s3(
     Args:
         file: Django UploadedFile 객체
         prefix: 폴더 prefix
-        storage: S3Storage 인스턴스 (없으면 새로 생성)
+        storage: S3Storage 인스턴스 (없으면 프로세스 공유 인스턴스)
     
     Returns:
         업로드 결과 정보
@@ -92,8 +84,8 @@ def upload_file_to_s3(
     if storage is None:
         logger.debug("스토리지 인스턴스 생성 시도")
         try:
-            storage = S3Storage()
-            logger.info("S3Storage 인스턴스 생성 성공")
+            storage = get_s3_storage()
+            logger.debug("S3Storage 인스턴스 확보")
         except Exception as exc:
             logger.error("S3Storage 인스턴스 생성 실패: %s", exc)
             return {
@@ -172,7 +164,7 @@ def delete_file_from_s3(file_path: str, storage: S3Storage = None) -> Dict[str,
         }
     """
     if storage is None:
-        storage = S3Storage()
+        storage = get_s3_storage()
 
     try:
         storage.delete(file_path)
@@ -197,7 +189,7 @@ def get_file_url(file_path: str, storage: S3Storage = None) -> Optional[str]:
         파일 URL (실패시 None)
     """
     if storage is None:
-        storage = S3Storage()
+        storage = get_s3_storage()
     
     try:
         return storage.url(file_path)
@@ -289,7 +281,7 @@ def get_file_info(file_path: str, storage: S3Storage = None) -> Optional[Dict[st
         }
     """
     if storage is None:
-        storage = S3Storage()
+        storage = get_s3_storage()
     
     try:
         if not storage.exists(file_path):
@@ -328,7 +320,7 @@ def bulk_upload_files(files: list, prefix: str = None) -> Dict[str, Any]:
     success_count = 0
     failed_count = 0
     
-    storage = S3Storage()
+    storage = get_s3_storage()
     
     for file in files:
         # 파일 검증
@@ -358,10 +350,10 @@ def bulk_upload_files(files: list, prefix: str = None) -> Dict[str, Any]:
 
 def process_store_image(image_file, target_width=1000, target_ratio=(16, 9)) -> Dict[str, Any]:
     """
-    스토어 이미지를 처리합니다.
+    스토어 이미지를 처리합니다. (``storage.image_derivatives`` 의 'store' 프로필)
     - 16:9 비율로 자르기
-    - 1000px 너비로 리사이즈
-    - AVIF 포맷으로 변환
+    - 1000px 너비로 리사이즈 (반응형 640px 함께 생성)
+    - AVIF 포맷으로 변환 (지원되지 않으면 WebP)
     
     Args:
         image_file: 업로드된 이미지 파일
@@ -375,86 +367,14 @@ def process_store_image(image_file, target_width=1000, target_ratio=(16, 9)) ->
             'processed_file': ContentFile,
             'original_size': tuple,
             'processed_size': tuple,
+            'derivatives': DerivativeSet,
             'error': str (실패시)
         }
     """
-    try:
-        if not PIL_AVAILABLE:
-            return {
-                'success': False,
-                'error': 'Pillow 패키지가 설치되지 않았습니다. pip install Pillow을 실행해주세요.'
-            }
-        
-        logger.info(f"이미지 처리 시작: {image_file.name}")
-        
-        # 이미지 열기
-        with Image.open(image_file) as img:
-            original_size = img.size
-            logger.info(f"원본 이미지 크기: {original_size}")
-            
-            # RGB 모드로 변환 (AVIF는 RGBA를 지원하지 않을 수 있음)
-            if img.mode in ('RGBA', 'LA'):
-                # 투명 배경을 흰색으로 변환
-                background = Image.new('RGB', img.size, (255, 255, 255))
-                if img.mode == 'RGBA':
-                    background.paste(img, mask=img.split()[-1])
-                else:
-                    background.paste(img, mask=img.split()[-1])
-                img = background
-            elif img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            # 목표 비율 계산
-            target_height = int(target_width * target_ratio[1] / target_ratio[0])
-            target_size = (target_width, target_height)
-            
-            # 이미지 자르기 및 리사이즈 (16:9 비율 맞추기)
-            img = ImageOps.fit(img, target_size, Image.Resampling.LANCZOS)
-            
-            logger.info(f"처리된 이미지 크기: {img.size}")
-            
-            # 포맷 결정 및 저장
-            output = io.BytesIO()
-            
-            if AVIF_AVAILABLE:
-                # AVIF 포맷으로 저장
-                img.save(output, format='AVIF', quality=85, speed=6)
-                file_ext = '.avif'
-            else:
-                # AVIF가 지원되지 않으면 WebP로 저장
-                img.save(output, format='WebP', quality=85, method=6)
-                file_ext = '.webp'
-            
-            output.seek(0)
-            
-            # 파일명 변경
-            original_name = os.path.splitext(image_file.name)[0]
-            processed_filename = f"{original_name}{file_ext}"
-            
-            processed_file = ContentFile(output.getvalue(), name=processed_filename)
-            
-            return {
-                'success': True,
-                'processed_file': processed_file,
-                'original_size': original_size,
-                'processed_size': img.size,
-                'filename': processed_filename
-            }
-            
-    except ImportError as e:
-        error_msg = f"이미지 처리에 필요한 패키지가 설치되지 않았습니다: {str(e)}"
-        logger.error(error_msg)
-        return {
-            'success': False,
-            'error': error_msg
-        }
-    except Exception as e:
-        error_msg = f"이미지 처리 중 오류 발생: {str(e)}"
-        logger.error(error_msg)
-        return {
-            'success': False,
-            'error': error_msg
-        }
+    profile = get_profile('store')
+    if (target_width, tuple(target_ratio)) != (profile.widths[0], profile.crop):
+        profile = replace(profile, widths=(target_width,), crop=tuple(target_ratio))
+    return process_profile_image(image_file, profile)
 
 
 def upload_store_image(image_file, store, user) -> Dict[str, Any]:
@@ -474,60 +394,7 @@ def upload_store_image(image_file, store, user) -> Dict[str, Any]:
             'error': str (실패시)
         }
     """
-    try:
-        from stores.models import StoreImage
-        
-        # 이미지 처리
-        process_result = process_store_image(image_file)
-        if not process_result['success']:
-            return process_result
-        
-        # S3에 업로드
-        prefix = f"stores/{store.store_id}/images"
-        upload_result = upload_file_to_s3(
-            process_result['processed_file'], 
-            prefix=prefix
-        )
-        
-        if not upload_result['success']:
-            return upload_result
-        
-        # DB에 저장
-        # 다음 순서 계산
-        last_order = StoreImage.objects.filter(store=store).aggregate(
-            models.Max('order')
-        )['order__max'] or 0
-        
-        # 파일 크기 다시 계산 (ContentFile에서)
-        process_result['processed_file'].seek(0)
-        file_content = process_result['processed_file'].read()
-        actual_file_size = len(file_content)
-        process_result['processed_file'].seek(0)  # 다시 처음으로
-        
-        store_image = StoreImage.objects.create(
-            store=store,
-            original_name=image_file.name,
-            file_path=upload_result['file_path'],
-            file_url=upload_result['file_url'],
-            file_size=actual_file_size,
-            width=process_result['processed_size'][0],
-            height=process_result['processed_size'][1],
-            order=last_order + 1,
-            uploaded_by=user
-        )
-        
-        return {
-            'success': True,
-            'store_image': store_image
-        }
-        
-    except Exception as e:
-        error_msg = f"스토어 이미지 업로드 실패: {str(e)}"
-        logger.error(error_msg)
-        return {
-            'success': False,
-            'error': error_msg
-        }
+    return _upload_gallery_image(image_file, 'store', store, user, 'store_image')
 
 
 def upload_product_image(image_file, product, user) -> Dict[str, Any]:
@@ -547,168 +414,24 @@ def upload_product_image(image_file, product, user) -> Dict[str, Any]:
             'error': str (실패시)
         }
     """
-    try:
-        from products.models import ProductImage
-        
-        # 이미지 처리 (1:1 비율로 500x500 크기)
-        process_result = process_product_image(image_file)
-        if not process_result['success']:
-            return process_result
-        
-        # S3에 업로드
-        prefix = f"products/{product.store.store_id}/{product.id}/images"
-        upload_result = upload_file_to_s3(
-            process_result['processed_file'], 
-            prefix=prefix
-        )
-        
-        if not upload_result['success']:
-            return upload_result
-        
-        # DB에 저장
-        # 다음 순서 계산
-        last_order = ProductImage.objects.filter(product=product).aggregate(
-            models.Max('order')
-        )['order__max'] or 0
-        
-        # 파일 크기 다시 계산 (ContentFile에서)
-        process_result['processed_file'].seek(0)
-        file_content = process_result['processed_file'].read()
-        actual_file_size = len(file_content)
-        process_result['processed_file'].seek(0)  # 다시 처음으로
-        
-        product_image = ProductImage.objects.create(
-            product=product,
-            original_name=image_file.name,
-            file_path=upload_result['file_path'],
-            file_url=upload_result['file_url'],
-            file_size=actual_file_size,
-            width=process_result['processed_size'][0],
-            height=process_result['processed_size'][1],
-            order=last_order + 1,
-            uploaded_by=user
-        )
-        
-        return {
-            'success': True,
-            'product_image': product_image
-        }
-        
-    except Exception as e:
-        error_msg = f"상품 이미지 업로드 실패: {str(e)}"
-        logger.error(error_msg)
-        return {
-            'success': False,
-            'error': error_msg
-        }
+    return _upload_gallery_image(image_file, 'product', product, user, 'product_image')
 
 
 def process_product_image(image_file, target_size=500) -> Dict[str, Any]:
     """
-    상품 이미지를 처리합니다.
+    상품 이미지를 처리합니다. (``storage.image_derivatives`` 의 'product' 프로필)
     - 1:1 비율로 자르기
-    - 500x500 크기로 리사이즈
-    - AVIF 포맷으로 변환
+    - 500x500 크기로 리사이즈 (반응형 250px 함께 생성)
+    - AVIF 포맷으로 변환 (지원되지 않으면 WebP)
     
     Args:
         image_file: 업로드된 이미지 파일
         target_size: 목표 크기 (기본값: 500px)
     
     Returns:
-        처리 결과 정보
-        {
-            'success': bool,
-            'processed_file': ContentFile,
-            'original_size': tuple,
-            'processed_size': tuple,
-            'error': str (실패시)
-        }
+        처리 결과 정보 (``process_store_image`` 와 같은 형식)
     """
-    try:
-        if not PIL_AVAILABLE:
-            return {
-                'success': False,
-                'error': 'Pillow 패키지가 설치되지 않았습니다. pip install Pillow을 실행해주세요.'
-            }
-        
-        logger.info(f"상품 이미지 처리 시작: {image_file.name}")
-        
-        # 이미지 열기
-        try:
-            image = Image.open(image_file)
-            original_size = image.size
-            logger.info(f"원본 이미지 크기: {original_size}")
-        except Exception as e:
-            return {
-                'success': False,
-                'error': f'이미지 파일을 열 수 없습니다: {str(e)}'
-            }
-        
-        # EXIF 정보에 따른 회전 보정
-        image = ImageOps.exif_transpose(image)
-        
-        # RGB 모드로 변환 (AVIF 변환을 위해)
-        if image.mode not in ('RGB', 'RGBA'):
-            image = image.convert('RGB')
-        
-        # 1:1 비율로 중앙 크롭
-        width, height = image.size
-        min_dimension = min(width, height)
-        
-        left = (width - min_dimension) // 2
-        top = (height - min_dimension) // 2
-        right = left + min_dimension
-        bottom = top + min_dimension
-        
-        image = image.crop((left, top, right, bottom))
-        logger.info(f"1:1 크롭 완료: {image.size}")
-        
-        # 500x500으로 리사이즈
-        image = image.resize((target_size, target_size), Image.Resampling.LANCZOS)
-        logger.info(f"리사이즈 완료: {image.size}")
-        
-        # AVIF 포맷으로 변환
-        output = io.BytesIO()
-        try:
-            if AVIF_AVAILABLE:
-                image.save(output, format='AVIF', quality=85, optimize=True)
-                file_extension = '.avif'
-                logger.info("AVIF 포맷으로 변환 완료")
-            else:
-                image.save(output, format='WEBP', quality=85, optimize=True)
-                file_extension = '.webp'
-                logger.info("WEBP 포맷으로 변환 완료")
-        except Exception as e:
-            # AVIF/WebP 실패 시 JPEG로 fallback
-            logger.warning(f"AVIF/WebP 변환 실패, JPEG로 변환: {e}")
-            image.save(output, format='JPEG', quality=85, optimize=True)
-            file_extension = '.jpg'
-        
-        output.seek(0)
-        
-        # 새 파일명 생성
-        base_name = os.path.splitext(image_file.name)[0]
-        new_filename = f"{base_name}_processed{file_extension}"
-        
-        processed_file = ContentFile(output.getvalue(), name=new_filename)
-        
-        result = {
-            'success': True,
-            'processed_file': processed_file,
-            'original_size': original_size,
-            'processed_size': (target_size, target_size)
-        }
-        
-        logger.info(f"상품 이미지 처리 완료: {image_file.name}")
-        return result
-        
-    except Exception as e:
-        error_msg = f"상품 이미지 처리 실패: {str(e)}"
-        logger.error(error_msg)
-        return {
-            'success': False,
-            'error': error_msg
-        }
+    return _process_square_image(image_file, 'product', target_size)
 
 
 def upload_menu_image(image_file, menu, user) -> Dict[str, Any]:
@@ -728,168 +451,12 @@ def upload_menu_image(image_file, menu, user) -> Dict[str, Any]:
             'error': str (실패시)
         }
     """
-    try:
-        from menu.models import MenuImage
-        
-        # 이미지 처리 (1:1 비율로 500x500 크기)
-        process_result = process_menu_image(image_file)
-        if not process_result['success']:
-            return process_result
-        
-        # S3에 업로드
-        prefix = f"menus/{menu.store.store_id}/{menu.id}/images"
-        upload_result = upload_file_to_s3(
-            process_result['processed_file'], 
-            prefix=prefix
-        )
-        
-        if not upload_result['success']:
-            return upload_result
-        
-        # DB에 저장
-        # 다음 순서 계산
-        last_order = MenuImage.objects.filter(menu=menu).aggregate(
-            models.Max('order')
-        )['order__max'] or 0
-        
-        # 파일 크기 다시 계산 (ContentFile에서)
-        process_result['processed_file'].seek(0)
-        file_content = process_result['processed_file'].read()
-        actual_file_size = len(file_content)
-        process_result['processed_file'].seek(0)  # 다시 처음으로
-        
-        menu_image = MenuImage.objects.create(
-            menu=menu,
-            original_name=image_file.name,
-            file_path=upload_result['file_path'],
-            file_url=upload_result['file_url'],
-            file_size=actual_file_size,
-            width=process_result['processed_size'][0],
-            height=process_result['processed_size'][1],
-            order=last_order + 1,
-            uploaded_by=user
-        )
-        
-        return {
-            'success': True,
-            'menu_image': menu_image
-        }
-        
-    except Exception as e:
-        error_msg = f"메뉴 이미지 업로드 실패: {str(e)}"
-        logger.error(error_msg)
-        return {
-            'success': False,
-            'error': error_msg
-        }
+    return _upload_gallery_image(image_file, 'menu', menu, user, 'menu_image')
 
 
 def process_menu_image(image_file, target_size=500) -> Dict[str, Any]:
-    """
-    메뉴 이미지를 처리합니다.
-    - 1:1 비율로 자르기
-    - 500x500 크기로 리사이즈
-    - AVIF 포맷으로 변환
-    
-    Args:
-        image_file: 업로드된 이미지 파일
-        target_size: 목표 크기 (기본값: 500px)
-    
-    Returns:
-        처리 결과 정보
-        {
-            'success': bool,
-            'processed_file': ContentFile,
-            'original_size': tuple,
-            'processed_size': tuple,
-            'error': str (실패시)
-        }
-    """
-    try:
-        if not PIL_AVAILABLE:
-            return {
-                'success': False,
-                'error': 'Pillow 패키지가 설치되지 않았습니다. pip install Pillow을 실행해주세요.'
-            }
-        
-        logger.info(f"메뉴 이미지 처리 시작: {image_file.name}")
-        
-        # 이미지 열기
-        try:
-            image = Image.open(image_file)
-            original_size = image.size
-            logger.info(f"원본 이미지 크기: {original_size}")
-        except Exception as e:
-            return {
-                'success': False,
-                'error': f'이미지 파일을 열 수 없습니다: {str(e)}'
-            }
-        
-        # EXIF 정보에 따른 회전 보정
-        image = ImageOps.exif_transpose(image)
-        
-        # RGB 모드로 변환 (AVIF 변환을 위해)
-        if image.mode not in ('RGB', 'RGBA'):
-            image = image.convert('RGB')
-        
-        # 1:1 비율로 중앙 크롭
-        width, height = image.size
-        min_dimension = min(width, height)
-        
-        left = (width - min_dimension) // 2
-        top = (height - min_dimension) // 2
-        right = left + min_dimension
-        bottom = top + min_dimension
-        
-        image = image.crop((left, top, right, bottom))
-        logger.info(f"1:1 크롭 완료: {image.size}")
-        
-        # 500x500으로 리사이즈
-        image = image.resize((target_size, target_size), Image.Resampling.LANCZOS)
-        logger.info(f"리사이즈 완료: {image.size}")
-        
-        # AVIF 포맷으로 변환
-        output = io.BytesIO()
-        try:
-            if AVIF_AVAILABLE:
-                image.save(output, format='AVIF', quality=85, optimize=True)
-                file_extension = '.avif'
-                logger.info("AVIF 포맷으로 변환 완료")
-            else:
-                image.save(output, format='WEBP', quality=85, optimize=True)
-                file_extension = '.webp'
-                logger.info("WEBP 포맷으로 변환 완료")
-        except Exception as e:
-            # AVIF/WebP 실패 시 JPEG로 fallback
-            logger.warning(f"AVIF/WebP 변환 실패, JPEG로 변환: {e}")
-            image.save(output, format='JPEG', quality=85, optimize=True)
-            file_extension = '.jpg'
-        
-        output.seek(0)
-        
-        # 새 파일명 생성
-        base_name = os.path.splitext(image_file.name)[0]
-        new_filename = f"{base_name}_processed{file_extension}"
-        
-        processed_file = ContentFile(output.getvalue(), name=new_filename)
-        
-        result = {
-            'success': True,
-            'processed_file': processed_file,
-            'original_size': original_size,
-            'processed_size': (target_size, target_size)
-        }
-        
-        logger.info(f"메뉴 이미지 처리 완료: {image_file.name}")
-        return result
-        
-    except Exception as e:
-        error_msg = f"메뉴 이미지 처리 실패: {str(e)}"
-        logger.error(error_msg)
-        return {
-            'success': False,
-            'error': error_msg
-        }
+    """메뉴 이미지를 처리합니다. (1:1, 500x500, 'menu' 프로필)"""
+    return _process_square_image(image_file, 'menu', target_size)
 
 
 def upload_meetup_image(image_file, meetup, user) -> Dict[str, Any]:
@@ -909,168 +476,12 @@ def upload_meetup_image(image_file, meetup, user) -> Dict[str, Any]:
             'error': str (실패시)
         }
     """
-    try:
-        from meetup.models import MeetupImage
-        
-        # 이미지 처리 (1:1 비율로 500x500 크기)
-        process_result = process_meetup_image(image_file)
-        if not process_result['success']:
-            return process_result
-        
-        # S3에 업로드
-        prefix = f"meetups/{meetup.store.store_id}/{meetup.id}/images"
-        upload_result = upload_file_to_s3(
-            process_result['processed_file'], 
-            prefix=prefix
-        )
-        
-        if not upload_result['success']:
-            return upload_result
-        
-        # DB에 저장
-        # 다음 순서 계산
-        last_order = MeetupImage.objects.filter(meetup=meetup).aggregate(
-            models.Max('order')
-        )['order__max'] or 0
-        
-        # 파일 크기 다시 계산 (ContentFile에서)
-        process_result['processed_file'].seek(0)
-        file_content = process_result['processed_file'].read()
-        actual_file_size = len(file_content)
-        process_result['processed_file'].seek(0)  # 다시 처음으로
-        
-        meetup_image = MeetupImage.objects.create(
-            meetup=meetup,
-            original_name=image_file.name,
-            file_path=upload_result['file_path'],
-            file_url=upload_result['file_url'],
-            file_size=actual_file_size,
-            width=process_result['processed_size'][0],
-            height=process_result['processed_size'][1],
-            order=last_order + 1,
-            uploaded_by=user
-        )
-        
-        return {
-            'success': True,
-            'meetup_image': meetup_image
-        }
-        
-    except Exception as e:
-        error_msg = f"밋업 이미지 업로드 실패: {str(e)}"
-        logger.error(error_msg)
-        return {
-            'success': False,
-            'error': error_msg
-        }
+    return _upload_gallery_image(image_file, 'meetup', meetup, user, 'meetup_image')
 
 
 def process_meetup_image(image_file, target_size=500) -> Dict[str, Any]:
-    """
-    밋업 이미지를 처리합니다.
-    - 1:1 비율로 자르기
-    - 500x500 크기로 리사이즈
-    - AVIF 포맷으로 변환
-    
-    Args:
-        image_file: 업로드된 이미지 파일
-        target_size: 목표 크기 (기본값: 500px)
-    
-    Returns:
-        처리 결과 정보
-        {
-            'success': bool,
-            'processed_file': ContentFile,
-            'original_size': tuple,
-            'processed_size': tuple,
-            'error': str (실패시)
-        }
-    """
-    try:
-        if not PIL_AVAILABLE:
-            return {
-                'success': False,
-                'error': 'Pillow 패키지가 설치되지 않았습니다. pip install Pillow을 실행해주세요.'
-            }
-        
-        logger.info(f"밋업 이미지 처리 시작: {image_file.name}")
-        
-        # 이미지 열기
-        try:
-            image = Image.open(image_file)
-            original_size = image.size
-            logger.info(f"원본 이미지 크기: {original_size}")
-        except Exception as e:
-            return {
-                'success': False,
-                'error': f'이미지 파일을 열 수 없습니다: {str(e)}'
-            }
-        
-        # EXIF 정보에 따른 회전 보정
-        image = ImageOps.exif_transpose(image)
-        
-        # RGB 모드로 변환 (AVIF 변환을 위해)
-        if image.mode not in ('RGB', 'RGBA'):
-            image = image.convert('RGB')
-        
-        # 1:1 비율로 중앙 크롭
-        width, height = image.size
-        min_dimension = min(width, height)
-        
-        left = (width - min_dimension) // 2
-        top = (height - min_dimension) // 2
-        right = left + min_dimension
-        bottom = top + min_dimension
-        
-        image = image.crop((left, top, right, bottom))
-        logger.info(f"1:1 크롭 완료: {image.size}")
-        
-        # 500x500으로 리사이즈
-        image = image.resize((target_size, target_size), Image.Resampling.LANCZOS)
-        logger.info(f"리사이즈 완료: {image.size}")
-        
-        # AVIF 포맷으로 변환
-        output = io.BytesIO()
-        try:
-            if AVIF_AVAILABLE:
-                image.save(output, format='AVIF', quality=85, optimize=True)
-                file_extension = '.avif'
-                logger.info("AVIF 포맷으로 변환 완료")
-            else:
-                image.save(output, format='WEBP', quality=85, optimize=True)
-                file_extension = '.webp'
-                logger.info("WEBP 포맷으로 변환 완료")
-        except Exception as e:
-            # AVIF/WebP 실패 시 JPEG로 fallback
-            logger.warning(f"AVIF/WebP 변환 실패, JPEG로 변환: {e}")
-            image.save(output, format='JPEG', quality=85, optimize=True)
-            file_extension = '.jpg'
-        
-        output.seek(0)
-        
-        # 새 파일명 생성
-        base_name = os.path.splitext(image_file.name)[0]
-        new_filename = f"{base_name}_processed{file_extension}"
-        
-        processed_file = ContentFile(output.getvalue(), name=new_filename)
-        
-        result = {
-            'success': True,
-            'processed_file': processed_file,
-            'original_size': original_size,
-            'processed_size': (target_size, target_size)
-        }
-        
-        logger.info(f"밋업 이미지 처리 완료: {image_file.name}")
-        return result
-        
-    except Exception as e:
-        error_msg = f"밋업 이미지 처리 실패: {str(e)}"
-        logger.error(error_msg)
-        return {
-            'success': False,
-            'error': error_msg
-        }
+    """밋업 이미지를 처리합니다. (1:1, 500x500, 'meetup' 프로필)"""
+    return _process_square_image(image_file, 'meetup', target_size)
 
 
 def upload_live_lecture_image(image_file, live_lecture, user) -> Dict[str, Any]:
@@ -1090,168 +501,27 @@ def upload_live_lecture_image(image_file, live_lecture, user) -> Dict[str, Any]:
             'error': str (실패시)
         }
     """
-    try:
-        from lecture.models import LiveLectureImage
-        
-        # 이미지 처리 (1:1 비율로 500x500 크기)
-        process_result = process_live_lecture_image(image_file)
-        if not process_result['success']:
-            return process_result
-        
-        # S3에 업로드
-        prefix = f"live_lectures/{live_lecture.store.store_id}/{live_lecture.id}/images"
-        upload_result = upload_file_to_s3(
-            process_result['processed_file'], 
-            prefix=prefix
-        )
-        
-        if not upload_result['success']:
-            return upload_result
-        
-        # DB에 저장
-        # 다음 순서 계산
-        last_order = LiveLectureImage.objects.filter(live_lecture=live_lecture).aggregate(
-            models.Max('order')
-        )['order__max'] or 0
-        
-        # 파일 크기 다시 계산 (ContentFile에서)
-        process_result['processed_file'].seek(0)
-        file_content = process_result['processed_file'].read()
-        actual_file_size = len(file_content)
-        process_result['processed_file'].seek(0)  # 다시 처음으로
-        
-        live_lecture_image = LiveLectureImage.objects.create(
-            live_lecture=live_lecture,
-            original_name=image_file.name,
-            file_path=upload_result['file_path'],
-            file_url=upload_result['file_url'],
-            file_size=actual_file_size,
-            width=process_result['processed_size'][0],
-            height=process_result['processed_size'][1],
-            order=last_order + 1,
-            uploaded_by=user
-        )
-        
-        return {
-            'success': True,
-            'live_lecture_image': live_lecture_image
-        }
-        
-    except Exception as e:
-        error_msg = f"라이브 강의 이미지 업로드 실패: {str(e)}"
-        logger.error(error_msg)
-        return {
-            'success': False,
-            'error': error_msg
-        }
+    return _upload_gallery_image(image_file, 'live_lecture', live_lecture, user, 'live_lecture_image')
 
 
 def process_live_lecture_image(image_file, target_size=500) -> Dict[str, Any]:
-    """
-    라이브 강의 이미지를 처리합니다.
-    - 1:1 비율로 자르기
-    - 500x500 크기로 리사이즈
-    - AVIF 포맷으로 변환
-    
-    Args:
-        image_file: 업로드된 이미지 파일
-        target_size: 목표 크기 (기본값: 500px)
-    
-    Returns:
-        처리 결과 정보
-        {
-            'success': bool,
-            'processed_file': ContentFile,
-            'original_size': tuple,
-            'processed_size': tuple,
-            'error': str (실패시)
-        }
-    """
-    try:
-        if not PIL_AVAILABLE:
-            return {
-                'success': False,
-                'error': 'Pillow 패키지가 설치되지 않았습니다. pip install Pillow을 실행해주세요.'
-            }
-        
-        logger.info(f"라이브 강의 이미지 처리 시작: {image_file.name}")
-        
-        # 이미지 열기
-        try:
-            image = Image.open(image_file)
-            original_size = image.size
-            logger.info(f"원본 이미지 크기: {original_size}")
-        except Exception as e:
-            return {
-                'success': False,
-                'error': f'이미지 파일을 열 수 없습니다: {str(e)}'
-            }
-        
-        # EXIF 정보에 따른 회전 보정
-        image = ImageOps.exif_transpose(image)
-        
-        # RGB 모드로 변환 (AVIF 변환을 위해)
-        if image.mode not in ('RGB', 'RGBA'):
-            image = image.convert('RGB')
-        
-        # 1:1 비율로 중앙 크롭
-        width, height = image.size
-        min_dimension = min(width, height)
-        
-        left = (width - min_dimension) // 2
-        top = (height - min_dimension) // 2
-        right = left + min_dimension
-        bottom = top + min_dimension
-        
-        image = image.crop((left, top, right, bottom))
-        logger.info(f"1:1 크롭 완료: {image.size}")
-        
-        # 500x500으로 리사이즈
-        image = image.resize((target_size, target_size), Image.Resampling.LANCZOS)
-        logger.info(f"리사이즈 완료: {image.size}")
-        
-        # AVIF 포맷으로 변환
-        output = io.BytesIO()
-        try:
-            if AVIF_AVAILABLE:
-                image.save(output, format='AVIF', quality=85, optimize=True)
-                file_extension = '.avif'
-                logger.info("AVIF 포맷으로 변환 완료")
-            else:
-                image.save(output, format='WEBP', quality=85, optimize=True)
-                file_extension = '.webp'
-                logger.info("WEBP 포맷으로 변환 완료")
-        except Exception as e:
-            # AVIF/WebP 실패 시 JPEG로 fallback
-            logger.warning(f"AVIF/WebP 변환 실패, JPEG로 변환: {e}")
-            image.save(output, format='JPEG', quality=85, optimize=True)
-            file_extension = '.jpg'
-        
-        output.seek(0)
-        
-        # 새 파일명 생성
-        base_name = os.path.splitext(image_file.name)[0]
-        new_filename = f"{base_name}_processed{file_extension}"
-        
-        processed_file = ContentFile(output.getvalue(), name=new_filename)
-        
-        result = {
-            'success': True,
-            'processed_file': processed_file,
-            'original_size': original_size,
-            'processed_size': (target_size, target_size)
-        }
-        
-        logger.info(f"라이브 강의 이미지 처리 완료: {image_file.name}")
+    """라이브 강의 이미지를 처리합니다. (1:1, 500x500, 'live_lecture' 프로필)"""
+    return _process_square_image(image_file, 'live_lecture', target_size)
+
+
+def _process_square_image(image_file, profile_name, target_size):
+    profile = get_profile(profile_name)
+    if target_size != profile.widths[0]:
+        profile = replace(profile, widths=(target_size,))
+    return process_profile_image(image_file, profile)
+
+
+def _upload_gallery_image(image_file, profile_name, owner, user, result_key):
+    """``upload_profile_image`` 결과를 기존 반환 키(``store_image`` 등)로"""
+    result = upload_profile_image(image_file, profile_name, owner, user)
+    if not result['success']:
         return result
-        
-    except Exception as e:
-        error_msg = f"라이브 강의 이미지 처리 실패: {str(e)}"
-        logger.error(error_msg)
-        return {
-            'success': False,
-            'error': error_msg
-        }
+    return {'success': True, result_key: result['image']}
 
 
 def upload_meme_image(image_file, original_processed_file, thumbnail_file, user) -> Dict[str, Any]:
@@ -1282,7 +552,7 @@ def upload_meme_image(image_file, original_processed_file, thumbnail_file, user)
         from boards.models import MemePost
         
         # S3 스토리지 인스턴스
-        storage = S3Storage()
+        storage = get_s3_storage()
         
         # 원본 이미지 업로드
         original_prefix = "memes/originals"
@@ -1349,7 +619,7 @@ def delete_meme_images(original_path: str, thumbnail_path: str) -> Dict[str, Any
         삭제 결과
     """
     try:
-        storage = S3Storage()
+        storage = get_s3_storage()
         
         # 원본 삭제
         original_result = delete_file_from_s3(original_path, storage)
@@ -3,14 +3,14 @@ Storage 앱의 뷰들
 """
 
 import logging
-import mimetypes
 import urllib.parse
 from django.http import HttpResponse, Http404, HttpResponseRedirect
 from django.views.decorators.cache import cache_control
 from django.views.decorators.vary import vary_on_headers
 from django.views.decorators.http import require_http_methods
 from django.conf import settings
-from .backends import S3Storage
+from .backends import get_s3_storage
+from .proxy import serve_s3_object
 
 logger = logging.getLogger(__name__)
 
@@ -85,6 +85,7 @@ def serve_s3_file(request, file_path):
     S3 파일을 안전하게 프록시하는 뷰
     AWS Access Key ID 등 민감한 정보 노출을 방지
     Referer 헤더 검증으로 핫링킹 방지
+    본문은 메모리에 모으지 않고 스트리밍하며 ETag 재검증(304)과 바이트 범위(206)를 지원
     """
     try:
         # Referer 헤더 검증 (핫링킹 방지)
@@ -100,35 +101,25 @@ def serve_s3_file(request, file_path):
         decoded_path = urllib.parse.unquote(file_path)
         logger.debug(f"S3 파일 요청: {decoded_path}")
         
-        # S3 스토리지 인스턴스 생성
-        storage = S3Storage()
+        # 프로세스 공유 S3 스토리지 (클라이언트/커넥션 풀 재사용)
+        storage = get_s3_storage()
         
-        # 파일 존재 확인
-        if not storage.exists(decoded_path):
-            logger.warning(f"S3 파일을 찾을 수 없음: {decoded_path}")
-            raise Http404("파일을 찾을 수 없습니다.")
-        
-        # 파일 내용 읽기
-        file_obj = storage._open(decoded_path)
-        file_content = file_obj.read()
-        
-        # Content-Type 추정
-        content_type = mimetypes.guess_type(decoded_path)[0] or 'application/octet-stream'
-        
-        # HTTP 응답 생성
-        response = HttpResponse(file_content, content_type=content_type)
+        # 디스크 캐시 또는 GetObject 한 번으로 스트리밍 (ETag/Range/If-None-Match 처리 포함)
+        response = serve_s3_object(request, storage, decoded_path)
         
         # 캐싱 헤더 설정
         response['Cache-Control'] = 'public, max-age=3600'
-        response['Content-Length'] = len(file_content)
         
         # 추가 보안 헤더
         response['X-Content-Type-Options'] = 'nosniff'
         response['X-Frame-Options'] = 'SAMEORIGIN'
         
-        logger.info(f"S3 파일 서빙 성공: {decoded_path} ({len(file_content)} bytes)")
+        logger.info(f"S3 파일 서빙: {decoded_path} ({response.status_code}, {response.get('Content-Length', 0)} bytes)")
         return response
         
+    except FileNotFoundError:
+        logger.warning(f"S3 파일을 찾을 수 없음: {file_path}")
+        raise Http404("파일을 찾을 수 없습니다.")
     except Http404:
         raise
     except Exception as e:
@@ -155,8 +146,8 @@ def serve_s3_file_redirect(request, file_path):
         # 파일 경로 디코딩
         decoded_path = urllib.parse.unquote(file_path)
         
-        # S3 스토리지 인스턴스 생성
-        storage = S3Storage()
+        # 프로세스 공유 S3 스토리지 (클라이언트/커넥션 풀 재사용)
+        storage = get_s3_storage()
         
         # 파일 존재 확인
         if not storage.exists(decoded_path):
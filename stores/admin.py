@@ -12,6 +12,8 @@ from .models import (
     BahPromotionAdmin,
     PROMOTION_STATUS_SHIPPED,
     BahPromotionLinkSettings,
+    EmailOutbox,
+    DailySalesRollup,
 )
 
 
@@ -350,6 +352,46 @@ class ReservedStoreIdAdmin(admin.ModelAdmin):
     list_per_page = 10
 
 
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ['id', 'store', 'kind', 'subject', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at']
+    list_filter = ['status', 'kind']
+    search_fields = ['store__store_id', 'subject', 'dedupe_key']
+    readonly_fields = ['store', 'kind', 'dedupe_key', 'to', 'subject', 'body', 'status', 'attempts', 'last_error', 'next_attempt_at', 'locked_at', 'created_at', 'sent_at']
+    exclude = ['attachments']
+    actions = ['retry_selected_emails']
+    list_per_page = 50
+
+    @admin.action(description='선택한 메일 다시 발송')
+    def retry_selected_emails(self, request, queryset):
+        count = queryset.exclude(status__in=[EmailOutbox.STATUS_SENDING, EmailOutbox.STATUS_SENT]).update(
+            status=EmailOutbox.STATUS_PENDING,
+            attempts=0,
+            next_attempt_at=None,
+            last_error='',
+        )
+        self.message_user(request, f'{count}건을 다시 발송 대기 상태로 되돌렸습니다.')
+
+
+@admin.register(DailySalesRollup)
+class DailySalesRollupAdmin(admin.ModelAdmin):
+    list_display = ['store', 'day', 'kind', 'item_id', 'channel', 'order_count', 'quantity', 'revenue', 'pending_shipment_count', 'updated_at']
+    list_filter = ['kind', 'day']
+    search_fields = ['store__store_id', 'channel']
+    readonly_fields = ['store', 'day', 'kind', 'item_id', 'channel', 'order_count', 'quantity', 'revenue', 'pending_shipment_count', 'updated_at']
+    actions = ['rebuild_selected_days']
+    list_per_page = 50
+
+    @admin.action(description='선택한 집계 다시 만들기')
+    def rebuild_selected_days(self, request, queryset):
+        from .sales_rollup import refresh_daily_sales
+
+        keys = set(queryset.values_list('store_id', 'kind', 'day'))
+        for store_id, kind, day in sorted(keys):
+            refresh_daily_sales(store_id, kind, day)
+        self.message_user(request, f'{len(keys)}일치 집계를 다시 만들었습니다.')
+
+
 # Admin 사이트 커스터마이징은 settings.py에서 통합 관리
 
 # 주의: Product, Order 관련 모델들은 각각 products, orders 앱에서 별도로 관리됩니다.
@@ -0,0 +1,67 @@
+"""스토어 자격 증명 복호화 캐시
+
+Blink API 키/월렛 ID/SMTP 비밀번호는 결제 상태 폴링과 이메일 발송마다 조회되는데,
+매번 Fernet 인스턴스를 새로 만들어 복호화하면 호출당 비용이 크다.
+
+- Fernet 인스턴스는 암호화 키별로 프로세스당 한 번만 만든다.
+- 복호화 결과는 ``(스토어 pk, 암호문 SHA-256)`` 키로 프로세스 내 LRU 에 보관한다.
+  암호문이 바뀌면 키도 바뀌므로 ``queryset.update()`` 로 갱신돼도 옛 값이 반환되지 않는다.
+- 스토어 저장/삭제 시(``stores.signals``) 해당 스토어 항목을 비운다.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from cryptography.fernet import Fernet
+from django.conf import settings
+
+DEFAULT_MAX_ENTRIES = 1024
+
+_lock = threading.Lock()
+_entries = OrderedDict()
+
+
+@lru_cache(maxsize=4)
+def get_fernet(key: bytes) -> Fernet:
+    """암호화 키별 Fernet 인스턴스 (프로세스당 한 번 생성)"""
+    return Fernet(key)
+
+
+def _max_entries() -> int:
+    return getattr(settings, 'STORE_CREDENTIAL_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)
+
+
+def _cache_key(store_pk, ciphertext: str):
+    return store_pk, hashlib.sha256(ciphertext.encode('utf-8')).hexdigest()
+
+
+def get_cached_credential(store_pk, ciphertext: str):
+    """캐시된 평문 (없으면 None)"""
+    key = _cache_key(store_pk, ciphertext)
+    with _lock:
+        plaintext = _entries.get(key)
+        if plaintext is not None:
+            _entries.move_to_end(key)
+        return plaintext
+
+
+def remember_credential(store_pk, ciphertext: str, plaintext: str):
+    key = _cache_key(store_pk, ciphertext)
+    max_entries = _max_entries()
+    with _lock:
+        _entries[key] = plaintext
+        _entries.move_to_end(key)
+        while len(_entries) > max_entries:
+            _entries.popitem(last=False)
+
+
+def invalidate_store_credentials(store_pk=None):
+    """스토어의 복호화 캐시 삭제 (인자가 없으면 전체)"""
+    with _lock:
+        if store_pk is None:
+            _entries.clear()
+            return
+        for key in [key for key in _entries if key[0] == store_pk]:
+            del _entries[key]
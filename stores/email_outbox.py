@@ -0,0 +1,316 @@
+"""스토어 이메일 발송 대기열
+
+주문/밋업/라이브 강의/파일 알림 메일과 송장 안내 메일은 요청이나 웹훅 처리 중에 SMTP 로
+바로 보내지 않는다. ``queue_store_email()`` 로 ``EmailOutbox`` 에 저장하고, 워커가 모아서 보낸다.
+
+- 한 배치 안에서 같은 스토어 메일은 SMTP 연결 하나로 보낸다. 로그인과 TLS 협상을 한 번만 한다.
+  Gmail 연결당 메시지 수 제한 때문에 ``MAX_MESSAGES_PER_CONNECTION`` 건마다 다시 연결한다.
+- 실패하면 ``RETRY_BACKOFF_SECONDS`` 간격으로 재시도한다. ``MAX_ATTEMPTS`` 회를 넘으면
+  ``failed`` 로 남긴다.
+- ``dedupe_key`` 가 같은 메일은 한 번만 대기열에 들어간다.
+- 전용 워커는 ``python manage.py run_email_outbox_worker`` 로 실행한다. 워커가 없어도 커밋
+  직후 같은 프로세스의 백그라운드 스레드가 한 번 발송을 시도한다.
+"""
+
+import base64
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.core.mail.backends.smtp import EmailBackend
+from django.db import IntegrityError, close_old_connections, transaction as db_transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import EmailOutbox, Store
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+RETRY_BACKOFF_SECONDS = (60, 300, 900, 3600)
+# 발송 중 상태로 이 시간 이상 남은 메일은 워커가 중단된 것으로 보고 다시 가져감
+STALE_LOCK_SECONDS = 600
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_POLL_INTERVAL_SECONDS = 2.0
+MAX_MESSAGES_PER_CONNECTION = 50
+
+_background_lock = threading.Lock()
+_background_thread = None
+
+
+@dataclass
+class OutboxResult:
+    sent: int = 0
+    failed: int = 0
+    connections: int = 0
+
+    @property
+    def handled(self) -> int:
+        return self.sent + self.failed
+
+
+def _background_delivery_enabled() -> bool:
+    return getattr(settings, 'STORE_EMAIL_OUTBOX_BACKGROUND', True)
+
+
+def store_email_configured(store) -> bool:
+    """스토어 SMTP 계정으로 메일을 보낼 수 있는지 여부"""
+    return bool(store.email_enabled and store.email_host_user and store.email_host_password_encrypted)
+
+
+def open_store_connection(store) -> EmailBackend:
+    """스토어 SMTP 계정으로 연결을 열어 반환 (호출자가 ``close()``)"""
+    connection = EmailBackend(
+        host=getattr(settings, 'STORE_EMAIL_SMTP_HOST', 'smtp.gmail.com'),
+        port=getattr(settings, 'STORE_EMAIL_SMTP_PORT', 587),
+        username=store.email_host_user,
+        password=store.get_email_host_password(),
+        use_tls=getattr(settings, 'STORE_EMAIL_SMTP_USE_TLS', True),
+        timeout=getattr(settings, 'STORE_EMAIL_SMTP_TIMEOUT', 30),
+        fail_silently=False,
+    )
+    connection.open()
+    return connection
+
+
+def _encode_attachments(message):
+    encoded = []
+    for attachment in message.attachments:
+        filename, content, mimetype = attachment
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        encoded.append({
+            'filename': filename,
+            'content': base64.b64encode(content).decode('ascii'),
+            'mimetype': mimetype,
+        })
+    return encoded
+
+
+def queue_store_email(store, message, *, kind='', dedupe_key=None):
+    """``EmailMessage`` 를 스토어 발송 대기열에 추가
+
+    발신 주소와 연결은 발송 시점에 스토어 설정으로 정한다.
+
+    Returns:
+        EmailOutbox | None: 같은 ``dedupe_key`` 로 이미 추가된 메일이면 None
+    """
+    recipients = [address for address in message.to if address]
+    if not recipients:
+        raise ValueError('수신 주소가 없습니다.')
+
+    try:
+        with db_transaction.atomic():
+            email = EmailOutbox.objects.create(
+                store=store,
+                kind=kind,
+                dedupe_key=dedupe_key,
+                to=recipients,
+                subject=message.subject,
+                body=message.body,
+                attachments=_encode_attachments(message),
+            )
+    except IntegrityError:
+        logger.debug('이미 대기열에 있는 메일 dedupe_key=%s', dedupe_key)
+        return None
+
+    db_transaction.on_commit(request_background_delivery)
+    return email
+
+
+def build_message(email, store, connection=None) -> EmailMessage:
+    message = EmailMessage(
+        subject=email.subject,
+        body=email.body,
+        from_email=f'{store.email_from_display} <{store.email_host_user}>',
+        to=email.to,
+        connection=connection,
+    )
+    for attachment in email.attachments or []:
+        message.attach(attachment['filename'], base64.b64decode(attachment['content']), attachment['mimetype'])
+    return message
+
+
+def _claimable_emails(now, limit):
+    stale_before = now - timedelta(seconds=STALE_LOCK_SECONDS)
+    EmailOutbox.objects.filter(
+        status=EmailOutbox.STATUS_SENDING,
+        locked_at__lt=stale_before,
+    ).update(status=EmailOutbox.STATUS_PENDING)
+
+    return list(
+        EmailOutbox.objects.filter(status=EmailOutbox.STATUS_PENDING)
+        .exclude(next_attempt_at__gt=now)
+        .order_by('id')[:limit]
+    )
+
+
+def _claim(email, now) -> bool:
+    claimed = EmailOutbox.objects.filter(pk=email.pk, status=EmailOutbox.STATUS_PENDING).update(
+        status=EmailOutbox.STATUS_SENDING,
+        locked_at=now,
+        attempts=F('attempts') + 1,
+    )
+    if claimed:
+        email.attempts += 1
+    return bool(claimed)
+
+
+def _mark_sent(email):
+    EmailOutbox.objects.filter(pk=email.pk).update(
+        status=EmailOutbox.STATUS_SENT,
+        sent_at=timezone.now(),
+        next_attempt_at=None,
+        last_error='',
+        locked_at=None,
+    )
+
+
+def _mark_retry(email, error, *, permanent=False):
+    if permanent or email.attempts >= MAX_ATTEMPTS:
+        status, next_attempt_at = EmailOutbox.STATUS_FAILED, None
+    else:
+        backoff = RETRY_BACKOFF_SECONDS[min(email.attempts, len(RETRY_BACKOFF_SECONDS)) - 1]
+        status, next_attempt_at = EmailOutbox.STATUS_PENDING, timezone.now() + timedelta(seconds=backoff)
+    EmailOutbox.objects.filter(pk=email.pk).update(
+        status=status,
+        next_attempt_at=next_attempt_at,
+        last_error=str(error)[:2000],
+        locked_at=None,
+    )
+
+
+def _close(connection):
+    if connection is None:
+        return
+    try:
+        connection.close()
+    except Exception:  # pylint: disable=broad-except
+        pass
+
+
+def _deliver_store_batch(store, emails, result):
+    """한 스토어의 메일을 연결 하나(최대 ``MAX_MESSAGES_PER_CONNECTION`` 건)로 발송"""
+    if store is None or not store_email_configured(store):
+        for email in emails:
+            _mark_retry(email, '스토어 이메일 설정이 없거나 비활성화되었습니다.', permanent=True)
+            result.failed += 1
+        return
+
+    connection = None
+    sent_on_connection = 0
+    try:
+        for index, email in enumerate(emails):
+            if connection is None or sent_on_connection >= MAX_MESSAGES_PER_CONNECTION:
+                _close(connection)
+                try:
+                    connection = open_store_connection(store)
+                except Exception as exc:  # pylint: disable=broad-except
+                    # 로그인/연결 실패는 남은 메일 모두에 해당하므로 이번 배치에서는 더 연결하지 않고
+                    # 남은 메일을 백오프 뒤 재시도로 미룸 (일시적인 SMTP 장애 대비)
+                    logger.error('스토어 SMTP 연결 실패 store=%s: %s', store.store_id, exc)
+                    connection = None
+                    for remaining in emails[index:]:
+                        _mark_retry(remaining, exc)
+                        result.failed += 1
+                    return
+                result.connections += 1
+                sent_on_connection = 0
+
+            try:
+                build_message(email, store, connection).send()
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.warning('메일 발송 실패 outbox=%s store=%s: %s', email.pk, store.store_id, exc)
+                _mark_retry(email, exc)
+                result.failed += 1
+                # 연결 상태를 알 수 없으므로 다음 메일은 새 연결로 보냄
+                _close(connection)
+                connection = None
+                continue
+
+            sent_on_connection += 1
+            _mark_sent(email)
+            result.sent += 1
+    finally:
+        _close(connection)
+
+
+def deliver_pending(limit=DEFAULT_BATCH_SIZE, now=None) -> OutboxResult:
+    """발송 가능한 메일을 최대 ``limit`` 건 가져와 스토어별로 묶어 발송"""
+    result = OutboxResult()
+    now = now or timezone.now()
+
+    by_store = OrderedDict()
+    for email in _claimable_emails(now, limit):
+        if _claim(email, now):
+            by_store.setdefault(email.store_id, []).append(email)
+    if not by_store:
+        return result
+
+    stores = Store.objects.in_bulk(list(by_store))
+    for store_id, emails in by_store.items():
+        _deliver_store_batch(stores.get(store_id), emails, result)
+    return result
+
+
+def _run_background_delivery():
+    global _background_thread
+    try:
+        while deliver_pending().handled:
+            pass
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.error('이메일 대기열 백그라운드 발송 실패: %s', exc, exc_info=True)
+    finally:
+        close_old_connections()
+        with _background_lock:
+            _background_thread = None
+
+
+def request_background_delivery() -> bool:
+    """현재 프로세스의 백그라운드 스레드에 대기열 발송을 맡김 (이미 실행 중이면 건너뜀)"""
+    global _background_thread
+    if not _background_delivery_enabled():
+        return False
+    with _background_lock:
+        if _background_thread is not None:
+            return False
+        _background_thread = threading.Thread(
+            target=_run_background_delivery,
+            name='email-outbox',
+            daemon=True,
+        )
+        _background_thread.start()
+    return True
+
+
+def run_worker(interval=DEFAULT_POLL_INTERVAL_SECONDS, stop_event=None, max_iterations=None, on_result=None, batch_size=DEFAULT_BATCH_SIZE):
+    """대기열 발송 루프 (``run_email_outbox_worker`` 관리 명령에서 사용)
+
+    보낼 메일이 남아 있으면 쉬지 않고 다음 배치를 가져온다.
+    """
+    stop_event = stop_event or threading.Event()
+    iterations = 0
+
+    while not stop_event.is_set():
+        started_at = time.monotonic()
+        try:
+            result = deliver_pending(limit=batch_size)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error('이메일 대기열 워커 오류: %s', exc, exc_info=True)
+            result = OutboxResult()
+        finally:
+            close_old_connections()
+
+        if on_result:
+            on_result(result, time.monotonic() - started_at)
+
+        iterations += 1
+        if max_iterations is not None and iterations >= max_iterations:
+            break
+        if result.handled < batch_size:
+            stop_event.wait(interval)
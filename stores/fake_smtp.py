@@ -0,0 +1,231 @@
+"""로컬 SMTP 수신 서버 (sink)
+
+테스트와 벤치마크에서 Gmail SMTP 대신 사용한다. 받은 메일을 버리지 않고 ``messages`` 에
+쌓는다. 연결 수, 로그인 수, 메일 수를 세어 ``email_outbox`` 워커의 연결 재사용을 확인할 수 있다.
+STARTTLS 는 지원하지 않으므로 ``STORE_EMAIL_SMTP_USE_TLS=False`` 로 사용한다.
+
+사용 예::
+
+    with FakeSMTPServer(latency=0.05) as server:
+        with override_settings(STORE_EMAIL_SMTP_HOST=server.host, STORE_EMAIL_SMTP_PORT=server.port,
+                               STORE_EMAIL_SMTP_USE_TLS=False):
+            deliver_pending()
+        server.connection_count, server.message_count
+"""
+
+import base64
+import socketserver
+import threading
+import time
+from dataclasses import dataclass, field
+from email import message_from_bytes
+from email.policy import default as default_policy
+
+
+@dataclass
+class ReceivedMessage:
+    username: str
+    mail_from: str
+    recipients: list = field(default_factory=list)
+    data: bytes = b''
+
+    def parsed(self):
+        return message_from_bytes(self.data, policy=default_policy)
+
+
+class _FakeSMTPHandler(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connection_count += 1
+
+    def _reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def _readline(self):
+        line = self.rfile.readline()
+        if not line:
+            raise ConnectionError
+        return line.decode('utf-8', 'replace').rstrip('\r\n')
+
+    def handle(self):
+        fake = self.server.fake
+        username = ''
+        mail_from = None
+        recipients = []
+        if fake.connect_latency:
+            time.sleep(fake.connect_latency)
+        self._reply('220 fake-smtp ready')
+        try:
+            while True:
+                line = self._readline()
+                command, _, argument = line.partition(' ')
+                command = command.upper()
+
+                if command in ('EHLO', 'HELO'):
+                    if command == 'EHLO':
+                        self.wfile.write(b'250-fake-smtp\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n')
+                    else:
+                        self._reply('250 fake-smtp')
+                elif command == 'AUTH':
+                    username = self._authenticate(argument)
+                    if username is None:
+                        self._reply('535 5.7.8 Authentication failed')
+                        continue
+                    with self.server.lock:
+                        self.server.login_count += 1
+                    self._reply('235 2.7.0 Authentication successful')
+                elif command == 'MAIL':
+                    mail_from = argument.split(':', 1)[-1].strip().strip('<>').split('>')[0]
+                    recipients = []
+                    self._reply('250 OK')
+                elif command == 'RCPT':
+                    recipients.append(argument.split(':', 1)[-1].strip().strip('<>'))
+                    self._reply('250 OK')
+                elif command == 'DATA':
+                    self._reply('354 End data with <CR><LF>.<CR><LF>')
+                    data = self._read_data()
+                    if fake.latency:
+                        time.sleep(fake.latency)
+                    if fake.take_failure():
+                        self._reply('451 4.3.0 Temporary failure')
+                        continue
+                    with self.server.lock:
+                        self.server.messages.append(ReceivedMessage(username, mail_from, recipients, data))
+                    self._reply('250 OK queued')
+                elif command == 'RSET':
+                    mail_from, recipients = None, []
+                    self._reply('250 OK')
+                elif command == 'NOOP':
+                    self._reply('250 OK')
+                elif command == 'QUIT':
+                    self._reply('221 Bye')
+                    return
+                else:
+                    self._reply('502 5.5.2 Command not implemented')
+        except (ConnectionError, OSError):
+            return
+
+    def _authenticate(self, argument):
+        fake = self.server.fake
+        mechanism, _, initial = argument.partition(' ')
+        mechanism = mechanism.upper()
+        if mechanism == 'PLAIN':
+            if not initial:
+                self._reply('334 ')
+                initial = self._readline()
+            _, username, password = base64.b64decode(initial).decode().split('\0')
+        elif mechanism == 'LOGIN':
+            if initial:
+                username = base64.b64decode(initial).decode()
+            else:
+                self._reply('334 VXNlcm5hbWU6')
+                username = base64.b64decode(self._readline()).decode()
+            self._reply('334 UGFzc3dvcmQ6')
+            password = base64.b64decode(self._readline()).decode()
+        else:
+            return None
+
+        if fake.password is not None and password != fake.password:
+            return None
+        return username
+
+    def _read_data(self):
+        lines = []
+        while True:
+            line = self.rfile.readline()
+            if not line or line in (b'.\r\n', b'.\n'):
+                break
+            if line.startswith(b'..'):
+                line = line[1:]
+            lines.append(line)
+        return b''.join(lines)
+
+
+class _ThreadingSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class FakeSMTPServer:
+    """받은 메일을 메모리에 쌓는 스레드 기반 SMTP 서버
+
+    Args:
+        password: 허용할 비밀번호 (None 이면 모두 허용)
+        latency: 메일(DATA)마다 추가할 지연(초)
+        connect_latency: 연결마다 추가할 지연(초, TLS 협상/로그인 비용 흉내)
+    """
+
+    def __init__(self, password=None, latency=0.0, connect_latency=0.0):
+        self.password = password
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self._failures = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        self._server = _ThreadingSMTPServer(('127.0.0.1', 0), _FakeSMTPHandler)
+        self._server.fake = self
+        self._server.lock = threading.Lock()
+        self._server.connection_count = 0
+        self._server.login_count = 0
+        self._server.messages = []
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-smtp', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def fail_next(self, count=1):
+        """다음 ``count`` 건의 메일을 451(일시 오류)로 거절"""
+        with self._lock:
+            self._failures += count
+
+    def take_failure(self) -> bool:
+        with self._lock:
+            if self._failures:
+                self._failures -= 1
+                return True
+        return False
+
+    @property
+    def host(self):
+        return self._server.server_address[0]
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    @property
+    def connection_count(self):
+        return self._server.connection_count
+
+    @property
+    def login_count(self):
+        return self._server.login_count
+
+    @property
+    def messages(self):
+        return list(self._server.messages)
+
+    @property
+    def message_count(self):
+        return len(self._server.messages)
+
+    def reset_counters(self):
+        with self._server.lock:
+            self._server.connection_count = 0
+            self._server.login_count = 0
+            self._server.messages = []
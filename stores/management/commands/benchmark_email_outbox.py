@@ -0,0 +1,122 @@
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.mail import EmailMessage
+from django.core.management.base import BaseCommand
+from django.db import transaction as db_transaction
+from django.test import override_settings
+
+from stores.email_outbox import deliver_pending, open_store_connection, queue_store_email
+from stores.fake_smtp import FakeSMTPServer
+from stores.models import EmailOutbox, Store
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = '로컬 SMTP 서버로 메일별 새 연결(변경 전)과 대기열 워커(연결 재사용)의 발송 처리량을 비교합니다 (모든 데이터는 롤백)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=200, help='보낼 메일 수 (기본 200)')
+        parser.add_argument('--stores', type=int, default=4, help='메일을 나눠 보낼 스토어 수 (기본 4)')
+        parser.add_argument(
+            '--connect-latency-ms',
+            type=float,
+            default=150.0,
+            help='SMTP 연결마다 추가할 지연(ms, TLS 협상/로그인 비용 흉내, 기본 150)',
+        )
+        parser.add_argument('--message-latency-ms', type=float, default=5.0, help='메일마다 추가할 지연(ms, 기본 5)')
+
+    def handle(self, *args, **options):
+        server = FakeSMTPServer(
+            latency=options['message_latency_ms'] / 1000,
+            connect_latency=options['connect_latency_ms'] / 1000,
+        ).start()
+        try:
+            with override_settings(
+                STORE_EMAIL_SMTP_HOST=server.host,
+                STORE_EMAIL_SMTP_PORT=server.port,
+                STORE_EMAIL_SMTP_USE_TLS=False,
+                STORE_EMAIL_OUTBOX_BACKGROUND=False,
+            ):
+                try:
+                    with db_transaction.atomic():
+                        self._run(server, options['messages'], options['stores'])
+                        raise _Rollback()
+                except _Rollback:
+                    pass
+        finally:
+            server.stop()
+
+    def _prepare(self, message_count, store_count):
+        suffix = uuid.uuid4().hex[:8]
+        stores = []
+        for index in range(store_count):
+            owner = User.objects.create_user(username=f'bench-{suffix}-{index}')
+            store = Store(
+                store_id=f'bench{suffix}{index}',
+                store_name=f'벤치마크 스토어 {index}',
+                owner_name='벤치마크',
+                owner_email=f'owner{index}@example.com',
+                chat_channel='https://t.me/example',
+                owner=owner,
+                email_enabled=True,
+                email_host_user=f'store{index}@example.com',
+            )
+            store.set_email_host_password('app-password')
+            store.save()
+            stores.append(store)
+
+        return [
+            (
+                stores[index % store_count],
+                EmailMessage(
+                    subject=f'[벤치마크] 주문 {index}',
+                    body='주문 알림 본문\n' * 20,
+                    to=[stores[index % store_count].owner_email],
+                ),
+            )
+            for index in range(message_count)
+        ]
+
+    def _report(self, label, server, elapsed, message_count):
+        self.stdout.write(self.style.SUCCESS(f'\n▶ {label}'))
+        self.stdout.write(
+            f'  {message_count}건 {elapsed:.2f}초 ({message_count / elapsed:.1f}건/초), '
+            f'SMTP 연결 {server.connection_count}회, 로그인 {server.login_count}회, 수신 {server.message_count}건'
+        )
+
+    def _run(self, server, message_count, store_count):
+        messages = self._prepare(message_count, store_count)
+
+        # 변경 전: 메일마다 새 EmailBackend 로 연결/로그인 후 발송
+        server.reset_counters()
+        started_at = time.perf_counter()
+        for store, message in messages:
+            connection = open_store_connection(store)
+            try:
+                message.connection = connection
+                message.send()
+            finally:
+                connection.close()
+        self._report('메일별 새 연결 (변경 전)', server, time.perf_counter() - started_at, message_count)
+
+        # 변경 후: 대기열에 넣는 시간(요청 안에서 드는 비용)과 워커 발송 시간을 따로 측정
+        server.reset_counters()
+        started_at = time.perf_counter()
+        for store, message in messages:
+            message.connection = None
+            queue_store_email(store, message, kind='benchmark')
+        queued_elapsed = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        while deliver_pending().handled:
+            pass
+        self._report('대기열 워커 (변경 후)', server, time.perf_counter() - started_at, message_count)
+        self.stdout.write(f'  요청 안 대기열 추가 {queued_elapsed / message_count * 1000:.2f}ms/건')
+
+        sent = EmailOutbox.objects.filter(kind='benchmark', status=EmailOutbox.STATUS_SENT).count()
+        self.stdout.write(f'  발송 완료 {sent}/{message_count}건')
@@ -0,0 +1,61 @@
+import time
+
+from cryptography.fernet import Fernet
+from django.core.management.base import BaseCommand
+
+from stores.credential_cache import invalidate_store_credentials
+from stores.models import Store
+
+
+class Command(BaseCommand):
+    help = '스토어 자격 증명(Blink API 키/월렛 ID/SMTP 비밀번호) 조회의 호출당 비용을 캐시 전후로 비교합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=5000, help='측정 횟수 (기본 5000)')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+
+        # DB 없이 측정하도록 저장하지 않은 인스턴스에 pk 만 지정
+        store = Store(pk=-1, store_id='benchmark', store_name='benchmark')
+        store.set_blink_api_info('blink_' + 'k' * 64)
+        store.set_blink_wallet_id('wallet-' + 'w' * 30)
+        store.set_email_host_password('app-password-1234')
+        getters = (store.get_blink_api_info, store.get_blink_wallet_id, store.get_email_host_password)
+        ciphertexts = (
+            store.blink_api_info_encrypted,
+            store.blink_wallet_id_encrypted,
+            store.email_host_password_encrypted,
+        )
+
+        def legacy_lookup():
+            # 변경 전: 호출마다 키 유도 + Fernet 생성 + 복호화
+            for ciphertext in ciphertexts:
+                Fernet(store._get_encryption_key()).decrypt(ciphertext.encode('utf-8')).decode('utf-8')
+
+        def cold_lookup():
+            invalidate_store_credentials(store.pk)
+            for getter in getters:
+                getter()
+
+        def cached_lookup():
+            for getter in getters:
+                getter()
+
+        invalidate_store_credentials(store.pk)
+        results = []
+        for label, func in (
+            ('변경 전 (매번 Fernet 생성)', legacy_lookup),
+            ('캐시 미스 (Fernet 재사용)', cold_lookup),
+            ('캐시 히트', cached_lookup),
+        ):
+            func()
+            started_at = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            per_call = (time.perf_counter() - started_at) / (iterations * len(getters))
+            results.append(per_call)
+            self.stdout.write(f'  {label:<24} {per_call * 1_000_000:8.2f}µs/조회')
+
+        invalidate_store_credentials(store.pk)
+        self.stdout.write(self.style.SUCCESS(f'✅ 캐시 히트는 변경 전 대비 약 {results[0] / results[2]:.0f}배 빠릅니다.'))
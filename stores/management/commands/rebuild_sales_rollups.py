@@ -0,0 +1,53 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from stores.models import DailySalesRollup, Store
+from stores.sales_rollup import rebuild_store_sales
+
+
+def _parse_day(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f'날짜 형식이 올바르지 않습니다 (YYYY-MM-DD): {value}')
+
+
+class Command(BaseCommand):
+    help = '주문 원본에서 스토어 일별 판매 집계(DailySalesRollup)를 다시 만듭니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--store', action='append', dest='stores', help='스토어 ID (여러 번 지정 가능, 기본 전체)')
+        parser.add_argument(
+            '--kind',
+            action='append',
+            dest='kinds',
+            choices=[kind for kind, _ in DailySalesRollup.KIND_CHOICES],
+            help='집계 종류 (여러 번 지정 가능, 기본 전체)',
+        )
+        parser.add_argument('--since', help='시작일 YYYY-MM-DD (포함, 기본 제한 없음)')
+        parser.add_argument('--until', help='종료일 YYYY-MM-DD (포함, 기본 제한 없음)')
+
+    def handle(self, *args, **options):
+        since = _parse_day(options['since']) if options['since'] else None
+        until = _parse_day(options['until']) if options['until'] else None
+        if since and until and since > until:
+            raise CommandError('시작일이 종료일보다 늦습니다.')
+
+        stores = Store.objects.order_by('pk')
+        if options['stores']:
+            stores = stores.filter(store_id__in=options['stores'])
+
+        started_at = time.perf_counter()
+        store_count = row_count = 0
+        for store_pk, store_id in list(stores.values_list('pk', 'store_id')):
+            written = rebuild_store_sales(store_pk, kinds=options['kinds'], since=since, until=until)
+            store_count += 1
+            row_count += written
+            if written:
+                self.stdout.write(f'  {store_id}: {written}행')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ 스토어 {store_count}곳, 집계 {row_count}행 재생성 ({time.perf_counter() - started_at:.1f}초)'
+        ))
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.2 on 2026-10-18 13:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0033_storefeatureditem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(blank=True, help_text='이메일 종류 (예: order_owner_notification)', max_length=50)),
+                ('dedupe_key', models.CharField(blank=True, help_text='같은 키의 이메일은 한 번만 대기열에 추가', max_length=200, null=True, unique=True)),
+                ('to', models.JSONField(default=list, help_text='수신 주소 목록')),
+                ('subject', models.CharField(max_length=500)),
+                ('body', models.TextField()),
+                ('attachments', models.JSONField(blank=True, default=list, help_text='첨부파일 (파일명/base64 내용/MIME 타입)')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('sending', '발송 중'), ('sent', '발송 완료'), ('failed', '실패')], default='pending', max_length=20)),
+                ('attempts', models.PositiveSmallIntegerField(default=0, help_text='발송 시도 횟수')),
+                ('last_error', models.TextField(blank=True)),
+                ('next_attempt_at', models.DateTimeField(blank=True, null=True)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('store', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outbox_emails', to='stores.store')),
+            ],
+            options={
+                'verbose_name': '이메일 발송 대기열',
+                'verbose_name_plural': '이메일 발송 대기열',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='stores_outbox_status_next_idx'), models.Index(fields=['store', 'status'], name='stores_outbox_store_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.2 on 2026-10-18 13:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0034_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(help_text='주문 생성일 (현지 시간 기준)')),
+                ('kind', models.CharField(choices=[('product', '상품'), ('meetup', '밋업'), ('live_lecture', '라이브 강의'), ('file', '디지털 파일'), ('menu', '메뉴')], max_length=20)),
+                ('item_id', models.PositiveIntegerField(help_text='상품/밋업/강의/파일/메뉴 ID (0 은 스토어 합계)')),
+                ('channel', models.SlugField(blank=True, help_text='주문 유입 채널 (상품 주문만)')),
+                ('order_count', models.PositiveIntegerField(default=0)),
+                ('quantity', models.PositiveIntegerField(default=0)),
+                ('revenue', models.PositiveBigIntegerField(default=0, help_text='사토시 단위')),
+                ('pending_shipment_count', models.PositiveIntegerField(default=0, help_text='송장 미입력 주문 수 (상품 주문만)')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('store', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='stores.store')),
+            ],
+            options={
+                'verbose_name': '일별 판매 집계',
+                'verbose_name_plural': '일별 판매 집계',
+                'ordering': ['-day'],
+                'constraints': [models.UniqueConstraint(fields=('store', 'kind', 'day', 'item_id', 'channel'), name='stores_daily_sales_unique')],
+            },
+        ),
+    ]
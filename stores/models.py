@@ -1,12 +1,12 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import RegexValidator
-from cryptography.fernet import Fernet
 from django.conf import settings
 from django.utils import timezone
 import os
 import base64
 from .constants import FEATURE_ITEM_TYPE_CHOICES
+from .credential_cache import get_cached_credential, get_fernet, remember_credential
 
 
 MAX_PROMOTION_IMAGES = 4
@@ -222,8 +222,7 @@ class Store(models.Model):
             return ""
         
         try:
-            key = self._get_encryption_key()
-            fernet = Fernet(key)
+            fernet = get_fernet(self._get_encryption_key())
             encrypted_data = fernet.encrypt(data.encode('utf-8'))
             return encrypted_data.decode('utf-8')
         except Exception as e:
@@ -237,8 +236,7 @@ class Store(models.Model):
             return ""
         
         try:
-            key = self._get_encryption_key()
-            fernet = Fernet(key)
+            fernet = get_fernet(self._get_encryption_key())
             decrypted_data = fernet.decrypt(encrypted_data.encode('utf-8'))
             return decrypted_data.decode('utf-8')
         except Exception as e:
@@ -251,20 +249,33 @@ class Store(models.Model):
         """블링크 API 정보 암호화 저장"""
         self.blink_api_info_encrypted = self.encrypt_data(api_info)
     
-    def get_blink_api_info(self):
-        """블링크 API 정보 가져오기"""
-        if not self.blink_api_info_encrypted:
+    def _get_decrypted_field(self, encrypted_value, label):
+        """암호화 필드 복호화 (스토어 pk + 암호문 해시 기준 프로세스 캐시 사용)"""
+        if not encrypted_value:
             return ""
-        
+
+        if self.pk:
+            cached = get_cached_credential(self.pk, encrypted_value)
+            if cached is not None:
+                return cached
+
         # 암호화된 데이터인지 평문인지 확인
         try:
             # 암호화된 데이터라면 복호화 시도
-            return self.decrypt_data(self.blink_api_info_encrypted)
+            plaintext = self.decrypt_data(encrypted_value)
         except:
             # 복호화 실패시 평문으로 간주하여 그대로 반환 (기존 데이터 호환성)
             if settings.DEBUG:
-                print(f"DEBUG: API 정보 복호화 실패 - 평문으로 간주")
-            return self.blink_api_info_encrypted
+                print(f"DEBUG: {label} 복호화 실패 - 평문으로 간주")
+            plaintext = encrypted_value
+
+        if self.pk:
+            remember_credential(self.pk, encrypted_value, plaintext)
+        return plaintext
+    
+    def get_blink_api_info(self):
+        """블링크 API 정보 가져오기"""
+        return self._get_decrypted_field(self.blink_api_info_encrypted, 'API 정보')
     
     def set_blink_wallet_id(self, wallet_id):
         """블링크 월렛 ID 암호화 저장"""
@@ -272,18 +283,7 @@ class Store(models.Model):
     
     def get_blink_wallet_id(self):
         """블링크 월렛 ID 가져오기"""
-        if not self.blink_wallet_id_encrypted:
-            return ""
-        
-        # 암호화된 데이터인지 평문인지 확인
-        try:
-            # 암호화된 데이터라면 복호화 시도
-            return self.decrypt_data(self.blink_wallet_id_encrypted)
-        except:
-            # 복호화 실패시 평문으로 간주하여 그대로 반환 (기존 데이터 호환성)
-            if settings.DEBUG:
-                print(f"DEBUG: 월렛 ID 복호화 실패 - 평문으로 간주")
-            return self.blink_wallet_id_encrypted
+        return self._get_decrypted_field(self.blink_wallet_id_encrypted, '월렛 ID')
     
     def set_email_host_password(self, password):
         """Gmail 앱 비밀번호 암호화 저장"""
@@ -291,16 +291,7 @@ class Store(models.Model):
     
     def get_email_host_password(self):
         """Gmail 앱 비밀번호 가져오기"""
-        if not self.email_host_password_encrypted:
-            return ""
-
-        try:
-            return self.decrypt_data(self.email_host_password_encrypted)
-        except:
-            # 복호화 실패시 평문으로 간주하여 그대로 반환 (기존 데이터 호환성)
-            if settings.DEBUG:
-                print(f"DEBUG: 이메일 비밀번호 복호화 실패 - 평문으로 간주")
-            return self.email_host_password_encrypted
+        return self._get_decrypted_field(self.email_host_password_encrypted, '이메일 비밀번호')
 
     # =====================
     # 배송비 관련 유틸
@@ -511,6 +502,8 @@ class StoreImage(models.Model):
     # 이미지 크기 정보
     width = models.PositiveIntegerField(default=1000, verbose_name='이미지 너비')
     height = models.PositiveIntegerField(default=563, verbose_name='이미지 높이')  # 16:9 비율
+    # 반응형 변형 [{width, height, file_path, file_url, file_size}, ...] (storage.image_derivatives)
+    variants = models.JSONField(default=list, blank=True, verbose_name='반응형 변형')
     
     # 순서 정보 (이미지 정렬용)
     order = models.PositiveIntegerField(default=0, verbose_name='정렬 순서')
@@ -697,3 +690,100 @@ class BahPromotionAdmin(models.Model):
 
     def __str__(self):
         return self.user.username
+
+
+class EmailOutbox(models.Model):
+    """스토어 SMTP 계정으로 보낼 이메일 발송 대기열 (발송은 ``email_outbox`` 워커가 담당)"""
+
+    STATUS_PENDING = 'pending'
+    STATUS_SENDING = 'sending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, '대기'),
+        (STATUS_SENDING, '발송 중'),
+        (STATUS_SENT, '발송 완료'),
+        (STATUS_FAILED, '실패'),
+    ]
+
+    store = models.ForeignKey(Store, on_delete=models.CASCADE, related_name='outbox_emails')
+    kind = models.CharField(max_length=50, blank=True, help_text='이메일 종류 (예: order_owner_notification)')
+    dedupe_key = models.CharField(
+        max_length=200,
+        unique=True,
+        null=True,
+        blank=True,
+        help_text='같은 키의 이메일은 한 번만 대기열에 추가',
+    )
+    to = models.JSONField(default=list, help_text='수신 주소 목록')
+    subject = models.CharField(max_length=500)
+    body = models.TextField()
+    attachments = models.JSONField(default=list, blank=True, help_text='첨부파일 (파일명/base64 내용/MIME 타입)')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0, help_text='발송 시도 횟수')
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = '이메일 발송 대기열'
+        verbose_name_plural = '이메일 발송 대기열'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='stores_outbox_status_next_idx'),
+            models.Index(fields=['store', 'status'], name='stores_outbox_store_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.store.store_name} - {self.subject} ({self.get_status_display()})"
+
+
+class DailySalesRollup(models.Model):
+    """스토어/판매 항목/일자별 판매 집계 (대시보드 조회용, ``sales_rollup`` 모듈이 갱신)
+
+    ``item_id`` 가 0 인 행은 해당 종류의 스토어 합계(주문 단위)입니다.
+    """
+
+    KIND_PRODUCT = 'product'
+    KIND_MEETUP = 'meetup'
+    KIND_LIVE_LECTURE = 'live_lecture'
+    KIND_FILE = 'file'
+    KIND_MENU = 'menu'
+
+    KIND_CHOICES = [
+        (KIND_PRODUCT, '상품'),
+        (KIND_MEETUP, '밋업'),
+        (KIND_LIVE_LECTURE, '라이브 강의'),
+        (KIND_FILE, '디지털 파일'),
+        (KIND_MENU, '메뉴'),
+    ]
+
+    STORE_TOTAL_ITEM_ID = 0
+
+    store = models.ForeignKey(Store, on_delete=models.CASCADE, related_name='daily_sales')
+    day = models.DateField(help_text='주문 생성일 (현지 시간 기준)')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    item_id = models.PositiveIntegerField(help_text='상품/밋업/강의/파일/메뉴 ID (0 은 스토어 합계)')
+    channel = models.SlugField(max_length=50, blank=True, help_text='주문 유입 채널 (상품 주문만)')
+    order_count = models.PositiveIntegerField(default=0)
+    quantity = models.PositiveIntegerField(default=0)
+    revenue = models.PositiveBigIntegerField(default=0, help_text='사토시 단위')
+    pending_shipment_count = models.PositiveIntegerField(default=0, help_text='송장 미입력 주문 수 (상품 주문만)')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = '일별 판매 집계'
+        verbose_name_plural = '일별 판매 집계'
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['store', 'kind', 'day', 'item_id', 'channel'],
+                name='stores_daily_sales_unique',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.store_id} {self.day} {self.kind}#{self.item_id}"
@@ -7,8 +7,8 @@ from typing import Iterable, List
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import UploadedFile
 from django.db import transaction
-from PIL import Image
 
+from storage.image_derivatives import probe_size
 from storage.utils import delete_file_from_s3, upload_file_to_s3
 
 from .models import BahPromotionImage, BahPromotionRequest
@@ -26,25 +26,11 @@ class PromotionImagePayload:
 
 
 def _prepare_image(uploaded_file: UploadedFile) -> PromotionImagePayload:
-    """원본 이미지를 그대로 업로드하면서 메타데이터를 추출한다."""
-    try:
-        uploaded_file.seek(0)
-    except (AttributeError, OSError):
-        pass
-
-    width = 0
-    height = 0
+    """원본 이미지를 그대로 업로드하면서 메타데이터를 추출한다.
 
-    try:
-        image = Image.open(uploaded_file)
-        width, height = image.size
-    except Exception as exc:  # pragma: no cover - Pillow가 다양한 예외 발생
-        logger.warning("BAH 홍보 이미지 메타데이터 추출 실패: %s", exc)
-    finally:
-        try:
-            uploaded_file.seek(0)
-        except (AttributeError, OSError):
-            pass
+    홍보 이미지는 원본을 보존하므로 파생본을 만들지 않고, 헤더만 읽어 EXIF 회전을 반영한 크기를 쓴다.
+    """
+    width, height = probe_size(uploaded_file)
 
     return PromotionImagePayload(
         original_name=uploaded_file.name,
@@ -0,0 +1,405 @@
+"""스토어 일별 판매 집계
+
+판매자 대시보드(주문 관리, 밋업 현황, 채널 판매 목록)는 주문 원본을 매번 집계하지 않고
+``DailySalesRollup`` 의 (스토어, 종류, 일자, 항목, 채널) 행을 합산한다. 조회 비용이 주문 수가
+아니라 일수에 비례한다.
+
+- 주문 저장/삭제 시그널이 (스토어, 종류, 주문 생성일) 을 표시해 두고, 커밋 직후 그 하루만 원본에서
+  다시 집계한다. 한 트랜잭션 안에서 여러 번 저장돼도 하루당 한 번만 다시 집계한다.
+- 다시 집계는 PostgreSQL advisory lock 으로 (스토어, 종류, 일자) 단위로만 직렬화한다. 같은 스토어의
+  다른 날짜/종류 집계나 ``Store`` 저장과는 기다리지 않는다. 기간 전체를 다시 만들 때는 (스토어, 종류)
+  잠금을 배타적으로 잡는다.
+- 하루 단위로 통째로 다시 쓰므로 상태 변경(취소, 송장 입력 등)도 그대로 반영된다.
+- ``queryset.update()`` 처럼 시그널이 나가지 않는 변경이나 배포 전 데이터는
+  ``python manage.py rebuild_sales_rollups`` 로 다시 만든다.
+
+집계 기준은 기존 대시보드와 같다.
+
+- 상품: 상태와 관계없이 모든 주문. 합계 행 금액은 배송비를 포함한 ``total_amount``,
+  상품 행 금액은 ``수량 x (단가 + 옵션가)``.
+- 밋업/라이브 강의: 참가 확정·완료 주문. 파일: 구매 확정 주문. 메뉴: 결제 완료 주문.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict, defaultdict
+from datetime import datetime, time, timedelta
+from functools import partial
+
+from django.db import transaction as db_transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import DailySalesRollup, Store
+
+logger = logging.getLogger(__name__)
+
+STORE_TOTAL = DailySalesRollup.STORE_TOTAL_ITEM_ID
+CONFIRMED_PARTICIPANT_STATUSES = ('confirmed', 'completed')
+
+# 스레드별로 기억하는 최근 다시 집계한 하루 수 (넘치면 오래된 것부터 잊음 → 중복 집계만 생김)
+_REFRESH_LOG_SIZE = 1024
+_local = threading.local()
+
+
+def _day_bounds(since, until):
+    """[since, until] 일자 범위를 현지 시간 기준 [시작, 끝) 시각으로 변환"""
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(since, time.min), tz) if since else None
+    end = timezone.make_aware(datetime.combine(until + timedelta(days=1), time.min), tz) if until else None
+    return start, end
+
+
+def _filter_created(queryset, field, start, end):
+    if start is not None:
+        queryset = queryset.filter(**{f'{field}__gte': start})
+    if end is not None:
+        queryset = queryset.filter(**{f'{field}__lt': end})
+    return queryset
+
+
+def _truncated_day(field):
+    return TruncDate(field, tzinfo=timezone.get_current_timezone())
+
+
+def _product_rows(store_id, start, end):
+    from orders.models import Order, OrderItem
+
+    pending_shipment = Q(courier_company='', tracking_number='')
+    orders = _filter_created(Order.objects.filter(store_id=store_id), 'created_at', start, end)
+    totals = orders.annotate(day=_truncated_day('created_at')).values('day', 'channel').annotate(
+        order_count=Count('id'),
+        revenue=Sum('total_amount'),
+        pending_shipment_count=Count('id', filter=pending_shipment),
+    ).order_by()
+
+    items = _filter_created(OrderItem.objects.filter(order__store_id=store_id), 'order__created_at', start, end)
+    item_rows = items.annotate(day=_truncated_day('order__created_at')).values(
+        'day', 'product_id', channel=F('order__channel'),
+    ).annotate(
+        order_count=Count('order', distinct=True),
+        # 모델의 quantity 필드와 이름이 겹치지 않도록 별칭 사용
+        quantity_sum=Sum('quantity'),
+        revenue=Sum(F('quantity') * (F('product_price') + F('options_price'))),
+        pending_shipment_count=Count('order', distinct=True, filter=Q(
+            order__courier_company='',
+            order__tracking_number='',
+        )),
+    ).order_by()
+
+    quantity_by_day = defaultdict(int)
+    for row in item_rows:
+        quantity = row.pop('quantity_sum') or 0
+        quantity_by_day[(row['day'], row['channel'])] += quantity
+        yield dict(row, item_id=row.pop('product_id'), quantity=quantity)
+    for row in totals:
+        yield dict(row, item_id=STORE_TOTAL, quantity=quantity_by_day[(row['day'], row['channel'])])
+
+
+def _single_item_rows(queryset, item_field, price_field, created_field='created_at'):
+    """주문 하나가 항목 하나인 종류(밋업/강의/파일): 항목 행과 그 합인 스토어 합계 행"""
+    rows = queryset.annotate(day=_truncated_day(created_field)).values('day', item_field).annotate(
+        order_count=Count('id'),
+        revenue=Sum(price_field),
+    ).order_by()
+
+    totals = defaultdict(lambda: {'order_count': 0, 'revenue': 0})
+    for row in rows:
+        total = totals[row['day']]
+        total['order_count'] += row['order_count']
+        total['revenue'] += row['revenue'] or 0
+        yield {
+            'day': row['day'],
+            'item_id': row[item_field],
+            'order_count': row['order_count'],
+            'quantity': row['order_count'],
+            'revenue': row['revenue'],
+        }
+    for day, total in totals.items():
+        yield dict(total, day=day, item_id=STORE_TOTAL, quantity=total['order_count'])
+
+
+def _meetup_rows(store_id, start, end):
+    from meetup.models import MeetupOrder
+
+    orders = MeetupOrder.objects.filter(meetup__store_id=store_id, status__in=CONFIRMED_PARTICIPANT_STATUSES)
+    return _single_item_rows(_filter_created(orders, 'created_at', start, end), 'meetup_id', 'total_price')
+
+
+def _live_lecture_rows(store_id, start, end):
+    from lecture.models import LiveLectureOrder
+
+    orders = LiveLectureOrder.objects.filter(
+        live_lecture__store_id=store_id,
+        status__in=CONFIRMED_PARTICIPANT_STATUSES,
+    )
+    return _single_item_rows(_filter_created(orders, 'created_at', start, end), 'live_lecture_id', 'price')
+
+
+def _file_rows(store_id, start, end):
+    from file.models import FileOrder
+
+    orders = FileOrder.objects.filter(digital_file__store_id=store_id, status='confirmed')
+    return _single_item_rows(_filter_created(orders, 'created_at', start, end), 'digital_file_id', 'price')
+
+
+def _menu_rows(store_id, start, end):
+    from menu.models import MenuOrder, MenuOrderItem
+
+    orders = _filter_created(MenuOrder.objects.filter(store_id=store_id, status='paid'), 'created_at', start, end)
+    totals = orders.annotate(day=_truncated_day('created_at')).values('day').annotate(
+        order_count=Count('id'),
+        revenue=Sum('total_amount'),
+    ).order_by()
+
+    items = _filter_created(
+        MenuOrderItem.objects.filter(order__store_id=store_id, order__status='paid'),
+        'order__created_at',
+        start,
+        end,
+    )
+    item_rows = items.annotate(day=_truncated_day('order__created_at')).values('day', 'menu_id').annotate(
+        order_count=Count('order', distinct=True),
+        quantity_sum=Sum('quantity'),
+        revenue=Sum(F('quantity') * (F('menu_price') + F('options_price'))),
+    ).order_by()
+
+    quantity_by_day = defaultdict(int)
+    for row in item_rows:
+        quantity = row.pop('quantity_sum') or 0
+        quantity_by_day[row['day']] += quantity
+        yield dict(row, item_id=row.pop('menu_id'), quantity=quantity)
+    for row in totals:
+        yield dict(row, item_id=STORE_TOTAL, quantity=quantity_by_day[row['day']])
+
+
+ROW_BUILDERS = {
+    DailySalesRollup.KIND_PRODUCT: _product_rows,
+    DailySalesRollup.KIND_MEETUP: _meetup_rows,
+    DailySalesRollup.KIND_LIVE_LECTURE: _live_lecture_rows,
+    DailySalesRollup.KIND_FILE: _file_rows,
+    DailySalesRollup.KIND_MENU: _menu_rows,
+}
+
+
+def rebuild_store_sales(store_id, *, kinds=None, since=None, until=None):
+    """스토어 하나의 집계 행을 원본 주문에서 다시 만든다 (``since``/``until`` 은 포함 범위 일자)
+
+    Returns:
+        int: 새로 쓴 집계 행 수
+    """
+    kinds = sorted(kinds or ROW_BUILDERS)
+    start, end = _day_bounds(since, until)
+    single_day = since is not None and since == until
+
+    with db_transaction.atomic():
+        if not Store.objects.filter(pk=store_id).exists():
+            return 0
+        # 같은 범위를 동시에 다시 집계하면 삭제/추가가 엇갈려 고유 제약에 걸리므로 범위 단위로 직렬화
+        for kind in kinds:
+            _advisory_lock(f'sales_rollup:{store_id}:{kind}', shared=single_day)
+            if single_day:
+                _advisory_lock(f'sales_rollup:{store_id}:{kind}:{since.isoformat()}')
+
+        stale = DailySalesRollup.objects.filter(store_id=store_id, kind__in=kinds)
+        if since is not None:
+            stale = stale.filter(day__gte=since)
+        if until is not None:
+            stale = stale.filter(day__lte=until)
+        stale.delete()
+
+        rollups = [
+            DailySalesRollup(
+                store_id=store_id,
+                kind=kind,
+                day=row['day'],
+                item_id=row['item_id'],
+                channel=row.get('channel') or '',
+                order_count=row['order_count'] or 0,
+                quantity=row['quantity'] or 0,
+                revenue=row['revenue'] or 0,
+                pending_shipment_count=row.get('pending_shipment_count') or 0,
+            )
+            for kind in kinds
+            for row in ROW_BUILDERS[kind](store_id, start, end)
+            if row['item_id'] is not None
+        ]
+        DailySalesRollup.objects.bulk_create(rollups, batch_size=1000)
+    return len(rollups)
+
+
+def refresh_daily_sales(store_id, kind, day):
+    """(스토어, 종류, 일자) 하루치 집계를 다시 만든다"""
+    return rebuild_store_sales(store_id, kinds=[kind], since=day, until=day)
+
+
+def _advisory_lock(name, *, shared=False):
+    """트랜잭션이 끝날 때까지 ``name`` 잠금 (PostgreSQL 만, SQLite 는 쓰기가 이미 직렬화됨)"""
+    connection = db_transaction.get_connection()
+    if connection.vendor != 'postgresql':
+        return
+    lock_id = int.from_bytes(hashlib.sha256(name.encode()).digest()[:8], 'big', signed=True)
+    function = 'pg_advisory_xact_lock_shared' if shared else 'pg_advisory_xact_lock'
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT {function}(%s)', [lock_id])
+
+
+def _next_sequence():
+    _local.sequence = getattr(_local, 'sequence', 0) + 1
+    return _local.sequence
+
+
+def _refresh_marked(key, marked_at):
+    """커밋 후 콜백. 표시한 뒤 같은 스레드에서 이미 다시 집계했으면 건너뜀
+
+    콜백은 표시한 트랜잭션이 커밋된 뒤에만 실행되므로, 표시 이후 시작한 집계는 그 변경을 읽었다.
+    """
+    log = getattr(_local, 'refreshed', None)
+    if log is None:
+        log = _local.refreshed = OrderedDict()
+    if log.get(key, 0) > marked_at:
+        return
+    log[key] = _next_sequence()
+    log.move_to_end(key)
+    while len(log) > _REFRESH_LOG_SIZE:
+        log.popitem(last=False)
+    _refresh_keys([key])
+
+
+def _refresh_keys(keys):
+    for store_id, kind, day in keys:
+        try:
+            refresh_daily_sales(store_id, kind, day)
+        except Exception:
+            # 주문은 이미 커밋됐으므로 집계 실패로 응답을 깨지 않음 (rebuild_sales_rollups 로 복구)
+            logger.exception("일별 판매 집계 갱신 실패 store=%s kind=%s day=%s", store_id, kind, day)
+
+
+def mark_sales_dirty(store_id, kind, day):
+    """커밋 후 다시 집계할 하루를 표시 (트랜잭션 밖이면 바로 다시 집계)"""
+    key = (store_id, kind, day)
+    if not db_transaction.get_connection().in_atomic_block:
+        _refresh_keys([key])
+        return
+    # 롤백되면 콜백도 함께 버려지므로 표시할 때마다 등록하고, 중복은 실행할 때 건너뜀
+    db_transaction.on_commit(partial(_refresh_marked, key, _next_sequence()))
+
+
+def sales_totals(kind, *, store=None, since=None, until=None, channel=None, item_ids=None):
+    """집계 행을 항목별로 합산
+
+    Args:
+        since/until: 포함 범위 일자 (``None`` 이면 제한 없음)
+        channel: 상품 주문 유입 채널 (``None`` 이면 전체)
+        item_ids: 합산할 항목 ID 목록 (``None`` 이면 전체)
+
+    Returns:
+        dict: ``{item_id: {'order_count', 'quantity', 'revenue', 'pending_shipment_count'}}``.
+        스토어 합계는 ``STORE_TOTAL`` 키.
+    """
+    rollups = DailySalesRollup.objects.filter(kind=kind)
+    if store is not None:
+        rollups = rollups.filter(store=store)
+    if since is not None:
+        rollups = rollups.filter(day__gte=since)
+    if until is not None:
+        rollups = rollups.filter(day__lte=until)
+    if channel is not None:
+        rollups = rollups.filter(channel=channel)
+    if item_ids is not None:
+        rollups = rollups.filter(item_id__in=item_ids)
+
+    rows = rollups.values('item_id').annotate(
+        order_count_sum=Sum('order_count'),
+        quantity_sum=Sum('quantity'),
+        revenue_sum=Sum('revenue'),
+        pending_shipment_count_sum=Sum('pending_shipment_count'),
+    ).order_by()
+    return {
+        row['item_id']: {
+            'order_count': row['order_count_sum'] or 0,
+            'quantity': row['quantity_sum'] or 0,
+            'revenue': row['revenue_sum'] or 0,
+            'pending_shipment_count': row['pending_shipment_count_sum'] or 0,
+        }
+        for row in rows
+    }
+
+
+def _order_location(order):
+    return order.store_id, order.created_at
+
+
+def _order_item_location(item):
+    return _order_location(item.order)
+
+
+def _meetup_order_location(order):
+    return order.meetup.store_id, order.created_at
+
+
+def _live_lecture_order_location(order):
+    return order.live_lecture.store_id, order.created_at
+
+
+def _file_order_location(order):
+    return order.digital_file.store_id, order.created_at
+
+
+# (앱, 모델) -> (종류, (스토어 ID, 생성 시각) 을 구하는 함수, 집계에 영향을 주는 필드)
+SIGNAL_SOURCES = {
+    ('orders', 'Order'): (
+        DailySalesRollup.KIND_PRODUCT,
+        _order_location,
+        {'status', 'total_amount', 'courier_company', 'tracking_number', 'channel', 'store'},
+    ),
+    ('orders', 'OrderItem'): (
+        DailySalesRollup.KIND_PRODUCT,
+        _order_item_location,
+        {'order', 'product', 'quantity', 'product_price', 'options_price'},
+    ),
+    ('meetup', 'MeetupOrder'): (
+        DailySalesRollup.KIND_MEETUP,
+        _meetup_order_location,
+        {'status', 'total_price', 'meetup'},
+    ),
+    ('lecture', 'LiveLectureOrder'): (
+        DailySalesRollup.KIND_LIVE_LECTURE,
+        _live_lecture_order_location,
+        {'status', 'price', 'live_lecture'},
+    ),
+    ('file', 'FileOrder'): (
+        DailySalesRollup.KIND_FILE,
+        _file_order_location,
+        {'status', 'price', 'digital_file'},
+    ),
+    ('menu', 'MenuOrder'): (
+        DailySalesRollup.KIND_MENU,
+        _order_location,
+        {'status', 'total_amount', 'store'},
+    ),
+    ('menu', 'MenuOrderItem'): (
+        DailySalesRollup.KIND_MENU,
+        _order_item_location,
+        {'order', 'menu', 'quantity', 'menu_price', 'options_price'},
+    ),
+}
+
+
+def handle_order_change(sender, instance, update_fields=None, **kwargs):
+    """주문/주문 항목 저장·삭제 시그널: 해당 주문의 생성일 집계를 다시 만들도록 표시"""
+    kind, locate, tracked_fields = SIGNAL_SOURCES[(sender._meta.app_label, sender.__name__)]
+    if update_fields and not tracked_fields.intersection(update_fields):
+        return
+
+    try:
+        store_id, created_at = locate(instance)
+    except Exception:
+        # 연쇄 삭제 중 상위 주문이 이미 지워진 경우 등
+        logger.debug("일별 판매 집계 대상 확인 실패: %s #%s", sender.__name__, instance.pk)
+        return
+    if store_id is None or created_at is None:
+        return
+    mark_sales_dirty(store_id, kind, timezone.localdate(created_at))
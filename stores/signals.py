@@ -8,6 +8,7 @@ from django.dispatch import receiver
 from .models import Store, StoreImage
 from storage.utils import delete_file_from_s3
 from .cache_utils import invalidate_store_browse_cache
+from .credential_cache import invalidate_store_credentials
 
 logger = logging.getLogger(__name__)
 
@@ -86,6 +87,13 @@ def invalidate_store_cache_on_store_change(sender, **kwargs):
     invalidate_store_browse_cache()
 
 
+@receiver(post_save, sender=Store)
+@receiver(post_delete, sender=Store)
+def invalidate_store_credentials_on_store_change(sender, instance, **kwargs):
+    """스토어 저장/삭제 시 복호화된 자격 증명 캐시 무효화"""
+    invalidate_store_credentials(instance.pk)
+
+
 def _invalidate_store_cache(sender, **kwargs):
     """외부 모델 변경 시 탐색 페이지 캐시 무효화"""
     invalidate_store_browse_cache()
@@ -121,4 +129,28 @@ def _register_external_cache_signals():
         )
 
 
+def _register_sales_rollup_signals():
+    """주문 모델 변경 시 일별 판매 집계를 다시 만들도록 연결"""
+    from django.apps import apps
+    from .sales_rollup import SIGNAL_SOURCES, handle_order_change
+
+    for app_label, model_name in SIGNAL_SOURCES:
+        try:
+            model = apps.get_model(app_label, model_name)
+        except LookupError:
+            continue
+
+        post_save.connect(
+            handle_order_change,
+            sender=model,
+            dispatch_uid=f'stores.sales_rollup.{app_label}.{model_name}.save',
+        )
+        post_delete.connect(
+            handle_order_change,
+            sender=model,
+            dispatch_uid=f'stores.sales_rollup.{app_label}.{model_name}.delete',
+        )
+
+
 _register_external_cache_signals()
+_register_sales_rollup_signals()
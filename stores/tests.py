@@ -1,3 +1,341 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.mail import EmailMessage
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from stores import credential_cache
+from stores.email_outbox import MAX_MESSAGES_PER_CONNECTION, deliver_pending, queue_store_email
+from stores.fake_smtp import FakeSMTPServer
+from stores import sales_rollup
+from stores.models import DailySalesRollup, EmailOutbox, Store
+
+
+class StoreCredentialCacheTests(TestCase):
+    def setUp(self):
+        credential_cache.invalidate_store_credentials()
+        self.addCleanup(credential_cache.invalidate_store_credentials)
+        self.owner = User.objects.create_user(username='owner', password='test-pass')
+        self.store = Store(
+            store_id='credstore',
+            store_name='자격 증명 스토어',
+            owner_name='홍길동',
+            chat_channel='https://t.me/example',
+            owner=self.owner,
+        )
+        self.store.set_blink_api_info('blink-api-key')
+        self.store.set_blink_wallet_id('wallet-1')
+        self.store.set_email_host_password('smtp-password')
+        self.store.save()
+
+    def test_repeated_lookups_decrypt_once(self):
+        store = Store.objects.get(pk=self.store.pk)
+        with mock.patch.object(Store, 'decrypt_data', wraps=store.decrypt_data) as decrypt:
+            for _ in range(3):
+                self.assertEqual(store.get_blink_api_info(), 'blink-api-key')
+                self.assertEqual(store.get_blink_wallet_id(), 'wallet-1')
+                self.assertEqual(store.get_email_host_password(), 'smtp-password')
+            # 다른 인스턴스도 같은 프로세스 캐시를 공유
+            self.assertEqual(Store.objects.get(pk=self.store.pk).get_blink_api_info(), 'blink-api-key')
+
+        self.assertEqual(decrypt.call_count, 3)
+
+    def test_save_and_ciphertext_change_return_new_value(self):
+        self.assertEqual(self.store.get_blink_api_info(), 'blink-api-key')
+
+        self.store.set_blink_api_info('rotated-key')
+        self.store.save()
+        self.assertEqual(Store.objects.get(pk=self.store.pk).get_blink_api_info(), 'rotated-key')
+
+        # save() 를 거치지 않은 갱신도 암호문 해시가 달라 옛 값이 반환되지 않음
+        Store.objects.filter(pk=self.store.pk).update(
+            blink_wallet_id_encrypted=self.store.encrypt_data('wallet-2')
+        )
+        self.assertEqual(Store.objects.get(pk=self.store.pk).get_blink_wallet_id(), 'wallet-2')
+
+    def test_cache_is_bounded(self):
+        with self.settings(STORE_CREDENTIAL_CACHE_MAX_ENTRIES=2):
+            for index in range(5):
+                credential_cache.remember_credential(index, f'cipher-{index}', f'plain-{index}')
+
+            self.assertIsNone(credential_cache.get_cached_credential(0, 'cipher-0'))
+            self.assertEqual(credential_cache.get_cached_credential(4, 'cipher-4'), 'plain-4')
+
+
+class EmailOutboxTests(TestCase):
+    def setUp(self):
+        self.server = FakeSMTPServer(password='app-password').start()
+        self.addCleanup(self.server.stop)
+        settings_override = override_settings(
+            STORE_EMAIL_SMTP_HOST=self.server.host,
+            STORE_EMAIL_SMTP_PORT=self.server.port,
+            STORE_EMAIL_SMTP_USE_TLS=False,
+            STORE_EMAIL_OUTBOX_BACKGROUND=False,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.stores = [self._create_store(index) for index in range(2)]
+
+    def _create_store(self, index, password='app-password'):
+        store = Store(
+            store_id=f'mailstore{index}',
+            store_name=f'메일 스토어 {index}',
+            owner_name='홍길동',
+            owner_email=f'owner{index}@example.com',
+            chat_channel='https://t.me/example',
+            owner=User.objects.create_user(username=f'owner{index}'),
+            email_enabled=True,
+            email_host_user=f'store{index}@example.com',
+        )
+        store.set_email_host_password(password)
+        store.save()
+        return store
+
+    def _queue(self, store, subject, **kwargs):
+        return queue_store_email(store, EmailMessage(subject=subject, body='본문', to=[store.owner_email]), **kwargs)
+
+    def test_worker_reuses_one_connection_per_store(self):
+        for index in range(6):
+            self._queue(self.stores[index % 2], f'주문 {index}')
+        message = EmailMessage(subject='QR 첨부', body='본문', to=['buyer@example.com'])
+        message.attach('ticket.png', b'\x89PNG-data', 'image/png')
+        queue_store_email(self.stores[0], message, kind='meetup_participant_confirmation', dedupe_key='meetup:1')
+        # 같은 키로 다시 넣으면 무시
+        self.assertIsNone(self._queue(self.stores[0], '중복', dedupe_key='meetup:1'))
+
+        result = deliver_pending()
+
+        self.assertEqual((result.sent, result.failed, result.connections), (7, 0, 2))
+        self.assertEqual((self.server.connection_count, self.server.login_count, self.server.message_count), (2, 2, 7))
+        self.assertEqual(EmailOutbox.objects.filter(status=EmailOutbox.STATUS_SENT).count(), 7)
+        received = {message.parsed()['Subject']: message for message in self.server.messages}
+        self.assertEqual(received['주문 1'].username, 'store1@example.com')
+        self.assertIn('store1@example.com', received['주문 1'].parsed()['From'])
+        attachment = next(received['QR 첨부'].parsed().iter_attachments())
+        self.assertEqual(attachment.get_filename(), 'ticket.png')
+        self.assertEqual(attachment.get_content(), b'\x89PNG-data')
+
+    def test_long_batches_reconnect_after_connection_limit(self):
+        for index in range(MAX_MESSAGES_PER_CONNECTION + 1):
+            self._queue(self.stores[0], f'주문 {index}')
+
+        result = deliver_pending(limit=MAX_MESSAGES_PER_CONNECTION + 1)
+
+        self.assertEqual((result.sent, result.connections), (MAX_MESSAGES_PER_CONNECTION + 1, 2))
+
+    def test_failed_messages_back_off_and_retry(self):
+        for index in range(3):
+            self._queue(self.stores[0], f'주문 {index}')
+        self.server.fail_next(1)
+
+        result = deliver_pending()
+
+        self.assertEqual((result.sent, result.failed), (2, 1))
+        failed = EmailOutbox.objects.get(status=EmailOutbox.STATUS_PENDING)
+        self.assertEqual(failed.attempts, 1)
+        self.assertGreater(failed.next_attempt_at, failed.created_at)
+        self.assertIn('451', failed.last_error)
+        # 재시도 시각 전에는 가져가지 않음
+        self.assertEqual(deliver_pending().handled, 0)
+
+        result = deliver_pending(now=failed.next_attempt_at + timedelta(seconds=1))
+        self.assertEqual(result.sent, 1)
+        self.assertEqual(self.server.message_count, 3)
+
+    def test_login_failure_defers_the_whole_store_batch(self):
+        store = self._create_store(2, password='wrong-password')
+        for index in range(3):
+            self._queue(store, f'주문 {index}')
+
+        result = deliver_pending()
+
+        self.assertEqual((result.sent, result.failed), (0, 3))
+        self.assertEqual(self.server.connection_count, 1)
+        self.assertEqual(EmailOutbox.objects.filter(status=EmailOutbox.STATUS_PENDING, attempts=1).count(), 3)
+
+
+class SalesRollupTests(TestCase):
+    def setUp(self):
+        from products.models import Product
+
+        self.owner = User.objects.create_user(username='rollup-owner', password='test-pass')
+        self.store = Store.objects.create(
+            store_id='rollupstore',
+            store_name='집계 스토어',
+            owner_name='홍길동',
+            chat_channel='https://t.me/example',
+            owner=self.owner,
+        )
+        self.products = [
+            Product.objects.create(store=self.store, title=f'상품 {index}', description='테스트', price=1000)
+            for index in range(2)
+        ]
+        self.today = timezone.localdate()
+
+    def _place_order(self, items, channel='', shipping_fee=0):
+        from orders.models import Order, OrderItem
+
+        subtotal = sum(price * quantity for _, price, quantity in items)
+        order = Order.objects.create(
+            user=self.owner,
+            store=self.store,
+            status='paid',
+            channel=channel,
+            buyer_name='구매자',
+            buyer_phone='01012345678',
+            buyer_email='buyer@example.com',
+            shipping_postal_code='04524',
+            shipping_address='서울시 중구',
+            shipping_detail_address='101호',
+            subtotal=subtotal,
+            shipping_fee=shipping_fee,
+            total_amount=subtotal + shipping_fee,
+        )
+        for product, price, quantity in items:
+            OrderItem.objects.create(
+                order=order,
+                product=product,
+                product_title=product.title,
+                product_price=price,
+                quantity=quantity,
+            )
+        return order
+
+    def _rollups(self, kind=DailySalesRollup.KIND_PRODUCT):
+        return {
+            (row.item_id, row.channel): (row.order_count, row.quantity, row.revenue, row.pending_shipment_count)
+            for row in DailySalesRollup.objects.filter(store=self.store, kind=kind, day=self.today)
+        }
+
+    def test_order_commit_refreshes_day_once_and_tracks_shipping(self):
+        first, second = self.products
+        with mock.patch.object(sales_rollup, 'refresh_daily_sales', wraps=sales_rollup.refresh_daily_sales) as refresh:
+            with self.captureOnCommitCallbacks(execute=True):
+                order = self._place_order([(first, 1000, 2), (second, 500, 1)], shipping_fee=300)
+                self._place_order([(first, 1000, 1)], channel='partner-a')
+
+        # 주문/항목 저장이 여러 번이어도 커밋 후 하루 한 번만 다시 집계
+        self.assertEqual(refresh.call_count, 1)
+        self.assertEqual(self._rollups(), {
+            (first.id, ''): (1, 2, 2000, 1),
+            (second.id, ''): (1, 1, 500, 1),
+            (sales_rollup.STORE_TOTAL, ''): (1, 3, 2800, 1),
+            (first.id, 'partner-a'): (1, 1, 1000, 1),
+            (sales_rollup.STORE_TOTAL, 'partner-a'): (1, 1, 1000, 1),
+        })
+
+        # 송장 입력은 발송 대기 수에 반영되고, 집계와 무관한 필드 저장은 다시 집계하지 않음
+        with mock.patch.object(sales_rollup, 'refresh_daily_sales', wraps=sales_rollup.refresh_daily_sales) as refresh:
+            with self.captureOnCommitCallbacks(execute=True):
+                order.order_memo = '문 앞'
+                order.save(update_fields=['order_memo'])
+            self.assertEqual(refresh.call_count, 0)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                order.courier_company = 'CJ대한통운'
+                order.tracking_number = '123456789'
+                order.save(update_fields=['courier_company', 'tracking_number'])
+            self.assertEqual(refresh.call_count, 1)
+        self.assertEqual(self._rollups()[(sales_rollup.STORE_TOTAL, '')], (1, 3, 2800, 0))
+        self.assertEqual(self._rollups()[(first.id, '')], (1, 2, 2000, 0))
+
+        totals = sales_rollup.sales_totals(DailySalesRollup.KIND_PRODUCT, store=self.store)
+        self.assertEqual(totals[first.id]['order_count'], 2)
+        self.assertEqual(totals[sales_rollup.STORE_TOTAL]['revenue'], 3800)
+
+    def test_rolled_back_marks_do_not_suppress_later_refresh(self):
+        first, second = self.products
+        with mock.patch.object(sales_rollup, 'refresh_daily_sales', wraps=sales_rollup.refresh_daily_sales) as refresh:
+            with self.captureOnCommitCallbacks(execute=True):
+                with self.assertRaises(RuntimeError), transaction.atomic():
+                    self._place_order([(first, 1000, 1)])
+                    raise RuntimeError('결제 실패')
+                self._place_order([(second, 500, 2)])
+
+        # 롤백된 저장의 콜백은 버려지고, 이후 저장이 하루를 한 번 다시 집계함
+        self.assertEqual(refresh.call_count, 1)
+        self.assertEqual(self._rollups()[(sales_rollup.STORE_TOTAL, '')], (1, 2, 1000, 1))
+
+    def test_rebuild_command_matches_incremental_rows(self):
+        from meetup.models import Meetup, MeetupOrder
+
+        meetup = Meetup.objects.create(store=self.store, name='밋업', price=5000)
+        with self.captureOnCommitCallbacks(execute=True):
+            self._place_order([(self.products[0], 1000, 3)], shipping_fee=100)
+            for status in ('confirmed', 'completed', 'pending', 'cancelled'):
+                MeetupOrder.objects.create(
+                    meetup=meetup,
+                    participant_name='참가자',
+                    participant_email='guest@example.com',
+                    status=status,
+                    base_price=5000,
+                    total_price=5000,
+                )
+
+        incremental = (self._rollups(), self._rollups(DailySalesRollup.KIND_MEETUP))
+        self.assertEqual(incremental[1], {
+            (meetup.id, ''): (2, 2, 10000, 0),
+            (sales_rollup.STORE_TOTAL, ''): (2, 2, 10000, 0),
+        })
+
+        DailySalesRollup.objects.all().delete()
+        call_command('rebuild_sales_rollups', store=[self.store.store_id], stdout=StringIO())
+        self.assertEqual((self._rollups(), self._rollups(DailySalesRollup.KIND_MEETUP)), incremental)
+
+    def test_channel_sales_summary_reads_rollups(self):
+        from meetup.models import Meetup, MeetupOrder
+
+        meetup = Meetup.objects.create(store=self.store, name='밋업', price=5000)
+        with self.captureOnCommitCallbacks(execute=True):
+            self._place_order([(self.products[0], 1000, 1)])
+            self._place_order([(self.products[1], 1000, 2)], channel='partner-a')
+            MeetupOrder.objects.create(
+                meetup=meetup,
+                participant_name='참가자',
+                participant_email='guest@example.com',
+                status='confirmed',
+                base_price=5000,
+                total_price=5000,
+            )
+        staff = User.objects.create_user(username='rollup-staff', password='test-pass', is_staff=True)
+        self.client.force_login(staff)
+
+        def summary(**params):
+            with mock.patch('api.admin_views.render', return_value=HttpResponse()) as render, \
+                    CaptureQueriesContext(connection) as queries:
+                self.client.get(reverse('api:channel_sales'), params)
+            self.assertFalse(any('"meetup_meetuporder"' in query['sql'] for query in queries.captured_queries))
+            return [(row['label'], row['count'], row['amount']) for row in render.call_args.args[2]['summary']]
+
+        self.assertEqual(summary(), [('상품 주문', 2, 3000), ('밋업', 1, 5000)])
+        # 밋업/라이브 강의/파일 주문은 유입 채널이 없어 채널 필터 시 제외
+        self.assertEqual(summary(channel='partner-a'), [('상품 주문', 1, 2000)])
+
+    def test_order_management_reads_rollups(self):
+        first, second = self.products
+        with self.captureOnCommitCallbacks(execute=True):
+            self._place_order([(second, 700, 1)])
+            self._place_order([(first, 1000, 2)], shipping_fee=100)
+
+        self.client.force_login(self.owner)
+        with mock.patch('orders.views.render', return_value=HttpResponse()) as render:
+            response = self.client.get(reverse('orders:order_management', args=[self.store.store_id]))
+
+        self.assertEqual(response.status_code, 200)
+        context = render.call_args.args[2]
+        self.assertEqual(context['monthly_orders_count'], 2)
+        self.assertEqual(context['monthly_revenue'], 2800)
+        products = context['products_with_orders']
+        self.assertEqual([product.id for product in products], [first.id, second.id])
+        self.assertEqual(
+            (products[0].total_orders, products[0].total_quantity, products[0].total_revenue),
+            (1, 2, 2000),
+        )
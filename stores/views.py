@@ -35,6 +35,7 @@ from .featured_services import (
 from products.models import (
     Product, ProductImage, ProductOption, ProductOptionChoice, ProductCategory
 )
+from products.pricing import resolve_product_prices
 from orders.models import (
     Cart, CartItem, Order, OrderItem, PurchaseHistory
 )
@@ -915,6 +916,7 @@ def store_detail(request, store_id):
     
     if store.is_active:
         products = get_featured_items_for_display(store, FEATURE_ITEM_TYPE_PRODUCT)
+        resolve_product_prices(products, include_options=False)
         meetups = get_featured_items_for_display(store, FEATURE_ITEM_TYPE_MEETUP)
         live_lectures = get_featured_items_for_display(store, FEATURE_ITEM_TYPE_LIVE)
         digital_files = get_featured_items_for_display(store, FEATURE_ITEM_TYPE_FILE)
@@ -2232,7 +2234,10 @@ def product_detail(request, store_id, product_id):
             'error_type': 'product_inactive'
         }
         return render(request, 'products/product_not_found.html', context, status=404)
-    
+
+    # 상품/옵션 가격을 단일 환율로 한 번에 계산 (옵션·선택지 prefetch 포함)
+    resolve_product_prices([product])
+
     from orders.services import CartService
 
     cart_service = CartService(request)